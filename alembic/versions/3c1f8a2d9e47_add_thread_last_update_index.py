@@ -0,0 +1,143 @@
+"""Add trigger-maintained thread_last_update table for checkpoints
+
+Revision ID: 3c1f8a2d9e47
+Revises: 9ff31683095d
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f8a2d9e47'
+down_revision = '9ff31683095d'
+branch_labels = None
+depends_on = None
+
+
+# Mesmo padrão usado pela view thread_ids_2: timestamp ISO em hex dentro do blob
+CHECKPOINT_TS_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION public.checkpoint_ts_from_blob(blob bytea)
+RETURNS timestamptz
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    ts_hex text;
+BEGIN
+    IF blob IS NULL THEN
+        RETURN NULL;
+    END IF;
+    ts_hex := (regexp_match(
+        encode(blob, 'hex'),
+        '((3[0-9]){4}2d(3[0-9]){2}2d(3[0-9]){2}54(3[0-9]){2}3a(3[0-9]){2}3a(3[0-9]){2}2e(3[0-9])+(2b|2d)(3[0-9]){2}3a(3[0-9]){2})'
+    ))[1];
+    IF ts_hex IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN convert_from(decode(ts_hex, 'hex'), 'UTF8')::timestamptz;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$;
+"""
+
+UPSERT_FUNCTION = """
+CREATE OR REPLACE FUNCTION public.thread_last_update_upsert()
+RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    ts timestamptz;
+BEGIN
+    ts := public.checkpoint_ts_from_blob(NEW.checkpoint);
+    IF ts IS NOT NULL THEN
+        INSERT INTO public.thread_last_update (thread_id, last_update)
+        VALUES (NEW.thread_id, ts)
+        ON CONFLICT (thread_id) DO UPDATE
+        SET last_update = GREATEST(thread_last_update.last_update, EXCLUDED.last_update);
+    END IF;
+    RETURN NEW;
+END;
+$$;
+"""
+
+PRUNE_FUNCTION = """
+CREATE OR REPLACE FUNCTION public.thread_last_update_prune()
+RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM public.thread_last_update t
+    USING (SELECT DISTINCT thread_id FROM deleted_checkpoints) d
+    WHERE t.thread_id = d.thread_id
+      AND NOT EXISTS (
+          SELECT 1 FROM public.checkpoints c WHERE c.thread_id = d.thread_id
+      );
+    RETURN NULL;
+END;
+$$;
+"""
+
+# A tabela checkpoints é criada pelo langchain_google_cloud_sql_pg, fora das
+# migrações. Sem ela os triggers não podem ser criados e thread_last_update
+# nunca seria mantida: a revisão falha em vez de ser registrada pela metade. A
+# verificação roda no servidor, então `alembic upgrade --sql` continua
+# funcionando.
+REQUIRE_CHECKPOINTS = """
+DO $$
+BEGIN
+    IF to_regclass('public.checkpoints') IS NULL THEN
+        RAISE EXCEPTION 'public.checkpoints não existe: os triggers de thread_last_update dependem dela'
+            USING HINT = 'Crie a tabela de checkpoints do langchain_google_cloud_sql_pg (ela é criada na primeira conversa com o agente) e rode alembic upgrade de novo.';
+    END IF;
+END
+$$;
+"""
+
+DROP_TRIGGERS = """
+DO $$
+BEGIN
+    IF to_regclass('public.checkpoints') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS checkpoints_thread_last_update_upsert ON public.checkpoints;
+        DROP TRIGGER IF EXISTS checkpoints_thread_last_update_prune ON public.checkpoints;
+    END IF;
+END
+$$;
+"""
+
+TRIGGERS = """
+CREATE TRIGGER checkpoints_thread_last_update_upsert
+AFTER INSERT OR UPDATE OF checkpoint ON public.checkpoints
+FOR EACH ROW EXECUTE FUNCTION public.thread_last_update_upsert();
+
+CREATE TRIGGER checkpoints_thread_last_update_prune
+AFTER DELETE ON public.checkpoints
+REFERENCING OLD TABLE AS deleted_checkpoints
+FOR EACH STATEMENT EXECUTE FUNCTION public.thread_last_update_prune();
+"""
+
+
+def upgrade():
+    op.execute(REQUIRE_CHECKPOINTS)
+
+    # Tabela com a última atividade de cada thread, mantida por triggers
+    op.create_table(
+        'thread_last_update',
+        sa.Column('thread_id', sa.Text(), primary_key=True),
+        sa.Column('last_update', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        'ix_thread_last_update_last_update', 'thread_last_update', ['last_update']
+    )
+
+    op.execute(CHECKPOINT_TS_FUNCTION)
+    op.execute(UPSERT_FUNCTION)
+    op.execute(PRUNE_FUNCTION)
+    op.execute(TRIGGERS)
+
+
+def downgrade():
+    op.execute(DROP_TRIGGERS)
+    op.execute("DROP FUNCTION IF EXISTS public.thread_last_update_prune()")
+    op.execute("DROP FUNCTION IF EXISTS public.thread_last_update_upsert()")
+    op.execute("DROP FUNCTION IF EXISTS public.checkpoint_ts_from_blob(bytea)")
+    op.drop_index('ix_thread_last_update_last_update', table_name='thread_last_update')
+    op.drop_table('thread_last_update')
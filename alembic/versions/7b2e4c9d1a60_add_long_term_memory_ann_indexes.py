@@ -0,0 +1,67 @@
+"""Add HNSW and composite user indexes to long_term_memory
+
+Revision ID: 7b2e4c9d1a60
+Revises: 3c1f8a2d9e47
+Create Date: 2026-10-17 12:05:09.427113
+
+"""
+import logging
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4c9d1a60'
+down_revision = '3c1f8a2d9e47'
+branch_labels = None
+depends_on = None
+
+log = logging.getLogger("alembic.runtime.migration")
+
+
+# Parâmetros de construção do HNSW (defaults do pgvector); ef_search é ajustado
+# por consulta via LANG_GRAPH_MEMORY_HNSW_EF_SEARCH
+HNSW_INDEX = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_long_term_memory_embedding_hnsw
+ON public.long_term_memory
+USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64)
+"""
+
+# Pré-filtro por usuário (e tipo) da busca exata e da busca cronológica
+USER_INDEX = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_long_term_memory_user_type_created
+ON public.long_term_memory (user_id, memory_type, creation_datetime DESC)
+"""
+
+
+def _has_long_term_memory(bind) -> bool:
+    return bind.execute(
+        sa.text("SELECT to_regclass('public.long_term_memory') IS NOT NULL")
+    ).scalar()
+
+
+def upgrade():
+    # A tabela long_term_memory é criada pelo DatabaseManager (create_all), que
+    # já declara os mesmos índices; aqui eles são adicionados a bancos antigos.
+    # Com --sql não há conexão para verificar: o script assume a tabela.
+    if not context.is_offline_mode() and not _has_long_term_memory(op.get_bind()):
+        log.info("public.long_term_memory não existe: índices criados pelo create_all")
+        return
+
+    # CONCURRENTLY não roda dentro de transação
+    with op.get_context().autocommit_block():
+        op.execute(USER_INDEX)
+        op.execute(HNSW_INDEX)
+        op.execute("ANALYZE public.long_term_memory")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS public.ix_long_term_memory_embedding_hnsw"
+        )
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS public.ix_long_term_memory_user_type_created"
+        )
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark do overhead por turno do nó agent_reasoning: modelo instanciado,
+`bind_tools` e system prompt completo a cada turno (comportamento anterior) vs.
+agente compilado em cache (só o contexto de memórias é renderizado).
+
+O modelo é um chat model falso (sem rede) que devolve sempre a mesma resposta,
+então o tempo medido é só o de preparação + `ainvoke` do LangChain. Com
+`--model gemini` o ChatGoogleGenerativeAI real é instanciado e vinculado às
+ferramentas para incluir o custo de criar o cliente; nesse modo o `ainvoke`
+não é chamado (não há rede) e só a preparação do turno é medida.
+
+    python -m benchmarks.bench_compiled_agent --turns 2000 --memories 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+from enum import Enum
+from types import SimpleNamespace
+from typing import Any, Callable, List, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.tools import BaseTool, StructuredTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, Field
+
+from src.services.lang_graph.compiled_agent import (
+    CompiledAgentCache,
+    render_memories_context,
+    render_static_prompt,
+)
+
+
+class FakeToolChatModel(GenericFakeChatModel):
+    """Chat model falso que converte as ferramentas como os modelos reais fazem"""
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        formatted = [convert_to_openai_tool(t) for t in tools]
+        return self.bind(tools=formatted, **kwargs)
+
+
+class _Responses:
+    """Iterador infinito exigido pelo GenericFakeChatModel"""
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> AIMessage:
+        return AIMessage(content="Você pode emitir pelo portal *Carioca Digital*.")
+
+
+class BenchMemoryTypes(BaseModel):
+    """Mesmo formato do MemoryTypeConfig (descrições nos defaults)"""
+
+    user_profile: str = "Fatos estáveis sobre o usuário."
+    preference: str = "Preferências subjetivas e gostos do usuário."
+    goal: str = "Um objetivo ou tarefa que o usuário deseja alcançar."
+    constraint: str = "Uma restrição ou condição que deve ser respeitada."
+    critical_info: str = "Informação crítica e pontual, geralmente de curto prazo."
+
+
+class _MemoryType(str, Enum):
+    USER_PROFILE = "user_profile"
+
+
+class GetMemoryArgs(BaseModel):
+    memory_type: str = Field(..., description="Tipo de memória")
+    query: str = Field(..., description="Query para busca semântica")
+
+
+class SaveMemoryArgs(BaseModel):
+    content: str = Field(..., description="Conteúdo da memória")
+    memory_type: str = Field(..., description="Tipo de memória")
+
+
+class UpdateMemoryArgs(BaseModel):
+    memory_id: str = Field(..., description="ID da memória a ser atualizada")
+    new_content: str = Field(..., description="Novo conteúdo da memória")
+
+
+class DeleteMemoryArgs(BaseModel):
+    memory_id: str = Field(..., description="ID da memória a ser deletada")
+
+
+def build_tools() -> List[BaseTool]:
+    """Ferramentas com os mesmos schemas das ferramentas de memória do agente"""
+
+    def noop(**kwargs) -> dict:
+        return {"success": True}
+
+    schemas = {
+        "get_memory_tool": GetMemoryArgs,
+        "save_memory_tool": SaveMemoryArgs,
+        "update_memory_tool": UpdateMemoryArgs,
+        "delete_memory_tool": DeleteMemoryArgs,
+    }
+    return [
+        StructuredTool.from_function(
+            func=noop, name=name, description=f"Ferramenta {name}", args_schema=schema
+        )
+        for name, schema in schemas.items()
+    ]
+
+
+def build_memories(count: int) -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            memory_id=f"mem-{i}",
+            content=f"O usuário mora no bairro {i}",
+            memory_type=_MemoryType.USER_PROFILE,
+            creation_datetime=now,
+            last_accessed=now,
+            relevance_score=0.9 - i * 0.01,
+        )
+        for i in range(count)
+    ]
+
+
+def model_factory(kind: str, temperature: float) -> Callable[[], BaseChatModel]:
+    if kind == "gemini":
+        from src.services.lang_graph.llms import llm_config
+
+        return lambda: llm_config.get_chat_model(temperature=temperature)
+    return lambda: FakeToolChatModel(messages=_Responses())
+
+
+async def run_turns(prepare, turns: int, history: list) -> List[float]:
+    samples = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        model, system_prompt = prepare()
+        if isinstance(model.bound, GenericFakeChatModel):
+            await model.ainvoke([SystemMessage(content=system_prompt), *history])
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--memories", type=int, default=5)
+    parser.add_argument("--model", choices=["fake", "gemini"], default="fake")
+    args = parser.parse_args()
+
+    tools = build_tools()
+    memories = build_memories(args.memories)
+    history = [HumanMessage(content="Onde emito a segunda via do IPTU?")]
+    config = SimpleNamespace(
+        system_prompt="Você é o EAí, assistente da Prefeitura do Rio.\n" * 40,
+        memory_types_config=BenchMemoryTypes(),
+        temperature=0.7,
+    )
+    factory = model_factory(args.model, config.temperature)
+    cache = CompiledAgentCache(max_entries=8)
+
+    def per_turn():
+        model = factory().bind_tools(tools)
+        system_prompt = render_static_prompt(
+            config.system_prompt, config.memory_types_config
+        ) + render_memories_context(memories)
+        return model, system_prompt
+
+    def cached():
+        agent = cache.get(config, tools, model_name=args.model, model_factory=factory)
+        return agent.model, agent.system_prompt(memories)
+
+    assert per_turn()[1] == cached()[1], "prompts diferentes"
+
+    print(f"{args.turns} turnos, modelo {args.model}, {args.memories} memórias")
+    print(f"{'modo':<18} {'p50 µs':>10} {'p95 µs':>10} {'total s':>9}")
+    results = {}
+    for label, prepare in (("por turno", per_turn), ("agente compilado", cached)):
+        await run_turns(prepare, min(50, args.turns), history)  # aquecimento
+        samples = await run_turns(prepare, args.turns, history)
+        cuts = statistics.quantiles(samples, n=100)
+        results[label] = sum(samples)
+        print(
+            f"{label:<18} {cuts[49] * 1e6:>10.1f} {cuts[94] * 1e6:>10.1f} "
+            f"{sum(samples):>9.3f}"
+        )
+    print(f"speed-up: {results['por turno'] / results['agente compilado']:.1f}x")
+    print(f"cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline do tamanho do prompt por turno do agent_reasoning: histórico
+completo (comportamento anterior) vs. políticas do ContextBudgeter.
+
+Gera conversas sintéticas de 200 turnos (perguntas, respostas e, em parte dos
+turnos, uma tool call com resultado longo) e simula o agente turno a turno,
+guardando context_start/conversation_summary como o grafo faz. Os tokens são
+contados com a aproximação local de context_window.py; o resumo é feito por um
+summarizer falso que devolve um texto do tamanho configurado, então nenhum
+modelo é chamado.
+
+    python -m benchmarks.bench_context_window --turns 200 --conversations 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+from typing import List
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from src.services.lang_graph.context_window import ContextBudgeter, ContextPolicy
+
+SYSTEM_PROMPT = (
+    "Você é o EAí, assistente da Prefeitura do Rio.\n" * 40
+    + "\n**Memórias Relevantes Recuperadas:**\n"
+    + "".join(f"{i}. **preference:** memória sintética {i}\n" for i in range(5))
+)
+
+WORDS = (
+    "iptu segunda via boleto prefeitura rio janeiro matrícula imóvel cadastro "
+    "carioca atendimento protocolo serviço endereço bairro vencimento parcela"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def turn_messages(rng: random.Random, turn: int, tool_ratio: float) -> List:
+    """Mensagens de um turno: pergunta, tool call opcional e resposta"""
+    messages: List[BaseMessage] = [
+        HumanMessage(content=sentence(rng, rng.randint(8, 40)))
+    ]
+    if rng.random() < tool_ratio:
+        call_id = f"call_{turn}"
+        messages.append(
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": "get_memory_tool",
+                        "args": {"query": sentence(rng, 6), "memory_type": "fact"},
+                        "id": call_id,
+                    }
+                ],
+            )
+        )
+        messages.append(
+            ToolMessage(
+                content=sentence(rng, rng.randint(80, 300)), tool_call_id=call_id
+            )
+        )
+    messages.append(AIMessage(content=sentence(rng, rng.randint(30, 150))))
+    return messages
+
+
+async def simulate(
+    policy: ContextPolicy, turns: int, seed: int, tool_ratio: float
+) -> tuple:
+    """Tokens do prompt na última chamada de cada turno, total e nº de resumos"""
+    rng = random.Random(seed)
+    summaries = []
+
+    async def fake_summarizer(previous: str, dropped: List[BaseMessage]) -> str:
+        summaries.append(len(dropped))
+        return " ".join(["fato"] * policy.summary_max_tokens)
+
+    budgeter = ContextBudgeter(policy, summarizer=fake_summarizer)
+    history: List[BaseMessage] = []
+    start, summary = 0, ""
+    per_turn, total = [], 0
+    for turn in range(turns):
+        messages = turn_messages(rng, turn, tool_ratio)
+        history.append(messages[0])
+        # Uma chamada ao modelo por AIMessage do turno
+        for reply in messages[1:]:
+            window = await budgeter.abuild(SYSTEM_PROMPT, history, start, summary)
+            start, summary = window.start, window.summary
+            total += window.tokens
+            history.append(reply)
+        per_turn.append(window.tokens)
+    return per_turn, total, len(summaries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--conversations", type=int, default=5)
+    parser.add_argument("--tool-ratio", type=float, default=0.4)
+    parser.add_argument("--max-tokens", type=int, default=8000)
+    args = parser.parse_args()
+
+    policies = {
+        "histórico completo": ContextPolicy(max_tokens=0, max_messages=0),
+        f"orçamento {args.max_tokens}": ContextPolicy(max_tokens=args.max_tokens),
+        f"orçamento {args.max_tokens // 2}": ContextPolicy(
+            max_tokens=args.max_tokens // 2
+        ),
+        "janela 40 mensagens": ContextPolicy(max_tokens=0, max_messages=40),
+        f"orçamento {args.max_tokens} + resumo": ContextPolicy(
+            max_tokens=args.max_tokens, summarize=True
+        ),
+    }
+
+    print(
+        f"{args.conversations} conversas x {args.turns} turnos, "
+        f"{args.tool_ratio:.0%} dos turnos com tool call (tokens aproximados)"
+    )
+    checkpoints = [t for t in (10, 50, 100, args.turns) if t <= args.turns]
+    header = "".join(f"{f'turno {t}':>11}" for t in checkpoints)
+    print(f"{'política':<30}{header}{'máximo':>9}{'soma':>12}{'resumos':>9}")
+    for label, policy in policies.items():
+        per_turn, totals, summaries = [], [], []
+        for seed in range(args.conversations):
+            sizes, total, summary_calls = asyncio.run(
+                simulate(policy, args.turns, seed, args.tool_ratio)
+            )
+            per_turn.append(sizes)
+            totals.append(total)
+            summaries.append(summary_calls)
+
+        columns = "".join(
+            f"{statistics.mean(sizes[t - 1] for sizes in per_turn):>11,.0f}"
+            for t in checkpoints
+        )
+        print(
+            f"{label:<30}{columns}"
+            f"{statistics.mean(max(sizes) for sizes in per_turn):>9,.0f}"
+            f"{statistics.mean(totals):>12,.0f}{statistics.mean(summaries):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tempo e pico de memória do DataLoader: leitura inteira vs. leitura em blocos.
+
+Gera um dataset sintético de `--rows` linhas em CSV e em Parquet, com uma
+coluna extra que não é usada na avaliação, e para cada cenário carrega o
+dataset, percorre todas as tarefas e calcula o dataset_id. Cada cenário roda
+num processo novo; a tabela mostra o RSS depois dos imports e o pico de RSS
+do processo (tracemalloc não enxerga as alocações do Arrow).
+
+    python -m benchmarks.bench_dataloader --rows 1000000 --chunk-size 50000
+"""
+
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = dict(
+    id_col="id",
+    prompt_col="prompt",
+    metadata_cols=["categoria", "golden_answer"],
+    dataset_name="bench",
+    dataset_description="bench",
+    upload_to_bq=False,
+)
+
+SCENARIOS = (
+    ("anterior", "csv", None),
+    ("inteiro", "csv", None),
+    ("blocos", "csv", True),
+    ("inteiro", "parquet", None),
+    ("blocos", "parquet", True),
+)
+
+
+def write_dataset(paths: dict, rows: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "prompt": [
+                f"Como faço para emitir a segunda via {i}?" for i in range(rows)
+            ],
+            "categoria": rng.choice(["iptu", "saude", "transporte"], size=rows),
+            "golden_answer": [
+                f"Acesse o portal e informe o código {i}." for i in range(rows)
+            ],
+            "observacoes": ["coluna que a avaliação não usa " * 4] * rows,
+        }
+    )
+    df.to_csv(paths["csv"], index=False)
+    df.to_parquet(paths["parquet"], index=False)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss vem em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_all(label: str, path: str, chunk_size, queue) -> None:
+    from benchmarks.dataloader_legacy import LegacyDataLoader
+    from src.evaluations.core.eval.dataloader import DataLoader
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if label == "anterior":
+        loader = LegacyDataLoader(path, **COLUMNS)
+    else:
+        loader = DataLoader(path, chunk_size=chunk_size, **COLUMNS)
+    tasks = sum(1 for _ in loader.get_tasks())
+    dataset_id = loader.get_dataset_config()["dataset_id"]
+    queue.put((time.perf_counter() - start, baseline, peak_rss_mb(), tasks, dataset_id))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {
+            "csv": str(Path(directory) / "dataset.csv"),
+            "parquet": str(Path(directory) / "dataset.parquet"),
+        }
+        # Gerado em outro processo: o pico de RSS passa do pai para os filhos
+        writer = context.Process(target=write_dataset, args=(paths, args.rows))
+        writer.start()
+        writer.join()
+        print(f"{args.rows} linhas, blocos de {args.chunk_size}")
+        print(
+            f"{'leitura':<10}{'formato':<10}{'tempo s':>10}{'base MB':>10}{'pico MB':>10}"
+        )
+        dataset_ids = set()
+        for label, file_format, chunked in SCENARIOS:
+            queue = context.Queue()
+            process = context.Process(
+                target=load_all,
+                args=(
+                    label,
+                    paths[file_format],
+                    args.chunk_size if chunked else None,
+                    queue,
+                ),
+            )
+            process.start()
+            elapsed, baseline, peak, tasks, dataset_id = queue.get()
+            process.join()
+            assert tasks == args.rows, f"{label}/{file_format}: {tasks} tarefas"
+            dataset_ids.add(dataset_id)
+            print(
+                f"{label:<10}{file_format:<10}{elapsed:>10.2f}{baseline:>10.1f}{peak:>10.1f}"
+            )
+
+    print(f"mesmo dataset_id em todos: {'sim' if len(dataset_ids) == 1 else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do cliente HTTP do EAI Gateway: um httpx.AsyncClient por
+requisição, nunca fechado (comportamento anterior do /eai-gateway/chat), vs.
+o cliente compartilhado da aplicação.
+
+Usa o gateway falso local (tests/fakes/fake_eai_gateway.py), que conta as
+conexões TCP abertas pelos clientes. O gateway é HTTP sem TLS: em produção o
+handshake TLS de cada conexão nova torna a diferença de latência maior.
+
+    python -m benchmarks.bench_eai_http_pool --requests 500 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional
+
+import httpx
+
+from src.services.eai_gateway.api import EAIClient
+from src.services.eai_gateway.http_client import (
+    GatewayHTTPSettings,
+    build_gateway_http_client,
+    pool_stats,
+)
+from src.services.eai_gateway.response_wait import ResponseWaitSettings
+from tests.fakes.fake_eai_gateway import FakeEAIGateway
+
+
+async def run_load(
+    gateway: FakeEAIGateway,
+    requests: int,
+    concurrency: int,
+    shared: Optional[httpx.AsyncClient],
+) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    leaked = []
+
+    async def chat(index: int) -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            client = EAIClient(
+                base_url=gateway.url,
+                http_client=shared,
+                rate_limit_requests_per_minute=1_000_000,
+                response_wait=ResponseWaitSettings(mode="sse"),
+            )
+            await client.send_message_and_get_response(
+                user_number=str(index), message="oi"
+            )
+            if shared is None:
+                # O endpoint antigo não fechava o cliente
+                leaked.append(client)
+            return time.perf_counter() - start
+
+    latencies = await asyncio.gather(*(chat(index) for index in range(requests)))
+    for client in leaked:
+        await client.close()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--max-keepalive", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.requests} chats, {args.concurrency} simultâneos")
+    print(
+        f"{'cliente':<28}{'conexões':>10}{'média ms':>10}{'p50 ms':>9}"
+        f"{'p95 ms':>9}{'chats/s':>9}"
+    )
+    for label in ("um por requisição", "compartilhado"):
+        with FakeEAIGateway(ready_after=0.0) as gateway:
+
+            async def scenario():
+                shared = None
+                if label == "compartilhado":
+                    shared = build_gateway_http_client(
+                        GatewayHTTPSettings(
+                            max_keepalive_connections=args.max_keepalive
+                        ),
+                        base_url=gateway.url,
+                    )
+                try:
+                    started = time.perf_counter()
+                    latencies = await run_load(
+                        gateway, args.requests, args.concurrency, shared
+                    )
+                    elapsed = time.perf_counter() - started
+                    if shared is not None:
+                        print(f"  pool ao final: {pool_stats(shared)}")
+                    return latencies, elapsed
+                finally:
+                    if shared is not None:
+                        await shared.aclose()
+
+            latencies, elapsed = asyncio.run(scenario())
+            cuts = statistics.quantiles(latencies, n=100)
+            print(
+                f"{label:<28}{len(gateway.connections):>10}"
+                f"{statistics.mean(latencies) * 1000:>10.1f}"
+                f"{cuts[49] * 1000:>9.1f}{cuts[94] * 1000:>9.1f}"
+                f"{args.requests / elapsed:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark da latência adicionada pela espera de respostas do EAIClient contra o
+gateway falso local (tests/fakes/fake_eai_gateway.py).
+
+Cada mensagem fica pronta depois de um atraso sorteado entre --min-ready e
+--max-ready segundos. Para cada modo de espera são enviadas --messages
+mensagens concorrentes; a latência adicionada é o tempo entre a resposta ficar
+pronta no gateway e o cliente recebê-la. Nenhum serviço externo é chamado.
+
+    python -m benchmarks.bench_eai_response_wait --messages 50 --polling-interval 2
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from src.services.eai_gateway.api import EAIClient
+from src.services.eai_gateway.response_wait import ResponseWaitSettings
+from tests.fakes.fake_eai_gateway import FakeEAIGateway
+
+# (rótulo, modo do cliente, gateway com SSE, gateway com long polling)
+SCENARIOS = [
+    ("poll (intervalo fixo)", "poll", False, False),
+    ("backoff", "backoff", False, False),
+    ("auto, gateway sem SSE/wait", "auto", False, False),
+    ("long_poll", "long_poll", False, True),
+    ("sse", "sse", True, True),
+]
+
+
+async def run_scenario(
+    gateway: FakeEAIGateway, mode: str, messages: int, polling_interval: float
+) -> List[float]:
+    client = EAIClient(
+        timeout=120,
+        polling_interval=polling_interval,
+        rate_limit_requests_per_minute=max(60, messages),
+        base_url=gateway.url,
+        response_wait=ResponseWaitSettings(mode=mode),
+    )
+
+    async def one(index: int) -> float:
+        response = await client.send_message_and_get_response(
+            user_number=str(index), message="oi"
+        )
+        return gateway.added_latency(response.message_id, time.monotonic())
+
+    try:
+        return await asyncio.gather(*(one(index) for index in range(messages)))
+    finally:
+        await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--polling-interval", type=float, default=2.0)
+    parser.add_argument("--min-ready", type=float, default=0.5)
+    parser.add_argument("--max-ready", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{args.messages} mensagens por modo, resposta pronta em "
+        f"{args.min_ready:g}-{args.max_ready:g}s, polling_interval="
+        f"{args.polling_interval:g}s"
+    )
+    print(
+        f"{'modo':<30}{'média ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'máx ms':>10}{'consultas/msg':>15}"
+    )
+    for label, mode, sse, long_poll in SCENARIOS:
+        rng = random.Random(args.seed)
+        gateway = FakeEAIGateway(
+            ready_after=lambda: rng.uniform(args.min_ready, args.max_ready),
+            sse=sse,
+            long_poll=long_poll,
+        )
+        with gateway:
+            latencies = asyncio.run(
+                run_scenario(gateway, mode, args.messages, args.polling_interval)
+            )
+        requests = gateway.requests["poll"] + gateway.requests["stream"]
+        cuts = statistics.quantiles(latencies, n=100)
+        print(
+            f"{label:<30}{statistics.mean(latencies) * 1000:>10.0f}"
+            f"{cuts[49] * 1000:>10.0f}{cuts[94] * 1000:>10.0f}"
+            f"{max(latencies) * 1000:>10.0f}{requests / args.messages:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Pico de memória do AsyncExperimentRunner: execuções em memória vs. journal JSONL.
+
+Roda um experimento com respostas pré-computadas e um avaliador sem juiz que
+devolve anotações de `--payload-kb` KB (como a justificativa de um LLM juiz), e
+mede o pico de memória alocada com tracemalloc. No modo journal o pico deve
+ficar limitado pela janela de concorrência, não pelo tamanho do dataset.
+
+    python -m benchmarks.bench_experiment_journal --tasks 2000 --payload-kb 8
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from src.evaluations.core.eval.dataloader import DataLoader
+from src.evaluations.core.eval.evaluators.base import BaseOneTurnEvaluator
+from src.evaluations.core.eval.log import logger
+from src.evaluations.core.eval.runner.orchestrator import AsyncExperimentRunner
+from src.evaluations.core.eval.schemas import EvaluationResult
+
+
+class VerboseEvaluator(BaseOneTurnEvaluator):
+    name = "verbose"
+
+    def __init__(self, payload_kb: int):
+        super().__init__(judge_client=None)
+        self.payload_kb = payload_kb
+
+    async def evaluate(self, agent_response, task):
+        await asyncio.sleep(0)
+        annotations = f"{task.id} " + "x" * (self.payload_kb * 1024)
+        return EvaluationResult(score=1.0, annotations=annotations)
+
+
+def run_experiment(tasks: int, payload_kb: int, concurrency: int, journal: bool):
+    df = pd.DataFrame({"id": range(tasks), "prompt": ["pergunta"] * tasks})
+    loader = DataLoader(
+        df,
+        id_col="id",
+        prompt_col="prompt",
+        dataset_name="bench",
+        dataset_description="bench",
+        upload_to_bq=False,
+    )
+    with tempfile.TemporaryDirectory() as output_dir:
+        runner = AsyncExperimentRunner(
+            experiment_name="bench",
+            experiment_description="bench",
+            metadata={},
+            evaluators=[VerboseEvaluator(payload_kb)],
+            precomputed_responses={
+                str(i): {"id": str(i), "one_turn_agent_message": "resposta"}
+                for i in range(tasks)
+            },
+            max_concurrency=concurrency,
+            upload_to_bq=False,
+            output_dir=output_dir,
+            journal_path=Path(output_dir) / "journal.jsonl" if journal else None,
+        )
+        tracemalloc.start()
+        start = time.perf_counter()
+        asyncio.run(runner.run(loader))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--payload-kb", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    logger.remove()
+    print(
+        f"{args.tasks} tarefas, {args.payload_kb} KB por resultado, "
+        f"{args.concurrency} simultâneas"
+    )
+    print(f"{'modo':<12}{'pico MB':>10}{'tempo s':>10}")
+    for label, journal in (("memória", False), ("journal", True)):
+        peak, elapsed = run_experiment(
+            args.tasks, args.payload_kb, args.concurrency, journal
+        )
+        print(f"{label:<12}{peak / 2**20:>10.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark do markdown_to_whatsapp: conversor compilado vs. a cópia congelada
+da versão com ~25 re.sub sequenciais (benchmarks/md_to_wpp_legacy.py), sobre
+históricos sintéticos de respostas reais do agente. Confere que as duas saídas
+são idênticas byte a byte.
+
+    python -m benchmarks.bench_md_to_wpp --sizes 10 1000
+"""
+
+import argparse
+import time
+
+from benchmarks.md_corpus import build_corpus
+from benchmarks.md_to_wpp_legacy import legacy_markdown_to_whatsapp
+from src.utils.md_to_wpp import markdown_to_whatsapp
+
+CONVERTERS = (
+    ("anterior", legacy_markdown_to_whatsapp),
+    ("compilado", markdown_to_whatsapp),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'mensagens':>10} {'conversor':<10} {'melhor ms':>10} {'speed-up':>9}")
+    identical = True
+    for size in args.sizes:
+        messages = build_corpus(size)
+        results = {}
+        best = {}
+        for label, converter in CONVERTERS:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results[label] = [converter(message) for message in messages]
+                timings.append(time.perf_counter() - start)
+            best[label] = min(timings)
+        identical = identical and results["compilado"] == results["anterior"]
+
+        print(f"{size:>10} {'anterior':<10} {best['anterior'] * 1000:>10.2f}")
+        print(
+            f"{size:>10} {'compilado':<10} {best['compilado'] * 1000:>10.2f} "
+            f"{best['anterior'] / best['compilado']:>8.1f}x"
+        )
+
+    print(f"saída idêntica à anterior: {'sim' if identical else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark do LangGraphMessageFormatter: laço único sem `dumpd` vs. a versão
+anterior (benchmarks/message_formatter_legacy.py), em threads sintéticas de 1k,
+10k e 100k mensagens. Mede tempo e pico de memória (tracemalloc) e confere que
+as duas saídas são iguais, ignorando os campos aleatórios (otid, step_id,
+processed_at).
+
+    python -m benchmarks.bench_message_formatter --sizes 1000 10000 100000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from benchmarks.md_corpus import AGENT_REPLIES
+from benchmarks.message_formatter_legacy import LegacyMessageFormatter
+from src.services.agent_engine.message_formatter import LangGraphMessageFormatter
+
+RANDOM_FIELDS = ("otid", "step_id", "processed_at")
+
+
+def _usage(prompt: int, candidates: int, thoughts: int) -> dict:
+    return {
+        "model_name": "gemini-2.5-flash",
+        "finish_reason": "STOP",
+        "avg_logprobs": -0.12,
+        "usage_metadata": {
+            "prompt_token_count": prompt,
+            "candidates_token_count": candidates,
+            "thoughts_token_count": thoughts,
+            "total_token_count": prompt + candidates + thoughts,
+            "output_token_details": {"reasoning": thoughts},
+        },
+    }
+
+
+def build_thread(size: int) -> List[BaseMessage]:
+    """Turnos de usuário -> tool call -> tool return -> resposta final"""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    messages: List[BaseMessage] = []
+    turn = 0
+    while len(messages) < size:
+        # Uma pausa longa a cada 20 turnos abre uma nova sessão
+        base = start + timedelta(minutes=turn * 2 + (turn // 20) * 180)
+
+        def ts(offset: int) -> dict:
+            return {"timestamp": (base + timedelta(seconds=offset)).isoformat()}
+
+        call_id = f"call-{turn}"
+        messages.append(
+            HumanMessage(
+                content=f"Pergunta {turn}: onde emito a segunda via do IPTU?",
+                id=f"human-{turn}",
+                additional_kwargs=ts(0),
+            )
+        )
+        messages.append(
+            AIMessage(
+                content="",
+                id=f"run--tool-{turn}",
+                tool_calls=[
+                    {
+                        "name": "google_search",
+                        "args": {"query": f"segunda via IPTU {turn}", "limit": 5},
+                        "id": call_id,
+                    }
+                ],
+                additional_kwargs=ts(2),
+                response_metadata=_usage(1200 + turn, 40, 128),
+            )
+        )
+        messages.append(
+            ToolMessage(
+                content=json.dumps(
+                    {"results": [{"title": "Carioca Digital", "url": "carioca.rio"}]}
+                ),
+                tool_call_id=call_id,
+                name="google_search",
+                id=f"tool-{turn}",
+                additional_kwargs=ts(4),
+            )
+        )
+        messages.append(
+            AIMessage(
+                content=[
+                    {"type": "thinking", "thinking": "Resumindo os resultados."},
+                    {"type": "text", "text": AGENT_REPLIES[turn % len(AGENT_REPLIES)]},
+                ],
+                id=f"run--answer-{turn}",
+                additional_kwargs=ts(9),
+                response_metadata=_usage(1500 + turn, 220, 256),
+            )
+        )
+        turn += 1
+    return messages[:size]
+
+
+def strip_random(result: dict) -> list:
+    return [
+        {k: v for k, v in message.items() if k not in RANDOM_FIELDS}
+        for message in result["data"]["messages"]
+    ]
+
+
+def measure(formatter_cls, messages: List[BaseMessage], whatsapp: bool) -> tuple:
+    """Tempo sem tracemalloc (que distorce o relógio) e pico numa segunda rodada"""
+
+    def run():
+        return formatter_cls(thread_id="bench-thread").format_messages(
+            messages, session_timeout_seconds=3600, use_whatsapp_format=whatsapp
+        )
+
+    gc.collect()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument(
+        "--whatsapp",
+        action="store_true",
+        help="Inclui a conversão markdown_to_whatsapp",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'mensagens':>10} {'modo':<10} {'tempo s':>9} {'pico MiB':>9} {'speed-up':>9}"
+    )
+    for size in args.sizes:
+        messages = build_thread(size)
+        legacy, legacy_s, legacy_peak = measure(
+            LegacyMessageFormatter, messages, args.whatsapp
+        )
+        current, current_s, current_peak = measure(
+            LangGraphMessageFormatter, messages, args.whatsapp
+        )
+        assert strip_random(current) == strip_random(legacy), "saídas diferentes"
+        del legacy, current
+
+        print(
+            f"{size:>10} {'anterior':<10} {legacy_s:>9.3f} {legacy_peak / 2**20:>9.1f}"
+        )
+        print(
+            f"{size:>10} {'laço único':<10} {current_s:>9.3f} "
+            f"{current_peak / 2**20:>9.1f} {legacy_s / current_s:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark do ResultAnalyzer: análise anterior (laços em Python e o módulo
+`statistics`) vs. análise colunar com NumPy, sobre runs sintéticos.
+
+Cada run tem avaliações one-turn e multi-turn com scores discretos, durações
+com 4 casas decimais e uma fração de erros, como o TaskProcessor produz. O
+benchmark confere que os campos da análise anterior saem idênticos.
+
+    python -m benchmarks.bench_result_analyzer --runs 100000 --metrics 15
+"""
+
+import argparse
+import time
+from typing import Any, Dict
+
+from benchmarks.result_analyzer_legacy import LegacyResultAnalyzer
+from src.evaluations.core.eval.runner.result_analyzer import ResultAnalyzer
+from tests.fakes.evaluation_runs import synthetic_runs
+
+# Campos novos da análise colunar, ausentes na anterior
+NEW_STAT_KEYS = ("percentiles", "mean_ci95")
+NEW_METRIC_KEYS = ("success_rate_ci95_percentage",)
+
+
+def without_new_stats(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """A análise sem os campos que a versão anterior não calculava"""
+    metrics = []
+    for metric in analysis["aggregate_metrics"]:
+        metric = {k: v for k, v in metric.items() if k not in NEW_METRIC_KEYS}
+        for key in ("score_statistics", "duration_statistics_seconds"):
+            if metric[key] is not None:
+                metric[key] = {
+                    k: v for k, v in metric[key].items() if k not in NEW_STAT_KEYS
+                }
+        metrics.append(metric)
+    return {**analysis, "aggregate_metrics": metrics}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=100_000)
+    parser.add_argument("--metrics", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    runs = synthetic_runs(args.runs, args.metrics)
+    print(f"{args.runs} runs x {args.metrics} métricas")
+    print(f"{'análise':<12}{'melhor s':>10}")
+    results = {}
+    for label, analyzer in (
+        ("anterior", LegacyResultAnalyzer()),
+        ("colunar", ResultAnalyzer()),
+    ):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[label] = analyzer.analyze(runs, total_duration=1.0)
+            timings.append(time.perf_counter() - start)
+        print(f"{label:<12}{min(timings):>10.3f}")
+
+    identical = without_new_stats(results["colunar"]) == results["anterior"]
+    print(f"saída idêntica à anterior: {'sim' if identical else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
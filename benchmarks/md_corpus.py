@@ -0,0 +1,79 @@
+"""
+Corpus de respostas típicas do agente EAí, usado pelos benchmarks e testes do
+conversor markdown_to_whatsapp. Mistura respostas curtas sem formatação com
+listas, tabelas, blocos de código e notas de rodapé.
+"""
+
+AGENT_REPLIES = [
+    "Olá! Como posso te ajudar hoje?",
+    "Claro, posso ajudar com isso. Qual é o número da sua inscrição do IPTU?",
+    (
+        "Para emitir a segunda via do IPTU, siga os passos abaixo:\n\n"
+        "1. Acesse o portal **Carioca Digital**.\n"
+        "2. Faça login com sua conta *gov.br*.\n"
+        "3. Clique em **IPTU** > **Segunda via**.\n"
+        "4. Informe o número da inscrição imobiliária.\n\n"
+        "Mais informações em [carioca.rio](https://carioca.rio/servicos/iptu)."
+    ),
+    (
+        "### Unidades de saúde próximas\n\n"
+        "* **Clínica da Família Maria do Socorro**\n"
+        "    * Endereço: Rua Padre Leonel Franca, s/n - Gávea\n"
+        "    * Horário: segunda a sexta, das 7h às 19h\n"
+        "* **CMS Píndaro de Carvalho Rodrigues**\n"
+        "    * Endereço: Rua Gal. Glicério, 445 - Laranjeiras\n"
+        "    * Horário: segunda a sexta, das 8h às 17h\n\n"
+        "---\n\n"
+        "_Leve documento com foto e o cartão do SUS._"
+    ),
+    (
+        "Aqui está o resumo das multas encontradas:\n\n"
+        "| Data       | Infração              | Valor     | Situação |\n"
+        "|------------|-----------------------|-----------|----------|\n"
+        "| 12/03/2025 | Excesso de velocidade | R$ 130,16 | Em aberto |\n"
+        "| 28/04/2025 | Estacionamento irregular | R$ 195,23 | Paga |\n"
+        "| 02/06/2025 | Avanço de sinal       | R$ 293,47 | Em recurso |\n\n"
+        "Você pode pagar as multas em aberto pelo app **Carioca Digital**."
+    ),
+    (
+        "O código de rastreio do seu chamado é `1234567-8`. "
+        "Guarde esse número: ele é ~~opcional~~ **obrigatório** para consultar "
+        "o andamento na central 1746."
+    ),
+    (
+        "## Como solicitar poda de árvore\n\n"
+        "Você pode abrir o chamado de três formas:\n\n"
+        "- [x] Pelo telefone **1746**\n"
+        "- [x] Pelo site [1746.rio](https://www.1746.rio)\n"
+        "- [ ] Pelo aplicativo *1746 Rio*\n\n"
+        "O prazo de atendimento é de até 30 dias úteis[^1].\n\n"
+        "[^1]: Conforme o Decreto Rio nº 45.541/2018."
+    ),
+    (
+        "***Atenção:*** o agendamento do CadÚnico está temporariamente "
+        "suspenso na sua região. Tente novamente a partir de __segunda-feira__.\n\n"
+        "Enquanto isso, reúna os documentos:\n"
+        "*   **CPF** de todos os moradores\n"
+        "*   **Comprovante de residência** recente\n"
+        "*   **Carteira de trabalho**, se houver"
+    ),
+    (
+        "Para consultar pela API, use:\n\n"
+        "```\n"
+        'curl -H "Authorization: Bearer <token>" \\\n'
+        "  https://api.dados.rio/v1/iptu/guia?inscricao=1234567\n"
+        "```\n\n"
+        "A resposta vem em JSON com os campos `valor`, `vencimento` e `situacao`."
+    ),
+    (
+        "* **Rio Scenarium:**\n"
+        "    * Abre de quarta a sábado com diversos shows. Aos sábados, costuma "
+        "ter o evento {r'\\\"Samba & Feijoada\\\"'} a partir das 13h.\n\n"
+        "**Importante:** confirme a programação no site oficial antes de ir."
+    ),
+]
+
+
+def build_corpus(size: int) -> list:
+    """Repete as respostas até `size` mensagens, como num histórico longo."""
+    return [AGENT_REPLIES[i % len(AGENT_REPLIES)] for i in range(size)]
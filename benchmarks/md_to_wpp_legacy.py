@@ -0,0 +1,166 @@
+"""
+Cópia congelada do markdown_to_whatsapp anterior ao tokenizer compilado.
+
+Serve de baseline para o benchmark e de oráculo de equivalência: a saída do
+conversor atual deve ser idêntica byte a byte à desta versão.
+"""
+
+import re
+
+
+def legacy_markdown_to_whatsapp(text):
+    """
+    Convert Markdown formatting to WhatsApp-compatible syntax with a robust,
+    order-of-operations approach. This version includes perfectly aligned tables,
+    corrected newline handling, and robust adjacent-formatting logic.
+    """
+    # 0. Normalize newlines to prevent issues with \r\n
+    converted_text = text.replace("\r\n", "\n")
+
+    # 1. PRESERVATION STAGE
+    code_blocks = []
+
+    def preserve_code(match):
+        code_blocks.append(match.group(0))
+        return f"¤C{len(code_blocks)-1}¤"
+
+    converted_text = re.sub(r"```[\s\S]*?```|`[^`\n]+`", preserve_code, converted_text)
+
+    # Protect list markers before they can be confused with italics
+    converted_text = re.sub(
+        r"^(\s*)\*\s", r"\1¤L¤ ", converted_text, flags=re.MULTILINE
+    )
+
+    # 2. DATA EXTRACTION & INLINE CONVERSIONS
+    footnote_defs = {}
+
+    def collect_footnote_def(match):
+        key, value = match.group(1), match.group(2).strip()
+        footnote_defs[key] = value
+        return ""
+
+    # Use finditer to collect, then sub to remove the whole block to preserve spacing
+    footnote_block_pattern = re.compile(r"(?:\n^\[\^[^\]]+\]:.*$)+", re.MULTILINE)
+    for match in footnote_block_pattern.finditer(converted_text):
+        for line in match.group(0).strip().split("\n"):
+            line_match = re.match(r"^\[\^([^\]]+)\]:\s*(.*)$", line)
+            if line_match:
+                collect_footnote_def(line_match)
+
+    converted_text = footnote_block_pattern.sub("", converted_text)
+
+    # Run image conversion BEFORE link conversion
+    converted_text = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", r"[Image: \1]", converted_text)
+    converted_text = re.sub(r"\[([^\]]*)\]\(([^)]+)\)", r"\2", converted_text)
+
+    # 3. INLINE FORMATTING (using temporary placeholders)
+    # The order is critical: multi-character markers first.
+    converted_text = re.sub(r"~~(.*?)~~", r"<s>\1</s>", converted_text, flags=re.DOTALL)
+
+    # Handle triple asterisk pattern (***text***) for bold+italic
+    converted_text = re.sub(
+        r"\*\*\*(.*?)\*\*\*", r"<i><b>\1</b></i>", converted_text, flags=re.DOTALL
+    )
+
+    converted_text = re.sub(
+        r"\*\*(.*?)\*\*", r"<b>\1</b>", converted_text, flags=re.DOTALL
+    )
+    converted_text = re.sub(r"__(.*?)__", r"<b>\1</b>", converted_text, flags=re.DOTALL)
+
+    # Specific regex for italics to prevent conflict with bold markers
+    converted_text = re.sub(
+        r"(?<!\*)\*([^\*\n].*?)\*(?!\*)", r"<i>\1</i>", converted_text
+    )
+    converted_text = re.sub(r"(?<!_)_([^\_\n].*?)_(?!_)", r"<i>\1</i>", converted_text)
+
+    # Convert placeholders to final WhatsApp format
+    converted_text = converted_text.replace("<s>", "~").replace("</s>", "~")
+    converted_text = converted_text.replace("<b>", "*").replace("</b>", "*")
+    converted_text = converted_text.replace("<i>", "_").replace("</i>", "_")
+
+    # 4. BLOCK-LEVEL CONVERSIONS
+    # FIX 1: Add a newline after headers to ensure separation.
+    converted_text = re.sub(
+        r"^\s*#+\s+(.+?)\s*#*$", r"*\1*\n", converted_text, flags=re.MULTILINE
+    )
+
+    # Replace horizontal rules with a guaranteed paragraph break
+    converted_text = re.sub(
+        r"^\s*[-*_]{3,}\s*$", "\n", converted_text, flags=re.MULTILINE
+    )
+
+    def convert_table(match):
+        table_text = match.group(0).strip()
+        lines = [line.strip() for line in table_text.split("\n")]
+        rows = [
+            [cell.strip() for cell in line.split("|") if cell.strip()]
+            for line in lines
+            if "|" in line and not re.match(r"^[\s|: -]+$", line)
+        ]
+        if not rows:
+            return ""
+        num_columns = max(len(row) for row in rows) if rows else 0
+        column_widths = [0] * num_columns
+        for row in rows:
+            for i, cell in enumerate(row):
+                if i < num_columns:
+                    column_widths[i] = max(column_widths[i], len(cell))
+        formatted_table = ""
+        for i, row in enumerate(rows):
+            formatted_cells = []
+            for j in range(num_columns):
+                cell_text = row[j] if j < len(row) else ""
+                formatted_cells.append(cell_text.ljust(column_widths[j]))
+            formatted_table += " | ".join(formatted_cells) + "\n"
+        # Return with guaranteed spacing and monospace formatting
+        return f"\n\n```{formatted_table.strip()}```\n\n"
+
+    converted_text = re.sub(
+        r"(?:^\|.*\|\n?)+", convert_table, converted_text, flags=re.MULTILINE
+    )
+
+    converted_text = re.sub(
+        r"^(\s*[-+]|¤L¤)\s*\[[xX ]\]\s+", r"\1 ", converted_text, flags=re.MULTILINE
+    )
+
+    footnote_map = {}
+    footnote_counter = 1
+
+    def replace_footnote_marker(match):
+        nonlocal footnote_counter, footnote_map
+        key = match.group(1)
+        if key in footnote_defs:
+            if key not in footnote_map:
+                footnote_map[key] = footnote_counter
+                footnote_counter += 1
+            return f"[{footnote_map[key]}]"
+        return ""
+
+    converted_text = re.sub(r"\[\^([^\]]+)\]", replace_footnote_marker, converted_text)
+
+    # 5. RESTORATION & FINAL CLEANUP
+    converted_text = converted_text.replace("¤L¤ ", "* ")
+    
+    # Normalize list spacing to ensure single space after asterisk
+    converted_text = re.sub(r"^\*\s+", "* ", converted_text, flags=re.MULTILINE)
+    
+    for i, code_block in enumerate(code_blocks):
+        converted_text = converted_text.replace(f"¤C{i}¤", code_block)
+
+    # FIX 2: Clean up the specific escaped quote pattern.
+    converted_text = re.sub(r"\{r'\\\"(.*?)\\\"\'\}", r'"\1"', converted_text)
+    converted_text = re.sub(r'"', "'", converted_text)
+
+    # Clean up excess newlines
+    converted_text = re.sub(r"\n{3,}", "\n\n", converted_text)
+    converted_text = converted_text.strip()
+
+    if footnote_map:
+        # Append footnote block with its own spacing
+        footnotes_text = "\n\n---\n_Notas:_\n"
+        sorted_footnotes = sorted(footnote_map.items(), key=lambda item: item[1])
+        for key, num in sorted_footnotes:
+            footnotes_text += f"[{num}] {footnote_defs.get(key, '')}\n"
+        converted_text += footnotes_text.rstrip()
+
+    return converted_text
@@ -0,0 +1,104 @@
+"""
+Cópia congelada do LangGraphMessageFormatter.format_messages anterior ao laço
+único: serializa cada mensagem com `dumpd`, parseia cada timestamp duas vezes e
+calcula as estatísticas de uso numa segunda passada. Usado como baseline pelo
+benchmark do formatador.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+from langchain_core.messages import BaseMessage
+
+from src.services.agent_engine.message_formatter import LangGraphMessageFormatter
+
+
+class LegacyMessageFormatter(LangGraphMessageFormatter):
+    def format_messages(
+        self,
+        messages: List[Union[BaseMessage, Dict[str, Any]]],
+        thread_id: Optional[str] = None,
+        session_timeout_seconds: Optional[int] = None,
+        use_whatsapp_format: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Converte uma lista de mensagens para o formato Gateway.
+
+        Args:
+            messages: Lista de mensagens (BaseMessage ou dict já serializados)
+            thread_id: ID do thread/agente (opcional, sobrescreve o da instância)
+            session_timeout_seconds: Tempo limite em segundos para nova sessão
+            use_whatsapp_format: Define se deve usar o markdown_to_whatsapp
+
+        Returns:
+            Dict no formato Gateway com status, data, mensagens e estatísticas de uso
+        """
+        # Usar thread_id fornecido ou o da instância
+        if thread_id:
+            self.thread_id = thread_id
+
+        # Resetar estado para nova formatação
+        self.reset_state()
+        self.processed_messages = []
+
+        # Serializar mensagens se necessário
+        messages_to_process = []
+        for msg in messages:
+            if isinstance(msg, BaseMessage):
+                serialized_msg = self.serialize_message(msg)
+                messages_to_process.append(serialized_msg)
+            else:
+                messages_to_process.append(msg)
+
+        # Processar cada mensagem
+        for msg in messages_to_process:
+            kwargs = msg.get("kwargs", {})
+            msg_type = kwargs.get("type")
+
+            # Extrair timestamp
+            additional_kwargs = kwargs.get("additional_kwargs", {})
+            message_timestamp = additional_kwargs.get("timestamp", None)
+
+            # Calcular tempo entre mensagens
+            time_since_last_message = self.calculate_time_since_last_message(
+                message_timestamp
+            )
+
+            # Atualizar estado da sessão
+            self.update_session_state(
+                message_timestamp, time_since_last_message, session_timeout_seconds
+            )
+
+            # Extrair metadados
+            metadata = self.extract_message_metadata(kwargs)
+
+            # Criar base da mensagem
+            base_dict = self.create_base_message_dict(
+                kwargs, message_timestamp, time_since_last_message, metadata
+            )
+
+            # Processar baseado no tipo
+            if msg_type == "human":
+                processed_msg = self.process_human_message(kwargs, base_dict)
+                self.processed_messages.append(processed_msg)
+
+            elif msg_type == "ai":
+                processed_msgs = self.process_ai_message(
+                    kwargs, base_dict, use_whatsapp_format
+                )
+                self.processed_messages.extend(processed_msgs)
+
+            elif msg_type == "tool":
+                processed_msg = self.process_tool_message(kwargs, base_dict)
+                self.processed_messages.append(processed_msg)
+
+        # Calcular estatísticas de uso
+        usage_stats = self.calculate_usage_statistics(messages_to_process)
+        self.processed_messages.append(usage_stats)
+
+        return {
+            "status": "completed",
+            "data": {
+                "messages": self.processed_messages,
+                # "messages": messages_to_process,
+            },
+        }
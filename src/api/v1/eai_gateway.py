@@ -1,11 +1,20 @@
 import asyncio
+import json
+import httpx
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from src.config import env
 from src.core.security.dependencies import validar_token
 from src.services.eai_gateway.api import EAIClient, CreateAgentRequest, EAIClientError
-from src.services.agent_engine.history import GoogleAgentEngineHistory
-from pydantic import BaseModel
+from src.services.eai_gateway.chat_stream import SSE_HEADERS, chat_event_stream
+from src.services.eai_gateway.http_client import get_gateway_http_client
+from src.services.agent_engine.history import (
+    GoogleAgentEngineHistory,
+    get_history_service,
+)
+from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
 from src.utils.log import logger
 
@@ -35,6 +44,10 @@ class BulkHistoryRequest(BaseModel):
     user_ids: List[str]
     session_timeout_seconds: int = 3600
     use_whatsapp_format: bool = False
+    # When true, the response is NDJSON with one {"user_id", "messages"} line per thread
+    stream: bool = False
+    # Max threads fetched at once; defaults to and is capped by HISTORY_BULK_CONCURRENCY
+    concurrency: Optional[int] = Field(None, ge=1, le=env.HISTORY_BULK_CONCURRENCY)
 
 
 class HistoryResponse(BaseModel):
@@ -70,6 +83,7 @@ router = APIRouter(
 @router.post("/chat", response_model=ChatResponse)
 async def handle_chat(
     request: ChatRequest,
+    http_client: httpx.AsyncClient = Depends(get_gateway_http_client),
 ):
     """
     Handles a user chat message.
@@ -81,6 +95,7 @@ async def handle_chat(
         timeout=300,
         polling_interval=2,
         provider=request.provider,
+        http_client=http_client,
     )
     try:
         response = await eai_client.send_message_and_get_response(
@@ -101,9 +116,58 @@ async def handle_chat(
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
 
 
+@router.post("/chat/stream")
+async def handle_chat_stream(
+    request: ChatRequest,
+    http_client: httpx.AsyncClient = Depends(get_gateway_http_client),
+):
+    """
+    Streaming variant of `/chat` (server-sent events).
+
+    Emits a `status` event as soon as the message is sent, `message` events
+    with intermediate status and partial output as the gateway reports them,
+    and a final `done` event with the same response object as `/chat` (or
+    `error`).
+    """
+    eai_client = EAIClient(
+        timeout=request.timeout,
+        polling_interval=request.polling_interval,
+        provider=request.provider,
+        http_client=http_client,
+    )
+    return StreamingResponse(
+        chat_event_stream(
+            eai_client,
+            user_number=request.user_number,
+            message=request.message,
+            reasoning_engine_id=request.reasoning_engine_id,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/history/health")
+async def history_health(
+    history_service: GoogleAgentEngineHistory = Depends(get_history_service),
+):
+    """
+    Checks the shared history connection pool.
+
+    Returns:
+        Dict with the ping status, the current pool counters and the WhatsApp
+        conversion cache hit/miss counters
+    """
+    result = await history_service.health_check()
+    if result["status"] != "ok":
+        raise HTTPException(status_code=503, detail=result)
+    return result
+
+
 @router.post("/history", response_model=HistoryResponse)
 async def get_user_history(
     request: HistoryRequest,
+    history_service: GoogleAgentEngineHistory = Depends(get_history_service),
 ):
     """
     Retrieves the conversation history for a single user.
@@ -115,9 +179,6 @@ async def get_user_history(
         HistoryResponse: List of formatted messages for the user
     """
     try:
-        # Initialize the history service
-        history_service = await GoogleAgentEngineHistory.create()
-
         # Get the history for the single user
         _, messages = await history_service._get_single_user_history(
             user_id=request.user_id,
@@ -135,25 +196,50 @@ async def get_user_history(
 @router.post("/history/bulk", response_model=BulkHistoryResponse)
 async def get_bulk_user_history(
     request: BulkHistoryRequest,
+    history_service: GoogleAgentEngineHistory = Depends(get_history_service),
 ):
     """
     Retrieves the conversation history for multiple users in bulk.
 
+    Threads are fetched with at most `concurrency` requests in flight (1 to
+    HISTORY_BULK_CONCURRENCY; larger values are rejected with a 422). With
+    `stream=true` each conversation is written to the wire as an NDJSON line as
+    soon as it is formatted, in completion order, so memory stays flat
+    regardless of how many user_ids are requested.
+
     Args:
         request: Contains user_ids list and optional session_timeout_seconds (default: 3600)
 
     Returns:
         BulkHistoryResponse: Dictionary mapping user_id to their message history
     """
-    try:
-        # Initialize the history service
-        history_service = await GoogleAgentEngineHistory.create()
+    if request.stream:
+
+        async def ndjson_lines():
+            try:
+                async for user_id, messages in history_service.iter_history_bulk(
+                    user_ids=request.user_ids,
+                    session_timeout_seconds=request.session_timeout_seconds,
+                    use_whatsapp_format=request.use_whatsapp_format,
+                    concurrency=request.concurrency,
+                ):
+                    line = {"user_id": user_id, "messages": messages}
+                    yield json.dumps(line, ensure_ascii=False, default=str) + "\n"
+            except Exception:
+                logger.exception(
+                    f"Error streaming bulk history for {len(request.user_ids)} users"
+                )
+                raise
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
+    try:
         # Get the history for multiple users
         bulk_history = await history_service.get_history_bulk(
             user_ids=request.user_ids,
             session_timeout_seconds=request.session_timeout_seconds,
             use_whatsapp_format=request.use_whatsapp_format,
+            concurrency=request.concurrency,
         )
 
         return BulkHistoryResponse(data=bulk_history)
@@ -166,6 +252,7 @@ async def get_bulk_user_history(
 @router.delete("/history", response_model=DeleteHistoryResponse)
 async def delete_user_history(
     request: DeleteHistoryRequest,
+    history_service: GoogleAgentEngineHistory = Depends(get_history_service),
 ):
     """
     Deletes the conversation history for a specific user from both checkpoint tables.
@@ -177,9 +264,6 @@ async def delete_user_history(
         DeleteHistoryResponse: Results of the deletion operation for both tables
     """
     try:
-        # Initialize the history service
-        history_service = await GoogleAgentEngineHistory.create()
-
         # Delete user history from both tables
         result = await history_service.delete_user_history(user_id=request.user_id)
 
@@ -44,6 +44,154 @@ PG_URI = getenv_or_action("PG_URI", action="ignore")
 # Usado quando não queremos depender da SQL Admin API/Connector
 DB_SSL = getenv_or_action("DB_SSL", default="true", action="ignore")
 
+# --- Pool de conexões do histórico (checkpoints do Agent Engine) ---
+HISTORY_PG_POOL_SIZE = int(
+    getenv_or_action("HISTORY_PG_POOL_SIZE", default="10", action="ignore")
+)
+HISTORY_PG_MAX_OVERFLOW = int(
+    getenv_or_action("HISTORY_PG_MAX_OVERFLOW", default="10", action="ignore")
+)
+HISTORY_PG_POOL_TIMEOUT = int(
+    getenv_or_action("HISTORY_PG_POOL_TIMEOUT", default="30", action="ignore")
+)
+HISTORY_PG_POOL_RECYCLE = int(
+    getenv_or_action("HISTORY_PG_POOL_RECYCLE", default="300", action="ignore")
+)
+# Número máximo de threads buscadas simultaneamente no histórico em lote
+HISTORY_BULK_CONCURRENCY = int(
+    getenv_or_action("HISTORY_BULK_CONCURRENCY", default="10", action="ignore")
+)
+# Limite em bytes do cache de conversões para o formato WhatsApp (0 desativa)
+HISTORY_WHATSAPP_CACHE_MAX_BYTES = int(
+    getenv_or_action(
+        "HISTORY_WHATSAPP_CACHE_MAX_BYTES", default="33554432", action="ignore"
+    )
+)
+
+# --- Checkpointer do agente LangGraph em processo ---
+# "memory" (InMemorySaver, estado local ao worker) ou "postgres" (compartilhado
+# entre workers, usando o mesmo pool do histórico)
+LANG_GRAPH_CHECKPOINTER = getenv_or_action(
+    "LANG_GRAPH_CHECKPOINTER", default="memory", action="ignore"
+).lower()
+LANG_GRAPH_CHECKPOINT_SCHEMA = getenv_or_action(
+    "LANG_GRAPH_CHECKPOINT_SCHEMA", default="public", action="ignore"
+)
+LANG_GRAPH_CHECKPOINT_TABLE = getenv_or_action(
+    "LANG_GRAPH_CHECKPOINT_TABLE", default="lang_graph_checkpoints", action="ignore"
+)
+# Retenção: checkpoints mantidos por thread e dias sem atividade até a thread
+# ser apagada (0 desativa cada regra)
+LANG_GRAPH_CHECKPOINT_KEEP_LAST = int(
+    getenv_or_action("LANG_GRAPH_CHECKPOINT_KEEP_LAST", default="20", action="ignore")
+)
+LANG_GRAPH_CHECKPOINT_TTL_DAYS = int(
+    getenv_or_action("LANG_GRAPH_CHECKPOINT_TTL_DAYS", default="30", action="ignore")
+)
+LANG_GRAPH_CHECKPOINT_PRUNE_INTERVAL_SECONDS = int(
+    getenv_or_action(
+        "LANG_GRAPH_CHECKPOINT_PRUNE_INTERVAL_SECONDS",
+        default="3600",
+        action="ignore",
+    )
+)
+
+# Agentes compilados (modelo com ferramentas + prompt estático) mantidos em cache
+LANG_GRAPH_COMPILED_AGENT_CACHE_SIZE = int(
+    getenv_or_action(
+        "LANG_GRAPH_COMPILED_AGENT_CACHE_SIZE", default="32", action="ignore"
+    )
+)
+
+# Pool do engine assíncrono das memórias de longo prazo do agente
+LANG_GRAPH_MEMORY_PG_POOL_SIZE = int(
+    getenv_or_action("LANG_GRAPH_MEMORY_PG_POOL_SIZE", default="5", action="ignore")
+)
+LANG_GRAPH_MEMORY_PG_MAX_OVERFLOW = int(
+    getenv_or_action("LANG_GRAPH_MEMORY_PG_MAX_OVERFLOW", default="10", action="ignore")
+)
+
+# Cache de embeddings: entradas do LRU em processo (0 desativa) e banco do nível
+# persistente opcional (URL SQLAlchemy, "pg" para usar o PG_URI, vazio desativa)
+LANG_GRAPH_EMBEDDING_CACHE_SIZE = int(
+    getenv_or_action(
+        "LANG_GRAPH_EMBEDDING_CACHE_SIZE", default="10000", action="ignore"
+    )
+)
+LANG_GRAPH_EMBEDDING_CACHE_DB = getenv_or_action(
+    "LANG_GRAPH_EMBEDDING_CACHE_DB", default="", action="ignore"
+)
+
+# Busca semântica nas memórias (ver lang_graph/vector_search.py): estratégia
+# (auto/exact/hnsw), ef_search e iterative_scan do HNSW (vazio desliga; só
+# relaxed_order/strict_order com pgvector >= 0.8) e mínimo de memórias do usuário para o modo auto usar o HNSW
+LANG_GRAPH_MEMORY_SEARCH_STRATEGY = getenv_or_action(
+    "LANG_GRAPH_MEMORY_SEARCH_STRATEGY", default="auto", action="ignore"
+)
+LANG_GRAPH_MEMORY_HNSW_EF_SEARCH = int(
+    getenv_or_action("LANG_GRAPH_MEMORY_HNSW_EF_SEARCH", default="100", action="ignore")
+)
+LANG_GRAPH_MEMORY_HNSW_ITERATIVE_SCAN = getenv_or_action(
+    "LANG_GRAPH_MEMORY_HNSW_ITERATIVE_SCAN", default="", action="ignore"
+)
+LANG_GRAPH_MEMORY_ANN_MIN_USER_ROWS = int(
+    getenv_or_action(
+        "LANG_GRAPH_MEMORY_ANN_MIN_USER_ROWS", default="2000", action="ignore"
+    )
+)
+
+# last_accessed das memórias gravado em lote (ver lang_graph/access_tracker.py):
+# intervalo entre flushes (0 grava a cada leitura) e tamanho que antecipa o flush
+LANG_GRAPH_MEMORY_ACCESS_FLUSH_INTERVAL_SECONDS = float(
+    getenv_or_action(
+        "LANG_GRAPH_MEMORY_ACCESS_FLUSH_INTERVAL_SECONDS", default="5", action="ignore"
+    )
+)
+LANG_GRAPH_MEMORY_ACCESS_FLUSH_MAX_PENDING = int(
+    getenv_or_action(
+        "LANG_GRAPH_MEMORY_ACCESS_FLUSH_MAX_PENDING", default="500", action="ignore"
+    )
+)
+
+# Execução das ferramentas do agente (ver lang_graph/tool_executor.py):
+# chamadas simultâneas por turno (1 = sequencial), timeout padrão em segundos
+# (0 desativa) e timeouts por ferramenta ("nome=segundos,nome=segundos")
+LANG_GRAPH_TOOL_MAX_CONCURRENCY = int(
+    getenv_or_action("LANG_GRAPH_TOOL_MAX_CONCURRENCY", default="4", action="ignore")
+)
+LANG_GRAPH_TOOL_TIMEOUT_SECONDS = float(
+    getenv_or_action("LANG_GRAPH_TOOL_TIMEOUT_SECONDS", default="30", action="ignore")
+)
+LANG_GRAPH_TOOL_TIMEOUTS = getenv_or_action(
+    "LANG_GRAPH_TOOL_TIMEOUTS", default="", action="ignore"
+)
+
+# Janela de contexto do agente (ver lang_graph/context_window.py): orçamento de
+# tokens do prompt e máximo de mensagens do histórico (0 desativa cada um; os
+# dois vêm desativados, então o corte do histórico é opt-in), fração do limite
+# para onde a janela é reduzida ao estourar e resumo contínuo das mensagens que
+# saem da janela
+LANG_GRAPH_CONTEXT_MAX_TOKENS = int(
+    getenv_or_action("LANG_GRAPH_CONTEXT_MAX_TOKENS", default="0", action="ignore")
+)
+LANG_GRAPH_CONTEXT_MAX_MESSAGES = int(
+    getenv_or_action("LANG_GRAPH_CONTEXT_MAX_MESSAGES", default="0", action="ignore")
+)
+LANG_GRAPH_CONTEXT_LOW_WATER = float(
+    getenv_or_action("LANG_GRAPH_CONTEXT_LOW_WATER", default="0.6", action="ignore")
+)
+LANG_GRAPH_CONTEXT_SUMMARIZE = (
+    getenv_or_action(
+        "LANG_GRAPH_CONTEXT_SUMMARIZE", default="false", action="ignore"
+    ).lower()
+    == "true"
+)
+LANG_GRAPH_CONTEXT_SUMMARY_MAX_TOKENS = int(
+    getenv_or_action(
+        "LANG_GRAPH_CONTEXT_SUMMARY_MAX_TOKENS", default="400", action="ignore"
+    )
+)
+
 
 PHOENIX_HOST = getenv_or_action("PHOENIX_HOST", action="ignore")
 PHOENIX_PORT = getenv_or_action("PHOENIX_PORT", action="ignore")
@@ -81,6 +229,53 @@ USE_LOCAL_API = (
 EAI_GATEWAY_API_URL = getenv_or_action("EAI_GATEWAY_API_URL")
 EAI_GATEWAY_API_TOKEN = getenv_or_action("EAI_GATEWAY_API_TOKEN")
 
+# Espera pela resposta do EAI Gateway: modo (backoff, poll, ou auto, sse e
+# long_poll quando o gateway tiver esses endpoints), primeiro intervalo e fator do backoff entre consultas e tempo máximo
+# que o gateway pode segurar uma consulta de long polling
+EAI_GATEWAY_RESPONSE_MODE = getenv_or_action(
+    "EAI_GATEWAY_RESPONSE_MODE", default="backoff", action="ignore"
+)
+EAI_GATEWAY_POLL_INITIAL_INTERVAL = float(
+    getenv_or_action(
+        "EAI_GATEWAY_POLL_INITIAL_INTERVAL", default="0.1", action="ignore"
+    )
+)
+EAI_GATEWAY_POLL_BACKOFF_FACTOR = float(
+    getenv_or_action("EAI_GATEWAY_POLL_BACKOFF_FACTOR", default="1.5", action="ignore")
+)
+EAI_GATEWAY_LONG_POLL_SECONDS = float(
+    getenv_or_action("EAI_GATEWAY_LONG_POLL_SECONDS", default="20", action="ignore")
+)
+
+# Rate limiter do EAI Gateway: "local" (por processo) ou "redis" (compartilhado
+# entre processos, com o limiter local como fallback) e chave do balde no Redis
+EAI_GATEWAY_RATE_LIMIT_BACKEND = getenv_or_action(
+    "EAI_GATEWAY_RATE_LIMIT_BACKEND", default="local", action="ignore"
+)
+EAI_GATEWAY_REDIS_URL = getenv_or_action(
+    "EAI_GATEWAY_REDIS_URL", default="", action="ignore"
+)
+EAI_GATEWAY_RATE_LIMIT_KEY = getenv_or_action(
+    "EAI_GATEWAY_RATE_LIMIT_KEY", default="eai_gateway:rate_limit", action="ignore"
+)
+
+# Cliente HTTP compartilhado do EAI Gateway (ver eai_gateway/http_client.py):
+# máximo de conexões (0 = sem limite), conexões ociosas mantidas, segundos de
+# keep-alive e HTTP/2 (requer o pacote h2)
+EAI_GATEWAY_HTTP_MAX_CONNECTIONS = int(
+    getenv_or_action("EAI_GATEWAY_HTTP_MAX_CONNECTIONS", default="100", action="ignore")
+)
+EAI_GATEWAY_HTTP_MAX_KEEPALIVE = int(
+    getenv_or_action("EAI_GATEWAY_HTTP_MAX_KEEPALIVE", default="20", action="ignore")
+)
+EAI_GATEWAY_HTTP_KEEPALIVE_EXPIRY = float(
+    getenv_or_action("EAI_GATEWAY_HTTP_KEEPALIVE_EXPIRY", default="30", action="ignore")
+)
+EAI_GATEWAY_HTTP2 = (
+    getenv_or_action("EAI_GATEWAY_HTTP2", default="false", action="ignore").lower()
+    == "true"
+)
+
 MCP_SERVER_URL = getenv_or_action("MCP_SERVER_URL", action="ignore")
 MCP_API_TOKEN = getenv_or_action("MCP_API_TOKEN", action="ignore")
 
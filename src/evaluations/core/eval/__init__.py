@@ -19,6 +19,8 @@ from src.evaluations.core.eval.llm_clients import (
     BaseJudgeClient,
     GeminiAIClient,
 )
+from src.evaluations.core.eval.adaptive_judge import AdaptiveJudgeClient
+from src.evaluations.core.eval.judge_cache import CachedJudgeClient, JudgeResponseCache
 from src.evaluations.core.eval.runner.orchestrator import AsyncExperimentRunner
 from src.evaluations.core.eval.schemas import (
     AgentResponse,
@@ -43,6 +45,9 @@ __all__ = [
     "AzureOpenAIClient",
     "BaseJudgeClient",
     "GeminiAIClient",
+    "AdaptiveJudgeClient",
+    "CachedJudgeClient",
+    "JudgeResponseCache",
     "AsyncExperimentRunner",
     "AgentResponse",
     "ConversationTurn",
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Cliente juiz com concorrência adaptativa (AIMD), retentativas e orçamentos.
+
+Os clientes juiz fazem uma chamada por avaliação, sem retentativa e sem
+noção da cota do provedor: em experimentos grandes, ou a concorrência fica
+abaixo do que a cota permite, ou o provedor começa a devolver 429 e as
+avaliações falham em rajada. O `AdaptiveJudgeClient` envolve qualquer
+`BaseJudgeClient` e:
+
+- limita as chamadas simultâneas com AIMD: cada sucesso soma 1/limite ao
+  limite (cerca de +1 por "rodada" de chamadas) e um 429 ou 5xx corta o
+  limite pela metade. Só o primeiro sinal de uma rodada corta: as chamadas
+  que já estavam em voo quando o limite caiu não o derrubam de novo;
+- refaz chamadas que falharam por 429, 5xx, timeout ou conexão, esperando o
+  `Retry-After` do provedor ou um backoff exponencial com jitter completo;
+- respeita orçamentos do modelo em requisições e tokens por minuto (a cota do
+  deployment no Azure), com token buckets FIFO. Os tokens são estimados pelo
+  tamanho do prompt e da resposta (~4 caracteres por token);
+- resume vazão e throttling em `stats()`, que o AsyncExperimentRunner inclui
+  no `execution_summary` ao final do experimento.
+
+Use uma instância por modelo, compartilhada por todos os avaliadores que usam
+esse juiz, para que o limite e os orçamentos valham para o modelo inteiro.
+Desligue as retentativas do SDK do cliente envolvido (ex.:
+`AzureOpenAIClient(..., max_retries=0)`).
+
+    judge_client = AdaptiveJudgeClient(
+        AzureOpenAIClient(model_name="gpt-4o", max_retries=0),
+        requests_per_minute=600,
+        tokens_per_minute=200_000,
+    )
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+from openai import APIConnectionError
+
+from src.evaluations.core.eval.llm_clients import BaseJudgeClient
+from src.evaluations.core.eval.log import logger
+from src.services.eai_gateway.rate_limiter import TokenBucketRateLimiter
+
+CHARS_PER_TOKEN = 4
+
+TRANSIENT_ERRORS = (
+    APIConnectionError,
+    httpx.TransportError,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def judge_error_status(error: BaseException) -> Optional[int]:
+    """Status HTTP de um erro do SDK da OpenAI, do Gemini ou do httpx"""
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def judge_retry_after(error: BaseException) -> Optional[float]:
+    """Segundos pedidos pelo provedor nos headers Retry-After da resposta"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+class AIMDConcurrencyLimiter:
+    """
+    Limite de chamadas simultâneas com aumento aditivo e redução
+    multiplicativa. Os chamadores esperam a vez em ordem de chegada.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        decrease_factor: float = 0.5,
+    ):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Requer 1 <= minimum <= initial <= maximum.")
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.decreases = 0
+        self.lowest_limit = self.limit
+        self.highest_limit = self.limit
+        # Rodada atual: muda a cada redução do limite
+        self._epoch = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> int:
+        """Espera uma vaga e devolve a rodada em que a chamada começou"""
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return self._epoch
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # A vaga já tinha sido concedida: passa para o próximo
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(future)
+            raise
+        return self._epoch
+
+    def release(self, epoch: int, congested: bool = False, succeeded: bool = False):
+        """Libera a vaga; `congested` reduz o limite e `succeeded` o aumenta"""
+        self.in_flight -= 1
+        if congested:
+            if epoch == self._epoch:
+                self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                self.lowest_limit = min(self.lowest_limit, self.limit)
+                self.decreases += 1
+                self._epoch += 1
+        elif succeeded:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.highest_limit = max(self.highest_limit, self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+
+class AdaptiveJudgeClient(BaseJudgeClient):
+    """Envolve um cliente juiz com AIMD, retentativas com jitter e orçamentos"""
+
+    def __init__(
+        self,
+        client: BaseJudgeClient,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        self.client = client
+        self.concurrency = AIMDConcurrencyLimiter(
+            initial_concurrency, min_concurrency, max_concurrency
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_budget = (
+            TokenBucketRateLimiter(requests_per_minute, sleep=sleep)
+            if requests_per_minute
+            else None
+        )
+        self.token_budget = (
+            TokenBucketRateLimiter(tokens_per_minute, sleep=sleep, unit="tokens")
+            if tokens_per_minute
+            else None
+        )
+        self._sleep = sleep
+        self._random = rng or random.Random()
+        self.reset_stats()
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.client, "model_name", type(self.client).__name__)
+
+    def generation_params(self) -> Dict[str, Any]:
+        return self.client.generation_params()
+
+    async def execute(self, prompt: str) -> str:
+        prompt_tokens = estimate_tokens(prompt)
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_budget(prompt_tokens)
+            epoch = await self.concurrency.acquire()
+            started = time.monotonic()
+            self._first_started = self._first_started or started
+            self.attempts += 1
+            try:
+                response = await self.client.execute(prompt)
+            except Exception as e:
+                status = judge_error_status(e)
+                congested = status == 429 or (status is not None and status >= 500)
+                self.concurrency.release(epoch, congested=congested)
+                if status == 429:
+                    self.throttled += 1
+                elif congested:
+                    self.server_errors += 1
+                if not (congested or isinstance(e, TRANSIENT_ERRORS)):
+                    self.failed += 1
+                    raise
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    logger.error(
+                        f"Juiz ({self.model_name}) falhou após "
+                        f"{self.max_retries + 1} tentativas: {e}"
+                    )
+                    raise
+                delay = self._retry_delay(attempt, e)
+                self.retries += 1
+                logger.warning(
+                    f"Juiz ({self.model_name}) respondeu {status or type(e).__name__}, "
+                    f"nova tentativa em {delay:.2f}s "
+                    f"(limite de concorrência {int(self.concurrency.limit)})"
+                )
+                await self._sleep(delay)
+            except BaseException:
+                self.concurrency.release(epoch)
+                self.failed += 1
+                raise
+            else:
+                finished = time.monotonic()
+                self.concurrency.release(epoch, succeeded=True)
+                self.succeeded += 1
+                self.latency_seconds += finished - started
+                self._last_finished = finished
+                completion_tokens = estimate_tokens(response)
+                self.estimated_tokens += prompt_tokens + completion_tokens
+                if self.token_budget is not None:
+                    # A resposta consome o orçamento sem esperar: quem vem
+                    # depois espera pelos tokens já gastos
+                    self.token_budget.reserve(completion_tokens)
+                return response
+
+    async def _wait_for_budget(self, prompt_tokens: int) -> None:
+        if self.request_budget is not None:
+            self.budget_wait_seconds += await self.request_budget.acquire()
+        if self.token_budget is not None:
+            self.budget_wait_seconds += await self.token_budget.acquire(prompt_tokens)
+
+    def _retry_delay(self, attempt: int, error: BaseException) -> float:
+        """Retry-After do provedor ou backoff exponencial com jitter completo"""
+        retry_after = judge_retry_after(error)
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after)
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return self._random.uniform(0, ceiling)
+
+    def reset_stats(self) -> None:
+        self.attempts = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.estimated_tokens = 0
+        self.latency_seconds = 0.0
+        self.budget_wait_seconds = 0.0
+        self._first_started: Optional[float] = None
+        self._last_finished: Optional[float] = None
+        self.concurrency.decreases = 0
+        self.concurrency.lowest_limit = self.concurrency.limit
+        self.concurrency.highest_limit = self.concurrency.limit
+
+    def stats(self) -> Dict[str, Any]:
+        """Resumo de vazão e throttling desde o último reset_stats()"""
+        elapsed = (
+            self._last_finished - self._first_started
+            if self._first_started is not None and self._last_finished is not None
+            else 0.0
+        )
+        return {
+            "model": self.model_name,
+            "attempts": self.attempts,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+            "throttle_rate": (
+                round(self.throttled / self.attempts, 4) if self.attempts else 0.0
+            ),
+            "requests_per_second": (
+                round(self.succeeded / elapsed, 2) if elapsed > 0 else 0.0
+            ),
+            "estimated_tokens": self.estimated_tokens,
+            "mean_latency_seconds": (
+                round(self.latency_seconds / self.succeeded, 4)
+                if self.succeeded
+                else 0.0
+            ),
+            "budget_wait_seconds": round(self.budget_wait_seconds, 3),
+            "concurrency_limit": int(self.concurrency.limit),
+            "lowest_concurrency_limit": int(self.concurrency.lowest_limit),
+            "highest_concurrency_limit": int(self.concurrency.highest_limit),
+            "concurrency_decreases": self.concurrency.decreases,
+        }
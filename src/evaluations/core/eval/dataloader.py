@@ -1,6 +1,24 @@
+"""
+Carregamento de datasets de avaliação.
+
+Por padrão o DataLoader lê a fonte inteira para um DataFrame em `self.df`.
+Com `chunk_size`, arquivos locais (CSV ou Parquet) e planilhas são lidos em
+blocos de `chunk_size` linhas, só com as colunas essenciais: as tarefas são
+produzidas sob demanda em `get_tasks()` e o hash do dataset é calculado bloco
+a bloco, sem manter o dataset inteiro em memória. O hash é o mesmo do modo
+padrão e não depende do `chunk_size`: no Parquet os tipos vêm do schema, e no
+CSV uma primeira passada pelas colunas essenciais resolve os tipos como a
+leitura do arquivo inteiro resolveria (ex.: uma coluna de inteiros com valores
+ausentes só em alguns blocos é float em todos eles).
+
+O upload para o BigQuery grava o dataset inteiro numa única linha, então o
+modo em blocos exige `upload_to_bq=False`.
+"""
+
+import numpy as np
 import pandas as pd
 import re
-from typing import Generator, Dict, Any, Union, List, Optional
+from typing import Generator, Dict, Any, Iterable, Iterator, Union, List, Optional, Set
 from urllib.parse import urlparse, parse_qs
 import hashlib
 from datetime import datetime, timezone
@@ -8,6 +26,32 @@ from datetime import datetime, timezone
 from src.utils.bigquery import upload_dataset_to_bq
 from src.evaluations.core.eval.schemas import EvaluationTask
 
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith(PARQUET_SUFFIXES)
+
+
+def _resolve_csv_dtype(kinds: Set[str], has_missing: bool) -> Optional[np.dtype]:
+    """
+    Tipo que a leitura do CSV inteiro daria a uma coluna, a partir dos tipos
+    inferidos nos blocos (sem contar blocos só de valores ausentes). None para
+    booleanos com valores ausentes, que a leitura inteira deixa como object
+    com True/False: cada bloco é inferido normalmente e convertido para object.
+    """
+    if not kinds:
+        return np.dtype("float64")
+    if kinds <= set("iu"):
+        if has_missing:
+            return np.dtype("float64")
+        return np.dtype("uint64") if kinds == {"u"} else np.dtype("int64")
+    if kinds <= set("iuf"):
+        return np.dtype("float64")
+    if kinds == {"b"}:
+        return None if has_missing else np.dtype(bool)
+    return np.dtype(object)
+
 
 class DataLoader:
     """
@@ -25,6 +69,7 @@ class DataLoader:
         metadata_cols: Optional[List[str]] = None,
         upload_to_bq: bool = True,
         number_rows: Optional[int] = None,
+        chunk_size: Optional[int] = None,
     ):
         """
         Inicializa o DataLoader.
@@ -38,6 +83,10 @@ class DataLoader:
             dataset_description (str): Descrição do dataset.
             metadata_cols (List[str], optional): Colunas de metadados adicionais.
             upload_to_bq (bool): Se True, tenta fazer o upload do dataset para o BigQuery.
+            chunk_size (Optional[int]): Se definido, fontes em arquivo ou planilha
+                são lidas em blocos desse número de linhas, sob demanda, e
+                `self.df` fica None. Requer upload_to_bq=False. Sem efeito para
+                um pandas.DataFrame.
         """
         self.id_col = id_col
         self.prompt_col = prompt_col
@@ -47,10 +96,28 @@ class DataLoader:
             list(set([id_col, prompt_col] + self.metadata_cols))
         )
 
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size deve ser um inteiro positivo.")
+        if chunk_size is not None and upload_to_bq and isinstance(source, str):
+            raise ValueError(
+                "chunk_size requer upload_to_bq=False: o upload para o BigQuery "
+                "envia o dataset inteiro numa única linha e anularia a leitura em blocos."
+            )
+        self.chunk_size = chunk_size
+        self.source = source
+        self.dataset_name = dataset_name
+        self.dataset_description = dataset_description
+        self.created_at = datetime.now(timezone.utc).isoformat()
+        self._dataset_config: Optional[Dict[str, Any]] = None
+        self._csv_dtypes: Optional[Dict[str, Optional[np.dtype]]] = None
+
+        self.df: Optional[pd.DataFrame] = None
         if isinstance(source, pd.DataFrame):
             self.df = source.head(self.number_rows)
         elif isinstance(source, str):
-            if "docs.google.com/spreadsheets" in source:
+            if chunk_size is not None:
+                self._validate_columns(self._read_columns(source))
+            elif "docs.google.com/spreadsheets" in source:
                 self.df = self._load_from_gsheet(source)
             else:
                 self.df = self._load_from_file(source)
@@ -59,10 +126,11 @@ class DataLoader:
                 "A fonte deve ser um caminho de arquivo, URL do Google Sheets ou um pandas.DataFrame."
             )
 
-        self._validate_columns()
-        self._dataset_config = self._create_dataset_config(
-            dataset_name, dataset_description
-        )
+        if self.df is not None:
+            self._validate_columns(self.df.columns)
+            self._dataset_config = self._create_dataset_config(
+                self._hash_chunks([self.df])
+            )
 
         if upload_to_bq:
             upload_dataset_to_bq(
@@ -70,63 +138,193 @@ class DataLoader:
                 filtered_df=self.df[self.essential_cols],
             )
 
-    def _create_dataset_config(self, name: str, description: str) -> Dict[str, Any]:
+    @property
+    def total_rows(self) -> Optional[int]:
+        """
+        Número de linhas do dataset, se conhecido sem ler a fonte inteira
+        (None para CSV e planilhas no modo em blocos).
+        """
+        if self.df is not None:
+            return len(self.df)
+        if not _is_parquet(self.source):
+            return None
+        import pyarrow.parquet as pq
+
+        total = pq.ParquetFile(self.source).metadata.num_rows
+        return total if self.number_rows is None else min(total, self.number_rows)
+
+    def _hash_chunks(self, chunks: Iterable[pd.DataFrame]) -> "hashlib._Hash":
+        """SHA-256 das colunas essenciais, atualizado bloco a bloco."""
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            self._update_hash(digest, chunk)
+        return digest
+
+    def _update_hash(self, digest: "hashlib._Hash", chunk: pd.DataFrame) -> None:
+        # Com lines=True cada registro termina em "\n", então a concatenação
+        # dos blocos é igual ao JSON do DataFrame inteiro
+        df_json = chunk[self.essential_cols].to_json(orient="records", lines=True)
+        digest.update(df_json.encode())
+
+    def _create_dataset_config(self, digest: "hashlib._Hash") -> Dict[str, Any]:
         """
         Cria a configuração e um ID determinístico em formato de inteiro para o dataset,
         baseado apenas nas colunas essenciais.
         """
-        filtered_df = self.df[self.essential_cols]
-        df_json = filtered_df.to_json(
-            orient="records",
-            lines=True,
-        )
-
-        # Gera um hash SHA-256, o converte para um inteiro e o mascara para 63 bits
+        # Converte o hash SHA-256 para um inteiro e o mascara para 63 bits
         # para garantir que ele se encaixe em um INT64 assinado do BigQuery.
-        df_hash_hex = hashlib.sha256(df_json.encode()).hexdigest()
+        df_hash_hex = digest.hexdigest()
         dataset_id = int(df_hash_hex[:16], 16) & (2**63 - 1)
 
         return {
-            "dataset_name": name,
-            "dataset_description": description,
+            "dataset_name": self.dataset_name,
+            "dataset_description": self.dataset_description,
             "dataset_id": dataset_id,
-            "dataset_created_at": datetime.now(timezone.utc).isoformat(),
+            "dataset_created_at": self.created_at,
         }
 
     def get_dataset_config(self) -> Dict[str, Any]:
-        """Retorna os metadados do dataset."""
+        """
+        Retorna os metadados do dataset. No modo em blocos, se `get_tasks()`
+        ainda não percorreu a fonte inteira, lê a fonte uma vez para o hash.
+        """
+        if self._dataset_config is None:
+            self._dataset_config = self._create_dataset_config(
+                self._hash_chunks(self._iter_chunks())
+            )
         return self._dataset_config
 
+    def _read_columns(self, source: str) -> List[str]:
+        """Colunas da fonte, lidas só do cabeçalho ou do schema."""
+        try:
+            if _is_parquet(source):
+                import pyarrow.parquet as pq
+
+                return pq.ParquetFile(source).schema_arrow.names
+            return list(pd.read_csv(self._csv_url(source), nrows=0).columns)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Arquivo não encontrado em: {source}")
+        except ImportError:
+            raise ImportError(
+                "A leitura de arquivos Parquet requer o pacote pyarrow (pip install pyarrow)."
+            )
+        except Exception as e:
+            raise Exception(f"Erro ao ler o cabeçalho da fonte de dados: {e}")
+
+    def _csv_url(self, source: str) -> str:
+        if "docs.google.com/spreadsheets" in source:
+            return self._gsheet_csv_url(source)
+        return source
+
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Blocos das colunas essenciais, respeitando `number_rows`. No modo
+        padrão, o próprio DataFrame é o único bloco.
+        """
+        if self.df is not None:
+            yield self.df[self.essential_cols]
+            return
+
+        if _is_parquet(self.source):
+            import pyarrow.parquet as pq
+
+            batches = (
+                batch.to_pandas()
+                for batch in pq.ParquetFile(self.source).iter_batches(
+                    batch_size=self.chunk_size, columns=self.essential_cols
+                )
+            )
+        else:
+            dtypes = self._resolve_csv_dtypes()
+            forced = {c: dtype for c, dtype in dtypes.items() if dtype is not None}
+            inferred = {c: object for c, dtype in dtypes.items() if dtype is None}
+            batches = (
+                chunk.astype(inferred)
+                for chunk in pd.read_csv(
+                    self._csv_url(self.source),
+                    usecols=self.essential_cols,
+                    dtype=forced,
+                    chunksize=self.chunk_size,
+                )
+            )
+
+        remaining = self.number_rows
+        for chunk in batches:
+            if remaining is not None:
+                if remaining <= 0:
+                    break
+                chunk = chunk.head(remaining)
+                remaining -= len(chunk)
+            yield chunk[self.essential_cols]
+
+    def _resolve_csv_dtypes(self) -> Dict[str, Optional[np.dtype]]:
+        """
+        Tipos das colunas essenciais no CSV inteiro. Cada bloco lido com
+        `chunksize` infere os seus, e o JSON do hash mudaria com o tamanho do
+        bloco; a passada considera o arquivo inteiro, mesmo com `number_rows`,
+        como a leitura padrão.
+        """
+        if self._csv_dtypes is None:
+            kinds: Dict[str, Set[str]] = {
+                column: set() for column in self.essential_cols
+            }
+            has_missing = dict.fromkeys(self.essential_cols, False)
+            for chunk in pd.read_csv(
+                self._csv_url(self.source),
+                usecols=self.essential_cols,
+                chunksize=self.chunk_size,
+            ):
+                for column in self.essential_cols:
+                    series = chunk[column]
+                    missing = series.isna()
+                    if missing.all():
+                        has_missing[column] = True
+                        continue
+                    has_missing[column] = has_missing[column] or bool(missing.any())
+                    kind = series.dtype.kind
+                    if kind == "O" and pd.api.types.infer_dtype(series) == "boolean":
+                        # Booleanos com valores ausentes no bloco
+                        kind = "b"
+                    kinds[column].add(kind)
+            self._csv_dtypes = {
+                column: _resolve_csv_dtype(kinds[column], has_missing[column])
+                for column in self.essential_cols
+            }
+        return self._csv_dtypes
+
     def _load_from_file(self, file_path: str) -> pd.DataFrame:
         try:
+            if _is_parquet(file_path):
+                return pd.read_parquet(file_path).head(self.number_rows)
             return pd.read_csv(file_path).head(self.number_rows)
         except FileNotFoundError:
             raise FileNotFoundError(f"Arquivo não encontrado em: {file_path}")
         except Exception as e:
-            raise Exception(f"Erro ao ler o arquivo CSV: {e}")
+            raise Exception(f"Erro ao ler o arquivo: {e}")
 
     def _load_from_gsheet(self, url: str) -> pd.DataFrame:
         try:
-            match = re.search(r"/spreadsheets/d/([a-zA-Z0-9-_]+)", url)
-            if not match:
-                raise ValueError("URL do Google Sheets inválida ou mal formatada.")
-            sheet_id = match.group(1)
-
-            parsed_url = urlparse(url)
-            query_params = parse_qs(parsed_url.query)
-            fragment_params = parse_qs(parsed_url.fragment)
-            gid = (
-                query_params.get("gid", [None])[0] or fragment_params.get("gid", [0])[0]
-            )
-
-            csv_export_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
-            return pd.read_csv(csv_export_url).head(self.number_rows)
+            return pd.read_csv(self._gsheet_csv_url(url)).head(self.number_rows)
         except Exception as e:
             raise Exception(f"Erro ao carregar dados do Google Sheets: {e}")
 
-    def _validate_columns(self):
-        """Verifica se as colunas mapeadas existem no DataFrame."""
-        missing_cols = set(self.essential_cols) - set(self.df.columns)
+    def _gsheet_csv_url(self, url: str) -> str:
+        """URL de exportação em CSV da aba da planilha."""
+        match = re.search(r"/spreadsheets/d/([a-zA-Z0-9-_]+)", url)
+        if not match:
+            raise ValueError("URL do Google Sheets inválida ou mal formatada.")
+        sheet_id = match.group(1)
+
+        parsed_url = urlparse(url)
+        query_params = parse_qs(parsed_url.query)
+        fragment_params = parse_qs(parsed_url.fragment)
+        gid = query_params.get("gid", [None])[0] or fragment_params.get("gid", [0])[0]
+
+        return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+
+    def _validate_columns(self, columns):
+        """Verifica se as colunas mapeadas existem na fonte de dados."""
+        missing_cols = set(self.essential_cols) - set(columns)
         if missing_cols:
             raise ValueError(
                 f"Colunas necessárias não encontradas na fonte de dados: {', '.join(missing_cols)}"
@@ -135,17 +333,33 @@ class DataLoader:
     def get_tasks(self) -> Generator[EvaluationTask, None, None]:
         """
         Retorna um gerador que produz cada linha como uma tarefa padronizada
-        e validada pelo Pydantic.
+        e validada pelo Pydantic. No modo em blocos, cada bloco é lido só
+        quando o anterior se esgota, e o hash do dataset é calculado no
+        caminho se ainda não foi.
         """
+        digest = hashlib.sha256() if self._dataset_config is None else None
+        for chunk in self._iter_chunks():
+            if digest is not None:
+                self._update_hash(digest, chunk)
+            yield from self._tasks_from_chunk(chunk)
+
+        if digest is not None and self._dataset_config is None:
+            self._dataset_config = self._create_dataset_config(digest)
+
+    def _tasks_from_chunk(
+        self, chunk: pd.DataFrame
+    ) -> Generator[EvaluationTask, None, None]:
         # Mapeia a coluna de prompt especificada para o nome de campo 'prompt' esperado pelo schema
-        df_renamed = self.df[self.essential_cols].rename(
+        df_renamed = chunk.rename(
             columns={self.prompt_col: "prompt", self.id_col: "id"}
         )
         df_renamed["id"] = df_renamed["id"].astype(str)
 
-        for _, row in df_renamed.iterrows():
+        # to_dict("records") devolve tipos nativos do Python, como iterrows,
+        # sem criar uma Series por linha
+        for row in df_renamed.to_dict("records"):
             try:
-                task = EvaluationTask(**row.to_dict())
+                task = EvaluationTask(**row)
                 yield task
             except Exception as e:
                 continue
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Cache persistente (SQLite) das respostas do LLM juiz.
+
+Rodar de novo um experimento com um avaliador novo refaz todas as chamadas ao
+juiz dos avaliadores que não mudaram. O `CachedJudgeClient` envolve qualquer
+`BaseJudgeClient` e guarda cada resposta num arquivo SQLite, com a chave
+formada pelo modelo, pelos parâmetros de geração e pelo texto do prompt: se o
+prompt (ou a resposta do agente contida nele) mudar, a chave muda.
+
+É opt-in: só os avaliadores que recebem um `CachedJudgeClient` usam o cache.
+
+    judge_client = CachedJudgeClient(
+        AzureOpenAIClient(model_name="gpt-4o"), cache="./data/judge_cache.db"
+    )
+
+Modos:
+- "use": lê do cache e grava as respostas novas (padrão);
+- "refresh": ignora o que está no cache, chama o juiz e sobrescreve;
+- "bypass": não lê nem grava.
+
+Os acertos e falhas são contados por execução do AsyncExperimentRunner e
+entram no `execution_summary` do resultado.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.evaluations.core.eval.llm_clients import BaseJudgeClient
+from src.evaluations.core.eval.log import logger
+
+JUDGE_CACHE_MODES = ("use", "refresh", "bypass")
+
+
+def judge_cache_key(model: str, params: Dict[str, Any], prompt: str) -> str:
+    """Chave do cache: blake2b de modelo + parâmetros de geração + prompt"""
+    digest = hashlib.blake2b(digest_size=16)
+    serialized_params = json.dumps(params, sort_keys=True, default=str)
+    for part in (model, serialized_params, prompt):
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class JudgeResponseCache:
+    """Respostas do juiz num arquivo SQLite, compartilhável entre execuções"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS judge_cache (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM judge_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO judge_cache "
+                "(cache_key, model, response, created_at) VALUES (?, ?, ?, ?)",
+                (key, model, response, datetime.now(timezone.utc).isoformat()),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM judge_cache").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedJudgeClient(BaseJudgeClient):
+    """
+    Envolve um cliente juiz com o cache de respostas. Falhas do cache são só
+    registradas: o juiz é chamado normalmente.
+    """
+
+    def __init__(
+        self,
+        client: BaseJudgeClient,
+        cache: Union[JudgeResponseCache, str, Path],
+        mode: str = "use",
+    ):
+        if mode not in JUDGE_CACHE_MODES:
+            raise ValueError(
+                f"Modo de cache inválido: '{mode}'. Use um de {JUDGE_CACHE_MODES}."
+            )
+        self.client = client
+        self.cache = (
+            cache
+            if isinstance(cache, JudgeResponseCache)
+            else JudgeResponseCache(cache)
+        )
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.client, "model_name", type(self.client).__name__)
+
+    def generation_params(self) -> Dict[str, Any]:
+        return self.client.generation_params()
+
+    async def execute(self, prompt: str) -> str:
+        key = judge_cache_key(self.model_name, self.generation_params(), prompt)
+
+        if self.mode == "use":
+            try:
+                cached = await asyncio.to_thread(self.cache.get, key)
+            except Exception as e:
+                logger.error(f"Erro ao ler cache de respostas do juiz: {e}")
+                cached = None
+            if cached is not None:
+                self.hits += 1
+                logger.debug(f"Resposta do juiz ({self.model_name}) lida do cache.")
+                return cached
+        self.misses += 1
+
+        response = await self.client.execute(prompt)
+
+        if self.mode != "bypass":
+            try:
+                await asyncio.to_thread(self.cache.put, key, self.model_name, response)
+                self.writes += 1
+            except Exception as e:
+                logger.error(f"Erro ao gravar cache de respostas do juiz: {e}")
+        return response
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.writes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso do cache desde o último reset_stats()"""
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model_name,
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,6 +1,6 @@
 import asyncio
 import json
-from typing import Optional
+from typing import Any, Dict, Optional
 from abc import ABC, abstractmethod
 from src.config import env
 
@@ -182,20 +182,46 @@ class BaseJudgeClient(ABC):
         """
         pass
 
+    def generation_params(self) -> Dict[str, Any]:
+        """
+        Parâmetros de geração que afetam a resposta, além do modelo e do
+        prompt. Fazem parte da chave do cache de respostas do juiz.
+        """
+        return {}
+
 
 class AzureOpenAIClient(BaseJudgeClient):
     """
     Cliente para Azure OpenAI.
     """
 
-    def __init__(self, model_name: str):
+    def __init__(
+        self,
+        model_name: str,
+        max_retries: int = 2,
+        azure_endpoint: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ):
+        """
+        Args:
+            model_name (str): Nome do deployment no Azure OpenAI.
+            max_retries (int): Retentativas internas do SDK. Use 0 quando o
+                cliente for envolvido por um AdaptiveJudgeClient, que já
+                faz as retentativas.
+            azure_endpoint (str, optional): Padrão: OPENAI_AZURE_URL.
+            api_key (str, optional): Padrão: OPENAI_AZURE_API_KEY.
+        """
         self.model_name = model_name
         self.client = AsyncAzureOpenAI(
-            azure_endpoint=env.OPENAI_AZURE_URL,
-            api_key=env.OPENAI_AZURE_API_KEY,
+            azure_endpoint=azure_endpoint or env.OPENAI_AZURE_URL,
+            api_key=api_key or env.OPENAI_AZURE_API_KEY,
             api_version=env.OPENAI_AZURE_API_VERSION,
+            max_retries=max_retries,
         )
 
+    def generation_params(self) -> Dict[str, Any]:
+        return {"response_format": "text"}
+
     async def execute(
         self,
         prompt: str,
@@ -214,8 +240,10 @@ class AzureOpenAIClient(BaseJudgeClient):
                 logger.error("Resposta do juiz (Azure OpenAI) está vazia.")
                 raise BaseException("No text response received from Azure OpenAI.")
         except Exception as e:
-            logger.error(
-                f"Erro ao executar o prompt do juiz (Azure OpenAI): {e}", exc_info=True
+            # exc_info não é suportado pelo loguru: viraria argumento de format
+            # e quebraria em mensagens com chaves (os erros da API têm JSON)
+            logger.opt(exception=True).error(
+                f"Erro ao executar o prompt do juiz (Azure OpenAI): {e}"
             )
             raise
 
@@ -231,6 +259,11 @@ class GeminiAIClient(BaseJudgeClient):
             api_key=env.GEMINI_API_KEY,
         )
 
+    def generation_params(self) -> Dict[str, Any]:
+        if "2.5" in self.model_name or "3.0" in self.model_name:
+            return {"thinking_budget": -1}
+        return {}
+
     async def execute(
         self,
         prompt: str,
@@ -238,10 +271,11 @@ class GeminiAIClient(BaseJudgeClient):
         logger.info(f"Executando prompt do juiz com o modelo {self.model_name}...")
         try:
             generate_content_config = types.GenerateContentConfig()
-            if "2.5" in self.model_name or "3.0" in self.model_name:
+            params = self.generation_params()
+            if "thinking_budget" in params:
                 generate_content_config = types.GenerateContentConfig(
                     thinking_config=types.ThinkingConfig(
-                        thinking_budget=-1,
+                        thinking_budget=params["thinking_budget"],
                     ),
                 )
 
@@ -257,8 +291,10 @@ class GeminiAIClient(BaseJudgeClient):
                 logger.error("Resposta do juiz (Gemini AI) está vazia.")
                 raise BaseException("No text response received from Gemini AI.")
         except Exception as e:
-            logger.error(
-                f"Erro ao executar o prompt do juiz (Gemini AI): {e}", exc_info=True
+            # exc_info não é suportado pelo loguru: viraria argumento de format
+            # e quebraria em mensagens com chaves (os erros da API têm JSON)
+            logger.opt(exception=True).error(
+                f"Erro ao executar o prompt do juiz (Gemini AI): {e}"
             )
             raise
 
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Journal JSONL dos resultados de um experimento.
+
+Cada tarefa concluída vira uma linha no journal assim que termina (com flush),
+em vez de ficar em memória até o fim do experimento. Se o processo cair no
+meio, as tarefas já gravadas não se perdem: o runner retoma a partir do
+journal e pula as tarefas cujo ID já está nele.
+
+O flush basta para sobreviver à queda do processo. O fsync, que protege
+também contra a queda da máquina, custa milissegundos e roda no event loop,
+então é feito no máximo a cada `fsync_interval` segundos e ao fechar o
+journal (0 faz fsync a cada linha; None desliga o fsync).
+
+Uma linha truncada no final do arquivo (queda durante a escrita) é descartada
+ao carregar o journal. As execuções são relidas do disco a cada iteração, o
+que permite passar o journal ao ResultAnalyzer e à persistência sem
+materializar a lista de runs.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Union
+
+from src.evaluations.core.eval.log import logger
+
+
+class RunJournal:
+    """Journal append-only com uma execução (run) por linha."""
+
+    def __init__(self, path: Union[str, Path], fsync_interval: Optional[float] = 1.0):
+        self.path = Path(path)
+        self.fsync_interval = fsync_interval
+        self._count = 0
+        self._file = None
+        self._last_fsync = 0.0
+        self._unsynced = False
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                run = self._parse(line)
+                if run is not None:
+                    yield run
+
+    def __enter__(self) -> "RunJournal":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def exists(self) -> bool:
+        return self.path.exists() and self.path.stat().st_size > 0
+
+    def load(self) -> Set[str]:
+        """
+        Lê o journal existente e retorna os IDs das tarefas já concluídas.
+        Descarta uma linha incompleta no final do arquivo.
+        """
+        completed: Set[str] = set()
+        self._count = 0
+        if not self.path.exists():
+            return completed
+
+        valid_size = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                valid_size += len(line)
+                run = self._parse(line)
+                if run is None:
+                    continue
+                completed.add(str(run.get("task_data", {}).get("id")))
+                self._count += 1
+
+        if valid_size < self.path.stat().st_size:
+            logger.warning(
+                f"Descartando linha incompleta no final do journal {self.path}"
+            )
+            os.truncate(self.path, valid_size)
+
+        logger.info(
+            f"Journal {self.path}: {len(completed)} tarefas concluídas encontradas"
+        )
+        return completed
+
+    def reset(self) -> None:
+        """Começa um journal vazio."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(b"")
+        self._count = 0
+
+    def open(self) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+            self._last_fsync = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is not None:
+            if self._unsynced and self.fsync_interval is not None:
+                self._fsync()
+            self._file.close()
+            self._file = None
+
+    def append(self, run: Dict[str, Any]) -> None:
+        """
+        Grava uma execução concluída. O flush é imediato; o fsync segue o
+        `fsync_interval`.
+        """
+        if self._file is None:
+            raise RuntimeError("Journal não está aberto para escrita.")
+        line = json.dumps(run, ensure_ascii=False, default=str) + "\n"
+        self._file.write(line.encode("utf-8"))
+        self._file.flush()
+        self._count += 1
+        self._unsynced = True
+        if (
+            self.fsync_interval is not None
+            and time.monotonic() - self._last_fsync >= self.fsync_interval
+        ):
+            self._fsync()
+
+    def _fsync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+
+    def _parse(self, line: bytes) -> Optional[Dict[str, Any]]:
+        if not line.strip():
+            return None
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning(f"Ignorando linha inválida no journal {self.path}")
+            return None
@@ -20,6 +20,10 @@ from src.evaluations.core.eval.runner.response_manager import ResponseManager
 from src.evaluations.core.eval.runner.task_processor import TaskProcessor
 from src.evaluations.core.eval.runner.result_analyzer import ResultAnalyzer
 from src.evaluations.core.eval.runner.persistence import ResultPersistence
+from src.evaluations.core.eval.runner.journal import RunJournal
+from src.evaluations.core.eval.judge_cache import CachedJudgeClient
+from src.evaluations.core.eval.adaptive_judge import AdaptiveJudgeClient
+from src.evaluations.core.eval.llm_clients import BaseJudgeClient
 from src.evaluations.core.eval.log import logger
 from src.evaluations.core.eval.schemas import ConversationTurn, ReasoningStep
 import time
@@ -42,6 +46,13 @@ class AsyncExperimentRunner:
     """
     Orquestra a execução de experimentos de avaliação de agentes de IA,
     delegando responsabilidades para componentes especializados.
+
+    Com `journal_path`, cada tarefa concluída é gravada num journal JSONL assim
+    que termina e no máximo `max_concurrency` resultados ficam em memória
+    durante a execução. Com `resume=True`, as tarefas já presentes no journal
+    são puladas, retomando um experimento interrompido. `journal_fsync_interval`
+    é o intervalo mínimo, em segundos, entre os fsync do journal (veja
+    RunJournal).
     """
 
     def __init__(
@@ -60,14 +71,27 @@ class AsyncExperimentRunner:
         polling_interval: int = 2,
         rate_limit_requests_per_minute: int = 60,
         reasoning_engine_id: Optional[str] = None,
+        journal_path: Optional[Union[str, Path]] = None,
+        resume: bool = False,
+        journal_fsync_interval: Optional[float] = 1.0,
     ):
+        if resume and journal_path is None:
+            raise ValueError("resume=True requer um journal_path.")
+
         self.experiment_name = experiment_name
         self.experiment_description = experiment_description
         self.metadata = metadata
         # self.agent_config = agent_config
         self.evaluators = evaluators
         self.precomputed_responses = precomputed_responses or {}
+        self.max_concurrency = max_concurrency
         self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.journal = (
+            RunJournal(journal_path, fsync_interval=journal_fsync_interval)
+            if journal_path
+            else None
+        )
+        self.resume = resume
         self.upload_to_bq = upload_to_bq
         self.output_dir = Path(output_dir)
         self.eai_client = EAIClient(
@@ -148,6 +172,50 @@ class AsyncExperimentRunner:
                 "Avaliadores 'multi' requerem um avaliador 'conversation'."
             )
 
+    def _judge_clients(self, kind: type) -> List[BaseJudgeClient]:
+        """
+        Clientes juiz do tipo `kind` usados pelos avaliadores, sem repetição,
+        incluindo os envolvidos por outros (ex.: cache sobre o adaptativo).
+        """
+        clients: Dict[int, BaseJudgeClient] = {}
+        for evaluator in self.evaluators:
+            judge_client = getattr(evaluator, "judge_client", None)
+            while isinstance(judge_client, BaseJudgeClient):
+                if isinstance(judge_client, kind):
+                    clients[id(judge_client)] = judge_client
+                judge_client = getattr(judge_client, "client", None)
+        return list(clients.values())
+
+    def _summarize_judge_clients(self, execution_summary: Dict[str, Any]) -> None:
+        """Adiciona ao resumo da execução o uso de cache e a vazão dos juízes."""
+        judge_cache_stats = [
+            judge_client.stats()
+            for judge_client in self._judge_clients(CachedJudgeClient)
+        ]
+        if judge_cache_stats:
+            execution_summary["judge_cache"] = judge_cache_stats
+            for stats in judge_cache_stats:
+                logger.info(
+                    f"Cache do juiz ({stats['model']}, modo {stats['mode']}): "
+                    f"{stats['hits']} acertos, {stats['misses']} falhas"
+                )
+
+        judge_throughput_stats = [
+            judge_client.stats()
+            for judge_client in self._judge_clients(AdaptiveJudgeClient)
+        ]
+        if judge_throughput_stats:
+            execution_summary["judge_throughput"] = judge_throughput_stats
+            for stats in judge_throughput_stats:
+                logger.info(
+                    f"Juiz ({stats['model']}): {stats['succeeded']} chamadas "
+                    f"({stats['requests_per_second']}/s), {stats['throttled']} "
+                    f"throttled, {stats['server_errors']} erros 5xx, "
+                    f"{stats['retries']} retentativas, limite de concorrência "
+                    f"entre {stats['lowest_concurrency_limit']} e "
+                    f"{stats['highest_concurrency_limit']}"
+                )
+
     def _generate_experiment_id(self) -> int:
         """Gera ID único para o experimento."""
         exp_hash = hashlib.sha256(
@@ -161,11 +229,10 @@ class AsyncExperimentRunner:
         """
         logger.info(f"Iniciando experimento: {self.experiment_name}")
         start_time = time.perf_counter()
-
-        tasks = list(loader.get_tasks())
-        if not tasks:
-            raise ValueError("Nenhuma tarefa encontrada no loader.")
-        logger.info(f"Carregadas {len(tasks)} tarefas para processamento.")
+        for judge_client in self._judge_clients(
+            (CachedJudgeClient, AdaptiveJudgeClient)
+        ):
+            judge_client.reset_stats()
 
         # Inicializa os componentes
         response_manager = ResponseManager(
@@ -181,21 +248,17 @@ class AsyncExperimentRunner:
             self.output_dir, self.experiment_name, self.upload_to_bq
         )
 
-        # Executa as tarefas em paralelo
-        async def process_with_semaphore(task):
-            async with self.semaphore:
-                return await task_processor.process(task)
-
-        runs = await tqdm_asyncio.gather(
-            *[process_with_semaphore(task) for task in tasks],
-            desc=f"Executando: {self.experiment_name}",
-        )
+        if self.journal is not None:
+            runs = await self._run_with_journal(loader, task_processor)
+        else:
+            runs = await self._run_in_memory(loader, task_processor)
 
         total_duration = time.perf_counter() - start_time
 
         # Analisa e monta o resultado final
         logger.info("Calculando métricas agregadas...")
         analysis_summary = result_analyzer.analyze(runs, total_duration)
+        self._summarize_judge_clients(analysis_summary["execution_summary"])
         dataset_config = loader.get_dataset_config()
 
         final_result = {
@@ -222,3 +285,85 @@ class AsyncExperimentRunner:
         await self.eai_client.close()
         logger.info("EAI Client encerrado.")
         return final_result
+
+    async def _run_in_memory(
+        self, loader: DataLoader, task_processor: TaskProcessor
+    ) -> List[Dict[str, Any]]:
+        """Executa todas as tarefas em paralelo, mantendo os resultados em memória."""
+        tasks = list(loader.get_tasks())
+        if not tasks:
+            raise ValueError("Nenhuma tarefa encontrada no loader.")
+        logger.info(f"Carregadas {len(tasks)} tarefas para processamento.")
+
+        async def process_with_semaphore(task):
+            async with self.semaphore:
+                return await task_processor.process(task)
+
+        return await tqdm_asyncio.gather(
+            *[process_with_semaphore(task) for task in tasks],
+            desc=f"Executando: {self.experiment_name}",
+        )
+
+    async def _run_with_journal(
+        self, loader: DataLoader, task_processor: TaskProcessor
+    ) -> RunJournal:
+        """
+        Consome as tarefas do loader sob demanda, com no máximo
+        `max_concurrency` em andamento, e grava cada resultado no journal
+        assim que a tarefa termina.
+        """
+        journal = self.journal
+        if self.resume:
+            completed = journal.load()
+        elif journal.exists():
+            raise ValueError(
+                f"O journal {journal.path} já existe. Use resume=True para "
+                f"retomar o experimento ou remova o arquivo."
+            )
+        else:
+            completed = set()
+            journal.reset()
+
+        pending = set()
+        skipped = 0
+        progress = tqdm_asyncio(
+            total=loader.total_rows, desc=f"Executando: {self.experiment_name}"
+        )
+
+        def record(finished) -> None:
+            for future in finished:
+                journal.append(future.result())
+                progress.update()
+
+        try:
+            with journal:
+                for task in loader.get_tasks():
+                    if task.id in completed:
+                        skipped += 1
+                        progress.update()
+                        continue
+                    if len(pending) >= self.max_concurrency:
+                        finished, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        record(finished)
+                    pending.add(asyncio.create_task(task_processor.process(task)))
+
+                while pending:
+                    finished, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    record(finished)
+        finally:
+            # Em caso de erro ou cancelamento, o que já terminou está no journal
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            progress.close()
+
+        if not len(journal):
+            raise ValueError("Nenhuma tarefa encontrada no loader.")
+        if skipped:
+            logger.info(f"{skipped} tarefas já concluídas no journal foram puladas.")
+        logger.info(f"Journal com {len(journal)} tarefas em {journal.path}")
+        return journal
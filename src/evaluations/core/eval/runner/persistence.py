@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import json
+import textwrap
 from pathlib import Path
 from typing import Dict, Any
 
@@ -23,13 +24,19 @@ class ResultPersistence:
         Salva o resultado final do experimento.
 
         Args:
-            final_result: O dicionário completo com os resultados.
+            final_result: O dicionário completo com os resultados. O campo
+                "runs" pode ser uma lista ou um iterável (ex.: RunJournal),
+                que é gravado execução a execução.
         """
         output_path = await self._save_to_json(final_result)
 
         if self.upload_to_bq:
             try:
                 logger.info("Fazendo upload para BigQuery...")
+                if not isinstance(final_result["runs"], list):
+                    # O experimento é uma única linha na tabela: o upload
+                    # precisa de todas as execuções em memória
+                    final_result = {**final_result, "runs": list(final_result["runs"])}
                 upload_experiment_to_bq(result_data=final_result)
                 logger.info("Upload para BigQuery concluído")
             except Exception as e:
@@ -45,8 +52,31 @@ class ResultPersistence:
 
         try:
             with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(final_result, f, indent=2, ensure_ascii=False)
+                if isinstance(final_result.get("runs"), list):
+                    json.dump(final_result, f, indent=2, ensure_ascii=False)
+                else:
+                    self._dump_streaming_runs(final_result, f)
             return output_path
         except Exception as e:
             logger.error(f"Erro ao salvar resultados em JSON: {e}")
             raise
+
+    @staticmethod
+    def _dump_streaming_runs(final_result: Dict[str, Any], f) -> None:
+        """
+        Grava o mesmo JSON que json.dump(indent=2), mas serializando uma
+        execução por vez em vez da lista inteira.
+        """
+        summary = {k: v for k, v in final_result.items() if k != "runs"}
+        header = json.dumps(summary, indent=2, ensure_ascii=False)
+        f.write(header[:-2] + ",\n" if summary else "{\n")
+        f.write('  "runs": [')
+
+        separator = "\n"
+        for run in final_result["runs"]:
+            f.write(separator)
+            f.write(
+                textwrap.indent(json.dumps(run, indent=2, ensure_ascii=False), "    ")
+            )
+            separator = ",\n"
+        f.write("\n  ]\n}" if separator != "\n" else "]\n}")
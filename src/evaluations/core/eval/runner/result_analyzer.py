@@ -1,15 +1,122 @@
 # -*- coding: utf-8 -*-
-import statistics
-from collections import defaultdict, Counter
-from typing import List, Dict, Any, TypedDict
+"""
+Análise agregada dos resultados de um experimento.
 
+Os runs são percorridos uma única vez e achatados em colunas (uma linha por
+avaliação: métrica, duração, tipo do resultado e score), e as estatísticas
+por métrica são calculadas com NumPy sobre essas colunas. Com os dados em
+colunas, percentis e intervalos de confiança saem praticamente de graça:
 
-class MetricStats(TypedDict):
-    """Estrutura para armazenar estatísticas de métricas."""
+- `score_statistics` e `duration_statistics_seconds` ganham `percentiles`
+  (p25, p75, p90, p95, p99) e `mean_ci95`, o intervalo de 95% da média pela
+  aproximação normal;
+- cada métrica ganha `success_rate_ci95_percentage`, o intervalo de Wilson
+  de 95% da taxa de sucesso.
 
-    scores: List[float]
-    times: List[float]
-    errors: int
+Os demais campos são os mesmos da análise anterior, com os mesmos
+arredondamentos.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+ANALYSIS_KEYS = ("one_turn_analysis", "multi_turn_analysis")
+
+PERCENTILES = (25, 75, 90, 95, 99)
+
+# Quantil da normal para intervalos de 95%
+Z_95 = 1.959963984540054
+
+# Tipo do resultado de cada avaliação
+SCORED, FAILED, UNSCORED = 0, 1, 2
+
+
+class ResultColumns(NamedTuple):
+    """Resultados achatados em colunas, uma linha por avaliação."""
+
+    metric_names: pd.Categorical
+    durations: np.ndarray
+    kinds: np.ndarray
+    scores: np.ndarray
+    has_error: np.ndarray
+    run_positions: np.ndarray
+    run_ids: List[Any]
+    run_failed: np.ndarray
+    run_durations: np.ndarray
+
+
+def _to_columns(runs: Iterable[Dict[str, Any]]) -> ResultColumns:
+    """Achata os runs em colunas numa única passada."""
+    metric_names: List[str] = []
+    durations: List[float] = []
+    kinds: List[int] = []
+    scores: List[float] = []
+    has_error: List[bool] = []
+    run_positions: List[int] = []
+    run_ids: List[Any] = []
+    run_failed: List[bool] = []
+    run_durations: List[float] = []
+
+    for position, run in enumerate(runs):
+        run_ids.append(run.get("task_data", {}).get("id", "unknown"))
+        if "error" in run:
+            run_failed.append(True)
+            continue
+        run_failed.append(False)
+        run_durations.append(run.get("duration_seconds", 0))
+
+        for analysis_key in ANALYSIS_KEYS:
+            analysis = run.get(analysis_key)
+            if not analysis or "evaluations" not in analysis:
+                continue
+            for evaluation in analysis["evaluations"]:
+                error = bool(evaluation.get("has_error"))
+                score = evaluation.get("score")
+                metric_names.append(evaluation.get("metric_name", "unknown"))
+                durations.append(evaluation.get("duration_seconds", 0.0))
+                has_error.append(error)
+                run_positions.append(position)
+                if error or score is None:
+                    kinds.append(FAILED)
+                    scores.append(math.nan)
+                elif isinstance(score, (int, float)):
+                    kinds.append(SCORED)
+                    scores.append(float(score))
+                else:
+                    # Score não numérico: só entra nos tempos da métrica
+                    kinds.append(UNSCORED)
+                    scores.append(math.nan)
+
+    return ResultColumns(
+        metric_names=pd.Categorical(metric_names),
+        durations=np.asarray(durations, dtype=float),
+        kinds=np.asarray(kinds, dtype=np.int8),
+        scores=np.asarray(scores, dtype=float),
+        has_error=np.asarray(has_error, dtype=bool),
+        run_positions=np.asarray(run_positions, dtype=np.int64),
+        run_ids=run_ids,
+        run_failed=np.asarray(run_failed, dtype=bool),
+        run_durations=np.asarray(run_durations, dtype=float),
+    )
+
+
+def _wilson_interval(successes: int, total: int) -> Dict[str, float]:
+    """Intervalo de Wilson de 95% de uma proporção, em porcentagem."""
+    proportion = successes / total
+    denominator = 1 + Z_95**2 / total
+    center = (proportion + Z_95**2 / (2 * total)) / denominator
+    margin = (
+        Z_95
+        * math.sqrt(proportion * (1 - proportion) / total + Z_95**2 / (4 * total**2))
+        / denominator
+    )
+    return {
+        "lower": round(max(0.0, center - margin) * 100, 2),
+        "upper": round(min(1.0, center + margin) * 100, 2),
+    }
 
 
 class ResultAnalyzer:
@@ -19,22 +126,24 @@ class ResultAnalyzer:
     """
 
     def analyze(
-        self, runs: List[Dict[str, Any]], total_duration: float
+        self, runs: Iterable[Dict[str, Any]], total_duration: float
     ) -> Dict[str, Any]:
         """
         Gera o relatório de análise completo.
 
         Args:
-            runs: Lista de resultados de cada tarefa.
+            runs: Resultados de cada tarefa. Qualquer iterável serve (ex.:
+                RunJournal); os runs são percorridos uma única vez.
             total_duration: Duração total do experimento.
 
         Returns:
             Um dicionário contendo os sumários de métricas, erros e execução.
         """
-        aggregate_metrics = self._calculate_metrics_summary(runs)
-        error_summary = self._calculate_error_summary(runs)
+        columns = _to_columns(runs)
+        aggregate_metrics = self._calculate_metrics_summary(columns)
+        error_summary = self._calculate_error_summary(columns)
         execution_summary = self._calculate_execution_summary(
-            runs, total_duration, aggregate_metrics
+            columns, total_duration, aggregate_metrics
         )
 
         return {
@@ -43,63 +152,52 @@ class ResultAnalyzer:
             "aggregate_metrics": aggregate_metrics,
         }
 
-    def _safe_statistics(self, values: List[float]) -> Dict[str, float]:
+    def _safe_statistics(self, values: np.ndarray) -> Optional[Dict[str, Any]]:
         """Calcula estatísticas de forma segura."""
-        if not values:
-            return {}
+        if values.size == 0:
+            return None
 
+        average = float(values.mean())
+        std_dev = float(values.std(ddof=1)) if values.size > 1 else 0.0
         stats = {
-            "average": round(statistics.mean(values), 4),
-            "median": round(statistics.median(values), 4),
-            "min": min(values),
-            "max": max(values),
+            "average": round(average, 4),
+            "median": round(float(np.median(values)), 4),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "std_dev": round(std_dev, 4),
         }
 
-        if len(values) > 1:
-            stats["std_dev"] = round(statistics.stdev(values), 4)
-        else:
-            stats["std_dev"] = 0.0
-
+        cuts = np.percentile(values, PERCENTILES)
+        stats["percentiles"] = {
+            f"p{percentile}": round(float(cut), 4)
+            for percentile, cut in zip(PERCENTILES, cuts)
+        }
+        margin = Z_95 * std_dev / math.sqrt(values.size)
+        stats["mean_ci95"] = {
+            "lower": round(average - margin, 4),
+            "upper": round(average + margin, 4),
+        }
         return stats
 
     def _calculate_metrics_summary(
-        self, runs: List[Dict[str, Any]]
+        self, columns: ResultColumns
     ) -> List[Dict[str, Any]]:
         """Calcula resumo das métricas com melhor tratamento de erros."""
-        stats_by_metric: defaultdict[str, MetricStats] = defaultdict(
-            lambda: {"scores": [], "times": [], "errors": 0}
+        metric_codes = columns.metric_names.codes
+        # Ordena por métrica uma vez; cada métrica vira uma fatia contígua
+        order = np.argsort(metric_codes, kind="stable")
+        boundaries = np.searchsorted(
+            metric_codes[order], np.arange(len(columns.metric_names.categories) + 1)
         )
 
-        for run in runs:
-            if "error" in run:
-                continue
-
-            all_evaluations = []
-            for analysis_key in ["one_turn_analysis", "multi_turn_analysis"]:
-                analysis = run.get(analysis_key)
-                if analysis and "evaluations" in analysis:
-                    all_evaluations.extend(analysis["evaluations"])
-
-            for evaluation in all_evaluations:
-                metric_name = evaluation.get("metric_name", "unknown")
-                stats = stats_by_metric[metric_name]
-                stats["times"].append(evaluation.get("duration_seconds", 0.0))
-
-                if evaluation.get("has_error") or evaluation.get("score") is None:
-                    stats["errors"] += 1
-                else:
-                    score = evaluation.get("score")
-                    if isinstance(score, (int, float)):
-                        stats["scores"].append(float(score))
-
         metrics_summary = []
-        for metric_name, stats in stats_by_metric.items():
-            scores, times, error_count = (
-                stats["scores"],
-                stats["times"],
-                stats["errors"],
-            )
-            successful_runs = len(scores)
+        for code, metric_name in enumerate(columns.metric_names.categories):
+            rows = order[boundaries[code] : boundaries[code + 1]]
+            kinds = columns.kinds[rows]
+            scores = columns.scores[rows][kinds == SCORED]
+            times = columns.durations[rows]
+            successful_runs = int(scores.size)
+            error_count = int(np.count_nonzero(kinds == FAILED))
             total_runs = successful_runs + error_count
 
             if total_runs == 0:
@@ -107,8 +205,8 @@ class ResultAnalyzer:
 
             score_distribution = []
             if successful_runs > 0:
-                score_counts = Counter(scores)
-                for score_value, count in sorted(score_counts.items()):
+                values, counts = np.unique(scores, return_counts=True)
+                for score_value, count in zip(values.tolist(), counts.tolist()):
                     score_distribution.append(
                         {
                             "value": score_value,
@@ -124,39 +222,33 @@ class ResultAnalyzer:
                 "success_rate_percentage": round(
                     (successful_runs / total_runs) * 100, 2
                 ),
+                "success_rate_ci95_percentage": _wilson_interval(
+                    successful_runs, total_runs
+                ),
                 "failed_runs": error_count,
                 "failure_rate_percentage": round((error_count / total_runs) * 100, 2),
-                "score_statistics": self._safe_statistics(scores) if scores else None,
-                "duration_statistics_seconds": (
-                    self._safe_statistics(times) if times else None
-                ),
+                "score_statistics": self._safe_statistics(scores),
+                "duration_statistics_seconds": self._safe_statistics(times),
                 "score_distribution": score_distribution,
             }
             metrics_summary.append(summary)
 
         return sorted(metrics_summary, key=lambda x: x["metric_name"])
 
-    def _calculate_error_summary(self, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_error_summary(self, columns: ResultColumns) -> Dict[str, Any]:
         """Calcula resumo de erros de forma mais eficiente."""
-        error_breakdown = defaultdict(int)
-        failed_run_ids = set()
-
-        for run in runs:
-            run_id = run.get("task_data", {}).get("id", "unknown")
-            if "error" in run:
-                failed_run_ids.add(run_id)
-                continue
+        error_metrics = pd.Series(columns.metric_names[columns.has_error])
+        error_breakdown = {
+            metric_name: int(count)
+            for metric_name, count in error_metrics.value_counts().items()
+            if count
+        }
 
-            has_evaluation_error = False
-            for analysis_key in ["one_turn_analysis", "multi_turn_analysis"]:
-                analysis = run.get(analysis_key)
-                if analysis and "evaluations" in analysis:
-                    for evaluation in analysis["evaluations"]:
-                        if evaluation.get("has_error"):
-                            has_evaluation_error = True
-                            error_breakdown[evaluation.get("metric_name", "unknown")] += 1
-            if has_evaluation_error:
-                failed_run_ids.add(run_id)
+        failed_positions = np.union1d(
+            np.flatnonzero(columns.run_failed),
+            columns.run_positions[columns.has_error],
+        )
+        failed_run_ids = {columns.run_ids[position] for position in failed_positions}
 
         return {
             "total_failed_runs": len(failed_run_ids),
@@ -166,18 +258,14 @@ class ResultAnalyzer:
 
     def _calculate_execution_summary(
         self,
-        runs: List[Dict[str, Any]],
+        columns: ResultColumns,
         total_duration: float,
         aggregate_metrics: List[Dict[str, Any]],
     ) -> Dict[str, float]:
         """Calcula resumo da execução."""
-        task_durations = [
-            r.get("duration_seconds", 0) for r in runs if "error" not in r
-        ]
+        task_durations = columns.run_durations
         avg_task_duration = (
-            round(sum(task_durations) / len(task_durations), 2)
-            if task_durations
-            else 0.0
+            round(float(task_durations.mean()), 2) if task_durations.size else 0.0
         )
 
         metric_durations = [
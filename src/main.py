@@ -1,4 +1,5 @@
 import time
+from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,6 +14,9 @@ from src.admin import router as admin_router
 from src.core.middlewares.logging import LoggingMiddleware
 from src.core.middlewares.static_cache import NoCacheStaticFilesMiddleware
 from src.db import Base, engine
+from src.services.agent_engine.history import history_service_manager
+from src.services.eai_gateway.http_client import gateway_http_client_manager
+from src.services.lang_graph.service import chatbot_service
 from src.config import env
 import logging
 
@@ -67,6 +71,17 @@ logger.configure(
 )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await history_service_manager.startup()
+    await gateway_http_client_manager.startup()
+    yield
+    await gateway_http_client_manager.shutdown()
+    # Antes do histórico: o checkpointer do grafo usa o pool dele
+    await chatbot_service.aclose()
+    await history_service_manager.shutdown()
+
+
 app = FastAPI(
     title="Agentic Search API",
     description="API que gerencia os fluxos e ferramentas dos agentes de IA da Prefeitura do Rio de Janeiro",
@@ -83,6 +98,7 @@ app = FastAPI(
     ],
     docs_url=None,
     redoc_url=None,
+    lifespan=lifespan,
 )
 
 app.add_middleware(LoggingMiddleware)
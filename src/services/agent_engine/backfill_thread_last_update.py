@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Popula a tabela thread_last_update com a última atividade de cada thread já
+gravada em checkpoints. Deve ser executado uma vez após a migração 3c1f8a2d9e47;
+depois disso os triggers mantêm a tabela atualizada.
+
+Uso:
+    python -m src.services.agent_engine.backfill_thread_last_update --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.services.agent_engine.history import GoogleAgentEngineHistory
+from src.utils.log import logger
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill de thread_last_update")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    history = await GoogleAgentEngineHistory.create()
+    try:
+        total = await history.backfill_thread_last_update(batch_size=args.batch_size)
+    finally:
+        await history.close()
+
+    logger.info(
+        f"Backfill concluído: {total} threads em {time.time() - start_time:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
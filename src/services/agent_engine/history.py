@@ -1,21 +1,69 @@
-from typing import List, Dict, Optional
+from typing import Any, AsyncIterator, List, Dict, Optional, Set, Tuple
 import asyncio
+from datetime import datetime, timezone
 
 from src.utils.log import logger
 from src.config import env
-from src.services.agent_engine.message_formatter import to_gateway_format
+from src.services.agent_engine.message_formatter import (
+    to_gateway_format,
+    whatsapp_conversion_cache,
+)
 
-from langchain_google_cloud_sql_pg import PostgresSaver, PostgresEngine, PostgresLoader
+from langchain_google_cloud_sql_pg import PostgresSaver, PostgresEngine
 from langchain_core.runnables import RunnableConfig
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool, QueuePool
+
+
+def _or_default(value: Optional[int], default: int) -> int:
+    """O valor informado, ou o padrão quando é None (0 é um valor válido)"""
+    return default if value is None else value
+
+
+def _pool_status(pool: Pool) -> Dict[str, Any]:
+    """Estado do pool pela API pública do SQLAlchemy"""
+    if not isinstance(pool, QueuePool):
+        return {"status": pool.status()}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
 
 
 class GoogleAgentEngineHistory:
     def __init__(self, checkpointer: PostgresSaver):
         self._checkpointer = checkpointer
 
+    @property
+    def engine(self) -> PostgresEngine:
+        """PostgresEngine (e pool de conexões) usado pelo checkpointer"""
+        return self._checkpointer._engine
+
+    @property
+    def sql_engine(self) -> AsyncEngine:
+        """
+        AsyncEngine do SQLAlchemy por trás do PostgresEngine. O
+        langchain_google_cloud_sql_pg não expõe um acessor público, então o
+        atributo privado é lido só aqui.
+        """
+        return self.engine._pool
+
     @classmethod
-    async def create(cls) -> "GoogleAgentEngineHistory":
-        """Factory method para criar uma instância com checkpointer inicializado"""
+    async def create(
+        cls,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_timeout: Optional[int] = None,
+        pool_recycle: Optional[int] = None,
+    ) -> "GoogleAgentEngineHistory":
+        """
+        Factory method para criar uma instância com checkpointer inicializado.
+
+        Os parâmetros do pool usam os valores de `env.HISTORY_PG_*` quando não
+        informados.
+        """
         url = env.PG_URI
         if url.startswith("postgres://"):
             url = url.replace("postgres://", "postgresql+asyncpg://", 1)
@@ -29,7 +77,10 @@ class GoogleAgentEngineHistory:
         engine = PostgresEngine.from_engine_args(
             url=url,
             pool_pre_ping=True,
-            pool_recycle=300,
+            pool_size=_or_default(pool_size, env.HISTORY_PG_POOL_SIZE),
+            max_overflow=_or_default(max_overflow, env.HISTORY_PG_MAX_OVERFLOW),
+            pool_timeout=_or_default(pool_timeout, env.HISTORY_PG_POOL_TIMEOUT),
+            pool_recycle=_or_default(pool_recycle, env.HISTORY_PG_POOL_RECYCLE),
             connect_args=connect_args,
         )
         checkpointer = await PostgresSaver.create(engine=engine)
@@ -39,6 +90,41 @@ class GoogleAgentEngineHistory:
     async def get_checkpointer(self) -> PostgresSaver:
         return self._checkpointer
 
+    async def health_check(self) -> Dict[str, Any]:
+        """
+        Executa um `SELECT 1` no pool compartilhado e retorna o estado do pool e
+        os contadores do cache de conversão para WhatsApp
+        """
+        from sqlalchemy import text
+
+        engine = self.engine
+        sql_engine = self.sql_engine
+
+        async def ping():
+            async with sql_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        pool_status = _pool_status(sql_engine.pool)
+        cache_status = (
+            whatsapp_conversion_cache.stats() if whatsapp_conversion_cache else None
+        )
+        try:
+            await engine._run_as_async(ping())
+            return {"status": "ok", "pool": pool_status, "whatsapp_cache": cache_status}
+        except Exception as e:
+            logger.error(f"Health check do histórico falhou: {e}")
+            return {
+                "status": "error",
+                "error": str(e),
+                "pool": pool_status,
+                "whatsapp_cache": cache_status,
+            }
+
+    async def close(self) -> None:
+        """Libera as conexões do pool"""
+        await self._checkpointer._engine.close()
+        logger.info("Pool de conexões do histórico fechado")
+
     async def _get_single_user_history(
         self,
         user_id: str,
@@ -64,33 +150,83 @@ class GoogleAgentEngineHistory:
 
         return user_id, letta_payload.get("data", {}).get("messages", [])
 
-    async def get_history_bulk(
+    async def iter_history_bulk(
         self,
         user_ids: List[str],
         session_timeout_seconds: Optional[int] = 3600,
         use_whatsapp_format: bool = True,
-    ) -> Dict[str, list]:
-        """Método otimizado com async concorrente para buscar histórico de múltiplos usuários"""
-        tasks = [
-            self._get_single_user_history(
-                user_id=user_id,
-                session_timeout_seconds=session_timeout_seconds,
-                use_whatsapp_format=use_whatsapp_format,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, list]]:
+        """
+        Busca o histórico de múltiplos usuários com no máximo `concurrency`
+        threads em andamento, entregando cada conversa assim que fica pronta.
+        `concurrency` é limitado a HISTORY_BULK_CONCURRENCY, que também é o
+        padrão.
+
+        A ordem de entrega é a ordem de conclusão, não a de `user_ids`. Threads
+        com erro são registradas no log e ignoradas.
+        """
+        window = env.HISTORY_BULK_CONCURRENCY
+        if concurrency is not None:
+            window = min(max(1, concurrency), window)
+        pending_ids = iter(dict.fromkeys(user_ids))
+        in_flight: Set[asyncio.Task] = set()
+
+        def schedule_next() -> bool:
+            user_id = next(pending_ids, None)
+            if user_id is None:
+                return False
+            in_flight.add(
+                asyncio.create_task(
+                    self._get_single_user_history(
+                        user_id=user_id,
+                        session_timeout_seconds=session_timeout_seconds,
+                        use_whatsapp_format=use_whatsapp_format,
+                    )
+                )
             )
-            for user_id in user_ids
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            return True
 
-        result = {}
-        for item in results:
-            if isinstance(item, Exception):
-                logger.error(f"Erro ao processar histórico: {item}")
-                continue
-            if isinstance(item, tuple) and len(item) == 2:
-                user_id, messages = item
-                result[user_id] = messages
+        try:
+            while len(in_flight) < window and schedule_next():
+                pass
 
-        return result
+            while in_flight:
+                done, _ = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    in_flight.discard(task)
+                    schedule_next()
+                    error = task.exception()
+                    if error is not None:
+                        logger.error(f"Erro ao processar histórico: {error}")
+                        continue
+                    yield task.result()
+        finally:
+            # Consumidor interrompeu a iteração (ex.: cliente desconectou)
+            for task in in_flight:
+                task.cancel()
+
+    async def get_history_bulk(
+        self,
+        user_ids: List[str],
+        session_timeout_seconds: Optional[int] = 3600,
+        use_whatsapp_format: bool = True,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, list]:
+        """Busca o histórico de múltiplos usuários com concorrência limitada"""
+        fetched = {}
+        async for user_id, messages in self.iter_history_bulk(
+            user_ids=user_ids,
+            session_timeout_seconds=session_timeout_seconds,
+            use_whatsapp_format=use_whatsapp_format,
+            concurrency=concurrency,
+        ):
+            fetched[user_id] = messages
+
+        # Mantém a ordem dos user_ids da requisição
+        return {user_id: fetched[user_id] for user_id in user_ids if user_id in fetched}
 
     async def _delete_user_history(self, user_id: str, table_id: str = "checkpoints"):
         """Deleta o histórico de um usuário específico"""
@@ -156,58 +292,55 @@ class GoogleAgentEngineHistory:
             },
         }
 
-    async def get_history_bulk_from_last_update(self, last_update: str = "2025-07-25"):
-        """
-        CREATE VIEW "public"."thread_ids" AS (
-                    WITH tb AS (
-                    SELECT
-                        thread_id,
-                        encode(checkpoint, 'hex') as checkpoint_hex
-                    FROM "public"."checkpoints"
-                    ),
-                    extracted_hex AS (
-                    SELECT
-                        thread_id,
-                        (regexp_matches(
-                        checkpoint_hex,
-                        '((3[0-9]){4}2d(3[0-9]){2}2d(3[0-9]){2}54(3[0-9]){2}3a(3[0-9]){2}3a(3[0-9]){2}2e(3[0-9])+(2b|2d)(3[0-9]){2}3a(3[0-9]){2})'
-                        ))[1] AS timestamp_hex
-                    FROM tb
-                    ),
-                    final_tb AS (
-                    SELECT DISTINCT
-                    thread_id,
-                    (convert_from(decode(timestamp_hex, 'hex'), 'UTF8'))::timestamptz AS checkpoint_ts
-                    FROM extracted_hex
-                    WHERE timestamp_hex IS NOT NULL
-                    )
+    async def _fetch_all(self, query: str, params: Dict[str, Any]) -> list:
+        """Executa uma query parametrizada no pool compartilhado e retorna as linhas"""
+        from sqlalchemy import text
+
+        async def execute_query():
+            async with self.sql_engine.connect() as conn:
+                result = await conn.execute(text(query), params)
+                rows = result.fetchall() if result.returns_rows else []
+                await conn.commit()
+            return rows
+
+        return await self._checkpointer._engine._run_as_async(execute_query())
 
-                    SELECT DISTINCT ON (thread_id)
-                    thread_id,
-                    checkpoint_ts
-                    FROM final_tb
-                    ORDER BY thread_id, checkpoint_ts DESC
-        );
+    async def get_thread_ids_from_last_update(
+        self, last_update: str
+    ) -> List[Dict[str, str]]:
         """
+        Lista as threads com atividade a partir de `last_update`.
 
-        query = f"""
-            SELECT 
-                thread_id,
-                checkpoint_ts::text
-            FROM "public"."thread_ids_2"
+        Usa a tabela `thread_last_update`, mantida por triggers em `checkpoints`
+        (ver migração 3c1f8a2d9e47), com busca por intervalo no índice de
+        `last_update` em vez de varrer os blobs de checkpoint.
         """
+        since = datetime.fromisoformat(last_update)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
 
-        engine = self._checkpointer._engine
-        loader = await PostgresLoader.create(engine=engine, query=query)
-        docs = await loader.aload()
-        logger.info(docs)
-        user_ids_infos = [
+        rows = await self._fetch_all(
+            """
+            SELECT thread_id, last_update
+            FROM "public"."thread_last_update"
+            WHERE last_update >= :since
+            ORDER BY last_update
+            """,
+            {"since": since},
+        )
+        return [
             {
-                "user_id": doc.page_content,
-                "last_update": doc.metadata["checkpoint_ts"][:19].replace(" ", "T"),
+                "user_id": row.thread_id,
+                "last_update": row.last_update.astimezone(timezone.utc).strftime(
+                    "%Y-%m-%dT%H:%M:%S"
+                ),
             }
-            for doc in docs
+            for row in rows
         ]
+
+    async def get_history_bulk_from_last_update(self, last_update: str = "2025-07-25"):
+        """Busca o histórico de todas as threads atualizadas a partir de `last_update`"""
+        user_ids_infos = await self.get_thread_ids_from_last_update(last_update)
         logger.info(f"Loaded {len(user_ids_infos)} users")
         user_ids = [info["user_id"] for info in user_ids_infos]
         history_to_save = await self.get_history_bulk(
@@ -215,3 +348,97 @@ class GoogleAgentEngineHistory:
         )
 
         return history_to_save
+
+    async def backfill_thread_last_update(self, batch_size: int = 1000) -> int:
+        """
+        Popula `thread_last_update` a partir dos checkpoints já existentes.
+
+        Percorre as threads em lotes pela chave primária de `checkpoints`, então
+        pode ser interrompido e executado de novo sem efeitos colaterais.
+
+        Returns:
+            Número de threads processadas
+        """
+        after = ""
+        total = 0
+        while True:
+            rows = await self._fetch_all(
+                """
+                SELECT DISTINCT thread_id
+                FROM "public"."checkpoints"
+                WHERE thread_id > :after
+                ORDER BY thread_id
+                LIMIT :batch_size
+                """,
+                {"after": after, "batch_size": batch_size},
+            )
+            thread_ids = [row.thread_id for row in rows]
+            if not thread_ids:
+                break
+
+            await self._fetch_all(
+                """
+                INSERT INTO "public"."thread_last_update" (thread_id, last_update)
+                SELECT thread_id, max(public.checkpoint_ts_from_blob(checkpoint))
+                FROM "public"."checkpoints"
+                WHERE thread_id = ANY(:thread_ids)
+                GROUP BY thread_id
+                HAVING max(public.checkpoint_ts_from_blob(checkpoint)) IS NOT NULL
+                ON CONFLICT (thread_id) DO UPDATE
+                SET last_update = GREATEST(
+                    thread_last_update.last_update, EXCLUDED.last_update
+                )
+                """,
+                {"thread_ids": thread_ids},
+            )
+            total += len(thread_ids)
+            after = thread_ids[-1]
+            logger.info(f"Backfill thread_last_update: {total} threads processadas")
+
+        return total
+
+
+class HistoryServiceManager:
+    """
+    Mantém uma única instância de GoogleAgentEngineHistory por processo.
+
+    A instância (e o seu pool de conexões) é criada no startup da aplicação,
+    ou de forma preguiçosa na primeira requisição, e fechada no shutdown.
+    """
+
+    def __init__(self):
+        self._service: Optional[GoogleAgentEngineHistory] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> GoogleAgentEngineHistory:
+        """Retorna o serviço compartilhado, criando-o se necessário"""
+        if self._service is not None:
+            return self._service
+
+        async with self._lock:
+            if self._service is None:
+                self._service = await GoogleAgentEngineHistory.create()
+        return self._service
+
+    async def startup(self) -> None:
+        """Aquece o pool no startup; falhas são adiadas para a primeira requisição"""
+        try:
+            await self.get()
+        except Exception as e:
+            logger.error(f"Não foi possível inicializar o serviço de histórico: {e}")
+
+    async def shutdown(self) -> None:
+        """Fecha o pool compartilhado"""
+        async with self._lock:
+            if self._service is not None:
+                await self._service.close()
+                self._service = None
+
+
+# Instância global única
+history_service_manager = HistoryServiceManager()
+
+
+async def get_history_service() -> GoogleAgentEngineHistory:
+    """Dependência FastAPI que injeta o serviço de histórico compartilhado"""
+    return await history_service_manager.get()
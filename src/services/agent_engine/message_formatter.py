@@ -1,11 +1,183 @@
 from typing import List, Optional, Union, Dict, Any
+from collections import OrderedDict
 from datetime import datetime, timezone
+import sys
+import threading
 import uuid
 import json
 import hashlib
+from src.config import env
 from src.utils.md_to_wpp import markdown_to_whatsapp
 from langchain_core.messages import BaseMessage
-from langchain_core.load.dump import dumpd
+from langchain_core.load.dump import dumpd, dumps
+
+
+class WhatsappConversionCache:
+    """
+    Cache LRU das conversões markdown_to_whatsapp, endereçado pelo hash do conteúdo.
+
+    Mensagens de IA já gravadas no checkpoint não mudam, então releituras do
+    histórico das mesmas threads convertem sempre os mesmos textos. O limite é
+    em bytes (tamanho aproximado das chaves e strings armazenadas); ao excedê-lo
+    as entradas usadas há mais tempo são descartadas primeiro.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(content: str) -> bytes:
+        return hashlib.blake2b(
+            content.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    @staticmethod
+    def _entry_size(key: bytes, value: str) -> int:
+        return len(key) + sys.getsizeof(value)
+
+    def convert(self, content: str) -> str:
+        """Retorna a conversão em cache ou converte e armazena o resultado"""
+        key = self._key(content)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        converted = markdown_to_whatsapp(content)
+        self._store(key, converted)
+        return converted
+
+    def _store(self, key: bytes, value: str) -> None:
+        entry_size = self._entry_size(key, value)
+        if entry_size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = value
+            self.size_bytes += entry_size
+            while self.size_bytes > self.max_bytes:
+                old_key, old_value = self._entries.popitem(last=False)
+                self.size_bytes -= self._entry_size(old_key, old_value)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso do cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Cache compartilhado pelas leituras de histórico; None quando desativado
+whatsapp_conversion_cache: Optional[WhatsappConversionCache] = (
+    WhatsappConversionCache(env.HISTORY_WHATSAPP_CACHE_MAX_BYTES)
+    if env.HISTORY_WHATSAPP_CACHE_MAX_BYTES > 0
+    else None
+)
+
+
+def _plain(value: Any) -> Any:
+    """
+    Cópia com os mesmos tipos que o round-trip JSON do `dumpd` produziria.
+
+    Tipos nativos de JSON são copiados diretamente; qualquer outra coisa passa
+    pelo mesmo `dumps`/`loads` do langchain para manter a saída idêntica.
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: _plain(item) for key, item in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return json.loads(dumps(value))
+
+
+def message_kwargs(message: BaseMessage) -> Dict[str, Any]:
+    """
+    Extrai de um BaseMessage apenas os campos usados pelo formatador.
+
+    Equivale a `dumpd(message)["kwargs"]` para esses campos, sem serializar a
+    mensagem inteira para JSON e de volta.
+    """
+    msg_type = message.type
+    kwargs = {
+        "type": msg_type,
+        "id": message.id or "",
+        "content": _plain(message.content),
+        "additional_kwargs": message.additional_kwargs,
+        "response_metadata": message.response_metadata,
+        "name": message.name,
+    }
+    if msg_type == "ai":
+        kwargs["tool_calls"] = _plain(message.tool_calls)
+    elif msg_type == "tool":
+        kwargs["tool_call_id"] = message.tool_call_id
+        kwargs["status"] = message.status
+    return kwargs
+
+
+class UsageTotals:
+    """Acumulador de tokens e modelos usados, alimentado mensagem a mensagem."""
+
+    __slots__ = (
+        "input_tokens",
+        "output_tokens",
+        "total_tokens",
+        "thoughts_tokens",
+        "model_names",
+    )
+
+    def __init__(self):
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.total_tokens = 0
+        self.thoughts_tokens = 0
+        self.model_names = set()
+
+    def add(self, response_metadata: Dict[str, Any]) -> None:
+        usage_md = response_metadata.get("usage_metadata", {})
+
+        # Mapear campos corretos do Google AI
+        prompt_tokens = int(usage_md.get("prompt_token_count", 0) or 0)
+        candidates_tokens = int(usage_md.get("candidates_token_count", 0) or 0)
+        thoughts_tokens = int(usage_md.get("thoughts_token_count", 0) or 0)
+        self.input_tokens += prompt_tokens
+        self.output_tokens += candidates_tokens
+        self.thoughts_tokens += thoughts_tokens
+
+        # total (geralmente a soma, mas usamos o valor retornado se existir)
+        msg_total = int(usage_md.get("total_token_count", 0) or 0)
+        if msg_total == 0:
+            msg_total = prompt_tokens + candidates_tokens + thoughts_tokens
+        self.total_tokens += msg_total
+
+        # Coletar model_names
+        model_name = response_metadata.get("model_name")
+        if model_name:
+            self.model_names.add(model_name)
 
 
 class LangGraphMessageFormatter:
@@ -19,10 +191,16 @@ class LangGraphMessageFormatter:
     - Serialização automática de objetos BaseMessage
     - Suporte opcional para formato WhatsApp
     - Estatísticas de uso agregadas
+    - Cache opcional das conversões para WhatsApp
     """
 
-    def __init__(self, thread_id: Optional[str] = None):
+    def __init__(
+        self,
+        thread_id: Optional[str] = None,
+        whatsapp_cache: Optional[WhatsappConversionCache] = None,
+    ):
         self.thread_id = thread_id
+        self.whatsapp_cache = whatsapp_cache
         self.reset_state()
 
     def reset_state(self):
@@ -52,6 +230,12 @@ class LangGraphMessageFormatter:
 
         return raw
 
+    def to_whatsapp(self, content: str) -> str:
+        """Converte o conteúdo para o formato WhatsApp, usando o cache se houver"""
+        if self.whatsapp_cache is not None:
+            return self.whatsapp_cache.convert(content)
+        return markdown_to_whatsapp(content)
+
     def generate_deterministic_session_id(
         self, timestamp_str: str, thread_id: Optional[str] = None
     ) -> str:
@@ -330,7 +514,7 @@ class LangGraphMessageFormatter:
                     **base_dict,
                     "message_type": "assistant_message",
                     "content": (
-                        markdown_to_whatsapp(final_content)
+                        self.to_whatsapp(final_content)
                         if use_whatsapp_format
                         else final_content
                     ),
@@ -420,62 +604,47 @@ class LangGraphMessageFormatter:
         Returns:
             Dict com estatísticas de uso
         """
-        input_tokens = 0
-        output_tokens = 0
-        total_tokens = 0
-        thoughts_tokens = 0
-        model_names = set()
-
+        totals = UsageTotals()
         for msg in messages_to_process:
             kwargs = msg.get("kwargs", {})
-            response_metadata = kwargs.get("response_metadata", {})
-            usage_md = response_metadata.get("usage_metadata", {})
-
-            # Mapear campos corretos do Google AI
-            # input
-            input_tokens += int(usage_md.get("prompt_token_count", 0) or 0)
-
-            # output (candidates)
-            output_tokens += int(usage_md.get("candidates_token_count", 0) or 0)
-
-            # thoughts (se houver)
-            thoughts_tokens += int(usage_md.get("thoughts_token_count", 0) or 0)
-
-            # total (geralmente a soma, mas usamos o valor retornado se existir)
-            msg_total = int(usage_md.get("total_token_count", 0) or 0)
-            if msg_total == 0:
-                msg_total = (
-                    int(usage_md.get("prompt_token_count", 0) or 0)
-                    + int(usage_md.get("candidates_token_count", 0) or 0)
-                    + int(usage_md.get("thoughts_token_count", 0) or 0)
-                )
-            total_tokens += msg_total
+            totals.add(kwargs.get("response_metadata", {}))
+
+        step_count = len(
+            {m.get("step_id") for m in self.processed_messages if m.get("step_id")}
+        )
+        return self.build_usage_statistics(totals, step_count)
 
-            # Coletar model_names
-            model_name = response_metadata.get("model_name")
-            if model_name:
-                model_names.add(model_name)
+    def build_usage_statistics(
+        self, totals: UsageTotals, step_count: int
+    ) -> Dict[str, Any]:
+        """
+        Monta a mensagem usage_statistics a partir dos totais acumulados.
 
+        Args:
+            totals: Tokens e modelos somados sobre todas as mensagens
+            step_count: Número de step_ids distintos nas mensagens geradas
+
+        Returns:
+            Dict com estatísticas de uso
+        """
         # Se thoughts não estiverem incluídos em output_tokens (candidates),
         # podemos querer expor isso ou somar.
         # No Gemini, thoughts são cobrados como output, então faz sentido somar para ter uma noção de "tokens gerados".
-        total_output_tokens = output_tokens + thoughts_tokens
+        total_output_tokens = totals.output_tokens + totals.thoughts_tokens
 
         return {
             "message_type": "usage_statistics",
             "completion_tokens": total_output_tokens,  # Inclui pensamentos para refletir geração total
-            "thoughts_tokens": thoughts_tokens,  # Novo campo para expor o total de tokens de pensamento
-            "prompt_tokens": input_tokens,
-            "total_tokens": total_tokens,
-            "step_count": len(
-                {m.get("step_id") for m in self.processed_messages if m.get("step_id")}
-            ),
+            "thoughts_tokens": totals.thoughts_tokens,  # Novo campo para expor o total de tokens de pensamento
+            "prompt_tokens": totals.input_tokens,
+            "total_tokens": totals.total_tokens,
+            "step_count": step_count,
             "steps_messages": None,
             "run_ids": None,
             "agent_id": self.thread_id,
             "processed_at": datetime.now(timezone.utc).isoformat(),
             "status": "done",
-            "model_names": list(model_names),
+            "model_names": list(totals.model_names),
         }
 
     def format_messages(
@@ -488,6 +657,10 @@ class LangGraphMessageFormatter:
         """
         Converte uma lista de mensagens para o formato Gateway.
 
+        As mensagens são percorridas uma única vez: os campos de BaseMessage são
+        lidos diretamente (sem `dumpd`), cada timestamp é parseado uma só vez e
+        as estatísticas de uso são acumuladas no mesmo laço.
+
         Args:
             messages: Lista de mensagens (BaseMessage ou dict já serializados)
             thread_id: ID do thread/agente (opcional, sobrescreve o da instância)
@@ -504,29 +677,32 @@ class LangGraphMessageFormatter:
         # Resetar estado para nova formatação
         self.reset_state()
         self.processed_messages = []
+        processed_messages = self.processed_messages
+
+        totals = UsageTotals()
+        step_ids = set()
+        last_message_datetime = None
 
-        # Serializar mensagens se necessário
-        messages_to_process = []
         for msg in messages:
             if isinstance(msg, BaseMessage):
-                serialized_msg = self.serialize_message(msg)
-                messages_to_process.append(serialized_msg)
+                kwargs = message_kwargs(msg)
             else:
-                messages_to_process.append(msg)
-
-        # Processar cada mensagem
-        for msg in messages_to_process:
-            kwargs = msg.get("kwargs", {})
+                kwargs = msg.get("kwargs", {})
             msg_type = kwargs.get("type")
 
             # Extrair timestamp
             additional_kwargs = kwargs.get("additional_kwargs", {})
             message_timestamp = additional_kwargs.get("timestamp", None)
 
-            # Calcular tempo entre mensagens
-            time_since_last_message = self.calculate_time_since_last_message(
-                message_timestamp
-            )
+            # Calcular tempo entre mensagens (cada timestamp é parseado uma vez)
+            time_since_last_message = None
+            if message_timestamp:
+                message_datetime = self.parse_timestamp(message_timestamp)
+                if message_datetime and last_message_datetime:
+                    time_since_last_message = (
+                        message_datetime - last_message_datetime
+                    ).total_seconds()
+                last_message_datetime = message_datetime
 
             # Atualizar estado da sessão
             self.update_session_state(
@@ -535,6 +711,7 @@ class LangGraphMessageFormatter:
 
             # Extrair metadados
             metadata = self.extract_message_metadata(kwargs)
+            totals.add(kwargs.get("response_metadata", {}))
 
             # Criar base da mensagem
             base_dict = self.create_base_message_dict(
@@ -542,28 +719,28 @@ class LangGraphMessageFormatter:
             )
 
             # Processar baseado no tipo
+            produced = len(processed_messages)
             if msg_type == "human":
-                processed_msg = self.process_human_message(kwargs, base_dict)
-                self.processed_messages.append(processed_msg)
+                processed_messages.append(self.process_human_message(kwargs, base_dict))
 
             elif msg_type == "ai":
-                processed_msgs = self.process_ai_message(
-                    kwargs, base_dict, use_whatsapp_format
+                processed_messages.extend(
+                    self.process_ai_message(kwargs, base_dict, use_whatsapp_format)
                 )
-                self.processed_messages.extend(processed_msgs)
 
             elif msg_type == "tool":
-                processed_msg = self.process_tool_message(kwargs, base_dict)
-                self.processed_messages.append(processed_msg)
+                processed_messages.append(self.process_tool_message(kwargs, base_dict))
+
+            if len(processed_messages) > produced:
+                step_ids.add(base_dict["step_id"])
 
-        # Calcular estatísticas de uso
-        usage_stats = self.calculate_usage_statistics(messages_to_process)
-        self.processed_messages.append(usage_stats)
+        # Estatísticas de uso acumuladas no laço acima
+        processed_messages.append(self.build_usage_statistics(totals, len(step_ids)))
 
         return {
             "status": "completed",
             "data": {
-                "messages": self.processed_messages,
+                "messages": processed_messages,
                 # "messages": messages_to_process,
             },
         }
@@ -575,6 +752,7 @@ def to_gateway_format(
     thread_id: Optional[str] = None,
     session_timeout_seconds: Optional[int] = None,
     use_whatsapp_format: bool = True,
+    whatsapp_cache: Optional[WhatsappConversionCache] = whatsapp_conversion_cache,
 ) -> Dict[str, Any]:
     """
     Função de conveniência que mantém a interface anterior.
@@ -584,11 +762,14 @@ def to_gateway_format(
         thread_id: ID do thread/agente (opcional)
         session_timeout_seconds: Tempo limite em segundos para nova sessão
         use_whatsapp_format: Define se deve usar o markdown_to_whatsapp
+        whatsapp_cache: Cache das conversões (padrão: cache compartilhado do módulo)
 
     Returns:
         Dict no formato Gateway com status, data, mensagens e estatísticas de uso
     """
-    formatter = LangGraphMessageFormatter(thread_id=thread_id)
+    formatter = LangGraphMessageFormatter(
+        thread_id=thread_id, whatsapp_cache=whatsapp_cache
+    )
     return formatter.format_messages(
         messages=messages,
         thread_id=thread_id,
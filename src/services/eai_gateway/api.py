@@ -1,79 +1,25 @@
 import httpx
 import asyncio
 import time
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, AsyncIterator
 from src.config import env
 from pydantic import BaseModel, Field
+from src.services.eai_gateway.http_client import build_gateway_http_client
+from src.services.eai_gateway.rate_limiter import (
+    GlobalEAIRateLimiter,
+    get_eai_rate_limiter,
+)
+from src.services.eai_gateway.response_wait import (
+    LONG_POLL_TIMEOUT_MARGIN,
+    RESPONSE_STREAM_PATH,
+    SSE_DRAIN_TIMEOUT,
+    ResponseWaitSettings,
+    iter_sse_events,
+    remember_sse_support,
+    sse_support,
+)
 from src.utils.log import logger
 
-
-# --- Rate Limiter ---
-
-import asyncio
-import time
-from typing import Optional
-
-
-class GlobalEAIRateLimiter:
-    """
-    Rate limiter global compartilhado para controlar requisições por minuto.
-    Implementa token bucket: permite até X requisições por minuto, mesmo simultâneas.
-    """
-
-    _instance: Optional["GlobalEAIRateLimiter"] = None
-    _lock = asyncio.Lock()
-
-    def __new__(cls, requests_per_minute: int = 60):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-
-    def __init__(self, requests_per_minute: int = 60):
-        # Sempre atualiza os parâmetros, mesmo se já foi inicializado
-        self.requests_per_minute = requests_per_minute
-        self.tokens_per_second = requests_per_minute / 60.0  # tokens por segundo
-        if not self._initialized:
-            self.tokens = requests_per_minute  # tokens disponíveis
-            self.last_refill_time = time.time()
-            self._initialized = True
-        else:
-            self.tokens = requests_per_minute
-            self.last_refill_time = time.time()
-
-    def _refill_tokens(self):
-        """Recarrega tokens baseado no tempo decorrido."""
-        current_time = time.time()
-        time_passed = current_time - self.last_refill_time
-        tokens_to_add = time_passed * self.tokens_per_second
-        self.tokens = min(self.requests_per_minute, self.tokens + tokens_to_add)
-
-    async def wait_if_needed(self):
-        """Aguarda se necessário para respeitar o rate limit global."""
-        async with self._lock:
-            self._refill_tokens()
-
-            # logger.debug(
-            #     f"Rate limiter check: tokens disponíveis = {self.tokens:.1f}, "
-            #     f"limite = {self.requests_per_minute} req/min"
-            # )
-
-            if self.tokens < 1:
-                # Calcula quanto tempo esperar para ter pelo menos 1 token
-                wait_time = (1 - self.tokens) / self.tokens_per_second
-                logger.info(
-                    f"Rate limit global de {self.requests_per_minute} requisições por minuto atingido, "
-                    f"aguardando {wait_time:.2f} segundos"
-                )
-                await asyncio.sleep(wait_time)
-                self._refill_tokens()  # Recarrega após esperar
-
-            self.tokens -= 1
-            # logger.debug(
-            #     f"Rate limiter: token consumido, restam {self.tokens:.1f} tokens"
-            # )
-
-
 # Alias para manter compatibilidade
 EAIRateLimiter = GlobalEAIRateLimiter
 
@@ -182,19 +128,24 @@ class EAIClient:
         polling_interval: int = 2,
         rate_limit_requests_per_minute: int = 60,
         reasoning_engine_id: Optional[str] = None,
+        response_wait: Optional[ResponseWaitSettings] = None,
+        base_url: Optional[str] = None,
+        rate_limit_burst: Optional[int] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
-        self.base_url = env.EAI_GATEWAY_API_URL
+        self.base_url = base_url or env.EAI_GATEWAY_API_URL
         self.timeout = timeout
         self.polling_interval = polling_interval
         self.reasoning_engine_id = reasoning_engine_id
-        self.rate_limiter = GlobalEAIRateLimiter(rate_limit_requests_per_minute)
-        headers = (
-            {"Authorization": f"Bearer {env.EAI_GATEWAY_API_TOKEN}"}
-            if env.EAI_GATEWAY_API_TOKEN
-            else {}
+        self.response_wait = response_wait or ResponseWaitSettings.from_env()
+        self.rate_limiter = get_eai_rate_limiter(
+            rate_limit_requests_per_minute, burst=rate_limit_burst
         )
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url, headers=headers, timeout=self.timeout
+        # Um cliente HTTP injetado (ex.: o compartilhado da aplicação) não é
+        # fechado por este EAIClient
+        self._owns_client = http_client is None
+        self._client = http_client or build_gateway_http_client(
+            base_url=self.base_url, timeout=self.timeout
         )
         self.provider = provider
 
@@ -268,12 +219,26 @@ class EAIClient:
                 user_number=request.user_number,
             ) from e
 
-    async def get_message_response(self, message_id: str) -> MessageResponse:
-        """(Low-level) Polls for the response of a sent message."""
+    async def get_message_response(
+        self, message_id: str, wait: Optional[float] = None
+    ) -> MessageResponse:
+        """
+        (Low-level) Polls for the response of a sent message.
+
+        With `wait`, asks the gateway to hold the request (long polling) for up
+        to `wait` seconds until the response is ready.
+        """
         # Polling não precisa de rate limiting pois não conta para quota do Google AI Platform
         try:
             params = {"message_id": message_id}
-            response = await self._client.get("/api/v1/message/response", params=params)
+            timeout = httpx.USE_CLIENT_DEFAULT
+            if wait:
+                params["wait"] = f"{wait:g}"
+                # O gateway pode segurar a consulta por até `wait` segundos
+                timeout = wait + LONG_POLL_TIMEOUT_MARGIN
+            response = await self._client.get(
+                "/api/v1/message/response", params=params, timeout=timeout
+            )
             response.raise_for_status()
 
             # Log the raw response from the API
@@ -304,6 +269,40 @@ class EAIClient:
         """
         # send_req = AgentWebhookRequest(agent_id=agent_id, message=message)
         # send_resp = await self.send_message_to_agent(send_req)
+        message_id = await self._send_user_message(
+            user_number, message, reasoning_engine_id
+        )
+        # logger.info(
+        #     f"Message sent to user number ({self.provider}): {user_number} with message_id: {message_id}"
+        # )
+        return await self.wait_for_response(message_id, user_number=user_number)
+
+    async def send_message_and_stream_response(
+        self,
+        user_number: Optional[str],
+        message: str,
+        reasoning_engine_id: Optional[str] = None,
+    ) -> AsyncIterator[MessageResponse]:
+        """
+        High-level method to send a message and stream its response events.
+
+        Yields a `sent` event with the message_id, then every intermediate
+        event the gateway reports (partial output when it streams over SSE)
+        and finally the `completed` response.
+        """
+        message_id = await self._send_user_message(
+            user_number, message, reasoning_engine_id
+        )
+        yield MessageResponse(status="sent", message_id=message_id)
+        async for event in self.iter_response_events(message_id, user_number):
+            yield event
+
+    async def _send_user_message(
+        self,
+        user_number: Optional[str],
+        message: str,
+        reasoning_engine_id: Optional[str],
+    ) -> str:
         send_req = UserWebhookRequest(
             user_number=user_number,
             message=message,
@@ -311,47 +310,188 @@ class EAIClient:
             reasoning_engine_id=self.reasoning_engine_id or reasoning_engine_id,
         )
         send_resp = await self.message_user_number(send_req)
-        message_id = send_resp.message_id
-        # logger.info(
-        #     f"Message sent to user number ({self.provider}): {user_number} with message_id: {message_id}"
-        # )
-        start_time = time.time()
-        while time.time() - start_time < self.timeout:
-            try:
-                response = await self.get_message_response(message_id)
-                # logger.info(
-                #     f"Pulling message response from ({self.provider}): {user_number} with message_id: {message_id}\nResponse: {response}"
-                # )
-
-                if response.status == "completed":
-                    return response
-                elif response.status == "failed":
-                    raise EAIClientError(
-                        message=f"API Error during polling: {response.status} | error: {response.error} | message: {response.message}",
-                        status_code=200,
-                        user_number=user_number,
-                        message_id=message_id,
-                    )
-            except EAIClientError as e:
-                # Ignore 404 Not Found, as it means the response is not ready yet.
-                if e.status_code != 404:
-                    raise EAIClientError(
-                        message=f"API Error during polling: {e.message}",
-                        status_code=e.status_code,
-                        user_number=user_number,
-                        message_id=message_id,
-                    ) from e
-
-            await asyncio.sleep(self.polling_interval)
-
-        raise EAIClientError(
+        return send_resp.message_id
+
+    async def wait_for_response(
+        self, message_id: str, user_number: Optional[str] = None
+    ) -> MessageResponse:
+        """
+        Waits for the final response of a sent message.
+
+        Uses server-sent events or long polling when the gateway supports them
+        and falls back to polling with adaptive backoff (see response_wait.py).
+        """
+        final = None
+        # Consome até o fim para o stream SSE devolver a conexão ao pool
+        async for event in self.iter_response_events(message_id, user_number):
+            if event.status == "completed":
+                final = event
+        if final is None:
+            raise self._timeout_error(user_number, message_id)
+        return final
+
+    async def iter_response_events(
+        self, message_id: str, user_number: Optional[str] = None
+    ) -> AsyncIterator[MessageResponse]:
+        """
+        Yields the response events of a sent message until the `completed` one.
+
+        Raises EAIClientError when the response fails or the client timeout
+        expires.
+        """
+        deadline = time.monotonic() + self.timeout
+        if self.response_wait.tries_sse and sse_support(self.base_url) is not False:
+            completed = False
+            async for event in self._stream_events(message_id, user_number, deadline):
+                completed = completed or event.status == "completed"
+                yield event
+            if completed:
+                return
+
+        last_status = None
+        delays = self.response_wait.poll_delays(self.polling_interval)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait = (
+                min(self.response_wait.long_poll_seconds, remaining)
+                if self.response_wait.long_poll
+                else None
+            )
+            started = time.monotonic()
+            response = await self._poll_response(message_id, user_number, wait)
+            if response is not None and response.status != last_status:
+                last_status = response.status
+                yield response
+            if last_status == "completed":
+                return
+            # O gateway segurou a consulta: a resposta ainda não existe, então
+            # consulta de novo sem esperar. Uma resposta imediata indica gateway
+            # sem long polling e o cliente segue o backoff.
+            if wait and time.monotonic() - started >= wait / 2:
+                continue
+            await asyncio.sleep(
+                max(0.0, min(next(delays), deadline - time.monotonic()))
+            )
+
+        raise self._timeout_error(user_number, message_id)
+
+    async def _poll_response(
+        self, message_id: str, user_number: Optional[str], wait: Optional[float]
+    ) -> Optional[MessageResponse]:
+        """Uma consulta da resposta; None enquanto ela não está pronta"""
+        try:
+            response = await self.get_message_response(message_id, wait=wait)
+        except EAIClientError as e:
+            # Ignore 404 Not Found, as it means the response is not ready yet.
+            if e.status_code == 404:
+                return None
+            raise EAIClientError(
+                message=f"API Error during polling: {e.message}",
+                status_code=e.status_code,
+                user_number=user_number,
+                message_id=message_id,
+            ) from e
+        self._raise_if_failed(response, user_number, message_id)
+        return response
+
+    async def _stream_events(
+        self, message_id: str, user_number: Optional[str], deadline: float
+    ) -> AsyncIterator[MessageResponse]:
+        """
+        Eventos da resposta pelo endpoint de SSE do gateway. Termina sem o
+        evento `completed` quando o gateway não tem o endpoint, a sondagem
+        falha ou o stream é interrompido, e a espera continua por polling.
+        """
+        try:
+            async with self._client.stream(
+                "GET",
+                RESPONSE_STREAM_PATH,
+                params={"message_id": message_id},
+                headers={"Accept": "text/event-stream"},
+            ) as stream:
+                is_event_stream = stream.headers.get("content-type", "").startswith(
+                    "text/event-stream"
+                )
+                if not (stream.is_success and is_event_stream):
+                    self._sse_unsupported(f"status {stream.status_code}")
+                    return
+                remember_sse_support(self.base_url, True)
+                lines = stream.aiter_lines()
+                events = iter_sse_events(lines)
+                while True:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        event = await asyncio.wait_for(
+                            anext(events), max(remaining, 0.0)
+                        )
+                    except StopAsyncIteration:
+                        return
+                    except asyncio.TimeoutError:
+                        raise self._timeout_error(user_number, message_id)
+                    event["message_id"] = message_id
+                    response = MessageResponse(**event)
+                    self._raise_if_failed(response, user_number, message_id)
+                    yield response
+                    if response.status == "completed":
+                        # Lê o fim do stream para a conexão voltar ao pool
+                        await self._drain(lines)
+                        return
+        except (httpx.HTTPError, ValueError) as e:
+            if sse_support(self.base_url) is None:
+                # A sondagem falhou antes de o stream abrir
+                self._sse_unsupported(str(e))
+                return
+            logger.warning(
+                f"Stream da resposta {message_id} interrompido ({e}), usando polling"
+            )
+
+    def _sse_unsupported(self, reason: str) -> None:
+        """Marca o gateway como sem SSE neste processo e avisa uma única vez"""
+        if sse_support(self.base_url) is None:
+            logger.info(
+                f"EAI Gateway sem suporte a SSE ({reason}), "
+                "usando polling para aguardar as respostas"
+            )
+        remember_sse_support(self.base_url, False)
+
+    @staticmethod
+    async def _drain(lines) -> None:
+        async def consume():
+            async for _ in lines:
+                pass
+
+        try:
+            await asyncio.wait_for(consume(), SSE_DRAIN_TIMEOUT)
+        except (asyncio.TimeoutError, httpx.HTTPError):
+            # Gateway que não encerra o stream: a conexão é descartada
+            pass
+
+    @staticmethod
+    def _raise_if_failed(
+        response: MessageResponse, user_number: Optional[str], message_id: str
+    ) -> None:
+        if response.status == "failed":
+            raise EAIClientError(
+                message=f"API Error during polling: {response.status} | error: {response.error} | message: {response.message}",
+                status_code=200,
+                user_number=user_number,
+                message_id=message_id,
+            )
+
+    def _timeout_error(
+        self, user_number: Optional[str], message_id: str
+    ) -> EAIClientError:
+        return EAIClientError(
             message=f"Timeout waiting for agent response after {self.timeout} seconds.",
             user_number=user_number,
             message_id=message_id,
         )
 
     async def close(self):
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
 
 async def main():
@@ -0,0 +1,75 @@
+"""
+Versão em streaming (SSE) do chat com o EAI Gateway.
+
+O `/eai-gateway/chat` só responde quando a resposta completa do agente está
+pronta. O `/eai-gateway/chat/stream` repassa ao cliente, em server-sent events,
+cada evento da mensagem assim que chega do gateway:
+
+- `status`: mensagem enviada, com o `message_id` (primeiro byte logo após o
+  envio);
+- `message`: eventos intermediários (status e saída parcial, quando o gateway
+  transmite por SSE);
+- `done`: a MessageResponse final (o campo `response` do `/eai-gateway/chat`);
+- `error`: falha ou timeout, com a mensagem do EAIClientError.
+
+Enquanto nada chega, um comentário de keep-alive é enviado a cada
+`keepalive_interval` segundos para proxies não encerrarem a conexão.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from src.services.eai_gateway.api import EAIClient, EAIClientError
+from src.utils.log import logger
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+KEEPALIVE_FRAME = ": keep-alive\n\n"
+
+
+def sse_frame(event: str, data: dict) -> str:
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def chat_event_stream(
+    client: EAIClient,
+    user_number: Optional[str],
+    message: str,
+    reasoning_engine_id: Optional[str] = None,
+    keepalive_interval: float = 15.0,
+) -> AsyncIterator[str]:
+    """Frames SSE de uma mensagem enviada ao gateway, até a resposta final"""
+    events = client.send_message_and_stream_response(
+        user_number=user_number,
+        message=message,
+        reasoning_engine_id=reasoning_engine_id,
+    )
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(events))
+            done, _ = await asyncio.wait({pending}, timeout=keepalive_interval)
+            if not done:
+                yield KEEPALIVE_FRAME
+                continue
+            try:
+                event = pending.result()
+            except StopAsyncIteration:
+                return
+            finally:
+                pending = None
+            name = {"sent": "status", "completed": "done"}.get(event.status, "message")
+            yield sse_frame(name, event.model_dump(exclude_none=True))
+    except EAIClientError as e:
+        logger.warning(f"Erro no chat em streaming: {e}")
+        yield sse_frame("error", {"error": str(e), "status_code": e.status_code})
+    finally:
+        if pending is not None:
+            # Cliente desconectou no meio da espera
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await events.aclose()
+        await client.close()
@@ -0,0 +1,146 @@
+"""
+Cliente HTTP compartilhado das chamadas ao EAI Gateway.
+
+Cada `EAIClient` criava o seu `httpx.AsyncClient`, e o endpoint
+`/eai-gateway/chat` criava um por requisição sem nunca fechá-lo: toda conversa
+pagava o handshake TCP/TLS e as conexões vazavam. A aplicação agora mantém um
+único cliente por processo (criado no startup e fechado no shutdown pelo
+GatewayHTTPClientManager) com limites de conexões e keep-alive configuráveis
+(`EAI_GATEWAY_HTTP_MAX_CONNECTIONS`, `EAI_GATEWAY_HTTP_MAX_KEEPALIVE`,
+`EAI_GATEWAY_HTTP_KEEPALIVE_EXPIRY`) e HTTP/2 opcional (`EAI_GATEWAY_HTTP2`,
+que requer o pacote `h2`). Esse cliente é injetado nos EAIClients das rotas.
+"""
+
+import asyncio
+import importlib.util
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from src.config import env
+from src.utils.log import logger
+
+
+def http2_available() -> bool:
+    """O httpx só fala HTTP/2 com o pacote opcional h2 instalado"""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class GatewayHTTPSettings:
+    """Pool de conexões do cliente HTTP do gateway"""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "GatewayHTTPSettings":
+        return cls(
+            max_connections=env.EAI_GATEWAY_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=env.EAI_GATEWAY_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=env.EAI_GATEWAY_HTTP_KEEPALIVE_EXPIRY,
+            http2=env.EAI_GATEWAY_HTTP2,
+        )
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections or None,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+def build_gateway_http_client(
+    settings: Optional[GatewayHTTPSettings] = None,
+    base_url: Optional[str] = None,
+    timeout: float = 300,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """Cria um AsyncClient para o gateway com o token e o pool configurados"""
+    settings = settings or GatewayHTTPSettings.from_env()
+    http2 = settings.http2
+    if http2 and not http2_available():
+        logger.warning("EAI_GATEWAY_HTTP2 ativo sem o pacote h2, usando HTTP/1.1")
+        http2 = False
+    headers = (
+        {"Authorization": f"Bearer {env.EAI_GATEWAY_API_TOKEN}"}
+        if env.EAI_GATEWAY_API_TOKEN
+        else {}
+    )
+    return httpx.AsyncClient(
+        base_url=base_url or env.EAI_GATEWAY_API_URL,
+        headers=headers,
+        timeout=httpx.Timeout(timeout, connect=settings.connect_timeout),
+        limits=settings.limits,
+        http2=http2,
+        transport=transport,
+    )
+
+
+def pool_stats(client: httpx.AsyncClient) -> dict:
+    """Conexões abertas e ociosas no pool do cliente (httpcore)"""
+    pool = getattr(client._transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    return {
+        "connections": len(connections),
+        "idle": sum(1 for connection in connections if connection.is_idle()),
+        "http2": sum(
+            1
+            for connection in connections
+            if getattr(connection, "_connection", None) is not None
+            and type(connection._connection).__name__ == "AsyncHTTP2Connection"
+        ),
+    }
+
+
+class GatewayHTTPClientManager:
+    """
+    Mantém um único AsyncClient do gateway por processo.
+
+    O cliente é criado no startup da aplicação, ou na primeira requisição, e
+    fechado no shutdown.
+    """
+
+    def __init__(self, settings: Optional[GatewayHTTPSettings] = None):
+        self._settings = settings
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> httpx.AsyncClient:
+        """Retorna o cliente compartilhado, criando-o se necessário"""
+        if self._client is not None:
+            return self._client
+
+        async with self._lock:
+            if self._client is None:
+                self._client = build_gateway_http_client(self._settings)
+        return self._client
+
+    async def startup(self) -> None:
+        await self.get()
+
+    async def shutdown(self) -> None:
+        """Fecha o cliente e as conexões do pool"""
+        async with self._lock:
+            if self._client is not None:
+                await self._client.aclose()
+                self._client = None
+
+    def stats(self) -> dict:
+        if self._client is None:
+            return {"connections": 0, "idle": 0, "http2": 0}
+        return pool_stats(self._client)
+
+
+# Instância global única
+gateway_http_client_manager = GatewayHTTPClientManager()
+
+
+async def get_gateway_http_client() -> httpx.AsyncClient:
+    """Dependência FastAPI que injeta o cliente HTTP compartilhado do gateway"""
+    return await gateway_http_client_manager.get()
@@ -0,0 +1,368 @@
+"""
+Rate limiter das requisições ao EAI Gateway.
+
+O limiter anterior dormia segurando um `asyncio.Lock` de classe: todos os
+chamadores ficavam enfileirados atrás de quem dormia, mesmo depois de os tokens
+voltarem, e cada `EAIClient` novo reiniciava o balde cheio.
+
+O TokenBucketRateLimiter reserva o token sem esperar: o saldo do balde pode
+ficar negativo, e cada chamador calcula, sob um lock que nunca é mantido
+durante uma espera, o instante em que o seu token fica disponível e dorme fora
+do lock. Como as reservas são feitas na ordem de chegada, os chamadores são
+atendidos em FIFO, e a vazão é exatamente `burst` requisições imediatas mais
+`requests_per_minute / 60` por segundo. Um chamador cancelado devolve o token
+reservado.
+
+Esse limite vale por processo: com N workers ou N runners de avaliação a taxa
+real é N vezes a configurada. Com `EAI_GATEWAY_RATE_LIMIT_BACKEND=redis` o
+balde fica no Redis (`EAI_GATEWAY_REDIS_URL`) e a reserva é feita por um
+script Lua atômico, com o mesmo algoritmo e o relógio do servidor Redis, e o
+limite passa a ser compartilhado por todos os processos. Se o Redis falhar, o
+limiter local do processo assume por `REDIS_RETRY_SECONDS`.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Awaitable, Callable, Optional, Union
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.config import env
+from src.utils.log import logger
+
+# Tempo sem tentar o Redis depois de uma falha (o limiter local assume)
+REDIS_RETRY_SECONDS = 30.0
+
+# Reserva `requested` tokens (negativo devolve) e responde, como string, quantos
+# segundos esperar. O saldo pode ficar negativo: quem chega depois espera mais,
+# na ordem em que o Redis executou as reservas. A chave expira quando o balde
+# estaria cheio de novo, o que equivale a não ter estado.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+tokens = math.min(burst, tokens - requested)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+local wait = 0
+if tokens < 0 then
+    wait = -tokens / rate
+end
+return tostring(wait)
+"""
+
+
+class TokenBucketRateLimiter:
+    """Token bucket FIFO com rajada configurável e métricas de espera"""
+
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        unit: str = "requisições",
+    ):
+        self.unit = unit
+        self._clock = clock
+        self._sleep = sleep
+        # Protege só a reserva (aritmética); nunca é mantido durante uma espera
+        self._lock = threading.Lock()
+        self._reset_stats()
+        self._configure(requests_per_minute, burst)
+        self.tokens = float(self.burst)
+        self.last_refill_time = self._clock()
+
+    def _configure(self, requests_per_minute: int, burst: Optional[int]) -> None:
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute deve ser positivo")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_second = requests_per_minute / 60.0
+        # Capacidade do balde; por padrão, um minuto de requisições
+        self.burst = max(1, burst if burst is not None else requests_per_minute)
+
+    def _reset_stats(self) -> None:
+        self.acquired = 0
+        self.waited = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _refill_tokens(self, now: float) -> None:
+        """Recarrega tokens baseado no tempo decorrido."""
+        elapsed = max(0.0, now - self.last_refill_time)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.tokens_per_second)
+        self.last_refill_time = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Reserva `tokens` tokens e devolve quantos segundos esperar por eles"""
+        with self._lock:
+            self._refill_tokens(self._clock())
+            self.tokens -= tokens
+            wait_time = -self.tokens / self.tokens_per_second if self.tokens < 0 else 0
+            self.acquired += 1
+            if wait_time > 0:
+                self.waited += 1
+                self.total_wait_seconds += wait_time
+                self.max_wait_seconds = max(self.max_wait_seconds, wait_time)
+            return wait_time
+
+    def _release(self, tokens: float = 1) -> None:
+        """Devolve os tokens de uma reserva cancelada"""
+        with self._lock:
+            self._refill_tokens(self._clock())
+            self.tokens = min(self.burst, self.tokens + tokens)
+            self.acquired -= 1
+
+    async def acquire(self, tokens: float = 1) -> float:
+        """Aguarda a vez do chamador e devolve o tempo esperado em segundos"""
+        wait_time = self.reserve(tokens)
+        if wait_time <= 0:
+            return 0.0
+        logger.info(
+            f"Rate limit de {self.requests_per_minute} {self.unit} por minuto "
+            f"atingido, aguardando {wait_time:.2f} segundos"
+        )
+        self.waiting += 1
+        try:
+            await self._sleep(wait_time)
+        except asyncio.CancelledError:
+            self._release(tokens)
+            raise
+        finally:
+            self.waiting -= 1
+        return wait_time
+
+    async def wait_if_needed(self):
+        """Aguarda se necessário para respeitar o rate limit."""
+        await self.acquire()
+
+    def reconfigure(self, requests_per_minute: int, burst: Optional[int] = None):
+        """Muda a taxa sem reabastecer o balde (tokens já consumidos continuam)"""
+        with self._lock:
+            self._refill_tokens(self._clock())
+            self._configure(requests_per_minute, burst)
+            self.tokens = min(self.tokens, self.burst)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refill_tokens(self._clock())
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "burst": self.burst,
+                "tokens": round(self.tokens, 3),
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "waiting": self.waiting,
+                "total_wait_seconds": round(self.total_wait_seconds, 3),
+                "max_wait_seconds": round(self.max_wait_seconds, 3),
+                "mean_wait_seconds": (
+                    round(self.total_wait_seconds / self.waited, 3)
+                    if self.waited
+                    else 0.0
+                ),
+            }
+
+
+class GlobalEAIRateLimiter(TokenBucketRateLimiter):
+    """
+    Rate limiter global compartilhado para controlar requisições por minuto.
+    Implementa token bucket: permite até `burst` requisições simultâneas e,
+    depois, `requests_per_minute` por minuto.
+    """
+
+    _instance: Optional["GlobalEAIRateLimiter"] = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls, requests_per_minute: int = 60, burst: Optional[int] = None):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, requests_per_minute: int = 60, burst: Optional[int] = None):
+        # Um cliente novo atualiza a taxa, mas não reabastece o balde
+        if self._initialized:
+            self.reconfigure(requests_per_minute, burst)
+            return
+        super().__init__(requests_per_minute, burst)
+        self._initialized = True
+
+
+class RedisTokenBucketRateLimiter:
+    """Token bucket compartilhado entre processos via script Lua no Redis"""
+
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        burst: Optional[int] = None,
+        redis_url: Optional[str] = None,
+        key: str = "eai_gateway:rate_limit",
+        client: Optional[aioredis.Redis] = None,
+        fallback: Optional[TokenBucketRateLimiter] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        if client is None and not redis_url:
+            raise ValueError("Informe redis_url ou client")
+        self.redis_url = redis_url
+        self.key = key
+        self._client = client
+        # Conexões do redis.asyncio pertencem a um event loop: sem cliente
+        # injetado, cada loop (ex.: asyncio.run por experimento) tem o seu
+        self._scripts = weakref.WeakKeyDictionary()
+        self._sleep = sleep
+        self.fallback = fallback or TokenBucketRateLimiter(requests_per_minute, burst)
+        self._redis_down_until = 0.0
+        self.acquired = 0
+        self.waited = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.fallbacks = 0
+        self.redis_errors = 0
+        self._configure(requests_per_minute, burst)
+
+    def _configure(self, requests_per_minute: int, burst: Optional[int]) -> None:
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute deve ser positivo")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_second = requests_per_minute / 60.0
+        self.burst = max(1, burst if burst is not None else requests_per_minute)
+
+    def reconfigure(self, requests_per_minute: int, burst: Optional[int] = None):
+        """Muda a taxa; o saldo no Redis é mantido"""
+        self._configure(requests_per_minute, burst)
+        self.fallback.reconfigure(requests_per_minute, burst)
+
+    def _script(self):
+        loop = asyncio.get_running_loop()
+        script = self._scripts.get(loop)
+        if script is None:
+            client = self._client or aioredis.Redis.from_url(self.redis_url)
+            script = client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._scripts[loop] = script
+        return script
+
+    async def _reserve(self, requested: int) -> float:
+        result = await self._script()(
+            keys=[self.key],
+            args=[self.tokens_per_second, self.burst, requested],
+        )
+        return max(0.0, float(result))
+
+    async def acquire(self) -> float:
+        """Aguarda a vez do chamador e devolve o tempo esperado em segundos"""
+        if time.monotonic() < self._redis_down_until:
+            self.fallbacks += 1
+            return await self.fallback.acquire()
+        try:
+            wait_time = await self._reserve(1)
+        except (RedisError, OSError) as e:
+            self.redis_errors += 1
+            self.fallbacks += 1
+            self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+            logger.warning(
+                f"Rate limiter no Redis indisponível ({e}), usando o limite local "
+                f"por {REDIS_RETRY_SECONDS:g}s"
+            )
+            return await self.fallback.acquire()
+
+        self.acquired += 1
+        if wait_time <= 0:
+            return 0.0
+        self.waited += 1
+        self.total_wait_seconds += wait_time
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_time)
+        logger.info(
+            f"Rate limit global de {self.requests_per_minute} requisições por "
+            f"minuto atingido, aguardando {wait_time:.2f} segundos"
+        )
+        self.waiting += 1
+        try:
+            await self._sleep(wait_time)
+        except asyncio.CancelledError:
+            await self._release()
+            raise
+        finally:
+            self.waiting -= 1
+        return wait_time
+
+    async def _release(self) -> None:
+        """Devolve o token de uma reserva cancelada"""
+        self.acquired -= 1
+        try:
+            await asyncio.shield(self._reserve(-1))
+        except (RedisError, OSError, asyncio.CancelledError):
+            pass
+
+    async def wait_if_needed(self):
+        """Aguarda se necessário para respeitar o rate limit."""
+        await self.acquire()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "requests_per_minute": self.requests_per_minute,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "waiting": self.waiting,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "mean_wait_seconds": (
+                round(self.total_wait_seconds / self.waited, 3) if self.waited else 0.0
+            ),
+            "fallbacks": self.fallbacks,
+            "redis_errors": self.redis_errors,
+            "fallback": self.fallback.stats(),
+        }
+
+
+_redis_limiter: Optional[RedisTokenBucketRateLimiter] = None
+_redis_limiter_lock = threading.Lock()
+
+
+def get_eai_rate_limiter(
+    requests_per_minute: int = 60, burst: Optional[int] = None
+) -> Union[GlobalEAIRateLimiter, RedisTokenBucketRateLimiter]:
+    """
+    Rate limiter compartilhado do processo, conforme
+    `EAI_GATEWAY_RATE_LIMIT_BACKEND` (local ou redis).
+    """
+    backend = env.EAI_GATEWAY_RATE_LIMIT_BACKEND.lower()
+    if backend == "redis" and env.EAI_GATEWAY_REDIS_URL:
+        global _redis_limiter
+        with _redis_limiter_lock:
+            if _redis_limiter is None:
+                _redis_limiter = RedisTokenBucketRateLimiter(
+                    requests_per_minute,
+                    burst,
+                    redis_url=env.EAI_GATEWAY_REDIS_URL,
+                    key=env.EAI_GATEWAY_RATE_LIMIT_KEY,
+                    fallback=GlobalEAIRateLimiter(requests_per_minute, burst),
+                )
+            else:
+                _redis_limiter.reconfigure(requests_per_minute, burst)
+            return _redis_limiter
+    if backend == "redis":
+        logger.warning(
+            "EAI_GATEWAY_RATE_LIMIT_BACKEND=redis sem EAI_GATEWAY_REDIS_URL, "
+            "usando o rate limiter local"
+        )
+    elif backend != "local":
+        raise ValueError(f"EAI_GATEWAY_RATE_LIMIT_BACKEND inválido: {backend!r}")
+    return GlobalEAIRateLimiter(requests_per_minute, burst)
@@ -0,0 +1,145 @@
+"""
+Espera pela resposta de uma mensagem enviada ao EAI Gateway.
+
+O EAIClient consultava `/api/v1/message/response` a cada `polling_interval`
+segundos: cada mensagem ganhava, em média, meio intervalo de latência extra e
+o gateway recebia uma consulta por intervalo. Os modos de espera
+(`EAI_GATEWAY_RESPONSE_MODE`) são:
+
+- `sse`: abre `/api/v1/message/response/stream` (server-sent events) e recebe
+  a resposta assim que fica pronta;
+- `long_poll`: consulta `/api/v1/message/response` com `wait=<segundos>`; o
+  gateway segura a requisição até a resposta ficar pronta ou o tempo acabar;
+- `backoff` (padrão): consultas sem `wait`, com intervalos que começam em
+  `EAI_GATEWAY_POLL_INITIAL_INTERVAL` e crescem por
+  `EAI_GATEWAY_POLL_BACKOFF_FACTOR` até o `polling_interval` do cliente;
+- `poll`: comportamento anterior, intervalo fixo;
+- `auto`: tenta SSE e, se o gateway não tiver o endpoint, usa long polling.
+  Um gateway que ignora `wait` responde na hora e o cliente cai no backoff.
+
+`sse`, `long_poll` e `auto` dependem de endpoints que o gateway ainda não
+publica; enquanto isso, o padrão é o backoff.
+
+O suporte a SSE é descoberto na primeira mensagem e guardado por processo,
+por `base_url`: os endpoints da API criam um EAIClient por requisição. Qualquer
+falha ao abrir o stream (status de erro, resposta que não é SSE, erro de
+conexão) marca o gateway como sem SSE, para que a sondagem não se repita a
+cada mensagem.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+from src.config import env
+
+RESPONSE_WAIT_MODES = ("auto", "sse", "long_poll", "backoff", "poll")
+
+RESPONSE_STREAM_PATH = "/api/v1/message/response/stream"
+
+# Suporte a SSE por base_url do gateway, descoberto uma vez por processo
+_sse_support: Dict[str, bool] = {}
+
+# Tempo máximo lendo o fim do stream depois da resposta final, para devolver a
+# conexão ao pool
+SSE_DRAIN_TIMEOUT = 1.0
+
+# Folga do timeout HTTP de uma consulta de long polling além do `wait`
+LONG_POLL_TIMEOUT_MARGIN = 10.0
+
+
+@dataclass(frozen=True)
+class ResponseWaitSettings:
+    """Como o EAIClient espera pela resposta de uma mensagem"""
+
+    mode: str = "backoff"
+    initial_interval: float = 0.1
+    backoff_factor: float = 1.5
+    # Fração aleatória aplicada a cada intervalo, para que clientes
+    # concorrentes não consultem o gateway em sincronia
+    jitter: float = 0.1
+    long_poll_seconds: float = 20.0
+
+    def __post_init__(self):
+        if self.mode not in RESPONSE_WAIT_MODES:
+            raise ValueError(
+                f"EAI_GATEWAY_RESPONSE_MODE inválido: {self.mode!r} "
+                f"(use um de {', '.join(RESPONSE_WAIT_MODES)})"
+            )
+
+    @classmethod
+    def from_env(cls) -> "ResponseWaitSettings":
+        return cls(
+            mode=env.EAI_GATEWAY_RESPONSE_MODE.lower(),
+            initial_interval=env.EAI_GATEWAY_POLL_INITIAL_INTERVAL,
+            backoff_factor=env.EAI_GATEWAY_POLL_BACKOFF_FACTOR,
+            long_poll_seconds=env.EAI_GATEWAY_LONG_POLL_SECONDS,
+        )
+
+    @property
+    def tries_sse(self) -> bool:
+        return self.mode in ("auto", "sse")
+
+    @property
+    def long_poll(self) -> bool:
+        return self.mode in ("auto", "sse", "long_poll") and self.long_poll_seconds > 0
+
+    def poll_delays(
+        self, max_interval: float, rng: Optional[random.Random] = None
+    ) -> Iterator[float]:
+        """Intervalos entre consultas que não foram seguradas pelo gateway"""
+        if self.mode == "poll":
+            while True:
+                yield max_interval
+        yield from backoff_delays(
+            self.initial_interval,
+            max_interval,
+            self.backoff_factor,
+            self.jitter,
+            rng=rng,
+        )
+
+
+def sse_support(base_url: str) -> Optional[bool]:
+    """Suporte do gateway a SSE (None = ainda não testado neste processo)"""
+    return _sse_support.get(base_url)
+
+
+def remember_sse_support(base_url: str, supported: bool) -> None:
+    _sse_support[base_url] = supported
+
+
+def backoff_delays(
+    initial: float,
+    maximum: float,
+    factor: float,
+    jitter: float = 0.0,
+    rng: Optional[random.Random] = None,
+) -> Iterator[float]:
+    """Intervalos exponenciais de `initial` até `maximum`, com jitter opcional"""
+    rng = rng or random.Random()
+    delay = min(initial, maximum)
+    while True:
+        spread = delay * jitter
+        yield max(0.0, min(maximum, delay + rng.uniform(-spread, spread)))
+        delay = min(maximum, delay * max(factor, 1.0))
+
+
+async def iter_sse_events(lines: AsyncIterator[str]) -> AsyncIterator[dict]:
+    """Eventos JSON de um stream SSE (campos `data:` até a linha em branco)"""
+    data = []
+    async for line in lines:
+        if not line:
+            if data:
+                yield json.loads("\n".join(data))
+                data = []
+            continue
+        if line.startswith(":"):
+            # Comentário, usado pelo gateway como keep-alive
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield json.loads("\n".join(data))
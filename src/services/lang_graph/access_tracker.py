@@ -0,0 +1,186 @@
+"""
+Atualização adiada (write-behind) do last_accessed das memórias.
+
+Cada leitura de memórias só registra os IDs acessados em um buffer em memória;
+uma thread em segundo plano grava o buffer num único
+`UPDATE ... WHERE memory_id = ANY(...)` a cada
+`LANG_GRAPH_MEMORY_ACCESS_FLUSH_INTERVAL_SECONDS` segundos, ou antes disso
+quando o buffer chega a `LANG_GRAPH_MEMORY_ACCESS_FLUSH_MAX_PENDING` IDs. O
+buffer também é gravado no close() e na saída do processo; depois do close(),
+o próximo acesso registrado reinicia a thread. Com intervalo 0 a gravação
+volta a ser feita a cada leitura.
+
+O last_accessed gravado é o horário do acesso mais recente do lote, com
+precisão de até um intervalo de flush; o GREATEST impede que um lote atrasado
+volte o valor para trás.
+"""
+
+import atexit
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+from src.config import env
+from src.services.lang_graph.database import db_manager
+from src.utils.log import logger
+
+UPDATE_LAST_ACCESSED = """
+UPDATE long_term_memory
+SET last_accessed = GREATEST(last_accessed, :accessed_at)
+WHERE memory_id = ANY(CAST(:memory_ids AS uuid[]))
+"""
+
+FlushFunction = Callable[[List[str], datetime], None]
+
+
+def update_last_accessed(memory_ids: List[str], accessed_at: datetime) -> None:
+    """Grava um lote de acessos em uma única transação"""
+    session = db_manager.get_session()
+    try:
+        session.execute(
+            text(UPDATE_LAST_ACCESSED),
+            {"memory_ids": memory_ids, "accessed_at": accessed_at},
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+class LastAccessedBuffer:
+    """
+    Buffer thread-safe de IDs acessados, gravados em lote por uma thread.
+
+    record() não faz I/O, então pode ser chamado tanto pelo repositório
+    síncrono quanto de dentro do event loop pelo assíncrono.
+    """
+
+    def __init__(
+        self,
+        flush_fn: FlushFunction = update_last_accessed,
+        flush_interval: float = 5.0,
+        max_pending: int = 500,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.flush_fn = flush_fn
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.clock = clock
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        # Serializa os flushes (thread, close() e chamadas manuais)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._atexit_registered = False
+        self.flushes = 0
+        self.flushed_ids = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls) -> "LastAccessedBuffer":
+        return cls(
+            flush_interval=env.LANG_GRAPH_MEMORY_ACCESS_FLUSH_INTERVAL_SECONDS,
+            max_pending=env.LANG_GRAPH_MEMORY_ACCESS_FLUSH_MAX_PENDING,
+        )
+
+    @property
+    def write_behind(self) -> bool:
+        return self.flush_interval > 0
+
+    def record(self, memory_ids: Iterable[str]) -> None:
+        """Registra o acesso às memórias (gravado no próximo flush)"""
+        now = self.clock()
+        with self._lock:
+            for memory_id in memory_ids:
+                self._pending[str(memory_id)] = now
+            pending = len(self._pending)
+            if self.write_behind and pending and not self._closed.is_set():
+                self._ensure_thread()
+
+        if not pending:
+            return
+        if not self.write_behind or self._closed.is_set():
+            self.flush()
+        elif pending >= self.max_pending:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Grava os acessos pendentes; devolve quantos IDs foram gravados"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            try:
+                self.flush_fn(list(batch), max(batch.values()))
+            except Exception as e:
+                logger.error(f"Erro ao atualizar last_accessed: {e}")
+                with self._lock:
+                    self.failures += 1
+                    # Devolve o lote ao buffer sem sobrescrever acessos mais novos
+                    for memory_id, accessed_at in batch.items():
+                        current = self._pending.get(memory_id)
+                        if current is None or current < accessed_at:
+                            self._pending[memory_id] = accessed_at
+                return 0
+
+            with self._lock:
+                self.flushes += 1
+                self.flushed_ids += len(batch)
+            return len(batch)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Para a thread e grava o que estiver pendente. O buffer pode voltar a
+        ser usado: o próximo record() inicia uma nova thread.
+        """
+        self._closed.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.flush()
+        with self._lock:
+            # Se a thread não terminou no timeout, os registros seguem
+            # gravados na hora em vez de abrir uma segunda thread
+            if self._thread is thread and (thread is None or not thread.is_alive()):
+                self._thread = None
+                self._wake.clear()
+                self._closed.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores do buffer"""
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "flushes": self.flushes,
+                "flushed_ids": self.flushed_ids,
+                "failures": self.failures,
+            }
+
+    def _ensure_thread(self) -> None:
+        # Chamado com self._lock adquirido
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="memory-last-accessed", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.close, timeout=5)
+                self._atexit_registered = True
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._closed.is_set():
+                break
+            self.flush()
+
+
+# Instância global compartilhada pelos repositórios síncrono e assíncrono
+last_accessed_buffer = LastAccessedBuffer.from_env()
@@ -0,0 +1,319 @@
+"""
+Checkpointer configurável do grafo LangGraph (memória de curto prazo).
+
+`LANG_GRAPH_CHECKPOINTER` escolhe o backend:
+
+- "memory": InMemorySaver, estado local ao processo (perdido no restart).
+- "postgres": PostgresSaver assíncrono do langchain_google_cloud_sql_pg,
+  compartilhado entre workers. Reaproveita o PostgresEngine (e o pool) do
+  serviço de histórico e aplica a retenção configurada periodicamente.
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langchain_google_cloud_sql_pg import PostgresEngine, PostgresSaver
+from sqlalchemy import text
+
+from src.config import env
+from src.utils.log import logger
+
+CHECKPOINTER_BACKENDS = ("memory", "postgres")
+
+# Offset entre a época gregoriana (UUIDv6) e a época Unix, em intervalos de 100ns
+_UUID6_EPOCH_OFFSET = 0x01B21DD213814000
+
+
+def checkpoint_id_before(moment: datetime) -> str:
+    """
+    Menor checkpoint_id possível gerado em `moment`.
+
+    O LangGraph usa UUIDv6 como checkpoint_id, cuja representação textual é
+    ordenada pelo tempo; qualquer id menor que este é de um checkpoint anterior.
+    """
+    timestamp = int(moment.timestamp() * 10**7) + _UUID6_EPOCH_OFFSET
+    high = f"{timestamp >> 12:012x}"
+    return f"{high[:8]}-{high[8:]}-6{timestamp & 0x0FFF:03x}-0000-000000000000"
+
+
+@dataclass
+class CheckpointRetention:
+    """Regras de retenção das tabelas de checkpoint do grafo"""
+
+    keep_last: int = 0
+    ttl_days: int = 0
+
+    @classmethod
+    def from_env(cls) -> "CheckpointRetention":
+        return cls(
+            keep_last=env.LANG_GRAPH_CHECKPOINT_KEEP_LAST,
+            ttl_days=env.LANG_GRAPH_CHECKPOINT_TTL_DAYS,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.keep_last > 0 or self.ttl_days > 0
+
+
+async def create_postgres_checkpointer(
+    engine: PostgresEngine,
+    table_name: Optional[str] = None,
+    schema_name: Optional[str] = None,
+) -> PostgresSaver:
+    """
+    Cria as tabelas de checkpoint (se ainda não existirem) e o PostgresSaver.
+
+    Args:
+        engine: PostgresEngine compartilhado
+        table_name: Tabela de checkpoints (padrão: LANG_GRAPH_CHECKPOINT_TABLE)
+        schema_name: Schema das tabelas (padrão: LANG_GRAPH_CHECKPOINT_SCHEMA)
+    """
+    table_name = table_name or env.LANG_GRAPH_CHECKPOINT_TABLE
+    schema_name = schema_name or env.LANG_GRAPH_CHECKPOINT_SCHEMA
+    try:
+        await engine.ainit_checkpoint_table(
+            table_name=table_name, schema_name=schema_name
+        )
+        logger.info(f"Tabelas de checkpoint {schema_name}.{table_name} criadas")
+    except Exception as e:
+        if "already exists" not in str(e):
+            raise
+    return await PostgresSaver.create(
+        engine=engine, table_name=table_name, schema_name=schema_name
+    )
+
+
+IDLE_THREADS_SQL = """
+SELECT thread_id FROM {checkpoints}
+GROUP BY thread_id
+HAVING max(checkpoint_id) < :cutoff
+"""
+
+DELETE_THREADS_SQL = "DELETE FROM {table} WHERE thread_id = ANY(:thread_ids)"
+
+# Mantém os :keep_last checkpoints mais recentes de cada (thread_id, checkpoint_ns)
+DELETE_OLD_CHECKPOINTS_SQL = """
+DELETE FROM {checkpoints} c
+USING (
+    SELECT thread_id, checkpoint_ns, checkpoint_id,
+           row_number() OVER (
+               PARTITION BY thread_id, checkpoint_ns
+               ORDER BY checkpoint_id DESC
+           ) AS position
+    FROM {checkpoints}
+) ranked
+WHERE ranked.position > :keep_last
+  AND c.thread_id = ranked.thread_id
+  AND c.checkpoint_ns = ranked.checkpoint_ns
+  AND c.checkpoint_id = ranked.checkpoint_id
+"""
+
+DELETE_ORPHAN_WRITES_SQL = """
+DELETE FROM {writes} w
+WHERE NOT EXISTS (
+    SELECT 1 FROM {checkpoints} c
+    WHERE c.thread_id = w.thread_id
+      AND c.checkpoint_ns = w.checkpoint_ns
+      AND c.checkpoint_id = w.checkpoint_id
+)
+"""
+
+
+async def prune_checkpoints(
+    engine: PostgresEngine,
+    retention: CheckpointRetention,
+    table_name: Optional[str] = None,
+    schema_name: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    Aplica a retenção nas tabelas de checkpoint do grafo.
+
+    - Threads cujo checkpoint mais recente é mais antigo que `ttl_days` são
+      apagadas por completo.
+    - Nas demais, só os `keep_last` checkpoints mais recentes de cada
+      (thread_id, checkpoint_ns) são mantidos, junto com os seus writes.
+
+    Um advisory lock garante que só um worker faz a limpeza por vez.
+
+    Returns:
+        Dict com o número de threads e checkpoints apagados
+    """
+    table_name = table_name or env.LANG_GRAPH_CHECKPOINT_TABLE
+    schema_name = schema_name or env.LANG_GRAPH_CHECKPOINT_SCHEMA
+    tables = {
+        "checkpoints": f'"{schema_name}"."{table_name}"',
+        "writes": f'"{schema_name}"."{table_name}_writes"',
+    }
+    now = now or datetime.now(timezone.utc)
+    result = {"deleted_threads": 0, "deleted_checkpoints": 0}
+
+    async def run():
+        async with engine._pool.connect() as conn:
+            locked = await conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(hashtext(:name))"),
+                {"name": f"{schema_name}.{table_name}.prune"},
+            )
+            if not locked.scalar():
+                await conn.rollback()
+                return
+
+            if retention.ttl_days > 0:
+                cutoff = checkpoint_id_before(now - timedelta(days=retention.ttl_days))
+                idle = await conn.execute(
+                    text(IDLE_THREADS_SQL.format(**tables)), {"cutoff": cutoff}
+                )
+                thread_ids = [row[0] for row in idle.fetchall()]
+                if thread_ids:
+                    params = {"thread_ids": thread_ids}
+                    await conn.execute(
+                        text(DELETE_THREADS_SQL.format(table=tables["writes"])), params
+                    )
+                    deleted = await conn.execute(
+                        text(DELETE_THREADS_SQL.format(table=tables["checkpoints"])),
+                        params,
+                    )
+                    result["deleted_threads"] = len(thread_ids)
+                    result["deleted_checkpoints"] += deleted.rowcount
+
+            if retention.keep_last > 0:
+                deleted = await conn.execute(
+                    text(DELETE_OLD_CHECKPOINTS_SQL.format(**tables)),
+                    {"keep_last": retention.keep_last},
+                )
+                result["deleted_checkpoints"] += deleted.rowcount
+                await conn.execute(text(DELETE_ORPHAN_WRITES_SQL.format(**tables)))
+
+            await conn.commit()
+
+    await engine._run_as_async(run())
+    return result
+
+
+class GraphCheckpointerManager:
+    """
+    Mantém o checkpointer do grafo por processo, conforme LANG_GRAPH_CHECKPOINTER.
+
+    Com o backend "postgres", o PostgresSaver usa o engine do
+    `history_service_manager` (um único pool por worker) e uma tarefa de fundo
+    aplica a retenção a cada LANG_GRAPH_CHECKPOINT_PRUNE_INTERVAL_SECONDS.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        retention: Optional[CheckpointRetention] = None,
+        prune_interval_seconds: Optional[int] = None,
+    ):
+        self.backend = (backend or env.LANG_GRAPH_CHECKPOINTER).lower()
+        if self.backend not in CHECKPOINTER_BACKENDS:
+            raise ValueError(
+                f"LANG_GRAPH_CHECKPOINTER inválido: {self.backend!r} "
+                f"(opções: {', '.join(CHECKPOINTER_BACKENDS)})"
+            )
+        self.retention = retention or CheckpointRetention.from_env()
+        self.prune_interval_seconds = (
+            prune_interval_seconds
+            if prune_interval_seconds is not None
+            else env.LANG_GRAPH_CHECKPOINT_PRUNE_INTERVAL_SECONDS
+        )
+        self._checkpointer: Optional[BaseCheckpointSaver] = None
+        self._engine: Optional[PostgresEngine] = None
+        self._prune_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> BaseCheckpointSaver:
+        """Retorna o checkpointer compartilhado, criando-o se necessário"""
+        if self._checkpointer is not None:
+            return self._checkpointer
+
+        async with self._lock:
+            if self._checkpointer is None:
+                self._checkpointer = await self._create()
+        return self._checkpointer
+
+    async def _create(self) -> BaseCheckpointSaver:
+        if self.backend == "memory":
+            logger.info("Checkpointer do grafo: InMemorySaver")
+            return InMemorySaver()
+
+        from src.services.agent_engine.history import history_service_manager
+
+        self._engine = (await history_service_manager.get()).engine
+        checkpointer = await create_postgres_checkpointer(self._engine)
+        if self.retention.enabled and self.prune_interval_seconds > 0:
+            self._prune_task = asyncio.create_task(self._prune_periodically())
+        logger.info(
+            f"Checkpointer do grafo: Postgres "
+            f"({env.LANG_GRAPH_CHECKPOINT_SCHEMA}.{env.LANG_GRAPH_CHECKPOINT_TABLE})"
+        )
+        return checkpointer
+
+    async def prune(self) -> Dict[str, int]:
+        """Aplica a retenção agora (no-op com o backend em memória)"""
+        if self.backend != "postgres":
+            return {"deleted_threads": 0, "deleted_checkpoints": 0}
+        await self.get()
+        return await prune_checkpoints(self._engine, self.retention)
+
+    async def _prune_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.prune_interval_seconds)
+            try:
+                result = await prune_checkpoints(self._engine, self.retention)
+                if any(result.values()):
+                    logger.info(f"Retenção de checkpoints do grafo: {result}")
+            except Exception as e:
+                logger.error(f"Erro na retenção de checkpoints do grafo: {e}")
+
+    async def shutdown(self) -> None:
+        """Para a retenção periódica; o pool é fechado pelo serviço de histórico"""
+        async with self._lock:
+            if self._prune_task is not None:
+                self._prune_task.cancel()
+                try:
+                    await self._prune_task
+                except asyncio.CancelledError:
+                    pass
+                self._prune_task = None
+            self._checkpointer = None
+            self._engine = None
+
+
+# Instância global única
+checkpointer_manager = GraphCheckpointerManager()
+
+
+async def main(argv: Any = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Aplica a retenção nas tabelas de checkpoint do grafo LangGraph"
+    )
+    parser.add_argument("--keep-last", type=int, default=None)
+    parser.add_argument("--ttl-days", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from src.services.agent_engine.history import history_service_manager
+
+    retention = CheckpointRetention.from_env()
+    if args.keep_last is not None:
+        retention.keep_last = args.keep_last
+    if args.ttl_days is not None:
+        retention.ttl_days = args.ttl_days
+
+    manager = GraphCheckpointerManager(
+        backend="postgres", retention=retention, prune_interval_seconds=0
+    )
+    try:
+        logger.info(f"Retenção aplicada: {await manager.prune()}")
+    finally:
+        await manager.shutdown()
+        await history_service_manager.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
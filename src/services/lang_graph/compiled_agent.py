@@ -0,0 +1,209 @@
+"""
+Cache do agente compilado do grafo LangGraph.
+
+O nó `agent_reasoning` precisava, a cada turno, instanciar o modelo de chat,
+chamar `bind_tools(TOOLS)` (que converte o schema de todas as ferramentas) e
+montar o system prompt inteiro. Só as memórias recuperadas mudam de um turno
+para outro, então o modelo com ferramentas e a parte estática do prompt são
+compilados uma vez por (modelo, temperatura, ferramentas, versão do prompt) e
+reaproveitados; por turno só o contexto de memórias é renderizado.
+
+A versão do prompt é o hash do prompt estático renderizado (system prompt da
+sessão + tipos de memória + instruções das ferramentas). Qualquer alteração em
+um deles gera uma nova entrada, e a antiga sai do cache pelo LRU.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+
+from src.config import env
+
+TOOLS_INSTRUCTIONS = """
+VOCÊ TEM 4 FERRAMENTAS DE MEMÓRIA DISPONÍVEIS:
+1. get_memory_tool - buscar informações do usuário
+2. save_memory_tool - salvar novas informações  
+3. update_memory_tool - atualizar informações existentes
+4. delete_memory_tool - deletar informações
+
+USE SEMPRE que apropriado. Não ignore informações pessoais do usuário.
+
+**Diretrizes Importantes:**
+1. **Use o Contexto da Conversa:** Você tem acesso ao histórico completo da conversa atual
+2. **Combine Memórias:** Use tanto o contexto da conversa quanto as memórias de longo prazo
+3. **Seja Proativo:** SEMPRE salve informações pessoais que o usuário compartilha
+4. **Mantenha a Qualidade:** Atualize memórias erradas, delete irrelevantes
+5. **Use Memórias Relevantes:** Utilize as memórias recuperadas para personalizar respostas
+6. **OBRIGATÓRIO:** Use as ferramentas sempre que apropriado - não ignore informações importantes
+7. **EFICIÊNCIA:** Faça operações únicas quando possível, evite chamadas desnecessárias
+8. **SEMPRE especifique memory_type** em get_memory_tool para evitar erros
+9. **IMPORTANTE:** Para update_memory_tool e delete_memory_tool, você PRECISA do memory_id (UUID). 
+   Se não tiver o ID correto, use get_memory_tool primeiro para buscar a memória e obter o ID.
+   NUNCA use memory_type como memory_id - isso causará erro!
+"""
+
+
+def render_memory_types(memory_types_config: Any) -> str:
+    """Descrições dos tipos de memória (defaults do modelo de configuração)"""
+    memory_types_desc = """
+**Tipos de Memória Disponíveis:**
+"""
+    for field_name, field in type(memory_types_config).model_fields.items():
+        memory_types_desc += f"* **{field_name}:** {field.default}\n"
+    return memory_types_desc
+
+
+def render_static_prompt(system_prompt: str, memory_types_config: Any) -> str:
+    """Parte do system prompt que não depende do turno"""
+    return system_prompt + render_memory_types(memory_types_config) + TOOLS_INSTRUCTIONS
+
+
+def render_memories_context(retrieved_memories: Optional[List[Any]]) -> str:
+    """Contexto das memórias recuperadas no turno"""
+    if not retrieved_memories:
+        return ""
+    memories_context = "\n**Memórias Relevantes Recuperadas:**\n"
+    for i, memory in enumerate(retrieved_memories, 1):
+        relevance = (
+            f" (relevância: {memory.relevance_score:.2f})"
+            if memory.relevance_score
+            else ""
+        )
+        memories_context += (
+            f"{i}. **{memory.memory_type.value}:** {memory.content}{relevance}\n"
+        )
+    return memories_context
+
+
+def prompt_version(static_prompt: str) -> str:
+    """Versão (hash do conteúdo) de um prompt estático"""
+    return hashlib.blake2b(static_prompt.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass(frozen=True)
+class CompiledAgent:
+    """Modelo de chat já com ferramentas e o prompt estático renderizado"""
+
+    model: Runnable
+    static_prompt: str
+    prompt_version: str
+
+    def system_prompt(self, retrieved_memories: Optional[List[Any]] = None) -> str:
+        return self.static_prompt + render_memories_context(retrieved_memories)
+
+
+class CompiledAgentCache:
+    """
+    Cache LRU de CompiledAgent.
+
+    A chave usa o texto do system prompt e a classe dos tipos de memória (o hash
+    de `str` é memorizado pelo Python, então a busca é O(1) depois do primeiro
+    turno) junto com o nome do modelo, a temperatura e a identidade das
+    ferramentas.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CompiledAgent]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(
+        model_name: str,
+        temperature: float,
+        tools: Sequence[Any],
+        system_prompt: str,
+        memory_types_config: Any,
+    ) -> Tuple:
+        tools_key = tuple((getattr(t, "name", None), id(t)) for t in tools)
+        return (
+            model_name,
+            temperature,
+            tools_key,
+            system_prompt,
+            type(memory_types_config),
+        )
+
+    def get(
+        self,
+        config: Any,
+        tools: Sequence[Any],
+        model_name: str,
+        model_factory: Callable[[], BaseChatModel],
+    ) -> CompiledAgent:
+        """
+        Retorna o agente compilado para a configuração da sessão.
+
+        Args:
+            config: SessionConfig (usa system_prompt, temperature e
+                memory_types_config)
+            tools: Ferramentas vinculadas ao modelo
+            model_name: Nome do modelo criado por `model_factory`
+            model_factory: Cria o modelo de chat em caso de miss
+        """
+        key = self._key(
+            model_name,
+            config.temperature,
+            tools,
+            config.system_prompt,
+            config.memory_types_config,
+        )
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        static_prompt = render_static_prompt(
+            config.system_prompt, config.memory_types_config
+        )
+        compiled = CompiledAgent(
+            model=model_factory().bind_tools(list(tools)),
+            static_prompt=static_prompt,
+            prompt_version=prompt_version(static_prompt),
+        )
+        if self.max_entries <= 0:
+            return compiled
+
+        with self._lock:
+            # Outra corrotina/thread pode ter compilado a mesma chave
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            self._entries[key] = compiled
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return compiled
+
+    def invalidate(self) -> None:
+        """Descarta todos os agentes compilados (ex.: após trocar o LLMConfig)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso do cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Instância global usada pelo nó agent_reasoning
+compiled_agent_cache = CompiledAgentCache(env.LANG_GRAPH_COMPILED_AGENT_CACHE_SIZE)
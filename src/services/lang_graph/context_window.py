@@ -0,0 +1,276 @@
+"""
+Política de janela de contexto do agente LangGraph.
+
+O `agent_reasoning` enviava ao modelo todo o histórico acumulado da thread, e
+o prompt crescia linearmente com a conversa. O ContextBudgeter escolhe, a cada
+turno, quais mensagens do histórico vão para o modelo:
+
+- orçamento de tokens (`LANG_GRAPH_CONTEXT_MAX_TOKENS`, contando o system
+  prompt com as memórias) e janela deslizante de mensagens
+  (`LANG_GRAPH_CONTEXT_MAX_MESSAGES`); 0 desativa cada limite, e os dois vêm
+  desativados: o histórico só é cortado quando um limite é configurado;
+- mensagens fixadas (SystemMessages do histórico ou com
+  `additional_kwargs["pinned"]`) nunca saem do contexto;
+- o corte é sempre no início de um turno (HumanMessage), então uma AIMessage
+  com tool calls nunca é separada dos seus ToolMessages;
+- ao estourar um limite, a janela é reduzida até `LANG_GRAPH_CONTEXT_LOW_WATER`
+  do limite, e não só o necessário: o início da janela (guardado no estado)
+  muda em saltos, o que mantém o prefixo do prompt estável entre turnos e
+  agrupa as chamadas de resumo;
+- com `LANG_GRAPH_CONTEXT_SUMMARIZE`, as mensagens que saem da janela são
+  incorporadas a um resumo contínuo, enviado no system prompt.
+
+A contagem de tokens é uma aproximação local (sem tokenizer do provedor),
+suficiente para orçamento e benchmark.
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from src.config import env
+from src.utils.log import logger
+
+# Custo fixo por mensagem (papel e delimitadores)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+Summarizer = Callable[[str, List[BaseMessage]], Awaitable[str]]
+
+SUMMARY_INSTRUCTIONS = """Você mantém o resumo de uma conversa entre um usuário e um assistente.
+Atualize o resumo anterior com as novas mensagens, preservando fatos sobre o
+usuário, pedidos em aberto, decisões e resultados de ferramentas que ainda
+importam. Responda só com o resumo atualizado, em até {max_tokens} tokens."""
+
+
+def approximate_tokens(text: str) -> int:
+    """Aproximação de tokens BPE: palavras e pontuação, ~4 caracteres por token"""
+    return sum(math.ceil(len(piece) / 4) for piece in _TOKEN_PATTERN.findall(text))
+
+
+def _content_text(content) -> str:
+    if isinstance(content, str):
+        return content
+    parts = []
+    for part in content:
+        if isinstance(part, str):
+            parts.append(part)
+        elif isinstance(part, dict) and "text" in part:
+            parts.append(str(part["text"]))
+    return " ".join(parts)
+
+
+def message_tokens(message: BaseMessage) -> int:
+    """Tokens aproximados de uma mensagem, incluindo os argumentos de tool calls"""
+    tokens = MESSAGE_OVERHEAD_TOKENS + approximate_tokens(
+        _content_text(message.content)
+    )
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += approximate_tokens(tool_call.get("name", ""))
+        tokens += approximate_tokens(
+            json.dumps(tool_call.get("args", {}), ensure_ascii=False, default=str)
+        )
+    return tokens
+
+
+def is_pinned(message: BaseMessage) -> bool:
+    return isinstance(message, SystemMessage) or bool(
+        message.additional_kwargs.get("pinned")
+    )
+
+
+def render_summary(summary: str) -> str:
+    """Trecho do system prompt com o resumo das mensagens fora da janela"""
+    if not summary:
+        return ""
+    return f"\n**Resumo da conversa anterior:**\n{summary}\n"
+
+
+@dataclass(frozen=True)
+class ContextPolicy:
+    """Limites da janela de contexto (0 desativa cada limite)"""
+
+    max_tokens: int = 0
+    max_messages: int = 0
+    summarize: bool = False
+    low_water: float = 0.6
+    summary_max_tokens: int = 400
+
+    @classmethod
+    def from_env(cls) -> "ContextPolicy":
+        return cls(
+            max_tokens=env.LANG_GRAPH_CONTEXT_MAX_TOKENS,
+            max_messages=env.LANG_GRAPH_CONTEXT_MAX_MESSAGES,
+            summarize=env.LANG_GRAPH_CONTEXT_SUMMARIZE,
+            low_water=env.LANG_GRAPH_CONTEXT_LOW_WATER,
+            summary_max_tokens=env.LANG_GRAPH_CONTEXT_SUMMARY_MAX_TOKENS,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_tokens > 0 or self.max_messages > 0
+
+
+@dataclass
+class ContextWindow:
+    """Mensagens do histórico enviadas ao modelo neste turno"""
+
+    messages: List[BaseMessage]
+    # Índice (no histórico completo) da primeira mensagem da janela
+    start: int
+    summary: str = ""
+    tokens: int = 0
+    # Mensagens que saíram da janela neste turno
+    dropped: List[BaseMessage] = field(default_factory=list)
+
+
+class ContextBudgeter:
+    """Aplica a ContextPolicy ao histórico de uma thread"""
+
+    def __init__(
+        self,
+        policy: Optional[ContextPolicy] = None,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        self.policy = policy or ContextPolicy.from_env()
+        self.summarizer = summarizer
+
+    def plan(
+        self,
+        system_prompt: str,
+        messages: Sequence[BaseMessage],
+        start: int = 0,
+        summary: str = "",
+    ) -> ContextWindow:
+        """Escolhe a janela do turno sem chamar o modelo"""
+        policy = self.policy
+        start = self._align(messages, min(max(start, 0), len(messages)))
+        # Mensagens antes do início atual (e não fixadas) nunca voltam à janela,
+        # então só o restante é tokenizado
+        costs = [
+            message_tokens(message) if index >= start or is_pinned(message) else 0
+            for index, message in enumerate(messages)
+        ]
+
+        fixed = MESSAGE_OVERHEAD_TOKENS + approximate_tokens(system_prompt)
+        if policy.summarize:
+            # Espaço reservado para o resumo, mesmo antes de existir
+            fixed += policy.summary_max_tokens
+        else:
+            fixed += approximate_tokens(render_summary(summary))
+
+        # Somas de sufixo: custo da janela a partir de cada índice em O(1)
+        total = len(messages)
+        pinned_before = [0] * (total + 1)
+        suffix_tokens = [0] * (total + 1)
+        suffix_count = [0] * (total + 1)
+        for index, message in enumerate(messages):
+            pinned_before[index + 1] = pinned_before[index] + (
+                costs[index] if is_pinned(message) else 0
+            )
+        for index in range(total - 1, -1, -1):
+            suffix_tokens[index] = suffix_tokens[index + 1] + costs[index]
+            suffix_count[index] = suffix_count[index + 1] + (
+                not is_pinned(messages[index])
+            )
+
+        def size(candidate: int):
+            tokens = fixed + pinned_before[candidate] + suffix_tokens[candidate]
+            return tokens, suffix_count[candidate]
+
+        def fits(candidate: int, ratio: float) -> bool:
+            tokens, count = size(candidate)
+            if policy.max_tokens and tokens > policy.max_tokens * ratio:
+                return False
+            if policy.max_messages and count > max(1, int(policy.max_messages * ratio)):
+                return False
+            return True
+
+        new_start = start
+        if policy.enabled and not fits(start, 1.0):
+            boundaries = [
+                index
+                for index, message in enumerate(messages)
+                if index > start and isinstance(message, HumanMessage)
+            ]
+            # Reduz até o low water; se nem assim couber, fica só o último turno
+            new_start = next(
+                (b for b in boundaries if fits(b, policy.low_water)),
+                boundaries[-1] if boundaries else start,
+            )
+
+        window = [
+            message
+            for index, message in enumerate(messages)
+            if index >= new_start or is_pinned(message)
+        ]
+        dropped = [
+            message for message in messages[start:new_start] if not is_pinned(message)
+        ]
+        return ContextWindow(
+            messages=window,
+            start=new_start,
+            summary=summary,
+            tokens=size(new_start)[0],
+            dropped=dropped,
+        )
+
+    async def abuild(
+        self,
+        system_prompt: str,
+        messages: Sequence[BaseMessage],
+        start: int = 0,
+        summary: str = "",
+    ) -> ContextWindow:
+        """Como plan, atualizando o resumo com as mensagens que saíram da janela"""
+        window = self.plan(system_prompt, messages, start=start, summary=summary)
+        if window.dropped and self.policy.summarize and self.summarizer is not None:
+            try:
+                window.summary = await self.summarizer(summary, window.dropped)
+            except Exception as e:
+                # Sem resumo novo as mensagens antigas só saem do contexto
+                logger.error(f"Erro ao resumir a conversa: {e}")
+        return window
+
+    @staticmethod
+    def _align(messages: Sequence[BaseMessage], start: int) -> int:
+        # A janela sempre começa em uma HumanMessage (início de turno)
+        while start > 0 and start < len(messages):
+            if isinstance(messages[start], HumanMessage):
+                break
+            start -= 1
+        return start
+
+
+def make_model_summarizer(model_factory: Callable[[], object], max_tokens: int):
+    """Summarizer que usa o modelo de chat (criado só na primeira chamada)"""
+    model = None
+
+    async def summarize(previous: str, dropped: List[BaseMessage]) -> str:
+        nonlocal model
+        if model is None:
+            model = model_factory()
+        transcript = "\n".join(
+            f"{message.type}: {_content_text(message.content)}"
+            for message in dropped
+            if _content_text(message.content)
+        )
+        response = await model.ainvoke(
+            [
+                SystemMessage(
+                    content=SUMMARY_INSTRUCTIONS.format(max_tokens=max_tokens)
+                ),
+                HumanMessage(
+                    content=f"Resumo anterior:\n{previous or '(vazio)'}\n\n"
+                    f"Novas mensagens:\n{transcript}"
+                ),
+            ]
+        )
+        return _content_text(response.content).strip()
+
+    return summarize
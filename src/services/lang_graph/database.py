@@ -1,6 +1,20 @@
 from typing import Optional
+import asyncio
 import logging
-from sqlalchemy import create_engine, Column, String, DateTime, Float, Text, func, text
+from sqlalchemy import (
+    create_engine,
+    Column,
+    String,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    LargeBinary,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
@@ -11,7 +25,6 @@ import uuid
 from src.config import env
 from src.utils.log import logger
 
-
 Base = declarative_base()
 
 
@@ -30,6 +43,49 @@ class LongTermMemory(Base):
     last_accessed = Column(DateTime, nullable=False, server_default=func.now())
     embedding = Column(Vector(768), nullable=True)  # Usando Vector do pgvector
 
+    __table_args__ = (
+        # Pré-filtro por usuário/tipo (busca exata e cronológica)
+        Index(
+            "ix_long_term_memory_user_type_created",
+            "user_id",
+            "memory_type",
+            creation_datetime.desc(),
+        ),
+        # Busca aproximada (ANN) por distância de cosseno
+        Index(
+            "ix_long_term_memory_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+
+class EmbeddingCacheEntry(Base):
+    """Nível persistente do cache de embeddings (ver embedding_cache.py)."""
+
+    __tablename__ = "embedding_cache"
+
+    # blake2b(modelo, tipo, texto)
+    cache_key = Column(LargeBinary(16), primary_key=True)
+    model = Column(String(255), nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    # float64 empacotados (array("d"))
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+def async_database_url(url: str) -> str:
+    """Troca o driver da URL do Postgres pelo asyncpg"""
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    return url
+
 
 class DatabaseManager:
     """Gerenciador de conexão com o banco de dados usando Singleton pattern."""
@@ -46,6 +102,10 @@ class DatabaseManager:
         if not self._initialized:
             self.engine = None
             self.SessionLocal = None
+            self.async_engine = None
+            self.AsyncSessionLocal = None
+            self._async_tables_ready = False
+            self._async_init_lock = asyncio.Lock()
             self.database_url = env.PG_URI
             self._initialized = True
 
@@ -90,12 +150,71 @@ class DatabaseManager:
 
         return self.SessionLocal()
 
+    def initialize_async_engine(self):
+        """Inicializa o engine assíncrono (asyncpg) apenas uma vez."""
+        if self.async_engine is not None:
+            return
+
+        connect_args = {}
+        if env.DB_SSL.lower() in ("false", "0", "no"):
+            connect_args = {"ssl": False}
+
+        try:
+            self.async_engine = create_async_engine(
+                async_database_url(self.database_url),
+                pool_pre_ping=True,
+                pool_size=env.LANG_GRAPH_MEMORY_PG_POOL_SIZE,
+                max_overflow=env.LANG_GRAPH_MEMORY_PG_MAX_OVERFLOW,
+                connect_args=connect_args,
+            )
+            self.AsyncSessionLocal = async_sessionmaker(
+                self.async_engine, class_=AsyncSession, expire_on_commit=False
+            )
+            logger.info("Engine SQLAlchemy assíncrono inicializado com sucesso")
+        except Exception as e:
+            logger.error(f"Erro ao inicializar engine assíncrono: {e}")
+            raise
+
+    async def acreate_tables(self):
+        """Cria a extensão pgvector e as tabelas pelo engine assíncrono."""
+        if self.async_engine is None:
+            self.initialize_async_engine()
+
+        try:
+            async with self.async_engine.begin() as conn:
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector;"))
+                await conn.run_sync(Base.metadata.create_all)
+            self._async_tables_ready = True
+            logger.info("Tabelas criadas com sucesso via SQLAlchemy assíncrono")
+        except Exception as e:
+            logger.error(f"Erro ao criar tabelas: {e}")
+            raise
+
+    async def get_async_session(self) -> AsyncSession:
+        """Retorna uma sessão assíncrona do banco de dados."""
+        if not self._async_tables_ready:
+            async with self._async_init_lock:
+                if not self._async_tables_ready:
+                    await self.acreate_tables()
+
+        return self.AsyncSessionLocal()
+
     def close(self):
         """Fecha o engine SQLAlchemy."""
         if self.engine:
             self.engine.dispose()
             logger.info("Engine SQLAlchemy fechado")
 
+    async def aclose(self):
+        """Fecha os engines SQLAlchemy síncrono e assíncrono."""
+        self.close()
+        if self.async_engine:
+            await self.async_engine.dispose()
+            self.async_engine = None
+            self.AsyncSessionLocal = None
+            self._async_tables_ready = False
+            logger.info("Engine SQLAlchemy assíncrono fechado")
+
 
 # Instância global única
 db_manager = DatabaseManager()
@@ -0,0 +1,213 @@
+"""
+Cache de embeddings em dois níveis para o LLMConfig.
+
+- L1: LRU em processo (`LANG_GRAPH_EMBEDDING_CACHE_SIZE` entradas).
+- L2 (opcional): tabela `embedding_cache` em um banco SQLAlchemy, persistente
+  entre restarts e compartilhada entre workers. `LANG_GRAPH_EMBEDDING_CACHE_DB`
+  aceita a URL do Postgres (ou "pg" para usar o PG_URI) ou um arquivo SQLite
+  (`sqlite:///caminho/embeddings.db`).
+
+A chave é o hash do modelo, do tipo de embedding (query/document) e do texto;
+o vetor é guardado como float64 empacotado, então o valor lido é idêntico ao
+devolvido pela API.
+"""
+
+import asyncio
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.config import env
+from src.services.lang_graph.database import EmbeddingCacheEntry
+from src.utils.log import logger
+
+
+def embedding_cache_key(model: str, kind: str, text: str) -> bytes:
+    """Chave do cache: blake2b de modelo + tipo + texto"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (model, kind, text):
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\x00")
+    return digest.digest()
+
+
+def _pack(embedding: List[float]) -> bytes:
+    return array("d", embedding).tobytes()
+
+
+def _unpack(data: bytes) -> List[float]:
+    values = array("d")
+    values.frombytes(data)
+    return values.tolist()
+
+
+class SQLEmbeddingStore:
+    """Nível persistente do cache, em Postgres ou SQLite"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._engine = None
+        self._lock = threading.Lock()
+
+    def _get_engine(self):
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    engine = create_engine(self.url, pool_pre_ping=True)
+                    EmbeddingCacheEntry.__table__.create(engine, checkfirst=True)
+                    self._engine = engine
+        return self._engine
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        if not keys:
+            return {}
+        table = EmbeddingCacheEntry.__table__
+        with self._get_engine().connect() as conn:
+            rows = conn.execute(
+                select(table.c.cache_key, table.c.embedding).where(
+                    table.c.cache_key.in_(keys)
+                )
+            ).all()
+        return {bytes(key): _unpack(embedding) for key, embedding in rows}
+
+    def put_many(self, model: str, items: Dict[bytes, List[float]]) -> None:
+        if not items:
+            return
+        engine = self._get_engine()
+        insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+        statement = insert(EmbeddingCacheEntry.__table__).on_conflict_do_nothing(
+            index_elements=["cache_key"]
+        )
+        with engine.begin() as conn:
+            conn.execute(
+                statement,
+                [
+                    {
+                        "cache_key": key,
+                        "model": model,
+                        "dimensions": len(embedding),
+                        "embedding": _pack(embedding),
+                    }
+                    for key, embedding in items.items()
+                ],
+            )
+
+    def close(self) -> None:
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+
+class EmbeddingCache:
+    """
+    LRU em processo com um nível persistente opcional.
+
+    Acertos no nível persistente são promovidos ao LRU. Falhas do nível
+    persistente são só registradas: o embedding é recalculado normalmente.
+    """
+
+    def __init__(self, max_entries: int, store: Optional[SQLEmbeddingStore] = None):
+        self.max_entries = max_entries
+        self.store = store
+        self._entries: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingCache":
+        url = env.LANG_GRAPH_EMBEDDING_CACHE_DB
+        if url == "pg":
+            url = env.PG_URI
+        store = SQLEmbeddingStore(url) if url else None
+        return cls(env.LANG_GRAPH_EMBEDDING_CACHE_SIZE, store=store)
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[float]]:
+        """Embeddings em cache das chaves pedidas (as ausentes ficam de fora)"""
+        found: Dict[bytes, List[float]] = {}
+        missing: List[bytes] = []
+        with self._lock:
+            for key in keys:
+                cached = self._entries.get(key)
+                if cached is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = cached
+                else:
+                    missing.append(key)
+            self.hits += len(found)
+
+        stored: Dict[bytes, List[float]] = {}
+        if missing and self.store is not None:
+            try:
+                stored = self.store.get_many(missing)
+            except Exception as e:
+                logger.error(f"Erro ao ler cache persistente de embeddings: {e}")
+            self._remember(stored)
+            found.update(stored)
+
+        with self._lock:
+            self.store_hits += len(stored)
+            self.misses += len(missing) - len(stored)
+        return found
+
+    def put_many(self, model: str, items: Dict[bytes, List[float]]) -> None:
+        """Armazena embeddings recém-calculados nos dois níveis"""
+        self._remember(items)
+        if items and self.store is not None:
+            try:
+                self.store.put_many(model, items)
+            except Exception as e:
+                logger.error(f"Erro ao gravar cache persistente de embeddings: {e}")
+
+    async def aget_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[float]]:
+        """Como get_many; o nível persistente é consultado fora do event loop"""
+        if self.store is None:
+            return self.get_many(keys)
+        return await asyncio.to_thread(self.get_many, list(keys))
+
+    async def aput_many(self, model: str, items: Dict[bytes, List[float]]) -> None:
+        """Como put_many; o nível persistente é gravado fora do event loop"""
+        if self.store is None:
+            return self.put_many(model, items)
+        await asyncio.to_thread(self.put_many, model, items)
+
+    def _remember(self, items: Dict[bytes, List[float]]) -> None:
+        if self.max_entries <= 0 or not items:
+            return
+        with self._lock:
+            for key, embedding in items.items():
+                self._entries[key] = embedding
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Limpa o nível em processo (o persistente é mantido)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso do cache"""
+        with self._lock:
+            lookups = self.hits + self.store_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self.store is not None,
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (
+                    (self.hits + self.store_hits) / lookups if lookups else 0.0
+                ),
+            }
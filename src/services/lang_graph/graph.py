@@ -3,9 +3,9 @@ from typing import Dict, Any, List, Optional, TypedDict, Annotated
 import logging
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langgraph.graph import StateGraph, END, START
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import MessagesState
-from langgraph.prebuilt import ToolNode
 
 from langchain_core.tools import tool
 from src.services.lang_graph.models import (
@@ -18,6 +18,19 @@ from src.services.lang_graph.models import (
 from src.services.lang_graph.llms import llm_config
 from src.services.lang_graph.tools import TOOLS
 from src.services.lang_graph.memory import memory_manager
+from src.services.lang_graph.checkpointer import checkpointer_manager
+from src.services.lang_graph.tool_executor import ParallelToolExecutor
+from src.services.lang_graph.context_window import (
+    ContextBudgeter,
+    ContextPolicy,
+    make_model_summarizer,
+    render_summary,
+)
+from src.services.lang_graph.compiled_agent import (
+    compiled_agent_cache,
+    render_memories_context,
+    render_static_prompt,
+)
 from src.utils.log import logger
 
 
@@ -25,54 +38,9 @@ def create_system_prompt(
     config: SessionConfig, retrieved_memories: List[MemoryResponse] = None
 ) -> str:
     """Cria o system prompt dinâmico baseado na configuração."""
-    base_prompt = config.system_prompt
-
-    # Adicionar descrições dos tipos de memória
-    memory_types_desc = """
-**Tipos de Memória Disponíveis:**
-"""
-    for field_name, field in config.memory_types_config.model_fields.items():
-        memory_types_desc += f"* **{field_name}:** {field.default}\n"
-
-    # Adicionar instruções das ferramentas (SEM expor parâmetros sensíveis)
-    tools_instructions = """
-VOCÊ TEM 4 FERRAMENTAS DE MEMÓRIA DISPONÍVEIS:
-1. get_memory_tool - buscar informações do usuário
-2. save_memory_tool - salvar novas informações  
-3. update_memory_tool - atualizar informações existentes
-4. delete_memory_tool - deletar informações
-
-USE SEMPRE que apropriado. Não ignore informações pessoais do usuário.
-
-**Diretrizes Importantes:**
-1. **Use o Contexto da Conversa:** Você tem acesso ao histórico completo da conversa atual
-2. **Combine Memórias:** Use tanto o contexto da conversa quanto as memórias de longo prazo
-3. **Seja Proativo:** SEMPRE salve informações pessoais que o usuário compartilha
-4. **Mantenha a Qualidade:** Atualize memórias erradas, delete irrelevantes
-5. **Use Memórias Relevantes:** Utilize as memórias recuperadas para personalizar respostas
-6. **OBRIGATÓRIO:** Use as ferramentas sempre que apropriado - não ignore informações importantes
-7. **EFICIÊNCIA:** Faça operações únicas quando possível, evite chamadas desnecessárias
-8. **SEMPRE especifique memory_type** em get_memory_tool para evitar erros
-9. **IMPORTANTE:** Para update_memory_tool e delete_memory_tool, você PRECISA do memory_id (UUID). 
-   Se não tiver o ID correto, use get_memory_tool primeiro para buscar a memória e obter o ID.
-   NUNCA use memory_type como memory_id - isso causará erro!
-"""
-
-    # Adicionar contexto das memórias recuperadas
-    memories_context = ""
-    if retrieved_memories:
-        memories_context = "\n**Memórias Relevantes Recuperadas:**\n"
-        for i, memory in enumerate(retrieved_memories, 1):
-            relevance = (
-                f" (relevância: {memory.relevance_score:.2f})"
-                if memory.relevance_score
-                else ""
-            )
-            memories_context += (
-                f"{i}. **{memory.memory_type.value}:** {memory.content}{relevance}\n"
-            )
-
-    return base_prompt + memory_types_desc + tools_instructions + memories_context
+    return render_static_prompt(
+        config.system_prompt, config.memory_types_config
+    ) + render_memories_context(retrieved_memories)
 
 
 async def proactive_memory_retrieval(state: CustomMessagesState) -> CustomMessagesState:
@@ -104,7 +72,7 @@ async def proactive_memory_retrieval(state: CustomMessagesState) -> CustomMessag
             return state
 
         # Buscar memórias relevantes
-        result = memory_manager.get_memory(
+        result = await memory_manager.aget_memory(
             user_id=config.user_id,
             query=user_content,
             limit=config.memory_limit,
@@ -126,6 +94,16 @@ async def proactive_memory_retrieval(state: CustomMessagesState) -> CustomMessag
         return state
 
 
+_context_policy = ContextPolicy.from_env()
+context_budgeter = ContextBudgeter(
+    _context_policy,
+    summarizer=make_model_summarizer(
+        lambda: llm_config.get_chat_model(temperature=0.0),
+        max_tokens=_context_policy.summary_max_tokens,
+    ),
+)
+
+
 async def agent_reasoning(state: CustomMessagesState) -> CustomMessagesState:
     """Nó principal do agente para raciocínio e decisão."""
     try:
@@ -137,30 +115,45 @@ async def agent_reasoning(state: CustomMessagesState) -> CustomMessagesState:
         messages = state.get("messages", [])
         retrieved_memories = state.get("retrieved_memories", [])
 
-        # Criar system prompt dinâmico
-        system_prompt = create_system_prompt(config, retrieved_memories)
-        logger.info(
-            f"System prompt criado com {len(retrieved_memories)} memórias recuperadas"
+        # Modelo com ferramentas e prompt estático compilados uma vez por
+        # (modelo, temperatura, ferramentas, versão do prompt)
+        agent = compiled_agent_cache.get(
+            config,
+            TOOLS,
+            model_name=llm_config.chat_model_name,
+            model_factory=lambda: llm_config.get_chat_model(
+                temperature=config.temperature
+            ),
         )
 
-        # Preparar mensagens para o LLM
-        langchain_messages = [SystemMessage(content=system_prompt)]
-
-        # Adicionar histórico de mensagens (já está no formato correto)
-        # O MessagesState mantém automaticamente o histórico da conversa
-        langchain_messages.extend(messages)
-
-        # Obter modelo de chat com ferramentas
-        chat_model = llm_config.get_chat_model(temperature=config.temperature)
+        # Só o contexto das memórias é renderizado a cada turno
+        system_prompt = agent.system_prompt(retrieved_memories)
+        logger.info(
+            f"System prompt {agent.prompt_version} com {len(retrieved_memories)} memórias recuperadas"
+        )
 
-        # Configurar modelo com ferramentas
-        model_with_tools = chat_model.bind_tools(TOOLS)
+        # Janela do histórico dentro do orçamento de contexto; o histórico
+        # completo continua no estado (checkpointer)
+        window = await context_budgeter.abuild(
+            system_prompt,
+            messages,
+            start=state.get("context_start", 0) or 0,
+            summary=state.get("conversation_summary", "") or "",
+        )
+        state["context_start"] = window.start
+        state["conversation_summary"] = window.summary
         logger.info(
-            f"Modelo configurado com {len(TOOLS)} ferramentas e temperatura {config.temperature}"
+            f"Contexto: {len(window.messages)}/{len(messages)} mensagens, ~{window.tokens} tokens"
         )
 
+        # Preparar mensagens para o LLM
+        langchain_messages = [
+            SystemMessage(content=system_prompt + render_summary(window.summary))
+        ]
+        langchain_messages.extend(window.messages)
+
         # Executar o modelo
-        response = await model_with_tools.ainvoke(langchain_messages)
+        response = await agent.model.ainvoke(langchain_messages)
         # logger.info(f"Resposta do modelo: {response.content[:100]}...")
 
         # Verificar se há tool calls na resposta
@@ -182,17 +175,15 @@ async def agent_reasoning(state: CustomMessagesState) -> CustomMessagesState:
         return state
 
 
-# ===== VERSÃO SIMPLIFICADA COM TOOLNODE =====
+# ===== EXECUÇÃO DE FERRAMENTAS =====
 
-# Criar ToolNode configurado com tratamento de erros personalizado
-tool_node = ToolNode(
-    TOOLS,
-    # handle_tool_errors="Desculpe, ocorreu um erro ao executar a ferramenta. Tente novamente com diferentes parâmetros.",
-)
+# Executa as tool calls do turno em paralelo (limite de concorrência e timeouts
+# configuráveis), mantendo a ordem dos resultados
+tool_executor = ParallelToolExecutor(TOOLS)
 
 
 async def tool_execution_simplified(state: CustomMessagesState) -> CustomMessagesState:
-    """Versão simplificada usando ToolNode do LangGraph."""
+    """Executa as ferramentas pedidas pelo agente com o ParallelToolExecutor."""
     try:
         messages = state.get("messages", [])
         if not messages:
@@ -230,7 +221,7 @@ async def tool_execution_simplified(state: CustomMessagesState) -> CustomMessage
             )
 
         # INJEÇÃO AUTOMÁTICA DE PARÂMETROS
-        # O ToolNode vai automaticamente injetar os parâmetros via RunnableConfig
+        # As ferramentas recebem os parâmetros via RunnableConfig
         config = state.get("config")
 
         # Criar RunnableConfig com os parâmetros que serão injetados
@@ -246,10 +237,9 @@ async def tool_execution_simplified(state: CustomMessagesState) -> CustomMessage
             f"Executando {len(tools_to_execute)} ferramenta(s) para user_id: {config.user_id}"
         )
 
-        # Executar ToolNode - ele cuida de tudo automaticamente!
-        result = await tool_node.ainvoke(state, config=runnable_config)
+        # Executar as ferramentas (um ToolMessage por tool call, na mesma ordem)
+        result = {"messages": await tool_executor.execute(tool_calls, runnable_config)}
 
-        # ToolNode retorna o estado atualizado com ToolMessages
         # Adicionar as mensagens de ferramenta ao estado
         if "messages" in result:
             tool_messages = result["messages"]
@@ -358,8 +348,13 @@ def should_use_tools(state: CustomMessagesState) -> str:
         return "end"
 
 
-def create_graph() -> StateGraph:
-    """Cria o grafo LangGraph com checkpointer para memória de curto prazo."""
+def create_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
+    """
+    Cria o grafo LangGraph com checkpointer para memória de curto prazo.
+
+    Args:
+        checkpointer: Saver usado pelo grafo (padrão: InMemorySaver)
+    """
     try:
         # Criar o grafo usando CustomMessagesState
         workflow = StateGraph(CustomMessagesState)
@@ -382,8 +377,9 @@ def create_graph() -> StateGraph:
         # Configurar ponto de entrada
         workflow.set_entry_point("proactive_memory_retrieval")
 
-        # Criar checkpointer para memória de curto prazo
-        checkpointer = InMemorySaver()
+        # Checkpointer para memória de curto prazo
+        if checkpointer is None:
+            checkpointer = InMemorySaver()
 
         return workflow.compile(checkpointer=checkpointer)
 
@@ -394,3 +390,17 @@ def create_graph() -> StateGraph:
 
 # Instância global do grafo
 graph = create_graph()
+
+
+async def get_graph():
+    """
+    Retorna o grafo compilado com o checkpointer de LANG_GRAPH_CHECKPOINTER.
+
+    O grafo é recompilado uma única vez, quando o checkpointer compartilhado é
+    criado (ou recriado após um shutdown).
+    """
+    global graph
+    checkpointer = await checkpointer_manager.get()
+    if graph.checkpointer is not checkpointer:
+        graph = create_graph(checkpointer)
+    return graph
@@ -1,13 +1,15 @@
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import google.generativeai as genai
 from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
 from src.config import env
+from src.services.lang_graph.embedding_cache import EmbeddingCache, embedding_cache_key
 
 
 class LLMConfig:
     """Configuração para modelos de linguagem e embeddings."""
 
-    def __init__(self):
+    def __init__(self, embedding_cache: Optional[EmbeddingCache] = None):
         # Configurar API key
         genai.configure(api_key=env.GEMINI_API_KEY)
 
@@ -23,6 +25,8 @@ class LLMConfig:
 
         # Parâmetros do embedding
         self.embedding_dimension = 768
+        self._embedding_models: Dict[str, GoogleGenerativeAIEmbeddings] = {}
+        self.embedding_cache = embedding_cache or EmbeddingCache.from_env()
 
     def get_chat_model(
         self, model_name: Optional[str] = None, temperature: Optional[float] = None
@@ -47,25 +51,89 @@ class LLMConfig:
     def get_embedding_model(
         self, model_name: Optional[str] = None
     ) -> GoogleGenerativeAIEmbeddings:
-        """Retorna o modelo de embedding configurado."""
+        """Retorna o modelo de embedding configurado (um cliente por modelo)."""
         model = model_name or self.embedding_model_name
 
-        return GoogleGenerativeAIEmbeddings(
-            model=model,
-            google_api_key=env.GEMINI_API_KEY,
-            task_type="retrieval_document",
-            title="Memory Embedding",
-        )
+        embedding_model = self._embedding_models.get(model)
+        if embedding_model is None:
+            embedding_model = GoogleGenerativeAIEmbeddings(
+                model=model,
+                google_api_key=env.GEMINI_API_KEY,
+                task_type="retrieval_document",
+                title="Memory Embedding",
+            )
+            self._embedding_models[model] = embedding_model
+        return embedding_model
+
+    def _plan_embeddings(
+        self, texts: List[str], kind: str
+    ) -> Tuple[List[bytes], Dict[bytes, str]]:
+        """Chaves de cache de cada texto e os textos únicos ainda sem embedding"""
+        model = self.embedding_model_name
+        keys = [embedding_cache_key(model, kind, text) for text in texts]
+        pending = {}
+        for key, text in zip(keys, texts):
+            pending.setdefault(key, text)
+        return keys, pending
 
     def generate_embedding(self, text: str) -> list:
         """Gera embedding para um texto."""
-        embedding_model = self.get_embedding_model()
-        return embedding_model.embed_query(text)
+        return self._generate_cached([text], "query")[0]
+
+    def generate_embeddings(self, texts: List[str]) -> List[list]:
+        """
+        Gera embeddings para uma lista de textos.
+
+        Textos repetidos ou já em cache não são reenviados; os demais vão em uma
+        única chamada `embed_documents`.
+        """
+        return self._generate_cached(texts, "document")
+
+    def _generate_cached(self, texts: List[str], kind: str) -> List[list]:
+        if not texts:
+            return []
+        keys, pending = self._plan_embeddings(texts, kind)
+        found = self.embedding_cache.get_many(pending)
+        missing = [key for key in pending if key not in found]
+        if missing:
+            embedding_model = self.get_embedding_model()
+            missing_texts = [pending[key] for key in missing]
+            if kind == "query":
+                computed = [embedding_model.embed_query(t) for t in missing_texts]
+            else:
+                computed = embedding_model.embed_documents(missing_texts)
+            new_entries = dict(zip(missing, computed))
+            self.embedding_cache.put_many(self.embedding_model_name, new_entries)
+            found.update(new_entries)
+        return [found[key] for key in keys]
+
+    async def agenerate_embedding(self, text: str) -> list:
+        """Gera embedding para um texto sem bloquear o event loop."""
+        return (await self._agenerate_cached([text], "query"))[0]
+
+    async def agenerate_embeddings(self, texts: List[str]) -> List[list]:
+        """Gera embeddings para uma lista de textos sem bloquear o event loop."""
+        return await self._agenerate_cached(texts, "document")
 
-    def generate_embeddings(self, texts: list) -> list:
-        """Gera embeddings para uma lista de textos."""
-        embedding_model = self.get_embedding_model()
-        return embedding_model.embed_documents(texts)
+    async def _agenerate_cached(self, texts: List[str], kind: str) -> List[list]:
+        if not texts:
+            return []
+        keys, pending = self._plan_embeddings(texts, kind)
+        found = await self.embedding_cache.aget_many(pending)
+        missing = [key for key in pending if key not in found]
+        if missing:
+            embedding_model = self.get_embedding_model()
+            missing_texts = [pending[key] for key in missing]
+            if kind == "query":
+                computed = await asyncio.gather(
+                    *(embedding_model.aembed_query(t) for t in missing_texts)
+                )
+            else:
+                computed = await embedding_model.aembed_documents(missing_texts)
+            new_entries = dict(zip(missing, computed))
+            await self.embedding_cache.aput_many(self.embedding_model_name, new_entries)
+            found.update(new_entries)
+        return [found[key] for key in keys]
 
 
 # Instância global para uso em todo o módulo
@@ -1,6 +1,9 @@
 from typing import List, Optional
 import logging
-from src.services.lang_graph.repository import MemoryRepository
+from src.services.lang_graph.repository import (
+    AsyncMemoryRepository,
+    MemoryRepository,
+)
 from src.services.lang_graph.models import (
     MemoryResponse,
     MemoryType,
@@ -17,6 +20,7 @@ class MemoryManager:
 
     def __init__(self):
         self.repository = MemoryRepository()
+        self.async_repository = AsyncMemoryRepository()
 
     def get_memory(
         self,
@@ -87,31 +91,23 @@ class MemoryManager:
                     error_message="Novo conteúdo da memória não pode estar vazio",
                 )
 
-            # Obter memória atual para retornar conteúdo antigo
-            current_memory = self.repository.get_memory_by_id(memory_id, user_id)
-            if not current_memory:
+            # UPDATE ... RETURNING: checagem de dono e atualização em uma ida ao banco
+            memory = self.repository.update_memory_returning(
+                memory_id=memory_id, user_id=user_id, new_content=new_content.strip()
+            )
+            if not memory:
                 return MemoryOperationResult(
                     success=False,
                     error_message="Memória não encontrada ou não pertence ao usuário",
                 )
 
-            # Atualizar memória
-            success = self.repository.update_memory(
-                memory_id=memory_id, user_id=user_id, new_content=new_content.strip()
+            return MemoryOperationResult(
+                success=True,
+                memory_id=memory_id,
+                content=new_content,
+                memory_type=memory.memory_type,
             )
 
-            if success:
-                return MemoryOperationResult(
-                    success=True,
-                    memory_id=memory_id,
-                    content=new_content,
-                    memory_type=current_memory.memory_type,
-                )
-            else:
-                return MemoryOperationResult(
-                    success=False, error_message="Falha ao atualizar memória"
-                )
-
         except Exception as e:
             logger.error(f"Erro ao atualizar memória: {e}")
             return MemoryOperationResult(success=False, error_message=str(e))
@@ -119,34 +115,48 @@ class MemoryManager:
     def delete_memory(self, user_id: str, memory_id: str) -> MemoryOperationResult:
         """Deleta uma memória."""
         try:
-            # Obter memória antes de deletar para retornar informações
-            memory = self.repository.get_memory_by_id(memory_id, user_id)
+            # DELETE ... RETURNING devolve o conteúdo removido
+            memory = self.repository.delete_memory_returning(
+                memory_id=memory_id, user_id=user_id
+            )
             if not memory:
                 return MemoryOperationResult(
                     success=False,
                     error_message="Memória não encontrada ou não pertence ao usuário",
                 )
 
-            # Deletar memória
-            success = self.repository.delete_memory(
-                memory_id=memory_id, user_id=user_id
+            return MemoryOperationResult(
+                success=True,
+                memory_id=memory_id,
+                content=memory.content,
+                memory_type=memory.memory_type,
             )
 
-            if success:
-                return MemoryOperationResult(
+        except Exception as e:
+            logger.error(f"Erro ao deletar memória: {e}")
+            return MemoryOperationResult(success=False, error_message=str(e))
+
+    def delete_memories(
+        self, user_id: str, memory_ids: List[str]
+    ) -> List[MemoryOperationResult]:
+        """Deleta várias memórias em um único DELETE; devolve as removidas."""
+        try:
+            deleted = self.repository.delete_memories(
+                memory_ids=memory_ids, user_id=user_id
+            )
+            return [
+                MemoryOperationResult(
                     success=True,
-                    memory_id=memory_id,
+                    memory_id=memory.memory_id,
                     content=memory.content,
                     memory_type=memory.memory_type,
                 )
-            else:
-                return MemoryOperationResult(
-                    success=False, error_message="Falha ao deletar memória"
-                )
+                for memory in deleted
+            ]
 
         except Exception as e:
-            logger.error(f"Erro ao deletar memória: {e}")
-            return MemoryOperationResult(success=False, error_message=str(e))
+            logger.error(f"Erro ao deletar memórias: {e}")
+            return [MemoryOperationResult(success=False, error_message=str(e))]
 
     def get_memory_by_id(self, user_id: str, memory_id: str) -> MemoryOperationResult:
         """Obtém uma memória específica por ID."""
@@ -198,6 +208,155 @@ class MemoryManager:
             new_content=request.new_content,
         )
 
+    # ===== VERSÕES ASSÍNCRONAS (usadas pelo grafo e pelas ferramentas) =====
+
+    async def aget_memory(
+        self,
+        user_id: str,
+        query: Optional[str] = None,
+        memory_type: Optional[MemoryType] = None,
+        limit: int = 20,
+        min_relevance: float = 0.6,
+    ) -> MemoryOperationResult:
+        """Busca memórias do usuário sem bloquear o event loop."""
+        try:
+            if query:
+                memories = await self.async_repository.get_memories_semantic(
+                    user_id=user_id,
+                    query=query,
+                    limit=limit,
+                    min_relevance=min_relevance,
+                )
+            else:
+                memories = await self.async_repository.get_memories_chronological(
+                    user_id=user_id,
+                    memory_type=memory_type,
+                    limit=limit,
+                )
+
+            return MemoryOperationResult(success=True, memories=memories)
+
+        except Exception as e:
+            logger.error(f"Erro ao recuperar memórias: {e}")
+            return MemoryOperationResult(success=False, error_message=str(e))
+
+    async def asave_memory(
+        self, user_id: str, content: str, memory_type: MemoryType
+    ) -> MemoryOperationResult:
+        """Salva uma nova memória sem bloquear o event loop."""
+        try:
+            return await self.async_repository.create_memory(
+                user_id=user_id,
+                content=content,
+                memory_type=memory_type,
+            )
+
+        except Exception as e:
+            logger.error(f"Erro ao salvar memória: {e}")
+            return MemoryOperationResult(success=False, error_message=str(e))
+
+    async def aupdate_memory(
+        self, user_id: str, memory_id: str, new_content: str
+    ) -> MemoryOperationResult:
+        """Atualiza uma memória existente sem bloquear o event loop."""
+        try:
+            if not new_content.strip():
+                return MemoryOperationResult(
+                    success=False,
+                    error_message="Novo conteúdo da memória não pode estar vazio",
+                )
+
+            memory = await self.async_repository.update_memory_returning(
+                memory_id=memory_id, user_id=user_id, new_content=new_content.strip()
+            )
+            if not memory:
+                return MemoryOperationResult(
+                    success=False,
+                    error_message="Memória não encontrada ou não pertence ao usuário",
+                )
+
+            return MemoryOperationResult(
+                success=True,
+                memory_id=memory_id,
+                content=new_content,
+                memory_type=memory.memory_type,
+            )
+
+        except Exception as e:
+            logger.error(f"Erro ao atualizar memória: {e}")
+            return MemoryOperationResult(success=False, error_message=str(e))
+
+    async def adelete_memory(
+        self, user_id: str, memory_id: str
+    ) -> MemoryOperationResult:
+        """Deleta uma memória sem bloquear o event loop."""
+        try:
+            memory = await self.async_repository.delete_memory_returning(
+                memory_id=memory_id, user_id=user_id
+            )
+            if not memory:
+                return MemoryOperationResult(
+                    success=False,
+                    error_message="Memória não encontrada ou não pertence ao usuário",
+                )
+
+            return MemoryOperationResult(
+                success=True,
+                memory_id=memory_id,
+                content=memory.content,
+                memory_type=memory.memory_type,
+            )
+
+        except Exception as e:
+            logger.error(f"Erro ao deletar memória: {e}")
+            return MemoryOperationResult(success=False, error_message=str(e))
+
+    async def adelete_memories(
+        self, user_id: str, memory_ids: List[str]
+    ) -> List[MemoryOperationResult]:
+        """Deleta várias memórias em um único DELETE sem bloquear o event loop."""
+        try:
+            deleted = await self.async_repository.delete_memories(
+                memory_ids=memory_ids, user_id=user_id
+            )
+            return [
+                MemoryOperationResult(
+                    success=True,
+                    memory_id=memory.memory_id,
+                    content=memory.content,
+                    memory_type=memory.memory_type,
+                )
+                for memory in deleted
+            ]
+
+        except Exception as e:
+            logger.error(f"Erro ao deletar memórias: {e}")
+            return [MemoryOperationResult(success=False, error_message=str(e))]
+
+    async def aget_memory_by_id(
+        self, user_id: str, memory_id: str
+    ) -> MemoryOperationResult:
+        """Obtém uma memória específica por ID sem bloquear o event loop."""
+        try:
+            memory = await self.async_repository.get_memory_by_id(memory_id, user_id)
+
+            if memory:
+                return MemoryOperationResult(
+                    success=True,
+                    memory_id=memory.memory_id,
+                    content=memory.content,
+                    memory_type=memory.memory_type,
+                )
+            else:
+                return MemoryOperationResult(
+                    success=False,
+                    error_message="Memória não encontrada ou não pertence ao usuário",
+                )
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar memória por ID: {e}")
+            return MemoryOperationResult(success=False, error_message=str(e))
+
 
 # Instância global para uso em todo o módulo
 memory_manager = MemoryManager()
@@ -272,6 +272,10 @@ class CustomMessagesState(MessagesState):
     tool_outputs: List[ToolOutput] = []
     config: SessionConfig
     current_step: str = "start"
+    # Janela de contexto (ver context_window.py): início da janela no histórico
+    # e resumo das mensagens que ficaram de fora
+    context_start: int = 0
+    conversation_summary: str = ""
 
     def __getitem__(self, key):
         """Permite acesso como dicionário."""
@@ -285,6 +289,10 @@ class CustomMessagesState(MessagesState):
             return self.tool_outputs
         elif key == "current_step":
             return self.current_step
+        elif key == "context_start":
+            return self.context_start
+        elif key == "conversation_summary":
+            return self.conversation_summary
         else:
             raise KeyError(f"Chave '{key}' não encontrada")
 
@@ -300,6 +308,10 @@ class CustomMessagesState(MessagesState):
             self.tool_outputs = value
         elif key == "current_step":
             self.current_step = value
+        elif key == "context_start":
+            self.context_start = value
+        elif key == "conversation_summary":
+            self.conversation_summary = value
         else:
             raise KeyError(f"Chave '{key}' não encontrada")
 
@@ -1,9 +1,11 @@
+import asyncio
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import delete, select, text, update
 from sqlalchemy.exc import SQLAlchemyError
+from src.services.lang_graph.access_tracker import last_accessed_buffer
 from src.services.lang_graph.database import db_manager, LongTermMemory
 from src.services.lang_graph.models import (
     MemoryResponse,
@@ -11,6 +13,12 @@ from src.services.lang_graph.models import (
     MemoryOperationResult,
 )
 from src.services.lang_graph.llms import llm_config
+from src.services.lang_graph.vector_search import (
+    SemanticSearchSettings,
+    semantic_search_statement,
+    sort_by_distance,
+    user_memory_count_statement,
+)
 from src.utils.log import logger
 
 
@@ -20,6 +28,8 @@ class MemoryRepository:
     def __init__(self):
         self.db_manager = db_manager
         self.llm_config = llm_config
+        self.search_settings = SemanticSearchSettings.from_env()
+        self.access_buffer = last_accessed_buffer
 
     def create_memory(
         self, user_id: str, content: str, memory_type: MemoryType
@@ -76,35 +86,31 @@ class MemoryRepository:
 
             session = self.db_manager.get_session()
             try:
-                # Usar SQLAlchemy ORM com pgvector conforme documentação
-                from sqlalchemy import select
-
-                # Construir query base usando a sintaxe correta do pgvector
-                query_obj = session.query(
-                    LongTermMemory,
-                    LongTermMemory.embedding.cosine_distance(
-                        query_embedding_list
-                    ).label("distance"),
-                ).filter(LongTermMemory.user_id == user_id)
-
-                # Adicionar filtro de memory_type se fornecido
-                if memory_type:
-                    query_obj = query_obj.filter(
-                        LongTermMemory.memory_type == memory_type.value
-                    )
-
-                # Adicionar filtro de relevância usando cosine_distance
-                similarity_threshold = 1 - min_relevance  # Converter para distância
-                query_obj = query_obj.filter(
-                    LongTermMemory.embedding.cosine_distance(query_embedding_list)
-                    < similarity_threshold
-                )
+                settings = self.search_settings
+                memory_type_value = memory_type.value if memory_type else None
+                user_rows = None
+                if settings.needs_user_count:
+                    user_rows = session.execute(
+                        user_memory_count_statement(user_id, memory_type_value)
+                    ).scalar()
+                use_ann = settings.use_ann(user_rows)
+                if use_ann:
+                    for statement in settings.ann_session_statements(limit):
+                        session.execute(statement)
 
                 # Ordenar por similaridade (menor distância = mais similar)
-                query_obj = query_obj.order_by("distance").limit(limit)
-
-                # Executar query
-                results = query_obj.all()
+                results = session.execute(
+                    semantic_search_statement(
+                        user_id,
+                        query_embedding_list,
+                        memory_type=memory_type_value,
+                        limit=limit,
+                        min_relevance=min_relevance,
+                        use_ann=use_ann,
+                    )
+                ).all()
+                if use_ann:
+                    results = sort_by_distance(results)
 
                 # Converter para objetos MemoryResponse
                 memories = []
@@ -192,99 +198,81 @@ class MemoryRepository:
             return []
 
     def update_memory(self, memory_id: str, user_id: str, new_content: str) -> bool:
+        return self.update_memory_returning(memory_id, user_id, new_content) is not None
+
+    def update_memory_returning(
+        self, memory_id: str, user_id: str, new_content: str
+    ) -> Optional[MemoryResponse]:
+        """Atualiza a memória em um único UPDATE ... RETURNING (None se não for do usuário)."""
         try:
+            new_embedding = self.llm_config.generate_embedding(new_content)
+
             session = self.db_manager.get_session()
             try:
-                # Buscar memória
-                memory = (
-                    session.query(LongTermMemory)
-                    .filter(
-                        LongTermMemory.memory_id == memory_id,
-                        LongTermMemory.user_id == user_id,
-                    )
-                    .first()
-                )
-
-                if not memory:
-                    logger.warning(
-                        f"Memória {memory_id} não encontrada ou não pertence ao usuário {user_id}"
+                memory_db = session.execute(
+                    _update_memory_statement(
+                        memory_id, user_id, new_content, new_embedding
                     )
-                    return False
-
-                # Gerar novo embedding
-                new_embedding = self.llm_config.generate_embedding(new_content)
-
-                # Atualizar memória
-                memory.content = new_content
-                memory.embedding = (
-                    new_embedding  # pgvector.Vector aceita lista diretamente
-                )
-                memory.last_accessed = datetime.utcnow()
-
+                ).one_or_none()
                 session.commit()
-                logger.info(f"Memória {memory_id} atualizada com sucesso")
-                return True
             finally:
                 session.close()
 
+            if memory_db is None:
+                logger.warning(
+                    f"Memória {memory_id} não encontrada ou não pertence ao usuário {user_id}"
+                )
+                return None
+
+            logger.info(f"Memória {memory_id} atualizada com sucesso")
+            return _to_memory_response(memory_db)
+
         except Exception as e:
             logger.error(f"Erro ao atualizar memória: {e}")
             raise
 
     def delete_memory(self, memory_id: str, user_id: str) -> bool:
-        try:
-            session = self.db_manager.get_session()
-            try:
-                # Buscar memória
-                memory = (
-                    session.query(LongTermMemory)
-                    .filter(
-                        LongTermMemory.memory_id == memory_id,
-                        LongTermMemory.user_id == user_id,
-                    )
-                    .first()
-                )
+        return self.delete_memory_returning(memory_id, user_id) is not None
 
-                if not memory:
-                    logger.warning(
-                        f"Memória {memory_id} não encontrada ou não pertence ao usuário {user_id}"
-                    )
-                    return False
-
-                # Deletar memória
-                session.delete(memory)
-                session.commit()
-
-                logger.info(f"Memória {memory_id} deletada com sucesso")
-                return True
-            finally:
-                session.close()
-
-        except Exception as e:
-            logger.error(f"Erro ao deletar memória: {e}")
-            raise
+    def delete_memory_returning(
+        self, memory_id: str, user_id: str
+    ) -> Optional[MemoryResponse]:
+        """Remove a memória em um único DELETE ... RETURNING (None se não for do usuário)."""
+        deleted = self.delete_memories([memory_id], user_id)
+        if not deleted:
+            logger.warning(
+                f"Memória {memory_id} não encontrada ou não pertence ao usuário {user_id}"
+            )
+            return None
+        return deleted[0]
 
-    def _update_last_accessed(self, memory_ids: List[str]) -> None:
-        """Atualiza o campo last_accessed para uma lista de memórias."""
+    def delete_memories(
+        self, memory_ids: List[str], user_id: str
+    ) -> List[MemoryResponse]:
+        """Remove várias memórias do usuário em um único DELETE; devolve as removidas."""
         if not memory_ids:
-            return
+            return []
 
         try:
             session = self.db_manager.get_session()
             try:
-                session.query(LongTermMemory).filter(
-                    LongTermMemory.memory_id.in_(memory_ids)
-                ).update(
-                    {LongTermMemory.last_accessed: datetime.utcnow()},
-                    synchronize_session=False,
-                )
+                deleted = session.execute(
+                    _delete_memories_statement(memory_ids, user_id)
+                ).all()
                 session.commit()
             finally:
                 session.close()
 
+            logger.info(f"{len(deleted)} memória(s) deletada(s) com sucesso")
+            return [_to_memory_response(memory_db) for memory_db in deleted]
+
         except Exception as e:
-            logger.error(f"Erro ao atualizar last_accessed: {e}")
-            # Não levantar exceção para não interromper o fluxo principal
+            logger.error(f"Erro ao deletar memórias: {e}")
+            raise
+
+    def _update_last_accessed(self, memory_ids: List[str]) -> None:
+        """Registra o acesso às memórias (gravado em lote pelo buffer)."""
+        self.access_buffer.record(memory_ids)
 
     def get_memory_by_id(
         self, memory_id: str, user_id: str
@@ -320,5 +308,299 @@ class MemoryRepository:
             raise
 
 
-# Instância global para uso em todo o módulo
+def _to_memory_response(
+    memory_db: LongTermMemory, relevance_score: Optional[float] = None
+) -> MemoryResponse:
+    return MemoryResponse(
+        memory_id=str(memory_db.memory_id),
+        content=memory_db.content,
+        memory_type=MemoryType(memory_db.memory_type),
+        creation_datetime=memory_db.creation_datetime,
+        last_accessed=memory_db.last_accessed,
+        relevance_score=relevance_score,
+    )
+
+
+# Colunas devolvidas pelo RETURNING (sem o embedding)
+_RETURNING_COLUMNS = (
+    LongTermMemory.memory_id,
+    LongTermMemory.content,
+    LongTermMemory.memory_type,
+    LongTermMemory.creation_datetime,
+    LongTermMemory.last_accessed,
+)
+
+
+def _update_memory_statement(
+    memory_id: str, user_id: str, new_content: str, new_embedding: List[float]
+):
+    """UPDATE com a checagem de dono no WHERE e a memória atualizada no RETURNING"""
+    return (
+        update(LongTermMemory)
+        .where(
+            LongTermMemory.memory_id == memory_id,
+            LongTermMemory.user_id == user_id,
+        )
+        .values(
+            content=new_content,
+            embedding=new_embedding,
+            last_accessed=datetime.utcnow(),
+        )
+        .returning(*_RETURNING_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _delete_memories_statement(memory_ids: List[str], user_id: str):
+    """DELETE das memórias do usuário, devolvendo as que foram removidas"""
+    return (
+        delete(LongTermMemory)
+        .where(
+            LongTermMemory.memory_id.in_(memory_ids),
+            LongTermMemory.user_id == user_id,
+        )
+        .returning(*_RETURNING_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class AsyncMemoryRepository:
+    """
+    Versão assíncrona do MemoryRepository.
+
+    Usa o engine asyncpg do DatabaseManager e os embeddings assíncronos do
+    LLMConfig, então as operações de memória não bloqueiam o event loop do
+    worker enquanto esperam o Postgres ou a API de embeddings.
+    """
+
+    def __init__(self):
+        self.db_manager = db_manager
+        self.llm_config = llm_config
+        self.search_settings = SemanticSearchSettings.from_env()
+        self.access_buffer = last_accessed_buffer
+
+    async def create_memory(
+        self, user_id: str, content: str, memory_type: MemoryType
+    ) -> MemoryOperationResult:
+        try:
+            # Gerar embedding antes de pegar uma conexão do pool
+            embedding = await self.llm_config.agenerate_embedding(content)
+
+            memory = LongTermMemory(
+                user_id=user_id,
+                content=content,
+                memory_type=memory_type.value,
+                embedding=embedding,
+            )
+
+            async with await self.db_manager.get_async_session() as session:
+                session.add(memory)
+                await session.commit()
+                await session.refresh(memory)
+                logger.info(f"Memória criada com sucesso: {memory.memory_id}")
+                return MemoryOperationResult(
+                    success=True,
+                    memory_id=str(memory.memory_id),
+                    content=content,
+                    memory_type=memory_type,
+                )
+
+        except Exception as e:
+            logger.error(f"Erro ao criar memória: {e}")
+            return MemoryOperationResult(success=False, error_message=str(e))
+
+    async def get_memories_semantic(
+        self,
+        user_id: str,
+        query: str,
+        memory_type: Optional[MemoryType] = None,
+        limit: int = 20,
+        min_relevance: float = 0.6,
+    ) -> List[MemoryResponse]:
+        try:
+            query_embedding = await self.llm_config.agenerate_embedding(query)
+            query_embedding_list = (
+                query_embedding.tolist()
+                if hasattr(query_embedding, "tolist")
+                else list(query_embedding)
+            )
+
+            settings = self.search_settings
+            memory_type_value = memory_type.value if memory_type else None
+            async with await self.db_manager.get_async_session() as session:
+                user_rows = None
+                if settings.needs_user_count:
+                    user_rows = (
+                        await session.execute(
+                            user_memory_count_statement(user_id, memory_type_value)
+                        )
+                    ).scalar()
+                use_ann = settings.use_ann(user_rows)
+                if use_ann:
+                    for statement in settings.ann_session_statements(limit):
+                        await session.execute(statement)
+
+                results = (
+                    await session.execute(
+                        semantic_search_statement(
+                            user_id,
+                            query_embedding_list,
+                            memory_type=memory_type_value,
+                            limit=limit,
+                            min_relevance=min_relevance,
+                            use_ann=use_ann,
+                        )
+                    )
+                ).all()
+            if use_ann:
+                results = sort_by_distance(results)
+
+            memories = [
+                _to_memory_response(memory_db, relevance_score=1 - distance)
+                for memory_db, distance in results
+            ]
+            if memories:
+                await self._update_last_accessed([m.memory_id for m in memories])
+
+            logger.info(
+                f"Encontradas {len(memories)} memórias semânticas para query: {query}"
+            )
+            return memories
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar memórias semânticas: {e}")
+            logger.info(f"Usando fallback cronológico para query: {query}")
+            return await self.get_memories_chronological(user_id, memory_type, limit)
+
+    async def get_memories_chronological(
+        self, user_id: str, memory_type: Optional[MemoryType] = None, limit: int = 20
+    ) -> List[MemoryResponse]:
+        try:
+            statement = select(LongTermMemory).where(LongTermMemory.user_id == user_id)
+            if memory_type:
+                statement = statement.where(
+                    LongTermMemory.memory_type == memory_type.value
+                )
+            statement = statement.order_by(
+                LongTermMemory.creation_datetime.desc()
+            ).limit(limit)
+
+            async with await self.db_manager.get_async_session() as session:
+                memories_db = (await session.execute(statement)).scalars().all()
+
+            memories = [_to_memory_response(memory_db) for memory_db in memories_db]
+            if memories:
+                await self._update_last_accessed([m.memory_id for m in memories])
+
+            logger.info(f"Encontradas {len(memories)} memórias cronológicas")
+            return memories
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar memórias cronológicas: {e}")
+            return []
+
+    async def update_memory(
+        self, memory_id: str, user_id: str, new_content: str
+    ) -> bool:
+        memory = await self.update_memory_returning(memory_id, user_id, new_content)
+        return memory is not None
+
+    async def update_memory_returning(
+        self, memory_id: str, user_id: str, new_content: str
+    ) -> Optional[MemoryResponse]:
+        """Atualiza a memória em um único UPDATE ... RETURNING (None se não for do usuário)."""
+        try:
+            new_embedding = await self.llm_config.agenerate_embedding(new_content)
+
+            async with await self.db_manager.get_async_session() as session:
+                memory_db = (
+                    await session.execute(
+                        _update_memory_statement(
+                            memory_id, user_id, new_content, new_embedding
+                        )
+                    )
+                ).one_or_none()
+                await session.commit()
+
+            if memory_db is None:
+                logger.warning(
+                    f"Memória {memory_id} não encontrada ou não pertence ao usuário {user_id}"
+                )
+                return None
+
+            logger.info(f"Memória {memory_id} atualizada com sucesso")
+            return _to_memory_response(memory_db)
+
+        except Exception as e:
+            logger.error(f"Erro ao atualizar memória: {e}")
+            raise
+
+    async def delete_memory(self, memory_id: str, user_id: str) -> bool:
+        return await self.delete_memory_returning(memory_id, user_id) is not None
+
+    async def delete_memory_returning(
+        self, memory_id: str, user_id: str
+    ) -> Optional[MemoryResponse]:
+        """Remove a memória em um único DELETE ... RETURNING (None se não for do usuário)."""
+        deleted = await self.delete_memories([memory_id], user_id)
+        if not deleted:
+            logger.warning(
+                f"Memória {memory_id} não encontrada ou não pertence ao usuário {user_id}"
+            )
+            return None
+        return deleted[0]
+
+    async def delete_memories(
+        self, memory_ids: List[str], user_id: str
+    ) -> List[MemoryResponse]:
+        """Remove várias memórias do usuário em um único DELETE; devolve as removidas."""
+        if not memory_ids:
+            return []
+
+        try:
+            async with await self.db_manager.get_async_session() as session:
+                deleted = (
+                    await session.execute(
+                        _delete_memories_statement(memory_ids, user_id)
+                    )
+                ).all()
+                await session.commit()
+
+            logger.info(f"{len(deleted)} memória(s) deletada(s) com sucesso")
+            return [_to_memory_response(memory_db) for memory_db in deleted]
+
+        except Exception as e:
+            logger.error(f"Erro ao deletar memórias: {e}")
+            raise
+
+    async def _update_last_accessed(self, memory_ids: List[str]) -> None:
+        """Registra o acesso às memórias; não faz I/O no event loop."""
+        if self.access_buffer.write_behind:
+            self.access_buffer.record(memory_ids)
+        else:
+            await asyncio.to_thread(self.access_buffer.record, memory_ids)
+
+    async def get_memory_by_id(
+        self, memory_id: str, user_id: str
+    ) -> Optional[MemoryResponse]:
+        try:
+            async with await self.db_manager.get_async_session() as session:
+                memory_db = (
+                    await session.execute(
+                        select(LongTermMemory).where(
+                            LongTermMemory.memory_id == memory_id,
+                            LongTermMemory.user_id == user_id,
+                        )
+                    )
+                ).scalar_one_or_none()
+
+            return _to_memory_response(memory_db) if memory_db else None
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar memória por ID: {e}")
+            raise
+
+
+# Instâncias globais para uso em todo o módulo
 memory_repository = MemoryRepository()
+async_memory_repository = AsyncMemoryRepository()
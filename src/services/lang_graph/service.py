@@ -10,7 +10,9 @@ from src.services.lang_graph.models import (
     ChatResponse,
     MemoryResponse,
 )
-from src.services.lang_graph.graph import graph
+from src.services.lang_graph.graph import graph, get_graph
+from src.services.lang_graph.access_tracker import last_accessed_buffer
+from src.services.lang_graph.checkpointer import checkpointer_manager
 from src.services.lang_graph.database import db_manager
 from src.services.lang_graph.memory import memory_manager
 from src.utils.log import logger
@@ -138,6 +140,8 @@ class LangGraphChatbotService:
             # Executar o grafo com thread_id para manter memória de curto prazo
             config_dict = {"configurable": {"thread_id": thread_id}}
 
+            # Grafo com o checkpointer configurado (memória ou Postgres)
+            self.graph = await get_graph()
             final_state = await self.graph.ainvoke(initial_state, config=config_dict)
 
             # Extrair resposta
@@ -313,11 +317,24 @@ class LangGraphChatbotService:
     def close(self):
         """Fecha o serviço e libera recursos."""
         try:
+            last_accessed_buffer.close()
             self.db_manager.close()
             logger.info("Serviço fechado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao fechar serviço: {e}")
 
+    async def aclose(self):
+        """
+        Fecha o serviço dentro do event loop: para a retenção periódica do
+        checkpointer do grafo e então libera os demais recursos. O pool do
+        PostgresSaver é o do serviço de histórico, fechado no shutdown dele.
+        """
+        try:
+            await checkpointer_manager.shutdown()
+        except Exception as e:
+            logger.error(f"Erro ao encerrar o checkpointer do grafo: {e}")
+        self.close()
+
 
 # Instância global do serviço
 chatbot_service = LangGraphChatbotService()
@@ -0,0 +1,137 @@
+"""
+Execução das chamadas de ferramenta de um turno do agente.
+
+Quando o modelo pede várias ferramentas no mesmo turno (ex.: busca de memória
+e uma ferramenta MCP de busca), elas são executadas em paralelo, até
+`LANG_GRAPH_TOOL_MAX_CONCURRENCY` ao mesmo tempo (1 volta à execução
+sequencial). Cada chamada tem um timeout (`LANG_GRAPH_TOOL_TIMEOUT_SECONDS`,
+com exceções por ferramenta em `LANG_GRAPH_TOOL_TIMEOUTS`, no formato
+"nome=segundos,nome=segundos"). Os ToolMessages voltam na ordem em que o
+modelo pediu as chamadas; erros e timeouts viram ToolMessages com
+status="error", sem interromper as demais chamadas.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+
+from src.config import env
+from src.utils.log import logger
+
+
+def parse_tool_timeouts(value: str) -> Dict[str, float]:
+    """Converte "nome=segundos,nome=segundos" em dicionário"""
+    timeouts = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, seconds = item.partition("=")
+        if not seconds.strip():
+            raise ValueError(f"LANG_GRAPH_TOOL_TIMEOUTS inválido: {item!r}")
+        timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+
+@dataclass(frozen=True)
+class ToolExecutionSettings:
+    """Limites da execução de ferramentas por turno"""
+
+    max_concurrency: int = 4
+    timeout_seconds: float = 30.0
+    tool_timeouts: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls) -> "ToolExecutionSettings":
+        return cls(
+            max_concurrency=env.LANG_GRAPH_TOOL_MAX_CONCURRENCY,
+            timeout_seconds=env.LANG_GRAPH_TOOL_TIMEOUT_SECONDS,
+            tool_timeouts=parse_tool_timeouts(env.LANG_GRAPH_TOOL_TIMEOUTS),
+        )
+
+    def timeout_for(self, tool_name: str) -> Optional[float]:
+        timeout = self.tool_timeouts.get(tool_name, self.timeout_seconds)
+        return timeout if timeout > 0 else None
+
+
+class ParallelToolExecutor:
+    """Executa as tool calls de uma AIMessage com limite de concorrência"""
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool],
+        settings: Optional[ToolExecutionSettings] = None,
+    ):
+        self.tools = {tool.name: tool for tool in tools}
+        self.settings = settings or ToolExecutionSettings.from_env()
+
+    async def execute(
+        self, tool_calls: List[Dict[str, Any]], config: Optional[RunnableConfig] = None
+    ) -> List[ToolMessage]:
+        """Executa as chamadas e devolve um ToolMessage por chamada, em ordem"""
+        # Semáforo por turno: turnos concorrentes não dividem o mesmo limite
+        semaphore = asyncio.Semaphore(max(1, self.settings.max_concurrency))
+
+        async def run(index: int, tool_call: Dict[str, Any]) -> ToolMessage:
+            async with semaphore:
+                return await self._run_tool_call(index, tool_call, config)
+
+        return list(
+            await asyncio.gather(
+                *(run(index, tool_call) for index, tool_call in enumerate(tool_calls))
+            )
+        )
+
+    async def _run_tool_call(
+        self,
+        index: int,
+        tool_call: Dict[str, Any],
+        config: Optional[RunnableConfig],
+    ) -> ToolMessage:
+        name = tool_call.get("name", "unknown")
+        tool_call_id = tool_call.get("id") or f"call_{index}"
+
+        tool = self.tools.get(name)
+        if tool is None:
+            return self._error_message(
+                name,
+                tool_call_id,
+                f"Erro: ferramenta {name} não existe. "
+                f"Ferramentas disponíveis: {', '.join(self.tools)}",
+            )
+
+        call = {
+            "name": name,
+            "args": tool_call.get("args", {}),
+            "id": tool_call_id,
+            "type": "tool_call",
+        }
+        timeout = self.settings.timeout_for(name)
+        try:
+            result = await asyncio.wait_for(tool.ainvoke(call, config), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Ferramenta {name} excedeu o timeout de {timeout}s")
+            return self._error_message(
+                name,
+                tool_call_id,
+                f"Erro: a ferramenta {name} excedeu o tempo limite de {timeout:g}s.",
+            )
+        except Exception as e:
+            logger.error(f"Erro ao executar ferramenta {name}: {e}")
+            return self._error_message(
+                name, tool_call_id, f"Erro: {repr(e)}\n Please fix your mistakes."
+            )
+
+        if isinstance(result, ToolMessage):
+            return result
+        # Ferramentas que devolvem o conteúdo diretamente
+        return ToolMessage(content=str(result), name=name, tool_call_id=tool_call_id)
+
+    @staticmethod
+    def _error_message(name: str, tool_call_id: str, content: str) -> ToolMessage:
+        return ToolMessage(
+            content=content, name=name, tool_call_id=tool_call_id, status="error"
+        )
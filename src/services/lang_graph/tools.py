@@ -80,7 +80,7 @@ def safe_serialize_memory(memory_data: dict) -> dict:
 
 
 @tool
-def get_memory_tool(
+async def get_memory_tool(
     memory_type: str,
     query: str,
     config: RunnableConfig = None,
@@ -139,7 +139,7 @@ def get_memory_tool(
         )
 
         # Chamar memory manager
-        result = memory_manager.get_memory(
+        result = await memory_manager.aget_memory(
             user_id=user_id,
             query=input_data.query,
             memory_type=memory_type_enum,
@@ -187,7 +187,7 @@ def get_memory_tool(
 
 
 @tool
-def save_memory_tool(
+async def save_memory_tool(
     content: str,
     memory_type: str,
     config: RunnableConfig = None,
@@ -242,7 +242,7 @@ def save_memory_tool(
         )
 
         # Chamar memory manager
-        result = memory_manager.save_memory(
+        result = await memory_manager.asave_memory(
             user_id=user_id,
             content=input_data.content,
             memory_type=memory_type_enum,
@@ -276,7 +276,7 @@ def save_memory_tool(
 
 
 @tool
-def update_memory_tool(
+async def update_memory_tool(
     memory_id: str,
     new_content: str,
     config: RunnableConfig = None,
@@ -336,7 +336,7 @@ def update_memory_tool(
         )
 
         # Chamar memory manager
-        result = memory_manager.update_memory(
+        result = await memory_manager.aupdate_memory(
             user_id=user_id,
             memory_id=input_data.memory_id,
             new_content=input_data.new_content,
@@ -367,7 +367,7 @@ def update_memory_tool(
 
 
 @tool
-def delete_memory_tool(
+async def delete_memory_tool(
     memory_id: str,
     config: RunnableConfig = None,
 ) -> Dict[str, Any]:
@@ -425,7 +425,7 @@ def delete_memory_tool(
         )
 
         # Chamar memory manager
-        result = memory_manager.delete_memory(
+        result = await memory_manager.adelete_memory(
             user_id=user_id,
             memory_id=input_data.memory_id,
         )
@@ -0,0 +1,155 @@
+"""
+Estratégia da busca semântica em long_term_memory.
+
+A busca sempre filtra por usuário, o que combina mal com um índice ANN global:
+o HNSW devolve os vizinhos mais próximos de toda a tabela e o filtro por
+user_id é aplicado depois, descartando quase tudo. Por isso há duas formas de
+consulta, escolhidas por `LANG_GRAPH_MEMORY_SEARCH_STRATEGY`:
+
+- "exact": as memórias do usuário são materializadas numa CTE (pelo índice
+  composto user_id/memory_type) e ordenadas pela distância exata. Recall de
+  100%; é o mais rápido enquanto cada usuário tem poucas memórias.
+- "hnsw": ordena pela distância usando o índice HNSW, com `hnsw.ef_search`
+  configurável e, opcionalmente, `hnsw.iterative_scan` para continuar a
+  varredura até preencher o limite após o filtro por usuário.
+- "auto" (padrão): com `hnsw.iterative_scan` ligado, conta as memórias do
+  usuário (index-only scan no índice composto) e só usa o HNSW acima de
+  `LANG_GRAPH_MEMORY_ANN_MIN_USER_ROWS`. Sem iterative scan usa sempre o
+  "exact": o HNSW devolveria só `ef_search` vizinhos da tabela inteira antes
+  do filtro por usuário, e a busca voltaria poucas ou nenhuma memória.
+
+`hnsw.iterative_scan` só existe a partir do pgvector 0.8: em versões
+anteriores o `SET LOCAL` falha e a busca cai no caminho cronológico. Por isso
+vem desligado; com pgvector >= 0.8 (`SELECT extversion FROM pg_extension
+WHERE extname = 'vector'`), ligue com
+`LANG_GRAPH_MEMORY_HNSW_ITERATIVE_SCAN=relaxed_order` (ou `strict_order`).
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+
+from src.config import env
+from src.services.lang_graph.database import LongTermMemory
+
+SEARCH_STRATEGIES = ("auto", "exact", "hnsw")
+ITERATIVE_SCAN_MODES = ("off", "strict_order", "relaxed_order")
+
+
+@dataclass
+class SemanticSearchSettings:
+    """Parâmetros da busca semântica"""
+
+    strategy: str = "auto"
+    ef_search: int = 100
+    iterative_scan: str = ""
+    ann_min_user_rows: int = 2000
+
+    def __post_init__(self):
+        if self.strategy not in SEARCH_STRATEGIES:
+            raise ValueError(
+                f"LANG_GRAPH_MEMORY_SEARCH_STRATEGY inválido: {self.strategy!r} "
+                f"(opções: {', '.join(SEARCH_STRATEGIES)})"
+            )
+        if self.iterative_scan and self.iterative_scan not in ITERATIVE_SCAN_MODES:
+            raise ValueError(
+                f"LANG_GRAPH_MEMORY_HNSW_ITERATIVE_SCAN inválido: "
+                f"{self.iterative_scan!r} (opções: {', '.join(ITERATIVE_SCAN_MODES)})"
+            )
+
+    @classmethod
+    def from_env(cls) -> "SemanticSearchSettings":
+        return cls(
+            strategy=env.LANG_GRAPH_MEMORY_SEARCH_STRATEGY,
+            ef_search=env.LANG_GRAPH_MEMORY_HNSW_EF_SEARCH,
+            iterative_scan=env.LANG_GRAPH_MEMORY_HNSW_ITERATIVE_SCAN,
+            ann_min_user_rows=env.LANG_GRAPH_MEMORY_ANN_MIN_USER_ROWS,
+        )
+
+    @property
+    def iterative_scan_enabled(self) -> bool:
+        return self.iterative_scan in ("strict_order", "relaxed_order")
+
+    @property
+    def needs_user_count(self) -> bool:
+        return self.strategy == "auto" and self.iterative_scan_enabled
+
+    def use_ann(self, user_rows: Optional[int] = None) -> bool:
+        if self.strategy == "auto":
+            return (
+                self.iterative_scan_enabled
+                and (user_rows or 0) > self.ann_min_user_rows
+            )
+        return self.strategy == "hnsw"
+
+    def ann_session_statements(self, limit: int) -> List[Any]:
+        """`SET LOCAL` da consulta ANN (valem só para a transação corrente)"""
+        # ef_search limita quantos candidatos o HNSW devolve: nunca menor que o limite
+        statements = [text(f"SET LOCAL hnsw.ef_search = {max(self.ef_search, limit)}")]
+        if self.iterative_scan:
+            statements.append(
+                text(f"SET LOCAL hnsw.iterative_scan = {self.iterative_scan}")
+            )
+        return statements
+
+
+def _user_filters(entity, user_id: str, memory_type: Optional[str]) -> list:
+    filters = [entity.user_id == user_id]
+    if memory_type:
+        filters.append(entity.memory_type == memory_type)
+    return filters
+
+
+def user_memory_count_statement(user_id: str, memory_type: Optional[str]) -> Select:
+    return select(func.count()).where(
+        *_user_filters(LongTermMemory, user_id, memory_type)
+    )
+
+
+def semantic_search_statement(
+    user_id: str,
+    embedding: Sequence[float],
+    memory_type: Optional[str] = None,
+    limit: int = 20,
+    min_relevance: float = 0.6,
+    use_ann: bool = False,
+) -> Select:
+    """
+    SELECT (LongTermMemory, distance) das memórias mais próximas do embedding.
+
+    Args:
+        memory_type: Valor do MemoryType para filtrar (opcional)
+        use_ann: Ordena pelo índice HNSW em vez de materializar as memórias
+            do usuário e ordenar pela distância exata
+    """
+    max_distance = 1 - min_relevance  # relevância -> distância de cosseno
+
+    if use_ann:
+        entity = LongTermMemory
+        filters = _user_filters(entity, user_id, memory_type)
+    else:
+        # MATERIALIZED impede o planner de trocar o pré-filtro pelo HNSW
+        user_memories = (
+            select(LongTermMemory)
+            .where(*_user_filters(LongTermMemory, user_id, memory_type))
+            .cte("user_memories")
+            .prefix_with("MATERIALIZED")
+        )
+        entity = aliased(LongTermMemory, user_memories)
+        filters = []
+
+    distance = entity.embedding.cosine_distance(embedding)
+    return (
+        select(entity, distance.label("distance"))
+        .where(*filters, distance < max_distance)
+        .order_by("distance")
+        .limit(limit)
+    )
+
+
+def sort_by_distance(rows: Sequence[Any]) -> List[Any]:
+    """Reordena os resultados (o iterative_scan relaxed_order pode trocá-los)"""
+    return sorted(rows, key=lambda row: row[1])
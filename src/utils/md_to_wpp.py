@@ -1,158 +1,203 @@
 import re
 
+# Patterns are compiled once at import time: markdown_to_whatsapp runs for every
+# AI message of a history, so each call should only pay for the passes whose
+# trigger characters actually appear in the text.
+_CODE_RE = re.compile(r"```[\s\S]*?```|`[^`\n]+`")
+_CODE_PLACEHOLDER_RE = re.compile(r"¤C(\d+)¤")
+_LIST_MARKER_RE = re.compile(r"^(\s*)\*\s", re.MULTILINE)
+_FOOTNOTE_BLOCK_RE = re.compile(r"(?:\n^\[\^[^\]]+\]:.*$)+", re.MULTILINE)
+_FOOTNOTE_DEF_RE = re.compile(r"^\[\^([^\]]+)\]:\s*(.*)$")
+_FOOTNOTE_MARKER_RE = re.compile(r"\[\^([^\]]+)\]")
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+_LINK_RE = re.compile(r"\[([^\]]*)\]\(([^)]+)\)")
+_STRIKE_RE = re.compile(r"~~(.*?)~~", re.DOTALL)
+_BOLD_ITALIC_RE = re.compile(r"\*\*\*(.*?)\*\*\*", re.DOTALL)
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*", re.DOTALL)
+_BOLD_UNDERSCORE_RE = re.compile(r"__(.*?)__", re.DOTALL)
+_ITALIC_RE = re.compile(r"(?<!\*)\*([^\*\n].*?)\*(?!\*)")
+_ITALIC_UNDERSCORE_RE = re.compile(r"(?<!_)_([^\_\n].*?)_(?!_)")
+_HEADER_RE = re.compile(r"^\s*#+\s+(.+?)\s*#*$", re.MULTILINE)
+_HR_RE = re.compile(r"^\s*[-*_]{3,}\s*$", re.MULTILINE)
+_TABLE_RE = re.compile(r"(?:^\|.*\|\n?)+", re.MULTILINE)
+_TABLE_SEPARATOR_RE = re.compile(r"^[\s|: -]+$")
+_TASK_BOX_RE = re.compile(r"^(\s*[-+]|¤L¤)\s*\[[xX ]\]\s+", re.MULTILINE)
+_LIST_SPACING_RE = re.compile(r"^\*\s+", re.MULTILINE)
+_ESCAPED_QUOTE_RE = re.compile(r"\{r'\\\"(.*?)\\\"\'\}")
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+
+# Temporary tags used between the inline passes, mapped to WhatsApp markers
+_INLINE_TAGS = (
+    ("<s>", "~"),
+    ("</s>", "~"),
+    ("<b>", "*"),
+    ("</b>", "*"),
+    ("<i>", "_"),
+    ("</i>", "_"),
+)
+
+
+def _convert_table(match):
+    table_text = match.group(0).strip()
+    lines = [line.strip() for line in table_text.split("\n")]
+    rows = [
+        [cell.strip() for cell in line.split("|") if cell.strip()]
+        for line in lines
+        if "|" in line and not _TABLE_SEPARATOR_RE.match(line)
+    ]
+    if not rows:
+        return ""
+    num_columns = max(len(row) for row in rows)
+    column_widths = [0] * num_columns
+    for row in rows:
+        for i, cell in enumerate(row):
+            column_widths[i] = max(column_widths[i], len(cell))
+    formatted_rows = []
+    for row in rows:
+        formatted_cells = [
+            (row[j] if j < len(row) else "").ljust(column_widths[j])
+            for j in range(num_columns)
+        ]
+        formatted_rows.append(" | ".join(formatted_cells))
+    # Return with guaranteed spacing and monospace formatting
+    return "\n\n```" + "\n".join(formatted_rows).strip() + "```\n\n"
+
+
+def _restore_code_blocks(text, code_blocks):
+    def restore(match):
+        index = int(match.group(1))
+        return code_blocks[index] if index < len(code_blocks) else match.group(0)
+
+    return _CODE_PLACEHOLDER_RE.sub(restore, text)
+
 
 def markdown_to_whatsapp(text):
     """
     Convert Markdown formatting to WhatsApp-compatible syntax with a robust,
     order-of-operations approach. This version includes perfectly aligned tables,
     corrected newline handling, and robust adjacent-formatting logic.
+
+    The passes run in a fixed order over precompiled patterns; a pass is skipped
+    when the text cannot contain a match, so plain replies cost a handful of
+    substring checks instead of the full pipeline.
     """
     # 0. Normalize newlines to prevent issues with \r\n
     converted_text = text.replace("\r\n", "\n")
 
     # 1. PRESERVATION STAGE
     code_blocks = []
+    if "`" in converted_text:
 
-    def preserve_code(match):
-        code_blocks.append(match.group(0))
-        return f"¤C{len(code_blocks)-1}¤"
+        def preserve_code(match):
+            code_blocks.append(match.group(0))
+            return f"¤C{len(code_blocks)-1}¤"
 
-    converted_text = re.sub(r"```[\s\S]*?```|`[^`\n]+`", preserve_code, converted_text)
+        converted_text = _CODE_RE.sub(preserve_code, converted_text)
 
-    # Protect list markers before they can be confused with italics
-    converted_text = re.sub(
-        r"^(\s*)\*\s", r"\1¤L¤ ", converted_text, flags=re.MULTILINE
-    )
+    has_asterisk = "*" in converted_text
+    if has_asterisk:
+        # Protect list markers before they can be confused with italics
+        converted_text = _LIST_MARKER_RE.sub(r"\1¤L¤ ", converted_text)
 
     # 2. DATA EXTRACTION & INLINE CONVERSIONS
     footnote_defs = {}
+    if "[^" in converted_text:
 
-    def collect_footnote_def(match):
-        key, value = match.group(1), match.group(2).strip()
-        footnote_defs[key] = value
-        return ""
-
-    # Use finditer to collect, then sub to remove the whole block to preserve spacing
-    footnote_block_pattern = re.compile(r"(?:\n^\[\^[^\]]+\]:.*$)+", re.MULTILINE)
-    for match in footnote_block_pattern.finditer(converted_text):
-        for line in match.group(0).strip().split("\n"):
-            line_match = re.match(r"^\[\^([^\]]+)\]:\s*(.*)$", line)
-            if line_match:
-                collect_footnote_def(line_match)
+        def collect_footnote_block(match):
+            for line in match.group(0).strip().split("\n"):
+                line_match = _FOOTNOTE_DEF_RE.match(line)
+                if line_match:
+                    footnote_defs[line_match.group(1)] = line_match.group(2).strip()
+            return ""
 
-    converted_text = footnote_block_pattern.sub("", converted_text)
+        converted_text = _FOOTNOTE_BLOCK_RE.sub(collect_footnote_block, converted_text)
 
-    # Run image conversion BEFORE link conversion
-    converted_text = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", r"[Image: \1]", converted_text)
-    converted_text = re.sub(r"\[([^\]]*)\]\(([^)]+)\)", r"\2", converted_text)
+    if "](" in converted_text:
+        # Run image conversion BEFORE link conversion
+        if "![" in converted_text:
+            converted_text = _IMAGE_RE.sub(r"[Image: \1]", converted_text)
+        converted_text = _LINK_RE.sub(r"\2", converted_text)
 
     # 3. INLINE FORMATTING (using temporary placeholders)
     # The order is critical: multi-character markers first.
-    converted_text = re.sub(r"~~(.*?)~~", r"<s>\1</s>", converted_text, flags=re.DOTALL)
+    if "~~" in converted_text:
+        converted_text = _STRIKE_RE.sub(r"<s>\1</s>", converted_text)
 
-    # Handle triple asterisk pattern (***text***) for bold+italic
-    converted_text = re.sub(
-        r"\*\*\*(.*?)\*\*\*", r"<i><b>\1</b></i>", converted_text, flags=re.DOTALL
-    )
+    if has_asterisk and "**" in converted_text:
+        # Handle triple asterisk pattern (***text***) for bold+italic
+        if "***" in converted_text:
+            converted_text = _BOLD_ITALIC_RE.sub(r"<i><b>\1</b></i>", converted_text)
+        converted_text = _BOLD_RE.sub(r"<b>\1</b>", converted_text)
 
-    converted_text = re.sub(
-        r"\*\*(.*?)\*\*", r"<b>\1</b>", converted_text, flags=re.DOTALL
-    )
-    converted_text = re.sub(r"__(.*?)__", r"<b>\1</b>", converted_text, flags=re.DOTALL)
+    has_underscore = "_" in converted_text
+    if has_underscore and "__" in converted_text:
+        converted_text = _BOLD_UNDERSCORE_RE.sub(r"<b>\1</b>", converted_text)
 
     # Specific regex for italics to prevent conflict with bold markers
-    converted_text = re.sub(
-        r"(?<!\*)\*([^\*\n].*?)\*(?!\*)", r"<i>\1</i>", converted_text
-    )
-    converted_text = re.sub(r"(?<!_)_([^\_\n].*?)_(?!_)", r"<i>\1</i>", converted_text)
+    if "*" in converted_text:
+        converted_text = _ITALIC_RE.sub(r"<i>\1</i>", converted_text)
+    if has_underscore:
+        converted_text = _ITALIC_UNDERSCORE_RE.sub(r"<i>\1</i>", converted_text)
 
     # Convert placeholders to final WhatsApp format
-    converted_text = converted_text.replace("<s>", "~").replace("</s>", "~")
-    converted_text = converted_text.replace("<b>", "*").replace("</b>", "*")
-    converted_text = converted_text.replace("<i>", "_").replace("</i>", "_")
+    if "<" in converted_text:
+        for tag, marker in _INLINE_TAGS:
+            converted_text = converted_text.replace(tag, marker)
 
     # 4. BLOCK-LEVEL CONVERSIONS
     # FIX 1: Add a newline after headers to ensure separation.
-    converted_text = re.sub(
-        r"^\s*#+\s+(.+?)\s*#*$", r"*\1*\n", converted_text, flags=re.MULTILINE
-    )
+    if "#" in converted_text:
+        converted_text = _HEADER_RE.sub(r"*\1*\n", converted_text)
 
     # Replace horizontal rules with a guaranteed paragraph break
-    converted_text = re.sub(
-        r"^\s*[-*_]{3,}\s*$", "\n", converted_text, flags=re.MULTILINE
-    )
+    converted_text = _HR_RE.sub("\n", converted_text)
 
-    def convert_table(match):
-        table_text = match.group(0).strip()
-        lines = [line.strip() for line in table_text.split("\n")]
-        rows = [
-            [cell.strip() for cell in line.split("|") if cell.strip()]
-            for line in lines
-            if "|" in line and not re.match(r"^[\s|: -]+$", line)
-        ]
-        if not rows:
-            return ""
-        num_columns = max(len(row) for row in rows) if rows else 0
-        column_widths = [0] * num_columns
-        for row in rows:
-            for i, cell in enumerate(row):
-                if i < num_columns:
-                    column_widths[i] = max(column_widths[i], len(cell))
-        formatted_table = ""
-        for i, row in enumerate(rows):
-            formatted_cells = []
-            for j in range(num_columns):
-                cell_text = row[j] if j < len(row) else ""
-                formatted_cells.append(cell_text.ljust(column_widths[j]))
-            formatted_table += " | ".join(formatted_cells) + "\n"
-        # Return with guaranteed spacing and monospace formatting
-        return f"\n\n```{formatted_table.strip()}```\n\n"
-
-    converted_text = re.sub(
-        r"(?:^\|.*\|\n?)+", convert_table, converted_text, flags=re.MULTILINE
-    )
+    if "|" in converted_text:
+        converted_text = _TABLE_RE.sub(_convert_table, converted_text)
 
-    converted_text = re.sub(
-        r"^(\s*[-+]|¤L¤)\s*\[[xX ]\]\s+", r"\1 ", converted_text, flags=re.MULTILINE
-    )
+    if "[" in converted_text:
+        converted_text = _TASK_BOX_RE.sub(r"\1 ", converted_text)
 
     footnote_map = {}
-    footnote_counter = 1
-
-    def replace_footnote_marker(match):
-        nonlocal footnote_counter, footnote_map
-        key = match.group(1)
-        if key in footnote_defs:
-            if key not in footnote_map:
-                footnote_map[key] = footnote_counter
-                footnote_counter += 1
-            return f"[{footnote_map[key]}]"
-        return ""
+    if "[^" in converted_text:
+
+        def replace_footnote_marker(match):
+            key = match.group(1)
+            if key in footnote_defs:
+                if key not in footnote_map:
+                    footnote_map[key] = len(footnote_map) + 1
+                return f"[{footnote_map[key]}]"
+            return ""
 
-    converted_text = re.sub(r"\[\^([^\]]+)\]", replace_footnote_marker, converted_text)
+        converted_text = _FOOTNOTE_MARKER_RE.sub(
+            replace_footnote_marker, converted_text
+        )
 
     # 5. RESTORATION & FINAL CLEANUP
-    converted_text = converted_text.replace("¤L¤ ", "* ")
-    
-    # Normalize list spacing to ensure single space after asterisk
-    converted_text = re.sub(r"^\*\s+", "* ", converted_text, flags=re.MULTILINE)
-    
-    for i, code_block in enumerate(code_blocks):
-        converted_text = converted_text.replace(f"¤C{i}¤", code_block)
+    if "¤L¤" in converted_text:
+        converted_text = converted_text.replace("¤L¤ ", "* ")
+
+    if "*" in converted_text:
+        # Normalize list spacing to ensure single space after asterisk
+        converted_text = _LIST_SPACING_RE.sub("* ", converted_text)
+
+    if code_blocks:
+        converted_text = _restore_code_blocks(converted_text, code_blocks)
 
     # FIX 2: Clean up the specific escaped quote pattern.
-    converted_text = re.sub(r"\{r'\\\"(.*?)\\\"\'\}", r'"\1"', converted_text)
-    converted_text = re.sub(r'"', "'", converted_text)
+    if "{r'" in converted_text:
+        converted_text = _ESCAPED_QUOTE_RE.sub(r'"\1"', converted_text)
+    converted_text = converted_text.replace('"', "'")
 
     # Clean up excess newlines
-    converted_text = re.sub(r"\n{3,}", "\n\n", converted_text)
+    if "\n\n\n" in converted_text:
+        converted_text = _EXCESS_NEWLINES_RE.sub("\n\n", converted_text)
     converted_text = converted_text.strip()
 
     if footnote_map:
         # Append footnote block with its own spacing
         footnotes_text = "\n\n---\n_Notas:_\n"
-        sorted_footnotes = sorted(footnote_map.items(), key=lambda item: item[1])
-        for key, num in sorted_footnotes:
+        for key, num in footnote_map.items():
             footnotes_text += f"[{num}] {footnote_defs.get(key, '')}\n"
         converted_text += footnotes_text.rstrip()
 
@@ -160,150 +205,153 @@ def markdown_to_whatsapp(text):
 
 
 # --- Comprehensive Test Cases ---
+TEST_CASES = [
+    {
+        "name": "Bold formatting (asterisk)",
+        "input": "**Bold text** and **another bold**",
+        "expected_contains": ["*Bold text*", "*another bold*"],
+    },
+    {
+        "name": "Bold formatting (underscore)",
+        "input": "__Bold text__ and __another bold__",
+        "expected_contains": ["*Bold text*", "*another bold*"],
+    },
+    {
+        "name": "Italic formatting (asterisk)",
+        "input": "*Italic text* and *another italic*",
+        "expected_contains": ["_Italic text_", "_another italic_"],
+    },
+    {
+        "name": "Italic formatting (underscore)",
+        "input": "_Italic text_ and _another italic_",
+        "expected_contains": ["_Italic text_", "_another italic_"],
+    },
+    {
+        "name": "Mixed bold and italic",
+        "input": "**Bold** with *italic* text",
+        "expected_contains": ["*Bold*", "_italic_"],
+    },
+    {
+        "name": "Complex mixed formatting",
+        "input": "**Bold** and *italic* and __more bold__ and _more italic_",
+        "expected_contains": ["*Bold*", "_italic_", "*more bold*", "_more italic_"],
+    },
+    {
+        "name": "Strikethrough",
+        "input": "~~strikethrough text~~",
+        "expected_contains": ["~strikethrough text~"],
+    },
+    {
+        "name": "Headers to bold",
+        "input": "# Header 1\n## Header 2\n### Header 3",
+        "expected_contains": ["*Header 1*", "*Header 2*", "*Header 3*"],
+    },
+    {
+        "name": "Links extraction",
+        "input": "Visit [Google](https://google.com) for search",
+        "expected_contains": ["https://google.com"],
+    },
+    {
+        "name": "Image conversion",
+        "input": "![Alt text](image.png)",
+        "expected_contains": ["[Image: Alt text]"],
+    },
+    {
+        "name": "Inline code preservation",
+        "input": "`inline code` and more text",
+        "expected_contains": ["`inline code`"],
+    },
+    {
+        "name": "Code block preservation",
+        "input": "```\ncode block\nwith multiple lines\n```",
+        "expected_contains": ["```\ncode block\nwith multiple lines\n```"],
+    },
+    {
+        "name": "Mixed code types",
+        "input": "`inline code` and ```\ncode block\n```",
+        "expected_contains": ["`inline code`", "```\ncode block\n```"],
+    },
+    {
+        "name": "Code with formatting around it",
+        "input": "Some **bold** and `code` and *italic*",
+        "expected_contains": ["*bold*", "`code`", "_italic_"],
+    },
+    {
+        "name": "Empty bold/italic",
+        "input": "**bold** and ** ** and *italic* and * *",
+        "expected_contains": ["*bold*", "_italic_"],
+    },
+    {
+        "name": "Nested formatting attempt",
+        "input": "**bold *and italic* together**",
+        "expected_contains": ["*bold _and italic_ together*"],
+    },
+    {
+        "name": "Adjacent formatting",
+        "input": "**bold***italic*",
+        "expected_contains": ["*bold*", "_italic_"],
+    },
+    {
+        "name": "Formatting in headers",
+        "input": "# Header with **bold** and *italic*",
+        "expected_contains": ["*Header with *bold* and _italic_*"],
+    },
+    {
+        "name": "Code in formatting",
+        "input": "**bold with `code` inside** and *italic with `code`*",
+        "expected_contains": ["*bold with `code` inside*", "_italic with `code`_"],
+    },
+    {
+        "name": "Multiple consecutive formatting",
+        "input": "**bold1** **bold2** *italic1* *italic2*",
+        "expected_contains": ["*bold1*", "*bold2*", "_italic1_", "_italic2_"],
+    },
+    {
+        "name": "Basic mixed",
+        "input": "**Bold text** and *italic text*",
+        "expected_contains": ["*Bold text*", "_italic text_"],
+    },
+    {
+        "name": "Underscore variations",
+        "input": "__Another bold__ and _another italic_",
+        "expected_contains": ["*Another bold*", "_another italic_"],
+    },
+    {
+        "name": "Complex mixed with code and strike",
+        "input": "**Bold** with *italic* and ~~strikethrough~~ and `code`",
+        "expected_contains": ["*Bold*", "_italic_", "~strikethrough~", "`code`"],
+    },
+    {
+        "name": "List with formatting",
+        "input": "List with formatting:\n* **Bold item**\n* *Italic item*\n* `Code item`",
+        "expected_contains": ["*Bold item*", "_Italic item_", "`Code item`"],
+    },
+    {
+        "name": "Complex document structure",
+        "input": "# Header\n\nSome **bold** and *italic* text.\n\n> Quote here\n\n* List item 1\n* List item 2\n\n```\ncode block\n```",
+        "expected_contains": [
+            "*Header*",
+            "*bold*",
+            "_italic_",
+            "```\ncode block\n```",
+        ],
+    },
+    {
+        "name": "Triple star pattern",
+        "input": "***Disque Denúncia:***",
+        "expected_contains": ["_*Disque Denúncia:*_"],
+    },
+    {
+        "name": "List with bold formatting (single space)",
+        "input": "*   **`calculator_add`**: Soma dois números.",
+        "expected_contains": ["* *`calculator_add`*: Soma dois números."],
+    },
+]
+
+
 def run_tests():
     """Run comprehensive tests to validate the converter."""
-    test_cases = [
-        {
-            "name": "Bold formatting (asterisk)",
-            "input": "**Bold text** and **another bold**",
-            "expected_contains": ["*Bold text*", "*another bold*"],
-        },
-        {
-            "name": "Bold formatting (underscore)",
-            "input": "__Bold text__ and __another bold__",
-            "expected_contains": ["*Bold text*", "*another bold*"],
-        },
-        {
-            "name": "Italic formatting (asterisk)",
-            "input": "*Italic text* and *another italic*",
-            "expected_contains": ["_Italic text_", "_another italic_"],
-        },
-        {
-            "name": "Italic formatting (underscore)",
-            "input": "_Italic text_ and _another italic_",
-            "expected_contains": ["_Italic text_", "_another italic_"],
-        },
-        {
-            "name": "Mixed bold and italic",
-            "input": "**Bold** with *italic* text",
-            "expected_contains": ["*Bold*", "_italic_"],
-        },
-        {
-            "name": "Complex mixed formatting",
-            "input": "**Bold** and *italic* and __more bold__ and _more italic_",
-            "expected_contains": ["*Bold*", "_italic_", "*more bold*", "_more italic_"],
-        },
-        {
-            "name": "Strikethrough",
-            "input": "~~strikethrough text~~",
-            "expected_contains": ["~strikethrough text~"],
-        },
-        {
-            "name": "Headers to bold",
-            "input": "# Header 1\n## Header 2\n### Header 3",
-            "expected_contains": ["*Header 1*", "*Header 2*", "*Header 3*"],
-        },
-        {
-            "name": "Links extraction",
-            "input": "Visit [Google](https://google.com) for search",
-            "expected_contains": ["https://google.com"],
-        },
-        {
-            "name": "Image conversion",
-            "input": "![Alt text](image.png)",
-            "expected_contains": ["[Image: Alt text]"],
-        },
-        {
-            "name": "Inline code preservation",
-            "input": "`inline code` and more text",
-            "expected_contains": ["`inline code`"],
-        },
-        {
-            "name": "Code block preservation",
-            "input": "```\ncode block\nwith multiple lines\n```",
-            "expected_contains": ["```\ncode block\nwith multiple lines\n```"],
-        },
-        {
-            "name": "Mixed code types",
-            "input": "`inline code` and ```\ncode block\n```",
-            "expected_contains": ["`inline code`", "```\ncode block\n```"],
-        },
-        {
-            "name": "Code with formatting around it",
-            "input": "Some **bold** and `code` and *italic*",
-            "expected_contains": ["*bold*", "`code`", "_italic_"],
-        },
-        {
-            "name": "Empty bold/italic",
-            "input": "**bold** and ** ** and *italic* and * *",
-            "expected_contains": ["*bold*", "_italic_"],
-        },
-        {
-            "name": "Nested formatting attempt",
-            "input": "**bold *and italic* together**",
-            "expected_contains": ["*bold _and italic_ together*"],
-        },
-        {
-            "name": "Adjacent formatting",
-            "input": "**bold***italic*",
-            "expected_contains": ["*bold*", "_italic_"],
-        },
-        {
-            "name": "Formatting in headers",
-            "input": "# Header with **bold** and *italic*",
-            "expected_contains": ["*Header with *bold* and _italic_*"],
-        },
-        {
-            "name": "Code in formatting",
-            "input": "**bold with `code` inside** and *italic with `code`*",
-            "expected_contains": ["*bold with `code` inside*", "_italic with `code`_"],
-        },
-        {
-            "name": "Multiple consecutive formatting",
-            "input": "**bold1** **bold2** *italic1* *italic2*",
-            "expected_contains": ["*bold1*", "*bold2*", "_italic1_", "_italic2_"],
-        },
-        {
-            "name": "Basic mixed",
-            "input": "**Bold text** and *italic text*",
-            "expected_contains": ["*Bold text*", "_italic text_"],
-        },
-        {
-            "name": "Underscore variations",
-            "input": "__Another bold__ and _another italic_",
-            "expected_contains": ["*Another bold*", "_another italic_"],
-        },
-        {
-            "name": "Complex mixed with code and strike",
-            "input": "**Bold** with *italic* and ~~strikethrough~~ and `code`",
-            "expected_contains": ["*Bold*", "_italic_", "~strikethrough~", "`code`"],
-        },
-        {
-            "name": "List with formatting",
-            "input": "List with formatting:\n* **Bold item**\n* *Italic item*\n* `Code item`",
-            "expected_contains": ["*Bold item*", "_Italic item_", "`Code item`"],
-        },
-        {
-            "name": "Complex document structure",
-            "input": "# Header\n\nSome **bold** and *italic* text.\n\n> Quote here\n\n* List item 1\n* List item 2\n\n```\ncode block\n```",
-            "expected_contains": [
-                "*Header*",
-                "*bold*",
-                "_italic_",
-                "```\ncode block\n```",
-            ],
-        },
-        {
-            "name": "Triple star pattern",
-            "input": "***Disque Denúncia:***",
-            "expected_contains": ["_*Disque Denúncia:*_"],
-        },
-        {
-            "name": "List with bold formatting (single space)",
-            "input": "*   **`calculator_add`**: Soma dois números.",
-            "expected_contains": ["* *`calculator_add`*: Soma dois números."],
-        },
-    ]
+    test_cases = TEST_CASES
     print("=== RUNNING COMPREHENSIVE VALIDATION TESTS ===\n")
     passed_tests = 0
     for i, test in enumerate(test_cases, 1):
@@ -0,0 +1,44 @@
+"""
+Runs sintéticos de avaliação, no formato que o TaskProcessor produz.
+
+Cada run tem avaliações one-turn e multi-turn com scores discretos, durações
+com 4 casas decimais e uma fração de erros. Usados nos testes e no benchmark
+do ResultAnalyzer.
+"""
+
+import random
+from typing import Any, Dict, List
+
+
+def synthetic_runs(runs: int, metrics: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Runs no formato do TaskOutput, com ~2% de avaliações com erro"""
+    rng = random.Random(seed)
+    names = [f"metric_{index:02d}" for index in range(metrics)]
+    result = []
+    for index in range(runs):
+        if rng.random() < 0.001:
+            result.append({"task_data": {"id": str(index)}, "error": "falha"})
+            continue
+        evaluations = []
+        for name in names:
+            evaluation = {
+                "metric_name": name,
+                "duration_seconds": round(rng.uniform(0.2, 8.0), 4),
+                "score": rng.choice((0.0, 0.25, 0.5, 0.75, 1.0)),
+                "annotations": "Score: 1",
+                "has_error": False,
+                "error_message": None,
+            }
+            if rng.random() < 0.02:
+                evaluation.update(score=None, has_error=True, error_message="erro")
+            evaluations.append(evaluation)
+        split = metrics // 2
+        result.append(
+            {
+                "duration_seconds": round(rng.uniform(1.0, 30.0), 4),
+                "task_data": {"id": str(index), "prompt": "pergunta"},
+                "one_turn_analysis": {"evaluations": evaluations[:split]},
+                "multi_turn_analysis": {"evaluations": evaluations[split:]},
+            }
+        )
+    return result
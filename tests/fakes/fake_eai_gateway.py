@@ -0,0 +1,182 @@
+"""
+EAI Gateway falso para testes e benchmarks da espera por respostas.
+
+Servidor HTTP local (FastAPI + uvicorn em uma thread) com os endpoints que o
+EAIClient usa para enviar mensagens e buscar respostas. Cada mensagem fica
+pronta `ready_after` segundos depois do envio (um número ou uma função que
+sorteia o atraso de cada mensagem). Com `chunks`, o stream SSE envia cada
+trecho da resposta como um evento `processing` parcial, um a cada
+`chunk_interval` segundos, antes do evento final. SSE e long polling podem ser
+desligados para simular versões do gateway sem esses recursos, e
+`stream_status` faz o endpoint de stream responder com esse status; o gateway
+conta as requisições e as conexões TCP (portas de origem distintas) e guarda
+o instante em que cada resposta ficou pronta, para medir a latência
+adicionada pelo cliente.
+
+    with FakeEAIGateway(ready_after=0.5, sse=False) as gateway:
+        client = EAIClient(base_url=gateway.url)
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence, Set, Tuple, Union
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class FakeMessage:
+    ready_at: float
+    sent_at: float = field(default_factory=time.monotonic)
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+    failed: bool = False
+
+    @property
+    def ready(self) -> bool:
+        return time.monotonic() >= self.ready_at
+
+    def payload(self, message_id: str) -> dict:
+        if self.failed:
+            return {"status": "failed", "error": "falha simulada"}
+        return {
+            "status": "completed",
+            "data": {"messages": [{"content": f"resposta de {message_id}"}]},
+        }
+
+
+class FakeEAIGateway:
+    """Gateway falso com SSE e long polling opcionais"""
+
+    def __init__(
+        self,
+        ready_after: Union[float, Callable[[], float]] = 0.5,
+        sse: bool = True,
+        long_poll: bool = True,
+        fail: bool = False,
+        keepalive_interval: float = 0.05,
+        chunks: Sequence[str] = (),
+        chunk_interval: float = 0.1,
+        stream_status: Optional[int] = None,
+    ):
+        self.ready_after = ready_after
+        self.sse = sse
+        self.long_poll = long_poll
+        self.fail = fail
+        self.keepalive_interval = keepalive_interval
+        self.chunks = list(chunks)
+        self.chunk_interval = chunk_interval
+        self.stream_status = stream_status
+        self.messages: Dict[str, FakeMessage] = {}
+        self.requests: Counter = Counter()
+        self.connections: Set[Tuple[str, int]] = set()
+        self.url: Optional[str] = None
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self.app = self._build_app()
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def track_connections(request: Request, call_next):
+            self.connections.add((request.client.host, request.client.port))
+            return await call_next(request)
+
+        @app.post("/api/v1/message/webhook/user")
+        async def webhook_user(request: Request):
+            self.requests["send"] += 1
+            await request.json()
+            message_id = uuid.uuid4().hex
+            delay = (
+                self.ready_after() if callable(self.ready_after) else self.ready_after
+            )
+            message = FakeMessage(ready_at=time.monotonic() + delay, failed=self.fail)
+            self.messages[message_id] = message
+            asyncio.get_running_loop().call_later(delay, message.event.set)
+            return {"message_id": message_id}
+
+        @app.get("/api/v1/message/response")
+        async def message_response(message_id: str, wait: Optional[float] = None):
+            self.requests["poll"] += 1
+            message = self.messages.get(message_id)
+            if message is None:
+                return JSONResponse({"detail": "message not found"}, status_code=404)
+            if not message.ready and wait and self.long_poll:
+                self.requests["held"] += 1
+                try:
+                    await asyncio.wait_for(message.event.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            if not message.ready:
+                return JSONResponse({"detail": "not ready"}, status_code=404)
+            return message.payload(message_id)
+
+        @app.get("/api/v1/message/response/stream")
+        async def message_stream(message_id: str):
+            self.requests["stream"] += 1
+            message = self.messages.get(message_id)
+            if self.stream_status is not None:
+                return JSONResponse(
+                    {"detail": "stream error"}, status_code=self.stream_status
+                )
+            if not self.sse or message is None:
+                return JSONResponse({"detail": "Not Found"}, status_code=404)
+
+            async def events():
+                yield f"data: {json.dumps({'status': 'processing'})}\n\n"
+                for index, chunk in enumerate(self.chunks):
+                    send_at = message.sent_at + (index + 1) * self.chunk_interval
+                    await asyncio.sleep(max(0.0, send_at - time.monotonic()))
+                    partial = {"status": "processing", "data": {"delta": chunk}}
+                    yield f"data: {json.dumps(partial)}\n\n"
+                while not message.ready:
+                    try:
+                        await asyncio.wait_for(
+                            message.event.wait(), self.keepalive_interval
+                        )
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+                yield f"data: {json.dumps(message.payload(message_id))}\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        return app
+
+    def start(self) -> "FakeEAIGateway":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        config = uvicorn.Config(self.app, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [sock]}, daemon=True
+        )
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+            self._server = None
+
+    def __enter__(self) -> "FakeEAIGateway":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def added_latency(self, message_id: str, received_at: float) -> float:
+        """Segundos entre a resposta ficar pronta e o cliente recebê-la"""
+        return received_at - self.messages[message_id].ready_at
@@ -0,0 +1,135 @@
+"""
+Servidor falso de LLM juiz, compatível com o Azure OpenAI, que simula throttling.
+
+Servidor HTTP local (FastAPI + uvicorn em uma thread) com o endpoint de chat
+completions do Azure OpenAI, então o AzureOpenAIClient real (e os erros do SDK
+da OpenAI) podem ser usados contra ele. Cada requisição leva `latency`
+segundos. Acima de `capacity` requisições simultâneas o servidor responde 429,
+com `Retry-After` se `retry_after` for dado, como o Azure faz quando a cota do
+deployment estoura; `error_rate` sorteia respostas 503. O servidor conta as
+respostas por tipo e a maior concorrência que recebeu.
+
+    with FakeJudgeServer(capacity=8) as server:
+        judge = AzureOpenAIClient(
+            "gpt-4o", max_retries=0, azure_endpoint=server.url, api_key="x"
+        )
+"""
+
+import asyncio
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class FakeJudgeServer:
+    """Juiz falso com limite de concorrência e erros 5xx sorteados"""
+
+    def __init__(
+        self,
+        capacity: int = 8,
+        latency: float = 0.02,
+        retry_after: Optional[float] = None,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.capacity = capacity
+        self.latency = latency
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests: Counter = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.url: Optional[str] = None
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self.app = self._build_app()
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/openai/deployments/{deployment}/chat/completions")
+        async def chat_completions(deployment: str, request: Request):
+            body = await request.json()
+            if self.in_flight >= self.capacity:
+                self.requests["throttled"] += 1
+                headers = {}
+                if self.retry_after is not None:
+                    headers["retry-after-ms"] = str(int(self.retry_after * 1000))
+                return JSONResponse(
+                    {"error": {"code": "429", "message": "Rate limit exceeded"}},
+                    status_code=429,
+                    headers=headers,
+                )
+
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.latency)
+                if self.random.random() < self.error_rate:
+                    self.requests["error"] += 1
+                    return JSONResponse(
+                        {"error": {"code": "503", "message": "Service unavailable"}},
+                        status_code=503,
+                    )
+                self.requests["ok"] += 1
+                prompt = body["messages"][-1]["content"]
+                return {
+                    "id": f"chatcmpl-{self.requests['ok']}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": deployment,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": f"Score: 1\nAvaliado: {prompt[:40]}",
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": len(prompt) // 4,
+                        "completion_tokens": 10,
+                        "total_tokens": len(prompt) // 4 + 10,
+                    },
+                }
+            finally:
+                self.in_flight -= 1
+
+        return app
+
+    def start(self) -> "FakeJudgeServer":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        config = uvicorn.Config(self.app, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [sock]}, daemon=True
+        )
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+            self._server = None
+
+    def __enter__(self) -> "FakeJudgeServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,208 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from src.evaluations.core.eval.dataloader import DataLoader
+from src.evaluations.core.eval.evaluators.base import BaseOneTurnEvaluator
+from src.evaluations.core.eval.runner.journal import RunJournal
+from src.evaluations.core.eval.runner.orchestrator import AsyncExperimentRunner
+from src.evaluations.core.eval.schemas import EvaluationResult
+
+TASKS = 20
+
+
+class FakeEvaluator(BaseOneTurnEvaluator):
+    """Avaliador sem juiz; trava a partir da chamada `hang_after`"""
+
+    name = "fake"
+
+    def __init__(self, hang_after=None):
+        super().__init__(judge_client=None)
+        self.hang_after = hang_after
+        self.evaluated = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def evaluate(self, agent_response, task):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.hang_after is not None and len(self.evaluated) >= self.hang_after:
+                await asyncio.Event().wait()
+            await asyncio.sleep(0.001 * (int(task.id) % 3))
+            self.evaluated.append(task.id)
+            return EvaluationResult(score=int(task.id) % 2, annotations=task.prompt)
+        finally:
+            self.in_flight -= 1
+
+
+def make_loader(count=TASKS):
+    df = pd.DataFrame(
+        {"id": range(count), "prompt": [f"pergunta {i}" for i in range(count)]}
+    )
+    return DataLoader(
+        df,
+        id_col="id",
+        prompt_col="prompt",
+        dataset_name="teste",
+        dataset_description="teste",
+        upload_to_bq=False,
+    )
+
+
+def make_runner(tmp_path, evaluator, journal=True, resume=False):
+    return AsyncExperimentRunner(
+        experiment_name="journal",
+        experiment_description="teste",
+        metadata={},
+        evaluators=[evaluator],
+        precomputed_responses={
+            str(i): {"id": str(i), "one_turn_agent_message": f"resposta {i}"}
+            for i in range(TASKS)
+        },
+        max_concurrency=4,
+        upload_to_bq=False,
+        output_dir=tmp_path,
+        journal_path=tmp_path / "journal.jsonl" if journal else None,
+        resume=resume,
+    )
+
+
+async def crash_after(tmp_path, completed):
+    """Roda até `completed` tarefas estarem no journal e cancela o runner"""
+    evaluator = FakeEvaluator(hang_after=completed)
+    run = asyncio.create_task(make_runner(tmp_path, evaluator).run(make_loader()))
+    journal = tmp_path / "journal.jsonl"
+    while not journal.exists() or journal.read_text().count("\n") < completed:
+        await asyncio.sleep(0.01)
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+
+def summary_of(result):
+    """Resultado sem os campos que variam entre execuções"""
+    keys = ("execution_summary", "experiment_id", "experiment_timestamp", "runs")
+    summary = {key: value for key, value in result.items() if key not in keys}
+    summary["aggregate_metrics"] = [
+        {k: v for k, v in metric.items() if k != "duration_statistics_seconds"}
+        for metric in summary["aggregate_metrics"]
+    ]
+    return summary
+
+
+def without_durations(run):
+    run = json.loads(json.dumps(run))
+    run.pop("duration_seconds")
+    for evaluation in run["one_turn_analysis"]["evaluations"]:
+        evaluation.pop("duration_seconds")
+    return run
+
+
+class TestRunJournal:
+    """Test cases for the JSONL run journal."""
+
+    def test_append_load_and_iterate(self, tmp_path):
+        journal = RunJournal(tmp_path / "journal.jsonl")
+        journal.reset()
+        with journal:
+            for task_id in ("a", "b"):
+                journal.append({"task_data": {"id": task_id}, "texto": "ação"})
+
+        reloaded = RunJournal(journal.path)
+        assert reloaded.load() == {"a", "b"}
+        assert len(reloaded) == 2
+        assert [run["texto"] for run in reloaded] == ["ação", "ação"]
+        # Pode ser percorrido mais de uma vez
+        assert len(list(reloaded)) == 2
+
+    def test_truncated_tail_is_discarded(self, tmp_path):
+        path = tmp_path / "journal.jsonl"
+        complete = json.dumps({"task_data": {"id": "a"}}) + "\n"
+        path.write_text(complete + '{"task_data": {"id": "b"')
+
+        journal = RunJournal(path)
+        assert journal.load() == {"a"}
+        assert path.read_text() == complete
+        with journal:
+            journal.append({"task_data": {"id": "b"}})
+        assert RunJournal(path).load() == {"a", "b"}
+
+    @pytest.mark.parametrize("fsync_interval, expected", [(0, 5), (3600, 1), (None, 0)])
+    def test_fsync_interval(self, tmp_path, monkeypatch, fsync_interval, expected):
+        fsyncs = []
+        monkeypatch.setattr(
+            "src.evaluations.core.eval.runner.journal.os.fsync", fsyncs.append
+        )
+        journal = RunJournal(tmp_path / "journal.jsonl", fsync_interval)
+        journal.reset()
+        with journal:
+            for task_id in "abcde":
+                journal.append({"task_data": {"id": task_id}})
+                # O flush é imediato mesmo sem fsync
+                assert RunJournal(journal.path).load() >= {task_id}
+
+        assert len(fsyncs) == expected
+
+
+class TestJournaledRunner:
+    """Test cases for the checkpoint/resume mode of AsyncExperimentRunner."""
+
+    @pytest.mark.asyncio
+    async def test_same_result_as_in_memory_run(self, tmp_path):
+        in_memory = await make_runner(tmp_path, FakeEvaluator(), journal=False).run(
+            make_loader()
+        )
+        expected = json.loads((tmp_path / "results_journal.json").read_text())
+
+        journaled = await make_runner(tmp_path, FakeEvaluator()).run(make_loader())
+        saved = json.loads((tmp_path / "results_journal.json").read_text())
+
+        assert summary_of(journaled) == summary_of(in_memory)
+        assert summary_of(saved) == summary_of(expected)
+        by_id = lambda runs: {
+            run["task_data"]["id"]: without_durations(run) for run in runs
+        }
+        assert by_id(saved["runs"]) == by_id(expected["runs"])
+        assert len(saved["runs"]) == TASKS
+
+    @pytest.mark.asyncio
+    async def test_concurrency_window_is_bounded(self, tmp_path):
+        evaluator = FakeEvaluator()
+        await make_runner(tmp_path, evaluator).run(make_loader())
+
+        assert evaluator.max_in_flight <= 4
+        assert len(evaluator.evaluated) == TASKS
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_tasks(self, tmp_path):
+        await crash_after(tmp_path, completed=7)
+        journal = RunJournal(tmp_path / "journal.jsonl")
+        done = journal.load()
+        # Tarefas que já estavam avaliando quando o limite foi atingido também terminam
+        assert 7 <= len(done) < TASKS
+
+        evaluator = FakeEvaluator()
+        result = await make_runner(tmp_path, evaluator, resume=True).run(make_loader())
+
+        assert sorted(evaluator.evaluated) == sorted(
+            str(i) for i in range(TASKS) if str(i) not in done
+        )
+        saved = json.loads((tmp_path / "results_journal.json").read_text())
+        ids = [run["task_data"]["id"] for run in saved["runs"]]
+        assert sorted(ids, key=int) == [str(i) for i in range(TASKS)]
+        metric = result["aggregate_metrics"][0]
+        assert metric["total_runs"] == TASKS
+
+    @pytest.mark.asyncio
+    async def test_existing_journal_requires_resume(self, tmp_path):
+        await crash_after(tmp_path, completed=3)
+
+        with pytest.raises(ValueError, match="resume=True"):
+            await make_runner(tmp_path, FakeEvaluator()).run(make_loader())
+
+    def test_resume_requires_journal_path(self, tmp_path):
+        with pytest.raises(ValueError, match="journal_path"):
+            make_runner(tmp_path, FakeEvaluator(), journal=False, resume=True)
@@ -0,0 +1,104 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.evaluations.core.eval.runner.result_analyzer import ResultAnalyzer
+from tests.fakes.evaluation_runs import synthetic_runs
+
+# Análises esperadas para total_duration=12.345. Os campos que já existiam
+# foram conferidos contra a implementação anterior
+# (benchmarks/result_analyzer_legacy.py) quando o arquivo foi gerado.
+GOLDEN = json.loads(
+    (Path(__file__).parent / "fixtures" / "result_analyzer.json").read_text()
+)
+
+
+def evaluation(metric, score, duration=1.0, has_error=False):
+    return {
+        "metric_name": metric,
+        "score": score,
+        "duration_seconds": duration,
+        "has_error": has_error,
+    }
+
+
+def run(task_id, one_turn=(), multi_turn=(), duration=2.0):
+    return {
+        "duration_seconds": duration,
+        "task_data": {"id": task_id},
+        "one_turn_analysis": {"evaluations": list(one_turn)},
+        "multi_turn_analysis": {"evaluations": list(multi_turn)},
+    }
+
+
+EDGE_CASE_RUNS = [
+    run("a", [evaluation("exatidao", 1.0), evaluation("tom", 0.5, 0.3)]),
+    run("b", [evaluation("exatidao", None, 0.7), evaluation("tom", 1, 0.1)]),
+    run("c", [evaluation("exatidao", 0.0, has_error=True)], duration=5.0),
+    # Score não numérico: só conta no tempo
+    run("d", [evaluation("tom", "alto", 0.9), evaluation("texto", "ok")]),
+    run("e", multi_turn=[evaluation("conversa", True, 3.0)]),
+    {"task_data": {"id": "f"}, "error": "falha ao obter resposta"},
+    {"duration_seconds": 1.0, "one_turn_analysis": None},
+]
+
+
+class TestResultAnalyzer:
+    """Test cases for the columnar ResultAnalyzer."""
+
+    @pytest.mark.parametrize(
+        "name, runs",
+        [
+            ("synthetic", synthetic_runs(300, 6, seed=7)),
+            ("edge-cases", EDGE_CASE_RUNS),
+            ("empty", []),
+        ],
+        ids=["synthetic", "edge-cases", "empty"],
+    )
+    def test_matches_golden_analysis(self, name, runs):
+        analysis = ResultAnalyzer().analyze(runs, total_duration=12.345)
+
+        assert analysis == GOLDEN[name]
+
+    def test_runs_are_read_in_a_single_pass(self):
+        runs = synthetic_runs(200, 4)
+
+        assert ResultAnalyzer().analyze(iter(runs), 1.0) == ResultAnalyzer().analyze(
+            runs, 1.0
+        )
+
+    def test_percentiles_and_confidence_intervals(self):
+        scores = [float(value) for value in range(1, 101)]
+        runs = [
+            run(str(index), [evaluation("m", score)])
+            for index, score in enumerate(scores)
+        ]
+        runs.append(run("erro", [evaluation("m", None, has_error=True)]))
+
+        metric = ResultAnalyzer().analyze(runs, 1.0)["aggregate_metrics"][0]
+        stats = metric["score_statistics"]
+
+        assert stats["percentiles"] == {
+            "p25": 25.75,
+            "p75": 75.25,
+            "p90": 90.1,
+            "p95": 95.05,
+            "p99": 99.01,
+        }
+        # 50.5 ± 1.95996 * 29.0115 / sqrt(100)
+        assert stats["mean_ci95"] == {"lower": 44.8139, "upper": 56.1861}
+        # Wilson para 100 sucessos em 101
+        interval = metric["success_rate_ci95_percentage"]
+        assert interval["lower"] == pytest.approx(94.6, abs=0.05)
+        assert interval["upper"] == pytest.approx(99.83, abs=0.01)
+        assert metric["success_rate_percentage"] == 99.01
+
+    def test_single_value_has_degenerate_interval(self):
+        metric = ResultAnalyzer().analyze([run("a", [evaluation("m", 0.5)])], 1.0)[
+            "aggregate_metrics"
+        ][0]
+
+        assert metric["score_statistics"]["std_dev"] == 0.0
+        assert metric["score_statistics"]["mean_ci95"] == {"lower": 0.5, "upper": 0.5}
+        assert metric["success_rate_ci95_percentage"]["upper"] == 100.0
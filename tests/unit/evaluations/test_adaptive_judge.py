@@ -0,0 +1,188 @@
+import asyncio
+import random
+
+import openai
+import pytest
+
+from src.config import env
+from src.evaluations.core.eval.adaptive_judge import (
+    AdaptiveJudgeClient,
+    AIMDConcurrencyLimiter,
+)
+from src.evaluations.core.eval.llm_clients import AzureOpenAIClient, BaseJudgeClient
+from tests.fakes.fake_judge_server import FakeJudgeServer
+
+CALLS = 120
+
+
+@pytest.fixture
+def azure_judge(monkeypatch):
+    monkeypatch.setattr(env, "OPENAI_AZURE_API_VERSION", "2024-06-01")
+
+    def build(server):
+        return AzureOpenAIClient(
+            "gpt-4o", max_retries=0, azure_endpoint=server.url, api_key="x"
+        )
+
+    return build
+
+
+def adaptive(client, **kwargs):
+    kwargs.setdefault("backoff_base", 0.01)
+    kwargs.setdefault("rng", random.Random(0))
+    return AdaptiveJudgeClient(client, **kwargs)
+
+
+async def judge_all(judge, calls=CALLS):
+    return await asyncio.gather(
+        *(judge.execute(f"avalie a resposta {i}") for i in range(calls)),
+        return_exceptions=True,
+    )
+
+
+class EchoJudge(BaseJudgeClient):
+    """Juiz falso em memória que conta as chamadas"""
+
+    model_name = "eco"
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    async def execute(self, prompt: str) -> str:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return prompt
+
+
+class TestAIMDConcurrencyLimiter:
+    """Test cases for the AIMD concurrency limiter."""
+
+    @pytest.mark.asyncio
+    async def test_one_decrease_per_round(self):
+        limiter = AIMDConcurrencyLimiter(initial=8, maximum=16)
+        epochs = [await limiter.acquire() for _ in range(8)]
+
+        for epoch in epochs:
+            limiter.release(epoch, congested=True)
+
+        assert limiter.limit == 4
+        assert limiter.decreases == 1
+
+    @pytest.mark.asyncio
+    async def test_additive_increase_and_waiters_in_order(self):
+        limiter = AIMDConcurrencyLimiter(initial=1, maximum=2)
+        first = await limiter.acquire()
+        order = []
+
+        async def waiter(name):
+            await limiter.acquire()
+            order.append(name)
+
+        waiters = [asyncio.create_task(waiter(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        assert order == []
+
+        limiter.release(first, succeeded=True)
+        await asyncio.sleep(0)
+        # Um sucesso com limite 1 dobra o limite: duas vagas
+        assert limiter.limit == 2
+        assert order == ["a", "b"]
+        limiter.release(0, succeeded=True)
+        await asyncio.gather(*waiters)
+        assert order == ["a", "b", "c"]
+
+
+class TestAdaptiveJudgeClient:
+    """Test cases for the adaptive-concurrency judge client."""
+
+    @pytest.mark.asyncio
+    async def test_bare_client_fails_in_bursts(self, azure_judge):
+        with FakeJudgeServer(capacity=6) as server:
+            results = await judge_all(azure_judge(server))
+
+        failures = [r for r in results if isinstance(r, openai.RateLimitError)]
+        assert len(failures) > CALLS // 2
+
+    @pytest.mark.asyncio
+    async def test_adapts_to_provider_capacity(self, azure_judge):
+        with FakeJudgeServer(capacity=6) as server:
+            judge = adaptive(azure_judge(server), initial_concurrency=2)
+            results = await judge_all(judge)
+
+        assert all(isinstance(r, str) for r in results)
+        stats = judge.stats()
+        assert stats["succeeded"] == CALLS == server.requests["ok"]
+        # Sondou acima da capacidade, foi cortado e voltou a subir
+        assert stats["throttled"] == server.requests["throttled"] > 0
+        assert stats["concurrency_decreases"] >= 1
+        assert stats["highest_concurrency_limit"] > 6
+        assert stats["throttle_rate"] < 0.5
+        assert stats["requests_per_second"] > 0
+
+    @pytest.mark.asyncio
+    async def test_honors_retry_after(self, azure_judge):
+        delays = []
+
+        async def sleep(seconds):
+            delays.append(seconds)
+            await asyncio.sleep(seconds)
+
+        with FakeJudgeServer(capacity=2, retry_after=0.05) as server:
+            judge = adaptive(azure_judge(server), initial_concurrency=8, sleep=sleep)
+            results = await judge_all(judge, calls=20)
+
+        assert all(isinstance(r, str) for r in results)
+        assert delays and set(delays) == {0.05}
+
+    @pytest.mark.asyncio
+    async def test_retries_server_errors(self, azure_judge):
+        with FakeJudgeServer(capacity=100, error_rate=0.3) as server:
+            judge = adaptive(azure_judge(server))
+            results = await judge_all(judge, calls=40)
+
+        assert all(isinstance(r, str) for r in results)
+        assert judge.stats()["server_errors"] == server.requests["error"] > 0
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, azure_judge):
+        with FakeJudgeServer(capacity=0) as server:
+            judge = adaptive(azure_judge(server), max_retries=3)
+            with pytest.raises(openai.RateLimitError):
+                await judge.execute("prompt")
+
+        assert server.requests["throttled"] == 4
+        assert judge.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self):
+        echo = EchoJudge(error=ValueError("prompt inválido"))
+        judge = adaptive(echo)
+
+        with pytest.raises(ValueError):
+            await judge.execute("prompt")
+        assert echo.calls == 1
+        assert judge.concurrency.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_request_and_token_budgets(self):
+        waits = []
+
+        async def sleep(seconds):
+            waits.append(seconds)
+
+        requests = adaptive(EchoJudge(), requests_per_minute=60, sleep=sleep)
+        for _ in range(62):
+            await requests.execute("oi")
+        # 60 de rajada; a 61ª e a 62ª esperam 1s e 2s
+        assert requests.stats()["budget_wait_seconds"] == pytest.approx(3, abs=0.1)
+
+        waits.clear()
+        tokens = adaptive(EchoJudge(), tokens_per_minute=300, sleep=sleep)
+        await tokens.execute("x" * 400)  # ~100 tokens de prompt e de resposta
+        await tokens.execute("x" * 400)
+        assert waits == []
+        await tokens.execute("x" * 400)
+        # Saldo de -200 tokens a 5 tokens/s
+        assert waits and waits[0] == pytest.approx(40, abs=0.5)
@@ -0,0 +1,187 @@
+import pandas as pd
+import pytest
+
+from src.evaluations.core.eval.dataloader import DataLoader
+
+ROWS = 25
+
+
+def make_df(rows=ROWS):
+    return pd.DataFrame(
+        {
+            "pergunta": [f"pergunta {index}" for index in range(rows)],
+            "codigo": range(100, 100 + rows),
+            "nota": [index / 4 if index % 5 else None for index in range(rows)],
+            "categoria": [None if index % 7 == 0 else "geral" for index in range(rows)],
+            "ignorada": ["x"] * rows,
+        }
+    )
+
+
+def make_loader(source, **kwargs):
+    return DataLoader(
+        source,
+        id_col="codigo",
+        prompt_col="pergunta",
+        dataset_name="dataset",
+        dataset_description="descrição",
+        metadata_cols=["nota", "categoria"],
+        upload_to_bq=False,
+        **kwargs,
+    )
+
+
+def dump(tasks):
+    # NaN != NaN: compara pela representação
+    return [repr(task.model_dump()) for task in tasks]
+
+
+@pytest.fixture(params=["csv", "parquet"])
+def dataset_file(request, tmp_path):
+    path = tmp_path / f"dataset.{request.param}"
+    df = make_df()
+    if request.param == "csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+    return str(path)
+
+
+class TestChunkedDataLoader:
+    """Test cases for the chunked DataLoader mode."""
+
+    def test_same_tasks_and_dataset_id_as_eager(self, dataset_file):
+        eager = make_loader(dataset_file)
+        chunked = make_loader(dataset_file, chunk_size=4)
+
+        assert chunked.df is None
+        assert dump(chunked.get_tasks()) == dump(eager.get_tasks())
+        assert (
+            chunked.get_dataset_config()["dataset_id"]
+            == eager.get_dataset_config()["dataset_id"]
+        )
+
+    def test_dataset_id_without_iterating_tasks(self, dataset_file):
+        eager = make_loader(dataset_file)
+        chunked = make_loader(dataset_file, chunk_size=4)
+
+        assert (
+            chunked.get_dataset_config()["dataset_id"]
+            == eager.get_dataset_config()["dataset_id"]
+        )
+
+    def test_partial_iteration_still_hashes_whole_dataset(self, dataset_file):
+        eager = make_loader(dataset_file)
+        chunked = make_loader(dataset_file, chunk_size=4)
+
+        tasks = chunked.get_tasks()
+        next(tasks)
+        tasks.close()
+
+        assert (
+            chunked.get_dataset_config()["dataset_id"]
+            == eager.get_dataset_config()["dataset_id"]
+        )
+
+    def test_number_rows(self, dataset_file):
+        eager = make_loader(dataset_file, number_rows=10)
+        chunked = make_loader(dataset_file, number_rows=10, chunk_size=4)
+
+        tasks = list(chunked.get_tasks())
+
+        assert [task.id for task in tasks] == [str(100 + i) for i in range(10)]
+        assert dump(tasks) == dump(eager.get_tasks())
+        assert (
+            chunked.get_dataset_config()["dataset_id"]
+            == eager.get_dataset_config()["dataset_id"]
+        )
+
+    def test_tasks_are_read_lazily(self, dataset_file, monkeypatch):
+        loader = make_loader(dataset_file, chunk_size=4)
+        read = []
+        chunks = loader._iter_chunks
+
+        def counting_chunks():
+            for chunk in chunks():
+                read.append(len(chunk))
+                yield chunk
+
+        monkeypatch.setattr(loader, "_iter_chunks", counting_chunks)
+        tasks = loader.get_tasks()
+        for _ in range(5):
+            next(tasks)
+
+        assert read == [4, 4]
+
+    def test_total_rows(self, dataset_file):
+        assert make_loader(dataset_file).total_rows == ROWS
+        assert make_loader(dataset_file, number_rows=10).total_rows == 10
+
+        chunked = make_loader(dataset_file, chunk_size=4)
+        expected = ROWS if dataset_file.endswith(".parquet") else None
+        assert chunked.total_rows == expected
+
+    def test_missing_columns_checked_from_header(self, tmp_path):
+        path = tmp_path / "dataset.csv"
+        make_df().drop(columns=["nota"]).to_csv(path, index=False)
+
+        with pytest.raises(ValueError, match="nota"):
+            make_loader(str(path), chunk_size=4)
+
+    def test_chunked_source_requires_upload_off(self, dataset_file, monkeypatch):
+        uploads = []
+        monkeypatch.setattr(
+            "src.evaluations.core.eval.dataloader.upload_dataset_to_bq",
+            lambda dataset_config, filtered_df: uploads.append(dataset_config),
+        )
+
+        with pytest.raises(ValueError, match="upload_to_bq=False"):
+            DataLoader(
+                dataset_file,
+                id_col="codigo",
+                prompt_col="pergunta",
+                dataset_name="dataset",
+                dataset_description="descrição",
+                chunk_size=4,
+            )
+        assert uploads == []
+
+    @pytest.mark.parametrize("chunk_size", [2, 4, 7, 25])
+    def test_csv_dtypes_do_not_depend_on_chunk_size(self, tmp_path, chunk_size):
+        path = tmp_path / "dataset.csv"
+        df = make_df()
+        # Inteiros com um valor ausente só no fim e um bloco só de ausentes
+        df["ordem"] = [None if i == 20 else i for i in range(ROWS)]
+        df["ordem"] = df["ordem"].astype("Int64")
+        df["flag"] = [None if 4 <= i < 8 else i % 2 == 0 for i in range(ROWS)]
+        df.to_csv(path, index=False)
+        columns = {"metadata_cols": ["nota", "categoria", "ordem", "flag"]}
+        eager = DataLoader(
+            str(path),
+            id_col="codigo",
+            prompt_col="pergunta",
+            dataset_name="dataset",
+            dataset_description="descrição",
+            upload_to_bq=False,
+            **columns,
+        )
+        chunked = DataLoader(
+            str(path),
+            id_col="codigo",
+            prompt_col="pergunta",
+            dataset_name="dataset",
+            dataset_description="descrição",
+            upload_to_bq=False,
+            chunk_size=chunk_size,
+            **columns,
+        )
+
+        assert dump(chunked.get_tasks()) == dump(eager.get_tasks())
+        assert (
+            chunked.get_dataset_config()["dataset_id"]
+            == eager.get_dataset_config()["dataset_id"]
+        )
+
+    def test_invalid_chunk_size(self, dataset_file):
+        with pytest.raises(ValueError, match="chunk_size"):
+            make_loader(dataset_file, chunk_size=0)
@@ -0,0 +1,156 @@
+import pandas as pd
+import pytest
+
+from src.evaluations.core.eval.adaptive_judge import AdaptiveJudgeClient
+from src.evaluations.core.eval.dataloader import DataLoader
+from src.evaluations.core.eval.evaluators.base import BaseOneTurnEvaluator
+from src.evaluations.core.eval.judge_cache import (
+    CachedJudgeClient,
+    JudgeResponseCache,
+    judge_cache_key,
+)
+from src.evaluations.core.eval.llm_clients import BaseJudgeClient
+from src.evaluations.core.eval.runner.orchestrator import AsyncExperimentRunner
+
+TASKS = 6
+
+
+class CountingJudge(BaseJudgeClient):
+    """Juiz falso que conta as chamadas"""
+
+    def __init__(self, model_name="juiz-falso", temperature=0.0):
+        self.model_name = model_name
+        self.temperature = temperature
+        self.calls = 0
+
+    def generation_params(self):
+        return {"temperature": self.temperature}
+
+    async def execute(self, prompt: str) -> str:
+        self.calls += 1
+        return f"Score: 1\nchamada {self.calls}"
+
+
+class JudgedEvaluator(BaseOneTurnEvaluator):
+    name = "judged"
+
+    async def evaluate(self, agent_response, task):
+        return await self._get_llm_judgement(
+            "Tarefa: {task}\nResposta: {agent_response}", task, agent_response
+        )
+
+
+def make_runner(tmp_path, judge_client):
+    return AsyncExperimentRunner(
+        experiment_name="cache",
+        experiment_description="teste",
+        metadata={},
+        evaluators=[JudgedEvaluator(judge_client)],
+        precomputed_responses={
+            str(i): {"id": str(i), "one_turn_agent_message": f"resposta {i}"}
+            for i in range(TASKS)
+        },
+        upload_to_bq=False,
+        output_dir=tmp_path,
+    )
+
+
+def make_loader():
+    df = pd.DataFrame({"id": range(TASKS), "prompt": ["pergunta"] * TASKS})
+    return DataLoader(
+        df,
+        id_col="id",
+        prompt_col="prompt",
+        dataset_name="teste",
+        dataset_description="teste",
+        upload_to_bq=False,
+    )
+
+
+class TestJudgeCache:
+    """Test cases for the persistent LLM-judge response cache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_miss_persists_across_instances(self, tmp_path):
+        judge = CountingJudge()
+        cached = CachedJudgeClient(judge, tmp_path / "judge.db")
+
+        first = await cached.execute("prompt")
+        assert await cached.execute("prompt") == first
+        assert judge.calls == 1
+        assert (cached.hits, cached.misses, cached.writes) == (1, 1, 1)
+
+        reopened = CachedJudgeClient(judge, tmp_path / "judge.db")
+        assert await reopened.execute("prompt") == first
+        assert judge.calls == 1
+
+    def test_key_covers_model_params_and_prompt(self):
+        base = judge_cache_key("gpt-4o", {"temperature": 0}, "prompt")
+
+        assert judge_cache_key("gpt-4o", {"temperature": 0}, "prompt") == base
+        assert judge_cache_key("gpt-4o-mini", {"temperature": 0}, "prompt") != base
+        assert judge_cache_key("gpt-4o", {"temperature": 1}, "prompt") != base
+        assert judge_cache_key("gpt-4o", {"temperature": 0}, "prompt 2") != base
+
+    @pytest.mark.asyncio
+    async def test_different_params_do_not_share_entries(self, tmp_path):
+        cache = JudgeResponseCache(tmp_path / "judge.db")
+        cold, hot = CountingJudge(temperature=0.0), CountingJudge(temperature=1.0)
+
+        await CachedJudgeClient(cold, cache).execute("prompt")
+        await CachedJudgeClient(hot, cache).execute("prompt")
+
+        assert (cold.calls, hot.calls) == (1, 1)
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_overwrites_and_bypass_skips_cache(self, tmp_path):
+        judge = CountingJudge()
+        cache = JudgeResponseCache(tmp_path / "judge.db")
+        await CachedJudgeClient(judge, cache).execute("prompt")
+
+        refreshed = await CachedJudgeClient(judge, cache, mode="refresh").execute(
+            "prompt"
+        )
+        assert judge.calls == 2
+        assert await CachedJudgeClient(judge, cache).execute("prompt") == refreshed
+
+        bypass = CachedJudgeClient(judge, cache, mode="bypass")
+        assert await bypass.execute("outro prompt") == "Score: 1\nchamada 3"
+        assert bypass.writes == 0
+        assert len(cache) == 1
+
+    def test_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="Modo de cache"):
+            CachedJudgeClient(CountingJudge(), tmp_path / "judge.db", mode="off")
+
+    @pytest.mark.asyncio
+    async def test_rerun_reuses_judge_calls_and_reports_counts(self, tmp_path):
+        judge = CountingJudge()
+        cached = CachedJudgeClient(judge, tmp_path / "judge.db")
+
+        first = await make_runner(tmp_path, cached).run(make_loader())
+        second = await make_runner(tmp_path, cached).run(make_loader())
+
+        assert judge.calls == TASKS
+        assert first["execution_summary"]["judge_cache"][0]["misses"] == TASKS
+        stats = second["execution_summary"]["judge_cache"][0]
+        assert (stats["hits"], stats["misses"]) == (TASKS, 0)
+        # Mesmos julgamentos, então as mesmas notas
+        assert (
+            second["aggregate_metrics"][0]["score_statistics"]
+            == first["aggregate_metrics"][0]["score_statistics"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_runner_reports_cache_over_adaptive_client(self, tmp_path):
+        judge = CountingJudge()
+        adaptive = AdaptiveJudgeClient(judge)
+        cached = CachedJudgeClient(adaptive, tmp_path / "judge.db")
+
+        result = await make_runner(tmp_path, cached).run(make_loader())
+
+        summary = result["execution_summary"]
+        assert summary["judge_cache"][0]["misses"] == TASKS
+        assert summary["judge_throughput"][0]["succeeded"] == TASKS
+        assert summary["judge_throughput"][0]["model"] == "juiz-falso"
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.config import env
+from src.services.agent_engine import history as history_module
+from src.services.agent_engine.history import GoogleAgentEngineHistory
+
+
+class FakeCheckpointer:
+    """Checkpointer em memória que registra o pico de chamadas simultâneas."""
+
+    def __init__(self, delay: float = 0.01, failing: set = None):
+        self.delay = delay
+        self.failing = failing or set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aget(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if thread_id in self.failing:
+                raise RuntimeError(f"falha em {thread_id}")
+            return {"channel_values": {"messages": [HumanMessage(content=thread_id)]}}
+        finally:
+            self.in_flight -= 1
+
+
+class TestHistoryBulk:
+    """Test cases for the bounded-concurrency bulk history fetch."""
+
+    @pytest.mark.asyncio
+    async def test_iter_history_bulk_respects_concurrency_window(self):
+        """Never more than `concurrency` threads are fetched at once."""
+        checkpointer = FakeCheckpointer()
+        service = GoogleAgentEngineHistory(checkpointer)
+        user_ids = [f"user-{i}" for i in range(50)]
+
+        results = [
+            item
+            async for item in service.iter_history_bulk(
+                user_ids=user_ids, use_whatsapp_format=False, concurrency=4
+            )
+        ]
+
+        assert checkpointer.max_in_flight == 4
+        assert sorted(user_id for user_id, _ in results) == sorted(user_ids)
+
+    @pytest.mark.asyncio
+    async def test_iter_history_bulk_caps_concurrency(self, monkeypatch):
+        """A requested window above HISTORY_BULK_CONCURRENCY is clamped."""
+        monkeypatch.setattr(env, "HISTORY_BULK_CONCURRENCY", 3)
+        checkpointer = FakeCheckpointer()
+        service = GoogleAgentEngineHistory(checkpointer)
+
+        results = [
+            item
+            async for item in service.iter_history_bulk(
+                user_ids=[str(i) for i in range(20)],
+                use_whatsapp_format=False,
+                concurrency=1000,
+            )
+        ]
+
+        assert checkpointer.max_in_flight == 3
+        assert len(results) == 20
+
+    @pytest.mark.asyncio
+    async def test_get_history_bulk_keeps_request_order_and_skips_errors(self):
+        """Failed threads are skipped and the dict follows the requested order."""
+        checkpointer = FakeCheckpointer(failing={"b"})
+        service = GoogleAgentEngineHistory(checkpointer)
+
+        result = await service.get_history_bulk(
+            user_ids=["c", "a", "b", "a"], use_whatsapp_format=False, concurrency=2
+        )
+
+        assert list(result) == ["c", "a"]
+        assert result["c"][0]["content"] == "c"
+
+    @pytest.mark.asyncio
+    async def test_iter_history_bulk_cancels_pending_on_early_exit(self):
+        """Stopping the iteration cancels the threads still in flight."""
+        checkpointer = FakeCheckpointer(delay=0.05)
+        service = GoogleAgentEngineHistory(checkpointer)
+
+        iterator = service.iter_history_bulk(
+            user_ids=[str(i) for i in range(10)], concurrency=3
+        )
+        await iterator.__anext__()
+        await iterator.aclose()
+        await asyncio.sleep(0)
+
+        assert checkpointer.in_flight == 0
+
+
+class FakePostgresEngine:
+    """PostgresEngine que roda as coroutines no loop atual"""
+
+    def __init__(self, sql_engine):
+        self._pool = sql_engine
+
+    async def _run_as_async(self, coro):
+        return await coro
+
+
+class FakeSaver:
+    def __init__(self, engine):
+        self._engine = engine
+
+
+class TestHistoryPool:
+    """Test cases for the history service connection pool."""
+
+    @pytest.mark.asyncio
+    async def test_health_check_reports_pool_status(self):
+        sql_engine = create_async_engine(
+            "sqlite+aiosqlite://", poolclass=AsyncAdaptedQueuePool, pool_size=3
+        )
+        service = GoogleAgentEngineHistory(FakeSaver(FakePostgresEngine(sql_engine)))
+        try:
+            result = await service.health_check()
+        finally:
+            await sql_engine.dispose()
+
+        assert result["status"] == "ok"
+        assert result["pool"]["size"] == 3
+        assert result["pool"]["checked_out"] == 0
+
+    @pytest.mark.asyncio
+    async def test_explicit_zero_pool_settings_are_kept(self, monkeypatch):
+        engine_args = {}
+
+        def from_engine_args(**kwargs):
+            engine_args.update(kwargs)
+            return object()
+
+        async def create_saver(engine):
+            return FakeSaver(engine)
+
+        monkeypatch.setattr(env, "PG_URI", "postgresql://u:p@localhost/db")
+        monkeypatch.setattr(
+            history_module.PostgresEngine, "from_engine_args", from_engine_args
+        )
+        monkeypatch.setattr(history_module.PostgresSaver, "create", create_saver)
+
+        await GoogleAgentEngineHistory.create(pool_size=0, pool_recycle=0)
+
+        assert engine_args["pool_size"] == 0
+        assert engine_args["pool_recycle"] == 0
+        assert engine_args["max_overflow"] == env.HISTORY_PG_MAX_OVERFLOW
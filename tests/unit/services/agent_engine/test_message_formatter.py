@@ -0,0 +1,241 @@
+from langchain_core.load.dump import dumpd
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.services.agent_engine.message_formatter import (
+    LangGraphMessageFormatter,
+    WhatsappConversionCache,
+    message_kwargs,
+)
+from src.utils.md_to_wpp import markdown_to_whatsapp
+
+
+def assistant_contents(result):
+    return [
+        m["content"]
+        for m in result["data"]["messages"]
+        if m["message_type"] == "assistant_message"
+    ]
+
+
+RANDOM_FIELDS = ("otid", "step_id", "processed_at")
+
+
+def without_random_fields(result):
+    return [
+        {k: v for k, v in m.items() if k not in RANDOM_FIELDS}
+        for m in result["data"]["messages"]
+    ]
+
+
+def usage(prompt, candidates, thoughts, total=None):
+    return {
+        "model_name": "gemini-2.5-flash",
+        "finish_reason": "STOP",
+        "usage_metadata": {
+            "prompt_token_count": prompt,
+            "candidates_token_count": candidates,
+            "thoughts_token_count": thoughts,
+            "total_token_count": total,
+            "output_token_details": {"reasoning": thoughts},
+        },
+    }
+
+
+def sample_thread():
+    return [
+        HumanMessage(
+            content="Onde emito o IPTU?",
+            id="h1",
+            additional_kwargs={"timestamp": "2025-01-01T10:00:00Z"},
+        ),
+        AIMessage(
+            content="",
+            id="run--a1",
+            tool_calls=[
+                {"name": "search", "args": {"q": "iptu", "pages": (1, 2)}, "id": "c1"}
+            ],
+            additional_kwargs={"timestamp": "2025-01-01T10:00:02+00:00"},
+            response_metadata=usage(100, 10, 5),
+        ),
+        ToolMessage(
+            content='{"url": "carioca.rio"}',
+            tool_call_id="c1",
+            id="t1",
+            additional_kwargs={"timestamp": "2025-01-01T10:00:03+00:00"},
+        ),
+        ToolMessage(content="falhou", tool_call_id="c2", status="error", id="t2"),
+        AIMessage(
+            content=[
+                {"type": "thinking", "thinking": "Vou responder."},
+                {"type": "text", "text": "Acesse o **Carioca Digital**."},
+            ],
+            id="run--a2",
+            additional_kwargs={"timestamp": "2025-01-01T12:00:00+00:00"},
+            response_metadata=usage(200, 20, 0, total=250),
+        ),
+        HumanMessage(
+            content=[{"type": "text", "text": "Obrigado"}],
+            id="h2",
+            additional_kwargs={"timestamp": "sem-data"},
+        ),
+    ]
+
+
+class TestFormatMessagesSinglePass:
+    """Test cases for the single-pass formatter against the dumpd-based path."""
+
+    def test_message_kwargs_matches_dumpd_for_used_fields(self):
+        """Reading fields directly yields the same values as dumpd's kwargs."""
+        # dumpd omite campos com valor padrão; o formatador lê com estes defaults
+        defaults = {
+            "id": "",
+            "additional_kwargs": {},
+            "response_metadata": {},
+            "tool_calls": [],
+        }
+        for message in sample_thread():
+            dumped = dumpd(message)["kwargs"]
+            fields = message_kwargs(message)
+
+            for key, value in fields.items():
+                assert dumped.get(key, defaults.get(key)) == value, key
+
+    def test_base_messages_and_serialized_dicts_format_identically(self):
+        """BaseMessage input matches the previously used dumpd dictionaries."""
+        messages = sample_thread()
+
+        formatter = LangGraphMessageFormatter(thread_id="t1")
+        direct = formatter.format_messages(messages, session_timeout_seconds=3600)
+        dumped = formatter.format_messages(
+            [dumpd(m) for m in messages], session_timeout_seconds=3600
+        )
+
+        assert without_random_fields(direct) == without_random_fields(dumped)
+        tool_call = direct["data"]["messages"][2]["tool_call"]
+        assert tool_call["arguments"] == {"q": "iptu", "pages": [1, 2]}
+
+    def test_usage_totals_match_second_pass_calculation(self):
+        """Folded usage totals equal calculate_usage_statistics over dumpd output."""
+        messages = sample_thread()
+        formatter = LangGraphMessageFormatter(thread_id="t1")
+
+        result = formatter.format_messages(messages)
+        folded = result["data"]["messages"][-1]
+        recalculated = formatter.calculate_usage_statistics(
+            [dumpd(m) for m in messages]
+        )
+
+        for key in ("completion_tokens", "thoughts_tokens", "prompt_tokens"):
+            assert folded[key] == recalculated[key]
+        assert folded["total_tokens"] == recalculated["total_tokens"] == 365
+        assert folded["step_count"] == recalculated["step_count"]
+        assert folded["model_names"] == recalculated["model_names"]
+
+    def test_time_since_last_message_and_sessions(self):
+        """Each timestamp is compared with the previous parseable one."""
+        formatter = LangGraphMessageFormatter(thread_id="t1")
+
+        result = formatter.format_messages(
+            sample_thread(), session_timeout_seconds=3600
+        )
+        messages = result["data"]["messages"][:-1]
+
+        assert [
+            (m["message_type"], m["time_since_last_message"]) for m in messages
+        ] == [
+            ("user_message", None),
+            ("reasoning_message", 2.0),
+            ("tool_call_message", 2.0),
+            ("tool_return_message", 1.0),
+            ("tool_return_message", None),
+            ("reasoning_message", 7197.0),
+            ("assistant_message", 7197.0),
+            ("user_message", None),
+        ]
+        # A pausa de duas horas abre uma nova sessão
+        assert messages[0]["session_id"] == messages[4]["session_id"]
+        assert messages[5]["session_id"] != messages[4]["session_id"]
+
+
+class TestWhatsappConversionCache:
+    """Test cases for the content-addressed WhatsApp conversion cache."""
+
+    def test_repeated_content_is_served_from_cache(self):
+        """The second conversion of the same text is a hit with the same output."""
+        cache = WhatsappConversionCache(max_bytes=1024 * 1024)
+
+        first = cache.convert("**Olá** _mundo_")
+        second = cache.convert("**Olá** _mundo_")
+
+        assert first == second == markdown_to_whatsapp("**Olá** _mundo_")
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_least_recently_used_entries_are_evicted_by_size(self):
+        """Exceeding max_bytes drops the oldest unused conversions first."""
+        entry_size = WhatsappConversionCache._entry_size(
+            WhatsappConversionCache._key("a"), markdown_to_whatsapp("a")
+        )
+        cache = WhatsappConversionCache(max_bytes=entry_size * 2)
+
+        cache.convert("a")
+        cache.convert("b")
+        cache.convert("a")  # "b" passa a ser o menos usado
+        cache.convert("c")
+
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        assert stats["size_bytes"] <= cache.max_bytes
+
+        cache.convert("a")
+        assert cache.stats()["hits"] == 2
+        cache.convert("b")
+        assert cache.stats()["misses"] == 4
+
+    def test_values_larger_than_the_limit_are_not_stored(self):
+        """A single oversized conversion is returned but never cached."""
+        cache = WhatsappConversionCache(max_bytes=64)
+
+        assert cache.convert("x" * 1000) == "x" * 1000
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["size_bytes"] == 0
+
+
+class TestFormatMessagesCache:
+    """Test cases for the cache wiring inside format_messages."""
+
+    def test_history_reads_hit_the_cache(self):
+        """Formatting the same thread twice converts each AI message only once."""
+        cache = WhatsappConversionCache(max_bytes=1024 * 1024)
+        messages = [
+            HumanMessage(content="Como emito o IPTU?"),
+            AIMessage(content="Acesse o **Carioca Digital**."),
+            HumanMessage(content="Obrigado"),
+            AIMessage(content="De *nada*!"),
+        ]
+
+        formatter = LangGraphMessageFormatter(thread_id="t1", whatsapp_cache=cache)
+        first = formatter.format_messages(messages, use_whatsapp_format=True)
+        second = formatter.format_messages(messages, use_whatsapp_format=True)
+
+        assert assistant_contents(first) == assistant_contents(second)
+        assert assistant_contents(first) == [
+            "Acesse o *Carioca Digital*.",
+            "De _nada_!",
+        ]
+        assert cache.stats()["misses"] == 2
+        assert cache.stats()["hits"] == 2
+
+    def test_cache_is_not_used_without_whatsapp_format(self):
+        """Raw markdown output never touches the cache."""
+        cache = WhatsappConversionCache(max_bytes=1024 * 1024)
+        formatter = LangGraphMessageFormatter(thread_id="t1", whatsapp_cache=cache)
+
+        result = formatter.format_messages(
+            [AIMessage(content="**negrito**")], use_whatsapp_format=False
+        )
+
+        assert assistant_contents(result) == ["**negrito**"]
+        assert cache.stats()["hits"] + cache.stats()["misses"] == 0
@@ -0,0 +1,132 @@
+import json
+import time
+
+import pytest
+
+from src.services.eai_gateway.api import EAIClient
+from src.services.eai_gateway.chat_stream import KEEPALIVE_FRAME, chat_event_stream
+from src.services.eai_gateway.response_wait import ResponseWaitSettings
+from tests.fakes.fake_eai_gateway import FakeEAIGateway
+
+CHUNKS = ["Olá", ", tudo", " bem?"]
+
+
+@pytest.fixture
+def gateway():
+    # Um trecho a cada 0.2s e resposta final em 0.8s
+    with FakeEAIGateway(ready_after=0.8, chunks=CHUNKS, chunk_interval=0.2) as server:
+        yield server
+
+
+def make_client(gateway, mode="auto", timeout=10):
+    return EAIClient(
+        timeout=timeout,
+        polling_interval=1,
+        base_url=gateway.url,
+        response_wait=ResponseWaitSettings(mode=mode),
+    )
+
+
+def parse_frame(frame: str):
+    if frame == KEEPALIVE_FRAME:
+        return "keep-alive", None
+    fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+async def collect(stream):
+    """(segundos desde o início, evento, dados) de cada frame"""
+    start = time.monotonic()
+    frames = []
+    async for frame in stream:
+        frames.append((time.monotonic() - start, *parse_frame(frame)))
+    return frames
+
+
+class TestChatEventStream:
+    """Test cases for the streaming chat endpoint body."""
+
+    @pytest.mark.asyncio
+    async def test_partial_output_is_forwarded_as_it_arrives(self, gateway):
+        frames = await collect(
+            chat_event_stream(make_client(gateway), user_number="123", message="oi")
+        )
+
+        names = [name for _, name, _ in frames]
+        assert names == ["status", "message", "message", "message", "message", "done"]
+        sent_at, _, sent = frames[0]
+        assert sent["status"] == "sent" and sent["message_id"]
+        # Primeiro byte logo após o envio, não quando a resposta fica pronta
+        assert sent_at < 0.2
+        deltas = [(at, data["data"]["delta"]) for at, _, data in frames[2:5]]
+        assert [delta for _, delta in deltas] == CHUNKS
+        # Medido a partir do envio: o primeiro request do cliente inclui o
+        # custo de abrir a conexão
+        for index, (at, _) in enumerate(deltas):
+            assert at - sent_at == pytest.approx(0.2 * (index + 1), abs=0.1)
+        done_at, _, done = frames[-1]
+        assert done["status"] == "completed"
+        assert done_at - sent_at == pytest.approx(0.8, abs=0.1)
+
+    @pytest.mark.asyncio
+    async def test_blocking_chat_only_answers_at_the_end(self, gateway):
+        client = make_client(gateway)
+        start = time.monotonic()
+        try:
+            response = await client.send_message_and_get_response(
+                user_number="123", message="oi"
+            )
+        finally:
+            await client.close()
+
+        assert response.status == "completed"
+        assert time.monotonic() - start >= 0.8
+
+    @pytest.mark.asyncio
+    async def test_polling_gateway_sends_status_and_done(self, gateway):
+        gateway.sse = False
+        frames = await collect(
+            chat_event_stream(make_client(gateway), user_number="123", message="oi")
+        )
+
+        assert [name for _, name, _ in frames] == ["status", "done"]
+        assert frames[-1][2]["data"]["messages"]
+
+    @pytest.mark.asyncio
+    async def test_keepalive_while_waiting(self, gateway):
+        gateway.sse = False
+        gateway.long_poll = False
+        frames = await collect(
+            chat_event_stream(
+                make_client(gateway, mode="poll"),
+                user_number="123",
+                message="oi",
+                keepalive_interval=0.1,
+            )
+        )
+
+        names = [name for _, name, _ in frames]
+        assert names[0] == "status" and names[-1] == "done"
+        assert names.count("keep-alive") >= 5
+
+    @pytest.mark.asyncio
+    async def test_failure_becomes_an_error_event(self, gateway):
+        gateway.fail = True
+        frames = await collect(
+            chat_event_stream(make_client(gateway), user_number="123", message="oi")
+        )
+
+        name, data = frames[-1][1:]
+        assert name == "error"
+        assert "falha simulada" in data["error"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_becomes_an_error_event(self, gateway):
+        frames = await collect(
+            chat_event_stream(
+                make_client(gateway, timeout=0.3), user_number="123", message="oi"
+            )
+        )
+
+        name, data = frames[-1][1:]
+        assert name == "error" and "Timeout" in data["error"]
@@ -0,0 +1,87 @@
+import pytest
+
+from src.services.eai_gateway import http_client as http_client_module
+from src.services.eai_gateway.api import EAIClient
+from src.services.eai_gateway.http_client import (
+    GatewayHTTPClientManager,
+    GatewayHTTPSettings,
+    build_gateway_http_client,
+    pool_stats,
+)
+from src.services.eai_gateway.response_wait import ResponseWaitSettings
+from tests.fakes.fake_eai_gateway import FakeEAIGateway
+
+
+@pytest.fixture
+def gateway():
+    with FakeEAIGateway(ready_after=0.0) as server:
+        yield server
+
+
+async def chat(gateway, http_client=None):
+    client = EAIClient(
+        base_url=gateway.url,
+        http_client=http_client,
+        response_wait=ResponseWaitSettings(mode="sse"),
+    )
+    response = await client.send_message_and_get_response(
+        user_number="123", message="oi"
+    )
+    await client.close()
+    return response
+
+
+class TestGatewayHTTPClient:
+    """Test cases for the shared HTTP client of the EAI gateway."""
+
+    @pytest.mark.asyncio
+    async def test_shared_client_reuses_connections(self, gateway):
+        shared = build_gateway_http_client(base_url=gateway.url)
+        try:
+            for _ in range(10):
+                response = await chat(gateway, shared)
+                assert response.status == "completed"
+            # close() do EAIClient não fecha o cliente injetado
+            assert not shared.is_closed
+            assert pool_stats(shared)["connections"] == 1
+        finally:
+            await shared.aclose()
+
+        assert len(gateway.connections) == 1
+
+    @pytest.mark.asyncio
+    async def test_client_per_request_opens_a_connection_each(self, gateway):
+        for _ in range(5):
+            await chat(gateway)
+
+        assert len(gateway.connections) == 5
+
+    def test_limits_come_from_settings(self):
+        settings = GatewayHTTPSettings(
+            max_connections=7, max_keepalive_connections=3, keepalive_expiry=5
+        )
+        client = build_gateway_http_client(settings, base_url="http://gateway")
+        pool = client._transport._pool
+
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._keepalive_expiry == 5
+
+    def test_http2_without_h2_falls_back_to_http1(self, monkeypatch):
+        monkeypatch.setattr(http_client_module, "http2_available", lambda: False)
+        client = build_gateway_http_client(
+            GatewayHTTPSettings(http2=True), base_url="http://gateway"
+        )
+
+        assert client._transport._pool._http2 is False
+
+    @pytest.mark.asyncio
+    async def test_manager_creates_one_client_and_closes_it(self):
+        manager = GatewayHTTPClientManager(GatewayHTTPSettings())
+        await manager.startup()
+        client = await manager.get()
+
+        assert await manager.get() is client
+        await manager.shutdown()
+        assert client.is_closed
+        assert manager.stats()["connections"] == 0
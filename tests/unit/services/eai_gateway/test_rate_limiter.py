@@ -0,0 +1,140 @@
+import asyncio
+import heapq
+import itertools
+import math
+
+import pytest
+
+from src.services.eai_gateway.rate_limiter import (
+    GlobalEAIRateLimiter,
+    TokenBucketRateLimiter,
+)
+
+
+class FakeClock:
+    """Relógio virtual: sleep só termina quando run() avança o tempo"""
+
+    def __init__(self):
+        self.now = 0.0
+        self._sleepers = []
+        self._order = itertools.count()
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + seconds, next(self._order), future))
+        await future
+
+    async def run(self, tasks) -> None:
+        """Acorda os sleepers em ordem de horário até as tasks terminarem"""
+        while not all(task.done() for task in tasks):
+            # Deixa as tasks prontas chegarem ao próximo sleep
+            for _ in range(3):
+                await asyncio.sleep(0)
+            if not self._sleepers:
+                continue
+            wake_at, _, future = heapq.heappop(self._sleepers)
+            self.now = max(self.now, wake_at)
+            if not future.done():
+                future.set_result(None)
+
+
+def make_limiter(clock, requests_per_minute=600, burst=None):
+    return TokenBucketRateLimiter(
+        requests_per_minute, burst=burst, clock=clock, sleep=clock.sleep
+    )
+
+
+async def run_callers(limiter, clock, callers):
+    """Dispara `callers` chamadores simultâneos e devolve (ordem, horário)"""
+    grants = []
+
+    async def caller(index):
+        await limiter.acquire()
+        grants.append((index, clock.now))
+
+    tasks = [asyncio.create_task(caller(index)) for index in range(callers)]
+    await clock.run(tasks)
+    return grants
+
+
+class TestTokenBucketRateLimiter:
+    """Test cases for the FIFO token-bucket rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_throughput_matches_rate_with_1000_callers(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock, requests_per_minute=600, burst=20)
+
+        grants = await run_callers(limiter, clock, 1000)
+
+        # FIFO: os chamadores são atendidos na ordem de chegada
+        assert [index for index, _ in grants] == list(range(1000))
+        times = [at for _, at in grants]
+        # burst imediatos e depois exatamente 10 por segundo
+        assert times[:20] == [0.0] * 20
+        for elapsed in (0.05, 1, 7.5, 50, 98):
+            granted = sum(1 for at in times if at <= elapsed + 1e-9)
+            assert granted == min(1000, 20 + math.floor(elapsed * 10))
+        assert times[-1] == pytest.approx(98.0)
+
+        stats = limiter.stats()
+        assert stats["acquired"] == 1000
+        assert stats["waited"] == 980
+        assert stats["waiting"] == 0
+        assert stats["max_wait_seconds"] == pytest.approx(98.0)
+        assert stats["mean_wait_seconds"] == pytest.approx(49.05)
+
+    @pytest.mark.asyncio
+    async def test_callers_after_refill_do_not_wait(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock, requests_per_minute=60, burst=2)
+
+        assert await limiter.acquire() == 0
+        assert await limiter.acquire() == 0
+        clock.now = 10.0
+
+        assert await limiter.acquire() == 0
+        assert limiter.stats()["tokens"] == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_returns_its_token(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock, requests_per_minute=60, burst=1)
+        await limiter.acquire()
+
+        task = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.stats()["waiting"] == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert limiter.stats()["tokens"] == pytest.approx(0.0)
+        assert limiter.stats()["waiting"] == 0
+
+    def test_reconfigure_does_not_refill(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock, requests_per_minute=60, burst=5)
+        for _ in range(5):
+            limiter.reserve()
+
+        limiter.reconfigure(120, burst=10)
+
+        assert limiter.tokens == pytest.approx(0.0)
+        assert limiter.reserve() == pytest.approx(0.5)
+
+    def test_global_limiter_is_shared_and_keeps_its_tokens(self, monkeypatch):
+        monkeypatch.setattr(GlobalEAIRateLimiter, "_instance", None)
+        first = GlobalEAIRateLimiter(60)
+        for _ in range(60):
+            first.reserve()
+
+        # Um EAIClient novo não reabastece o balde
+        second = GlobalEAIRateLimiter(120)
+
+        assert second is first
+        assert second.requests_per_minute == 120
+        assert second.tokens < 1
@@ -0,0 +1,124 @@
+"""
+Testes do rate limiter distribuído. Os testes do script Lua usam o Redis de
+TEST_REDIS_URL ou, sem ele, o fakeredis (com lupa); sem nenhum dos dois são
+pulados. Os de fallback e seleção do backend não precisam de Redis:
+
+    docker run --rm -p 6379:6379 redis:7
+    TEST_REDIS_URL=redis://localhost:6379/15 \
+        pytest tests/unit/services/eai_gateway/test_redis_rate_limiter.py
+"""
+
+import asyncio
+import os
+import time
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from src.config import env
+from src.services.eai_gateway import rate_limiter
+from src.services.eai_gateway.rate_limiter import (
+    GlobalEAIRateLimiter,
+    RedisTokenBucketRateLimiter,
+    TokenBucketRateLimiter,
+    get_eai_rate_limiter,
+)
+
+TEST_REDIS_URL = os.getenv("TEST_REDIS_URL")
+
+
+@pytest_asyncio.fixture
+async def redis_client():
+    if TEST_REDIS_URL:
+        from redis import asyncio as aioredis
+
+        client = aioredis.Redis.from_url(TEST_REDIS_URL)
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeAsyncRedis()
+    yield client
+    await client.aclose()
+
+
+def make_limiter(client, key, requests_per_minute=6000, burst=5):
+    return RedisTokenBucketRateLimiter(
+        requests_per_minute, burst, client=client, key=key
+    )
+
+
+class TestRedisTokenBucketRateLimiter:
+    """Test cases for the Redis-backed distributed rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_limit_is_shared_between_processes(self, redis_client):
+        key = f"test:rate_limit:{uuid.uuid4().hex}"
+        # Dois limiters com o mesmo balde simulam dois workers
+        workers = [make_limiter(redis_client, key) for _ in range(2)]
+
+        start = time.monotonic()
+        await asyncio.gather(*(workers[index % 2].acquire() for index in range(105)))
+        elapsed = time.monotonic() - start
+
+        # 5 imediatos e 100 a 100 req/s: ~1s no total, não ~0.5s por worker
+        assert 0.9 <= elapsed < 1.5
+        assert sum(worker.stats()["acquired"] for worker in workers) == 105
+        assert sum(worker.stats()["waited"] for worker in workers) == 100
+        assert all(worker.stats()["fallbacks"] == 0 for worker in workers)
+        await redis_client.delete(key)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_returns_its_token(self, redis_client):
+        key = f"test:rate_limit:{uuid.uuid4().hex}"
+        limiter = make_limiter(redis_client, key, requests_per_minute=60, burst=1)
+        await limiter.acquire()
+
+        task = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # Sem a devolução, a próxima reserva esperaria ~2s
+        assert await limiter._reserve(1) == pytest.approx(1.0, abs=0.1)
+        await redis_client.delete(key)
+
+
+class TestRateLimiterFallback:
+    """Test cases for backend selection and the in-process fallback."""
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_falls_back_to_local_limiter(self):
+        fallback = TokenBucketRateLimiter(60, burst=2)
+        limiter = RedisTokenBucketRateLimiter(
+            60, burst=2, redis_url="redis://127.0.0.1:1/0", fallback=fallback
+        )
+
+        assert await limiter.acquire() == 0
+        assert await limiter.acquire() == 0
+
+        stats = limiter.stats()
+        # Depois da primeira falha o Redis não é tentado de novo por um tempo
+        assert stats["redis_errors"] == 1
+        assert stats["fallbacks"] == 2
+        assert stats["fallback"]["acquired"] == 2
+
+    def test_backend_is_selected_by_config(self, monkeypatch):
+        monkeypatch.setattr(rate_limiter, "_redis_limiter", None)
+        monkeypatch.setattr(env, "EAI_GATEWAY_RATE_LIMIT_BACKEND", "redis")
+        monkeypatch.setattr(env, "EAI_GATEWAY_REDIS_URL", "redis://127.0.0.1:1/0")
+
+        first = get_eai_rate_limiter(60)
+        second = get_eai_rate_limiter(120)
+
+        assert isinstance(first, RedisTokenBucketRateLimiter)
+        assert second is first and second.requests_per_minute == 120
+        assert isinstance(first.fallback, GlobalEAIRateLimiter)
+
+        monkeypatch.setattr(env, "EAI_GATEWAY_RATE_LIMIT_BACKEND", "local")
+        assert isinstance(get_eai_rate_limiter(60), GlobalEAIRateLimiter)
+
+        monkeypatch.setattr(env, "EAI_GATEWAY_RATE_LIMIT_BACKEND", "memcached")
+        with pytest.raises(ValueError):
+            get_eai_rate_limiter(60)
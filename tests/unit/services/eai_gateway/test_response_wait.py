@@ -0,0 +1,190 @@
+import itertools
+import time
+
+import pytest
+
+from src.services.eai_gateway.api import EAIClient, EAIClientError
+from src.services.eai_gateway.response_wait import (
+    ResponseWaitSettings,
+    backoff_delays,
+    iter_sse_events,
+)
+from tests.fakes.fake_eai_gateway import FakeEAIGateway
+
+
+@pytest.fixture
+def gateway():
+    with FakeEAIGateway(ready_after=0.3) as server:
+        yield server
+
+
+def make_client(gateway, mode, polling_interval=1, timeout=10, **kwargs):
+    return EAIClient(
+        timeout=timeout,
+        polling_interval=polling_interval,
+        base_url=gateway.url,
+        response_wait=ResponseWaitSettings(mode=mode, **kwargs),
+    )
+
+
+async def send(client, gateway):
+    """Envia uma mensagem e devolve a resposta e a latência adicionada"""
+    response = await client.send_message_and_get_response(
+        user_number="123", message="oi"
+    )
+    return response, gateway.added_latency(response.message_id, time.monotonic())
+
+
+async def lines(*items):
+    for item in items:
+        yield item
+
+
+class TestResponseWaitSettings:
+    """Test cases for the polling schedule of the EAI client."""
+
+    def test_backoff_grows_up_to_the_polling_interval(self):
+        delays = backoff_delays(0.1, 2.0, 2.0)
+        assert list(itertools.islice(delays, 7)) == pytest.approx(
+            [0.1, 0.2, 0.4, 0.8, 1.6, 2.0, 2.0]
+        )
+
+    def test_jitter_stays_within_bounds(self):
+        delays = list(itertools.islice(backoff_delays(1.0, 1.0, 1.5, 0.2), 100))
+        assert all(0.8 <= delay <= 1.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_poll_mode_keeps_the_fixed_interval(self):
+        delays = ResponseWaitSettings(mode="poll").poll_delays(2)
+        assert list(itertools.islice(delays, 3)) == [2, 2, 2]
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            ResponseWaitSettings(mode="webhook")
+
+    @pytest.mark.asyncio
+    async def test_sse_parsing(self):
+        events = [
+            event
+            async for event in iter_sse_events(
+                lines(
+                    ": keep-alive",
+                    "",
+                    'data: {"status":',
+                    'data: "processing"}',
+                    "",
+                    "event: message",
+                    'data:{"status": "completed"}',
+                )
+            )
+        ]
+        assert events == [{"status": "processing"}, {"status": "completed"}]
+
+
+class TestEAIClientResponseWait:
+    """Test cases for EAIClient response waiting against a fake gateway."""
+
+    @pytest.mark.asyncio
+    async def test_sse_delivers_the_response_when_ready(self, gateway):
+        client = make_client(gateway, "auto")
+        try:
+            response, latency = await send(client, gateway)
+        finally:
+            await client.close()
+
+        assert response.status == "completed"
+        assert latency < 0.1
+        assert gateway.requests["stream"] == 1
+        assert gateway.requests["poll"] == 0
+
+    @pytest.mark.asyncio
+    async def test_auto_falls_back_to_long_polling_and_remembers(self, gateway):
+        gateway.sse = False
+        # Os endpoints da API criam um cliente por requisição
+        first_client = make_client(gateway, "auto")
+        second_client = make_client(gateway, "auto")
+        try:
+            _, first = await send(first_client, gateway)
+            _, second = await send(second_client, gateway)
+        finally:
+            await first_client.close()
+            await second_client.close()
+
+        assert max(first, second) < 0.1
+        # O endpoint de stream só é testado na primeira mensagem do processo
+        assert gateway.requests["stream"] == 1
+        assert gateway.requests["held"] >= 2
+        assert gateway.requests["poll"] <= 4
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [400, 401, 500])
+    async def test_failed_probe_is_remembered(self, gateway, status):
+        gateway.stream_status = status
+        for _ in range(2):
+            client = make_client(gateway, "auto")
+            try:
+                response, _ = await send(client, gateway)
+            finally:
+                await client.close()
+            assert response.status == "completed"
+
+        assert gateway.requests["stream"] == 1
+
+    def test_default_mode_is_backoff(self):
+        assert ResponseWaitSettings().mode == "backoff"
+        assert not ResponseWaitSettings().tries_sse
+
+    @pytest.mark.asyncio
+    async def test_backoff_when_gateway_ignores_wait(self, gateway):
+        gateway.sse = False
+        gateway.long_poll = False
+        client = make_client(gateway, "auto", polling_interval=2, jitter=0)
+        try:
+            response, latency = await send(client, gateway)
+        finally:
+            await client.close()
+
+        assert response.status == "completed"
+        # Consultas em 0, 0.1, 0.25 e 0.475s: a resposta pronta em 0.3s chega
+        # com bem menos que o intervalo fixo de 2s
+        assert latency < 0.3
+        assert gateway.requests["poll"] <= 5
+
+    @pytest.mark.asyncio
+    async def test_poll_mode_uses_fixed_interval_without_wait(self, gateway):
+        client = make_client(gateway, "poll", polling_interval=0.5)
+        try:
+            _, latency = await send(client, gateway)
+        finally:
+            await client.close()
+
+        assert 0.1 < latency < 0.4
+        assert gateway.requests["stream"] == 0
+        assert gateway.requests["held"] == 0
+        assert gateway.requests["poll"] == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sse", [True, False])
+    async def test_failed_response_raises(self, gateway, sse):
+        gateway.sse = sse
+        gateway.fail = True
+        client = make_client(gateway, "auto")
+        try:
+            with pytest.raises(EAIClientError, match="falha simulada"):
+                await send(client, gateway)
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["sse", "long_poll", "backoff"])
+    async def test_timeout(self, gateway, mode):
+        gateway.ready_after = 5
+        client = make_client(gateway, mode, timeout=0.5)
+        start = time.monotonic()
+        try:
+            with pytest.raises(EAIClientError, match="Timeout"):
+                await send(client, gateway)
+        finally:
+            await client.close()
+
+        assert time.monotonic() - start < 1.5
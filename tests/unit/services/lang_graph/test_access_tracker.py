@@ -0,0 +1,153 @@
+import threading
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+from src.services.lang_graph.access_tracker import LastAccessedBuffer
+
+START = datetime(2025, 1, 1)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = START
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+class RecordingFlush:
+    """Fake flush target that records each batched UPDATE."""
+
+    def __init__(self, fail_times: int = 0):
+        self.batches = []
+        self.fail_times = fail_times
+        self.flushed = threading.Event()
+
+    def __call__(self, memory_ids: List[str], accessed_at: datetime) -> None:
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("banco indisponível")
+        self.batches.append((sorted(memory_ids), accessed_at))
+        self.flushed.set()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_buffer(flush, clock, **kwargs) -> LastAccessedBuffer:
+    kwargs.setdefault("flush_interval", 3600)
+    kwargs.setdefault("max_pending", 100)
+    return LastAccessedBuffer(flush_fn=flush, clock=clock, **kwargs)
+
+
+class TestLastAccessedBuffer:
+    """Test cases for the write-behind last_accessed buffer."""
+
+    def test_record_does_not_write_until_flush(self, clock):
+        flush = RecordingFlush()
+        buffer = make_buffer(flush, clock)
+
+        buffer.record(["a", "b"])
+        clock.advance(1)
+        buffer.record(["b", "c"])
+
+        assert flush.batches == []
+        assert buffer.stats()["pending"] == 3
+
+        assert buffer.flush() == 3
+        assert flush.batches == [(["a", "b", "c"], START + timedelta(seconds=1))]
+        assert buffer.flush() == 0
+        buffer.close()
+
+    def test_size_threshold_wakes_the_flusher(self, clock):
+        flush = RecordingFlush()
+        buffer = make_buffer(flush, clock, max_pending=3)
+
+        buffer.record(["a", "b"])
+        assert not flush.flushed.wait(0.05)
+
+        buffer.record(["c"])
+        assert flush.flushed.wait(2)
+        assert flush.batches == [(["a", "b", "c"], START)]
+        buffer.close()
+
+    def test_interval_flush(self, clock):
+        flush = RecordingFlush()
+        buffer = make_buffer(flush, clock, flush_interval=0.01)
+
+        buffer.record(["a"])
+
+        assert flush.flushed.wait(2)
+        assert flush.batches == [(["a"], START)]
+        buffer.close()
+
+    def test_close_flushes_pending_and_later_records_restart_the_thread(self, clock):
+        flush = RecordingFlush()
+        buffer = make_buffer(flush, clock)
+        buffer.record(["a"])
+        first_thread = buffer._thread
+
+        buffer.close()
+        assert flush.batches == [(["a"], START)]
+        assert not first_thread.is_alive()
+
+        buffer.record(["b"])
+        # Volta ao write-behind: nada é gravado antes do próximo flush
+        assert flush.batches == [(["a"], START)]
+        assert buffer._thread is not first_thread and buffer._thread.is_alive()
+
+        buffer.close()
+        assert flush.batches == [(["a"], START), (["b"], START)]
+        assert buffer.stats()["flushes"] == 2
+
+    def test_failed_flush_is_retried_without_losing_newer_accesses(self, clock):
+        flush = RecordingFlush(fail_times=1)
+        buffer = make_buffer(flush, clock)
+        buffer.record(["a", "b"])
+
+        assert buffer.flush() == 0
+        clock.advance(10)
+        buffer.record(["b"])
+        assert buffer.flush() == 2
+
+        assert flush.batches == [(["a", "b"], START + timedelta(seconds=10))]
+        assert buffer.stats()["failures"] == 1
+        buffer.close()
+
+    def test_zero_interval_writes_on_every_read(self, clock):
+        flush = RecordingFlush()
+        buffer = make_buffer(flush, clock, flush_interval=0)
+
+        buffer.record(["a"])
+        buffer.record([])
+
+        assert flush.batches == [(["a"], START)]
+        assert buffer._thread is None
+
+    def test_concurrent_records_are_flushed_exactly_once(self, clock):
+        flush = RecordingFlush()
+        buffer = make_buffer(flush, clock, max_pending=50)
+
+        def reader(worker: int):
+            for i in range(100):
+                buffer.record([f"{worker}-{i}"])
+
+        threads = [threading.Thread(target=reader, args=(w,)) for w in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        buffer.close()
+
+        flushed = [memory_id for ids, _ in flush.batches for memory_id in ids]
+        assert sorted(flushed) == sorted(
+            f"{w}-{i}" for w in range(8) for i in range(100)
+        )
+        assert buffer.stats()["flushed_ids"] == 800
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.services.lang_graph.llms import LLMConfig
+
+EMBEDDING_LATENCY = 0.2
+
+
+class SlowBlockingEmbeddings(Embeddings):
+    """Embeddings whose calls block the calling thread like the Gemini SDK."""
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(EMBEDDING_LATENCY)
+        return [float(len(text))] * 3
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(EMBEDDING_LATENCY)
+        return [[float(len(text))] * 3 for text in texts]
+
+
+async def max_loop_lag(work, interval: float = 0.01) -> float:
+    """Runs `work` while a heartbeat measures the largest event loop stall."""
+    lags = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(interval)
+    try:
+        await work()
+    finally:
+        done.set()
+        await beat
+    return max(lags)
+
+
+@pytest.fixture
+def llm_config(monkeypatch):
+    config = LLMConfig()
+    monkeypatch.setattr(config, "get_embedding_model", SlowBlockingEmbeddings)
+    return config
+
+
+class TestAsyncEmbeddings:
+    """Test cases for the non-blocking embedding helpers used by memory tools."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_embeddings_keep_event_loop_responsive(self, llm_config):
+        """Concurrent memory embeddings neither stall the loop nor serialize."""
+        results = []
+
+        async def work():
+            results.extend(
+                await asyncio.gather(
+                    *(llm_config.agenerate_embedding(f"memória {i}") for i in range(5))
+                )
+            )
+
+        start = time.perf_counter()
+        lag = await max_loop_lag(work)
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 5
+        assert lag < EMBEDDING_LATENCY / 2
+        assert elapsed < 5 * EMBEDDING_LATENCY
+
+    @pytest.mark.asyncio
+    async def test_sync_embedding_blocks_event_loop(self, llm_config):
+        """Baseline: the synchronous call stalls every coroutine in the worker."""
+
+        async def work():
+            llm_config.generate_embedding("memória")
+
+        assert await max_loop_lag(work) >= EMBEDDING_LATENCY * 0.9
+
+    @pytest.mark.asyncio
+    async def test_batch_embeddings(self, llm_config):
+        embeddings = await llm_config.agenerate_embeddings(["a", "bb"])
+
+        assert embeddings == [[1.0] * 3, [2.0] * 3]
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from langgraph.checkpoint.base.id import uuid6
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.services.lang_graph.checkpointer import (
+    CheckpointRetention,
+    GraphCheckpointerManager,
+    checkpoint_id_before,
+)
+
+
+class TestCheckpointIdBefore:
+    """Test cases for the UUIDv6 cutoff used by the retention TTL."""
+
+    def test_cutoff_orders_like_langgraph_checkpoint_ids(self):
+        """Ids generated now sort between cutoffs one second apart."""
+        now = datetime.now(timezone.utc)
+        checkpoint_id = str(uuid6())
+
+        assert checkpoint_id_before(now - timedelta(seconds=1)) < checkpoint_id
+        assert checkpoint_id < checkpoint_id_before(now + timedelta(seconds=1))
+
+    def test_cutoff_is_monotonic(self):
+        """Earlier moments always produce smaller cutoffs."""
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        cutoffs = [checkpoint_id_before(start + timedelta(days=d)) for d in range(40)]
+
+        assert cutoffs == sorted(cutoffs)
+        assert len(set(cutoffs)) == len(cutoffs)
+
+
+class TestGraphCheckpointerManager:
+    """Test cases for the backend selection of the graph checkpointer."""
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError):
+            GraphCheckpointerManager(backend="redis")
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_is_shared_and_skips_retention(self):
+        """The in-memory saver is created once and prune is a no-op."""
+        manager = GraphCheckpointerManager(
+            backend="memory", retention=CheckpointRetention(keep_last=1, ttl_days=1)
+        )
+
+        first = await manager.get()
+        second = await manager.get()
+
+        assert isinstance(first, InMemorySaver)
+        assert first is second
+        assert await manager.prune() == {"deleted_threads": 0, "deleted_checkpoints": 0}
+
+        await manager.shutdown()
+        assert await manager.get() is not first
@@ -0,0 +1,180 @@
+from enum import Enum
+from types import SimpleNamespace
+from typing import Any, Sequence
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from pydantic import BaseModel
+
+from src.services.lang_graph.compiled_agent import (
+    TOOLS_INSTRUCTIONS,
+    CompiledAgentCache,
+    render_static_prompt,
+)
+
+BIND_CALLS = []
+
+
+class CountingChatModel(GenericFakeChatModel):
+    """Fake chat model that records every bind_tools call."""
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        BIND_CALLS.append([t.name for t in tools])
+        return self.bind(tools=[t.name for t in tools], **kwargs)
+
+
+class MemoryTypes(BaseModel):
+    user_profile: str = "Fatos estáveis sobre o usuário."
+    preference: str = "Preferências do usuário."
+
+
+class FakeMemoryType(str, Enum):
+    PREFERENCE = "preference"
+
+
+@tool
+def get_memory_tool(memory_type: str, query: str) -> dict:
+    """Busca memórias do usuário."""
+    return {}
+
+
+@tool
+def save_memory_tool(content: str, memory_type: str) -> dict:
+    """Salva uma memória do usuário."""
+    return {}
+
+
+TOOLS = [get_memory_tool, save_memory_tool]
+
+
+def make_config(system_prompt="Você é o EAí.", temperature=0.7):
+    return SimpleNamespace(
+        system_prompt=system_prompt,
+        temperature=temperature,
+        memory_types_config=MemoryTypes(),
+    )
+
+
+@pytest.fixture
+def factory():
+    calls = []
+
+    def create():
+        model = CountingChatModel(messages=iter([AIMessage(content="ok")] * 10))
+        calls.append(model)
+        return model
+
+    create.calls = calls
+    BIND_CALLS.clear()
+    return create
+
+
+class TestCompiledAgentCache:
+    """Test cases for the compiled agent cache used by agent_reasoning."""
+
+    def test_binds_tools_once_per_key(self, factory):
+        """Repeated turns reuse the same bound model and static prompt."""
+        cache = CompiledAgentCache(max_entries=8)
+        config = make_config()
+
+        agents = [
+            cache.get(config, TOOLS, model_name="fake", model_factory=factory)
+            for _ in range(5)
+        ]
+
+        assert len(factory.calls) == 1
+        assert BIND_CALLS == [["get_memory_tool", "save_memory_tool"]]
+        assert all(agent is agents[0] for agent in agents)
+        assert cache.stats()["hits"] == 4
+        assert cache.stats()["misses"] == 1
+
+    def test_prompt_change_invalidates(self, factory):
+        """A new system prompt yields a new prompt version and a new binding."""
+        cache = CompiledAgentCache(max_entries=8)
+
+        first = cache.get(make_config(), TOOLS, "fake", factory)
+        second = cache.get(make_config("Novo prompt."), TOOLS, "fake", factory)
+
+        assert first.prompt_version != second.prompt_version
+        assert second.static_prompt.startswith("Novo prompt.")
+        assert len(factory.calls) == 2
+
+    def test_temperature_and_tools_are_part_of_the_key(self, factory):
+        """Different temperatures or tool sets are compiled separately."""
+        cache = CompiledAgentCache(max_entries=8)
+
+        cache.get(make_config(temperature=0.2), TOOLS, "fake", factory)
+        cache.get(make_config(temperature=0.9), TOOLS, "fake", factory)
+        cache.get(make_config(temperature=0.9), TOOLS[:1], "fake", factory)
+
+        assert len(factory.calls) == 3
+
+    def test_lru_eviction_and_invalidate(self, factory):
+        """The least recently used entry is evicted when the cache is full."""
+        cache = CompiledAgentCache(max_entries=2)
+
+        cache.get(make_config("a"), TOOLS, "fake", factory)
+        cache.get(make_config("b"), TOOLS, "fake", factory)
+        cache.get(make_config("a"), TOOLS, "fake", factory)
+        cache.get(make_config("c"), TOOLS, "fake", factory)
+        cache.get(make_config("a"), TOOLS, "fake", factory)
+
+        assert len(factory.calls) == 3
+        assert cache.stats()["evictions"] == 1
+
+        cache.invalidate()
+        cache.get(make_config("a"), TOOLS, "fake", factory)
+        assert len(factory.calls) == 4
+
+    def test_disabled_cache_compiles_every_time(self, factory):
+        cache = CompiledAgentCache(max_entries=0)
+
+        cache.get(make_config(), TOOLS, "fake", factory)
+        cache.get(make_config(), TOOLS, "fake", factory)
+
+        assert len(factory.calls) == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_system_prompt_matches_full_render(self, factory):
+        """Static prefix plus per-turn memories equals the previous prompt."""
+        cache = CompiledAgentCache(max_entries=8)
+        config = make_config()
+        memories = [
+            SimpleNamespace(
+                memory_type=FakeMemoryType.PREFERENCE,
+                content="Gosta de comida italiana",
+                relevance_score=0.87,
+            ),
+            SimpleNamespace(
+                memory_type=FakeMemoryType.PREFERENCE,
+                content="Prefere atendimento presencial",
+                relevance_score=None,
+            ),
+        ]
+
+        prompt = cache.get(config, TOOLS, "fake", factory).system_prompt(memories)
+
+        assert prompt == (
+            "Você é o EAí."
+            "\n**Tipos de Memória Disponíveis:**\n"
+            "* **user_profile:** Fatos estáveis sobre o usuário.\n"
+            "* **preference:** Preferências do usuário.\n"
+            + TOOLS_INSTRUCTIONS
+            + "\n**Memórias Relevantes Recuperadas:**\n"
+            "1. **preference:** Gosta de comida italiana (relevância: 0.87)\n"
+            "2. **preference:** Prefere atendimento presencial\n"
+        )
+        assert prompt.startswith(
+            render_static_prompt(config.system_prompt, config.memory_types_config)
+        )
+
+    @pytest.mark.asyncio
+    async def test_cached_model_is_invocable(self, factory):
+        cache = CompiledAgentCache(max_entries=8)
+        agent = cache.get(make_config(), TOOLS, "fake", factory)
+
+        response = await agent.model.ainvoke([HumanMessage(content="Oi")])
+
+        assert response.content == "ok"
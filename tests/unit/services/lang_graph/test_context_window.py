@@ -0,0 +1,189 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.services.lang_graph.context_window import (
+    ContextBudgeter,
+    ContextPolicy,
+    approximate_tokens,
+    message_tokens,
+)
+
+SYSTEM_PROMPT = "Você é um assistente."
+
+
+def conversation(turns: int, words: int = 40) -> list:
+    """Turnos alternando resposta direta e resposta com uma tool call"""
+    messages = []
+    for turn in range(turns):
+        text = " ".join(f"palavra{turn}" for _ in range(words))
+        messages.append(HumanMessage(content=f"pergunta {turn}: {text}"))
+        if turn % 2:
+            messages.append(
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {
+                            "name": "get_memory_tool",
+                            "args": {"query": text},
+                            "id": f"call_{turn}",
+                        }
+                    ],
+                )
+            )
+            messages.append(
+                ToolMessage(content=f"resultado {text}", tool_call_id=f"call_{turn}")
+            )
+        messages.append(AIMessage(content=f"resposta {turn}: {text}"))
+    return messages
+
+
+def assert_tool_pairs_intact(window: list) -> None:
+    assert isinstance(window[0], (HumanMessage, SystemMessage))
+    for index, message in enumerate(window):
+        if isinstance(message, ToolMessage):
+            assert window[index - 1].tool_calls[0]["id"] == message.tool_call_id
+
+
+class TestTokenApproximation:
+    """Test cases for the local token approximation."""
+
+    def test_words_and_punctuation(self):
+        assert approximate_tokens("") == 0
+        assert approximate_tokens("olá, mundo!") == 5
+        # Palavras longas contam ~1 token a cada 4 caracteres
+        assert approximate_tokens("a" * 40) == 10
+
+    def test_tool_call_arguments_are_counted(self):
+        plain = AIMessage(content="ok")
+        with_call = AIMessage(
+            content="ok",
+            tool_calls=[{"name": "t", "args": {"query": "x " * 50}, "id": "1"}],
+        )
+        assert message_tokens(with_call) > message_tokens(plain) + 50
+
+
+class TestContextBudgeter:
+    """Test cases for the context-window policy of the agent graph."""
+
+    def test_everything_fits_under_budget(self):
+        messages = conversation(3)
+        budgeter = ContextBudgeter(ContextPolicy(max_tokens=10_000))
+
+        window = budgeter.plan(SYSTEM_PROMPT, messages)
+
+        assert window.messages == messages
+        assert window.start == 0 and window.dropped == []
+
+    def test_disabled_by_default(self):
+        messages = conversation(200)
+        budgeter = ContextBudgeter(ContextPolicy())
+
+        window = budgeter.plan(SYSTEM_PROMPT, messages)
+
+        assert not ContextPolicy().enabled
+        assert window.messages == messages and window.dropped == []
+
+    def test_budget_trims_to_low_water_at_turn_boundaries(self):
+        messages = conversation(60)
+        policy = ContextPolicy(max_tokens=2000, low_water=0.5)
+        budgeter = ContextBudgeter(policy)
+
+        window = budgeter.plan(SYSTEM_PROMPT, messages)
+
+        assert window.tokens <= 1000
+        assert window.messages[-1] is messages[-1]
+        assert window.messages == messages[window.start :]
+        assert_tool_pairs_intact(window.messages)
+        assert len(window.dropped) == window.start
+
+    def test_window_start_is_sticky_until_the_budget_is_exceeded_again(self):
+        messages = conversation(60)
+        budgeter = ContextBudgeter(ContextPolicy(max_tokens=2000, low_water=0.5))
+        first = budgeter.plan(SYSTEM_PROMPT, messages)
+
+        # Um turno a mais ainda cabe: o início da janela não muda
+        grown = messages + conversation(61)[-2:]
+        second = budgeter.plan(SYSTEM_PROMPT, grown, start=first.start)
+
+        assert second.start == first.start
+        assert second.dropped == []
+
+    def test_sliding_window_counts_messages(self):
+        messages = conversation(20)
+        budgeter = ContextBudgeter(
+            ContextPolicy(max_tokens=0, max_messages=10, low_water=1.0)
+        )
+
+        window = budgeter.plan(SYSTEM_PROMPT, messages)
+
+        assert len(window.messages) <= 10
+        assert_tool_pairs_intact(window.messages)
+
+    def test_pinned_messages_are_kept(self):
+        pinned = HumanMessage(
+            content="meu nome é Ana", additional_kwargs={"pinned": True}
+        )
+        system = SystemMessage(content="contexto fixo")
+        messages = [system, pinned] + conversation(60)
+        budgeter = ContextBudgeter(ContextPolicy(max_tokens=2000))
+
+        window = budgeter.plan(SYSTEM_PROMPT, messages)
+
+        assert window.messages[:2] == [system, pinned]
+        assert pinned not in window.dropped
+        assert window.start > 2
+
+    def test_last_turn_is_kept_even_over_budget(self):
+        messages = conversation(3, words=500)
+        budgeter = ContextBudgeter(ContextPolicy(max_tokens=100))
+
+        window = budgeter.plan(SYSTEM_PROMPT, messages)
+
+        assert isinstance(window.messages[0], HumanMessage)
+        assert window.messages == messages[window.start :]
+        assert window.messages[0].content.startswith("pergunta 2")
+
+    @pytest.mark.asyncio
+    async def test_rolling_summary_only_sees_newly_dropped_messages(self):
+        calls = []
+
+        async def summarizer(previous, dropped):
+            calls.append((previous, len(dropped)))
+            return f"{previous}+{len(dropped)}"
+
+        budgeter = ContextBudgeter(
+            ContextPolicy(max_tokens=2000, summarize=True, summary_max_tokens=100),
+            summarizer=summarizer,
+        )
+        messages = conversation(60)
+
+        first = await budgeter.abuild(SYSTEM_PROMPT, messages)
+        unchanged = await budgeter.abuild(
+            SYSTEM_PROMPT, messages, first.start, first.summary
+        )
+        longer = conversation(120)
+        second = await budgeter.abuild(
+            SYSTEM_PROMPT, longer, unchanged.start, unchanged.summary
+        )
+
+        assert calls == [
+            ("", first.start),
+            (first.summary, second.start - first.start),
+        ]
+        assert second.summary == f"+{first.start}+{second.start - first.start}"
+
+    @pytest.mark.asyncio
+    async def test_summarizer_failure_keeps_previous_summary(self):
+        async def summarizer(previous, dropped):
+            raise RuntimeError("modelo indisponível")
+
+        budgeter = ContextBudgeter(
+            ContextPolicy(max_tokens=2000, summarize=True), summarizer=summarizer
+        )
+
+        window = await budgeter.abuild(
+            SYSTEM_PROMPT, conversation(60), summary="antigo"
+        )
+
+        assert window.summary == "antigo"
+        assert window.start > 0
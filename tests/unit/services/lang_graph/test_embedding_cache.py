@@ -0,0 +1,116 @@
+from typing import List
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.services.lang_graph.embedding_cache import (
+    EmbeddingCache,
+    SQLEmbeddingStore,
+    embedding_cache_key,
+)
+from src.services.lang_graph.llms import LLMConfig
+
+CALLS = []
+
+
+class CountingFakeEmbedding(DeterministicFakeEmbedding):
+    """Deterministic fake embedder that records which texts hit the 'API'."""
+
+    def embed_query(self, text: str) -> List[float]:
+        CALLS.append(("query", [text]))
+        return super().embed_query(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        CALLS.append(("document", list(texts)))
+        return super().embed_documents(texts)
+
+
+def make_config(monkeypatch, cache: EmbeddingCache) -> LLMConfig:
+    config = LLMConfig(embedding_cache=cache)
+    embedder = CountingFakeEmbedding(size=8)
+    monkeypatch.setattr(config, "get_embedding_model", lambda *a, **k: embedder)
+    return config
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    CALLS.clear()
+
+
+class TestEmbeddingCache:
+    """Test cases for the two-tier embedding cache in LLMConfig."""
+
+    def test_repeated_query_is_embedded_once(self, monkeypatch):
+        config = make_config(monkeypatch, EmbeddingCache(max_entries=100))
+
+        first = config.generate_embedding("qual é o meu nome?")
+        second = config.generate_embedding("qual é o meu nome?")
+
+        assert first == second
+        assert CALLS == [("query", ["qual é o meu nome?"])]
+        assert config.embedding_cache.stats()["hits"] == 1
+
+    def test_batch_deduplicates_and_embeds_only_misses(self, monkeypatch):
+        config = make_config(monkeypatch, EmbeddingCache(max_entries=100))
+        expected = CountingFakeEmbedding(size=8).embed_documents(["a", "b", "c"])
+        CALLS.clear()
+
+        first = config.generate_embeddings(["a", "b", "a"])
+        second = config.generate_embeddings(["c", "a"])
+
+        assert first == [expected[0], expected[1], expected[0]]
+        assert second == [expected[2], expected[0]]
+        assert CALLS == [("document", ["a", "b"]), ("document", ["c"])]
+
+    def test_key_depends_on_model_and_kind(self):
+        assert embedding_cache_key("m1", "query", "x") != embedding_cache_key(
+            "m2", "query", "x"
+        )
+        assert embedding_cache_key("m1", "query", "x") != embedding_cache_key(
+            "m1", "document", "x"
+        )
+
+    def test_lru_evicts_least_recently_used(self, monkeypatch):
+        config = make_config(monkeypatch, EmbeddingCache(max_entries=2))
+
+        for text in ["a", "b", "a", "c", "a"]:
+            config.generate_embedding(text)
+
+        assert [texts for _, texts in CALLS] == [["a"], ["b"], ["c"]]
+        assert config.embedding_cache.stats()["evictions"] == 1
+
+    def test_persistent_tier_survives_new_process(self, monkeypatch, tmp_path):
+        url = f"sqlite:///{tmp_path / 'embeddings.db'}"
+        writer = make_config(monkeypatch, EmbeddingCache(10, SQLEmbeddingStore(url)))
+        written = writer.generate_embeddings(["memória 1", "memória 2"])
+        CALLS.clear()
+
+        # Novo LLMConfig com LRU vazio: só o nível persistente é compartilhado
+        reader = make_config(monkeypatch, EmbeddingCache(10, SQLEmbeddingStore(url)))
+        read = reader.generate_embeddings(["memória 2", "memória 1"])
+
+        assert CALLS == []
+        assert read == [written[1], written[0]]
+        assert reader.embedding_cache.stats()["store_hits"] == 2
+
+    def test_store_failure_falls_back_to_embedder(self, monkeypatch, tmp_path):
+        url = f"sqlite:///{tmp_path / 'missing' / 'embeddings.db'}"
+        config = make_config(monkeypatch, EmbeddingCache(10, SQLEmbeddingStore(url)))
+
+        embedding = config.generate_embedding("texto")
+
+        assert len(embedding) == 8
+        assert CALLS == [("query", ["texto"])]
+
+    @pytest.mark.asyncio
+    async def test_async_path_shares_the_cache(self, monkeypatch, tmp_path):
+        url = f"sqlite:///{tmp_path / 'embeddings.db'}"
+        config = make_config(monkeypatch, EmbeddingCache(10, SQLEmbeddingStore(url)))
+
+        sync_embedding = config.generate_embedding("oi")
+        async_embedding = await config.agenerate_embedding("oi")
+        batch = await config.agenerate_embeddings(["x", "y", "x"])
+
+        assert async_embedding == sync_embedding
+        assert len(batch) == 3 and batch[0] == batch[2]
+        assert CALLS == [("query", ["oi"]), ("document", ["x", "y"])]
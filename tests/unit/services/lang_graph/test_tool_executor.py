@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+
+from src.services.lang_graph.tool_executor import (
+    ParallelToolExecutor,
+    ToolExecutionSettings,
+    parse_tool_timeouts,
+)
+
+RUNNING = []
+PEAK = []
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    RUNNING.clear()
+    PEAK.clear()
+
+
+async def _sleep(seconds: float) -> None:
+    RUNNING.append(seconds)
+    PEAK.append(len(RUNNING))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        RUNNING.remove(seconds)
+
+
+@tool
+async def slow_search_tool(query: str, seconds: float) -> str:
+    """Fake search tool that takes `seconds` to answer."""
+    await _sleep(seconds)
+    return f"resultado para {query}"
+
+
+@tool
+async def slow_memory_tool(seconds: float, config: RunnableConfig = None) -> str:
+    """Fake memory lookup that echoes the injected user_id."""
+    await _sleep(seconds)
+    return f"memórias de {config['configurable']['user_id']}"
+
+
+@tool
+async def failing_tool() -> str:
+    """Fake tool that always raises."""
+    raise RuntimeError("falhou")
+
+
+TOOLS = [slow_search_tool, slow_memory_tool, failing_tool]
+CONFIG = {"configurable": {"user_id": "user-1"}}
+
+
+def call(name: str, index: int, **args) -> dict:
+    return {"name": name, "args": args, "id": f"call_{index}", "type": "tool_call"}
+
+
+def make_executor(**kwargs) -> ParallelToolExecutor:
+    return ParallelToolExecutor(TOOLS, ToolExecutionSettings(**kwargs))
+
+
+class TestParallelToolExecutor:
+    """Test cases for concurrent tool execution in the agent graph."""
+
+    @pytest.mark.asyncio
+    async def test_wall_time_is_max_not_sum(self):
+        executor = make_executor(max_concurrency=4)
+        calls = [
+            call("slow_search_tool", 0, query="a", seconds=0.3),
+            call("slow_memory_tool", 1, seconds=0.2),
+            call("slow_search_tool", 2, query="b", seconds=0.1),
+        ]
+
+        start = time.perf_counter()
+        messages = await executor.execute(calls, CONFIG)
+        elapsed = time.perf_counter() - start
+
+        # Sequencial levaria 0.6s
+        assert 0.3 <= elapsed < 0.5
+        assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2"]
+        assert [m.content for m in messages] == [
+            "resultado para a",
+            "memórias de user-1",
+            "resultado para b",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        executor = make_executor(max_concurrency=2)
+        calls = [
+            call("slow_search_tool", i, query=str(i), seconds=0.1) for i in range(4)
+        ]
+
+        start = time.perf_counter()
+        messages = await executor.execute(calls, CONFIG)
+        elapsed = time.perf_counter() - start
+
+        assert max(PEAK) == 2
+        assert 0.2 <= elapsed < 0.35
+        assert [m.content for m in messages] == [
+            f"resultado para {i}" for i in range(4)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sequential_mode(self):
+        executor = make_executor(max_concurrency=1)
+        calls = [call("slow_memory_tool", i, seconds=0.05) for i in range(3)]
+
+        start = time.perf_counter()
+        await executor.execute(calls, CONFIG)
+
+        assert max(PEAK) == 1
+        assert time.perf_counter() - start >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_timeout_only_fails_the_slow_call(self):
+        executor = make_executor(
+            timeout_seconds=1.0, tool_timeouts={"slow_search_tool": 0.05}
+        )
+        calls = [
+            call("slow_search_tool", 0, query="x", seconds=5),
+            call("slow_memory_tool", 1, seconds=0.1),
+        ]
+
+        start = time.perf_counter()
+        timed_out, ok = await executor.execute(calls, CONFIG)
+
+        assert time.perf_counter() - start < 0.5
+        assert timed_out.status == "error"
+        assert "tempo limite de 0.05s" in timed_out.content
+        assert ok.status == "success" and ok.content == "memórias de user-1"
+
+    @pytest.mark.asyncio
+    async def test_errors_and_unknown_tools_become_error_messages(self):
+        executor = make_executor()
+        calls = [
+            call("failing_tool", 0),
+            call("does_not_exist", 1),
+            call("slow_memory_tool", 2, seconds=0),
+        ]
+
+        failed, unknown, ok = await executor.execute(calls, CONFIG)
+
+        assert failed.status == "error" and "falhou" in failed.content
+        assert unknown.status == "error" and unknown.name == "does_not_exist"
+        assert ok.status == "success"
+
+    def test_parse_tool_timeouts(self):
+        assert parse_tool_timeouts("") == {}
+        assert parse_tool_timeouts("a=5, b=0.5") == {"a": 5.0, "b": 0.5}
+        with pytest.raises(ValueError):
+            parse_tool_timeouts("a")
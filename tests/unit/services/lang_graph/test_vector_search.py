@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.services.lang_graph.vector_search import (
+    SemanticSearchSettings,
+    semantic_search_statement,
+    sort_by_distance,
+)
+
+EMBEDDING = [0.1] * 768
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestSemanticSearchSettings:
+    """Test cases for the semantic search strategy settings."""
+
+    def test_auto_uses_ann_only_for_large_users(self):
+        settings = SemanticSearchSettings(
+            strategy="auto", ann_min_user_rows=100, iterative_scan="relaxed_order"
+        )
+
+        assert settings.needs_user_count
+        assert not settings.use_ann(100)
+        assert settings.use_ann(101)
+
+    @pytest.mark.parametrize("iterative_scan", ["", "off"])
+    def test_auto_without_iterative_scan_stays_exact(self, iterative_scan):
+        # Sem iterative scan o HNSW perde as memórias do usuário no pós-filtro
+        settings = SemanticSearchSettings(
+            strategy="auto", ann_min_user_rows=100, iterative_scan=iterative_scan
+        )
+
+        assert not settings.needs_user_count
+        assert not settings.use_ann(1_000_000)
+
+    def test_fixed_strategies_skip_the_count(self):
+        exact = SemanticSearchSettings(strategy="exact")
+        hnsw = SemanticSearchSettings(strategy="hnsw")
+
+        assert not exact.needs_user_count and not exact.use_ann()
+        assert not hnsw.needs_user_count and hnsw.use_ann()
+
+    def test_ann_statements(self):
+        settings = SemanticSearchSettings(ef_search=40, iterative_scan="strict_order")
+
+        statements = [str(s) for s in settings.ann_session_statements(limit=64)]
+
+        # ef_search nunca fica abaixo do limite pedido
+        assert statements == [
+            "SET LOCAL hnsw.ef_search = 64",
+            "SET LOCAL hnsw.iterative_scan = strict_order",
+        ]
+
+    def test_iterative_scan_is_off_by_default(self):
+        # SET LOCAL hnsw.iterative_scan falha no pgvector < 0.8
+        settings = SemanticSearchSettings()
+
+        assert [str(s) for s in settings.ann_session_statements(10)] == [
+            "SET LOCAL hnsw.ef_search = 100"
+        ]
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"strategy": "ivfflat"}, {"iterative_scan": "fast"}]
+    )
+    def test_invalid_values_are_rejected(self, kwargs):
+        with pytest.raises(ValueError):
+            SemanticSearchSettings(**kwargs)
+
+
+class TestSemanticSearchStatement:
+    """Test cases for the exact and ANN semantic search statements."""
+
+    def test_exact_prefilters_user_in_materialized_cte(self):
+        sql = compile_sql(
+            semantic_search_statement("u1", EMBEDDING, memory_type="preference")
+        )
+
+        assert "WITH user_memories AS MATERIALIZED" in sql
+        assert "long_term_memory.user_id = %(user_id_1)s" in sql
+        assert "long_term_memory.memory_type = %(memory_type_1)s" in sql
+        assert "FROM user_memories \nWHERE (user_memories.embedding <=>" in sql
+        assert "ORDER BY distance" in sql
+
+    def test_ann_orders_the_table_directly(self):
+        sql = compile_sql(semantic_search_statement("u1", EMBEDDING, use_ann=True))
+
+        assert "WITH" not in sql
+        assert "memory_type" not in sql.split("WHERE")[1]
+        assert "<=>" in sql and "ORDER BY distance" in sql
+
+    def test_sort_by_distance(self):
+        rows = [("b", 0.3), ("a", 0.1), ("c", 0.2)]
+
+        assert [row[0] for row in sort_by_distance(rows)] == ["a", "c", "b"]
@@ -0,0 +1,61 @@
+import pytest
+
+from src.utils.md_to_wpp import TEST_CASES, advanced_markdown, markdown_to_whatsapp
+
+# Saída exata do conversor antes do tokenizer compilado, por caso de run_tests
+EXPECTED_OUTPUTS = {
+    "Bold formatting (asterisk)": "*Bold text* and *another bold*",
+    "Bold formatting (underscore)": "*Bold text* and *another bold*",
+    "Italic formatting (asterisk)": "_Italic text_ and _another italic_",
+    "Italic formatting (underscore)": "_Italic text_ and _another italic_",
+    "Mixed bold and italic": "*Bold* with _italic_ text",
+    "Complex mixed formatting": "*Bold* and _italic_ and *more bold* and _more italic_",
+    "Strikethrough": "~strikethrough text~",
+    "Headers to bold": "*Header 1*\n\n*Header 2*\n\n*Header 3*",
+    "Links extraction": "Visit https://google.com for search",
+    "Image conversion": "[Image: Alt text]",
+    "Inline code preservation": "`inline code` and more text",
+    "Code block preservation": "```\ncode block\nwith multiple lines\n```",
+    "Mixed code types": "`inline code` and ```\ncode block\n```",
+    "Code with formatting around it": "Some *bold* and `code` and _italic_",
+    "Empty bold/italic": "*bold* and * * and _italic_ and _ _",
+    "Nested formatting attempt": "*bold _and italic_ together*",
+    "Adjacent formatting": "*bold*_italic_",
+    "Formatting in headers": "*Header with *bold* and _italic_*",
+    "Code in formatting": "*bold with `code` inside* and _italic with `code`_",
+    "Multiple consecutive formatting": "*bold1* *bold2* _italic1_ _italic2_",
+    "Basic mixed": "*Bold text* and _italic text_",
+    "Underscore variations": "*Another bold* and _another italic_",
+    "Complex mixed with code and strike": "*Bold* with _italic_ and ~strikethrough~ and `code`",
+    "List with formatting": "List with formatting:\n* *Bold item*\n* _Italic item_\n* `Code item`",
+    "Complex document structure": "*Header*\n\nSome *bold* and _italic_ text.\n\n> Quote here\n\n* List item 1\n* List item 2\n\n```\ncode block\n```",
+    "Triple star pattern": "_*Disque Denúncia:*_",
+    "List with bold formatting (single space)": "* *`calculator_add`*: Soma dois números.",
+}
+
+EXPECTED_ADVANCED = "*Report Summary*\n\nThis is a test of the advanced converter. It includes *bold*, _italic_, and ~strikethrough~.\n\nHere is a table of our quarterly results:\n\n```Month    | Revenue | Expenses | Profit\nJanuary  | 10,000  | 8,000    | 2,000 \nFebruary | 12,000  | 9,000    | 3,000 \nMarch    | 15,000  | 10,000   | 5,000```\n\nPlease review this data. Here is an important image: [Image: Company Logo].\n*Action Items*\n\n- Review the report.\n- Prepare feedback for the team.\n\nThe main conclusion[1] is that we are growing steadily. More details can be found on our https://example.com.\n\n* *Rio Scenarium:*\n    * Abre de quarta a sábado com diversos show. Aos sábados, costuma ter o evento 'Samba & Feijoada' a partir das 13h.\n    \n*Importante:*: ....\n\n---\n_Notas:_\n[1] Based on Q1 2024 data."
+
+
+class TestMarkdownToWhatsapp:
+    """Test cases for the compiled markdown_to_whatsapp converter."""
+
+    @pytest.mark.parametrize("case", TEST_CASES, ids=lambda case: case["name"])
+    def test_run_tests_cases_are_byte_identical(self, case):
+        """Every run_tests case keeps the exact output of the previous converter."""
+        result = markdown_to_whatsapp(case["input"])
+
+        assert result == EXPECTED_OUTPUTS[case["name"]]
+        for expected in case["expected_contains"]:
+            assert expected in result
+
+    def test_advanced_document_is_byte_identical(self):
+        """Tables, footnotes, task lists and rules render exactly as before."""
+        assert markdown_to_whatsapp(advanced_markdown) == EXPECTED_ADVANCED
+
+    def test_plain_text_passes_through(self):
+        """Text without markdown only has its quotes normalized."""
+        assert markdown_to_whatsapp('Olá, "tudo bem"?\r\n') == "Olá, 'tudo bem'?"
+
+    def test_code_placeholders_in_input_are_kept(self):
+        """A literal placeholder without a matching code block is left untouched."""
+        assert markdown_to_whatsapp("`a` e ¤C7¤") == "`a` e ¤C7¤"